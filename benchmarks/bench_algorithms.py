@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分析表构造算法对比
+对配置文件中的文法和合成文法(见grammar_factory.py)，分别用SLR(1)、LALR(1)、Pager最小LR(1)、
+规范LR(1)生成分析表，输出每种算法的状态数、未解决的冲突数和生成耗时，
+据此为每个文法选择没有冲突的最便宜的算法:
+    python benchmarks/bench_algorithms.py
+    python benchmarks/bench_algorithms.py --output benchmarks/results/algorithms.json
+"""
+
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.generator import ParserGenerator, ALGORITHMS
+from utils.config_loader import ConfigLoader
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+# 合成文法: (文法族, 参数)
+SYNTHETIC = [('expression_tower', 4), ('expression_tower', 8), ('statement_language', 8),
+             ('lr1_not_lalr', 1), ('lr1_not_lalr', 8)]
+QUICK_SYNTHETIC = [('expression_tower', 4), ('lr1_not_lalr', 2)]
+
+
+def measure(make_grammar, algorithm: str, repeat: int):
+    """用algorithm生成分析表，返回 {状态数, 冲突数, ACTION表项数, 耗时}，耗时取repeat次中的最小值"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = ParserGenerator(make_grammar(), algorithm=algorithm)
+            start = time.perf_counter()
+            generator.generate()
+            best = min(best, time.perf_counter() - start)
+    return {
+        'states': len(generator.states),
+        'conflicts': len(generator.table_builder.conflicts),
+        'action_entries': len(generator.action_table),
+        'seconds': round(best, 6),
+    }
+
+
+def grammars(quick: bool):
+    """待测文法: [(名称, 生成文法对象的函数)]"""
+    result = []
+    loader = ConfigLoader(str(project_root / "configs"))
+    if not quick:
+        for config_path in sorted((project_root / "configs").glob("*.json")):
+            config = loader.load(config_path.name)
+            result.append((config_path.stem, config.to_grammar))
+    for family, size in (QUICK_SYNTHETIC if quick else SYNTHETIC):
+        rules = FAMILIES[family](size)
+        result.append((f"{family}/{size}", lambda rules=rules: build_grammar(rules)))
+    return result
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="分析表构造算法对比")
+    arg_parser.add_argument('--output', help="结果JSON文件路径")
+    arg_parser.add_argument('--label', default='', help="写入结果的标签(如提交号)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    arg_parser.add_argument('--quick', action='store_true', help="只测小规模合成文法")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("[分析表构造算法对比] 每格: 状态数/冲突数/耗时，* 为无冲突且最快的算法")
+    print(f"  {'文法':<28}" + "".join(f"{name:>22}" for name in ALGORITHMS))
+    results = []
+    for name, make_grammar in grammars(args.quick):
+        row = {algorithm: measure(make_grammar, algorithm, args.repeat) for algorithm in ALGORITHMS}
+        clean = [a for a in ALGORITHMS if row[a]['conflicts'] == 0]
+        choice = min(clean, key=lambda a: row[a]['seconds']) if clean else None
+        results.append({'grammar': name, 'choice': choice, 'algorithms': row})
+        cells = "".join(
+            f"{('*' if a == choice else '') + '%d/%d/%.1fms' % (r['states'], r['conflicts'], r['seconds'] * 1000):>22}"
+            for a, r in row.items())
+        print(f"  {name:<28}{cells}")
+
+    if args.output:
+        report = {
+            'label': args.label,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[已保存] {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Earley分析性能测试
+1. 合成文法(见grammar_factory.py): 生成分析表后才能分析第一个句子(ParserGenerator + LRParser)，
+   与不生成分析表直接用EarleyParser分析同一个句子的耗时对比
+2. 文法配置上的长程序: LRParser与EarleyParser的分析耗时(Earley的常数更大，用于验证文法而不是代替LR分析)
+    python benchmarks/bench_earley.py
+    python benchmarks/bench_earley.py --tokens 2000 --repeat 1
+"""
+
+import sys
+import io
+import time
+import random
+import argparse
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.generator import ParserGenerator
+from driver import LRParser, EarleyParser
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+from benchmarks.bench_pipeline import Pipeline
+
+
+CONFIGS = ['grammar1_arithmetic.json', 'grammar_imperative.json', 'grammar_control_flow.json']
+CASES = [('statement_language', 16), ('statement_language', 64),
+         ('expression_tower', 16), ('lr1_not_lalr', 64)]
+
+
+def sample_sentence(family: str, size: int):
+    """合成文法族的一个句子(token类型与值相同)"""
+    if family == 'statement_language':
+        text = f"kw{size - 1} ( id + num * id ) {{ int id ; id := ( id ) ; }}"
+    elif family == 'expression_tower':
+        text = f"id op0 ( num op{size - 1} id ) op{size // 2} num"
+    else:
+        text = f"a{size - 1} c e{size - 1}"
+    return [(word, word) for word in text.split()]
+
+
+def best_time(function, repeat: int) -> float:
+    """执行repeat次(屏蔽输出)，返回最短耗时"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_family(family: str, size: int, repeat: int):
+    """分析第一个句子前的等待时间: 生成分析表 + LRParser，对比 EarleyParser"""
+    rules = FAMILIES[family](size)
+    tokens = sample_sentence(family, size)
+    results = {}
+
+    def with_tables():
+        grammar = build_grammar(rules)
+        action_table, goto_table = ParserGenerator(grammar).generate()
+        parser = LRParser(grammar, action_table, goto_table, lambda production, symbols: {})
+        results['lr'] = parser.parse(tokens) == 1
+
+    def without_tables():
+        parser = EarleyParser(build_grammar(rules))
+        results['earley'] = parser.parse(tokens)
+
+    table_seconds = best_time(with_tables, repeat)
+    earley_seconds = best_time(without_tables, repeat)
+    assert results['earley'], f"{family}/{size}: 样例句子不属于文法"
+    return len(rules), table_seconds, earley_seconds, results['lr']
+
+
+def measure_config(config: str, tokens_target: int, repeat: int):
+    """文法配置上的随机程序: LRParser与EarleyParser(含建语法树)的耗时"""
+    pipeline = Pipeline(str(project_root / "configs" / config))
+    tokens = pipeline.scan(pipeline.generate(tokens_target, random.Random(42)))
+    lr = LRParser(pipeline.grammar, pipeline.action_table, pipeline.goto_table, lambda production, symbols: {})
+    earley = EarleyParser(pipeline.grammar)
+    lr_seconds = best_time(lambda: lr.parse(tokens), repeat)
+    earley_seconds = best_time(lambda: earley.parse(tokens), repeat)
+    tree_seconds = best_time(earley.get_parse_tree, repeat)
+    assert earley.get_parse_tree() == lr.get_parse_tree(), f"{config}: 语法树不同"
+    return len(tokens), lr_seconds, earley_seconds, tree_seconds, earley.stats['items']
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="Earley分析性能测试")
+    arg_parser.add_argument('--tokens', type=int, default=5000, help="随机程序的目标token数")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("[分析第一个句子: 生成分析表 + LRParser vs EarleyParser]")
+    print(f"  {'文法':<24} {'产生式':>6} {'生成表+LR':>10} {'Earley':>10} {'加速':>8}  LALR接受")
+    for family, size in CASES:
+        count, table_seconds, earley_seconds, lr_accepted = measure_family(family, size, args.repeat)
+        print(f"  {family + '/' + str(size):<24} {count:>6} {table_seconds:>9.3f}s {earley_seconds:>9.4f}s"
+              f" {table_seconds / earley_seconds:>7.0f}x  {'是' if lr_accepted else '否(有冲突)'}")
+
+    print("\n[长程序: LRParser vs EarleyParser]")
+    print(f"  {'文法':<28} {'token数':>8} {'LRParser':>10} {'Earley':>10} {'建语法树':>10} {'项目数':>9}")
+    for config in CONFIGS:
+        count, lr_seconds, earley_seconds, tree_seconds, items = measure_config(config, args.tokens, args.repeat)
+        print(f"  {config:<28} {count:>8} {lr_seconds:>9.3f}s {earley_seconds:>9.3f}s"
+              f" {tree_seconds:>9.3f}s {items:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GLR分析性能测试
+1. 无冲突的文法配置: 同一个随机程序分别用LRParser和GLRParser分析，比较耗时(GLR走确定性快速路径)
+2. 歧义文法 E -> E + E | E * E | id: 运算符个数增加时GLR分析(构建共享分析森林)的耗时和推导个数
+    python benchmarks/bench_glr.py
+    python benchmarks/bench_glr.py --tokens 5000 --repeat 1
+"""
+
+import sys
+import io
+import time
+import random
+import argparse
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.generator import ParserGenerator
+from driver import LRParser, GLRParser
+from benchmarks.grammar_factory import build_grammar
+from benchmarks.bench_pipeline import Pipeline
+
+
+CONFIGS = ['grammar1_arithmetic.json', 'grammar_imperative.json', 'grammar_control_flow.json']
+AMBIGUOUS = ["E -> E + E", "E -> E * E", "E -> id"]
+
+
+def best_time(function, repeat: int) -> float:
+    """执行repeat次(屏蔽输出)，返回最短耗时"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_config(config: str, tokens_target: int, repeat: int):
+    """无冲突的文法上LRParser与GLRParser的耗时"""
+    pipeline = Pipeline(str(project_root / "configs" / config))
+    tokens = pipeline.scan(pipeline.generate(tokens_target, random.Random(42)))
+    lr = LRParser(pipeline.grammar, pipeline.action_table, pipeline.goto_table, lambda production, symbols: {})
+    glr = GLRParser(pipeline.grammar, pipeline.action_table, pipeline.goto_table)
+    lr_seconds = best_time(lambda: lr.parse(tokens), repeat)
+    glr_seconds = best_time(lambda: glr.parse(tokens), repeat)
+    tree_seconds = best_time(glr.get_parse_tree, repeat)
+    assert glr.get_parse_tree() == lr.get_parse_tree(), f"{config}: 语法树不同"
+    return len(tokens), lr_seconds, glr_seconds, tree_seconds
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="GLR分析性能测试")
+    arg_parser.add_argument('--tokens', type=int, default=20000, help="随机程序的目标token数")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("[无冲突文法: LRParser vs GLRParser]")
+    print(f"  {'文法':<28} {'token数':>8} {'LRParser':>10} {'GLRParser':>10} {'比值':>6} {'建语法树':>10}")
+    for config in CONFIGS:
+        count, lr_seconds, glr_seconds, tree_seconds = measure_config(config, args.tokens, args.repeat)
+        print(f"  {config:<28} {count:>8} {lr_seconds:>9.3f}s {glr_seconds:>9.3f}s"
+              f" {glr_seconds / lr_seconds:>6.2f} {tree_seconds:>9.3f}s")
+
+    print("\n[歧义文法: " + " | ".join(AMBIGUOUS) + "]")
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(build_grammar(AMBIGUOUS))
+        action_table, goto_table = generator.generate()
+    parser = GLRParser(generator.grammar, action_table, goto_table, generator.conflict_actions)
+    print(f"  {'运算符个数':<12} {'耗时':>10} {'推导个数':>16}")
+    for operators in (10, 20, 40, 80):
+        tokens = [('id', 'x')]
+        for i in range(operators):
+            tokens += [('+' if i % 2 else '*', None), ('id', 'x')]
+        seconds = best_time(lambda: parser.parse(tokens), args.repeat)
+        print(f"  {operators:<12} {seconds:>9.3f}s {parser.forest.count_trees():>16.3g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量分析表生成性能测试
+对合成文法(见grammar_factory.py)修改一个产生式，比较完整生成(ParserGenerator)与
+基于上一次结果的增量生成(IncrementalParserGenerator)的耗时:
+    python benchmarks/bench_incremental.py
+    python benchmarks/bench_incremental.py --output benchmarks/results/incremental.json
+"""
+
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.generator import ParserGenerator
+from syntax.incremental_generator import IncrementalParserGenerator
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+# (文法族, 参数, 修改说明, 修改前的规则, 修改后的规则)；修改后的规则为None表示在末尾追加
+CASES = [
+    ('statement_language', 32, "修改因子", "F -> num", "F -> num ! id"),
+    ('statement_language', 32, "新增语句", None, "S -> kwX ( E ) S"),
+    ('statement_language', 64, "修改因子", "F -> num", "F -> num ! id"),
+    ('expression_tower', 16, "修改运算符", "E8 -> E8 op8 E9", "E8 -> E8 op8 op8 E9"),
+    ('lr1_not_lalr', 64, "修改一份", "A3 -> c", "A3 -> c c"),
+]
+QUICK_CASES = [
+    ('statement_language', 8, "修改因子", "F -> num", "F -> num ! id"),
+    ('expression_tower', 8, "修改运算符", "E4 -> E4 op4 E5", "E4 -> E4 op4 op4 E5"),
+]
+
+
+def edit_rules(rules, old, new):
+    """把规则old替换为new(old为None时追加new)"""
+    if old is None:
+        return rules + [new]
+    assert old in rules, f"规则不存在: {old}"
+    return [new if rule == old else rule for rule in rules]
+
+
+def timed_generate(make_generator, repeat: int):
+    """生成repeat次，返回 (最后一次的生成器, 最短耗时)"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = make_generator()
+            start = time.perf_counter()
+            generator.generate()
+            best = min(best, time.perf_counter() - start)
+    return generator, best
+
+
+def measure(family: str, size: int, description: str, old, new, repeat: int):
+    """测量一次修改的完整生成和增量生成耗时"""
+    rules = FAMILIES[family](size)
+    edited = edit_rules(rules, old, new)
+    with contextlib.redirect_stdout(io.StringIO()):
+        previous = IncrementalParserGenerator(build_grammar(rules))
+        previous.generate()
+
+    full, full_seconds = timed_generate(lambda: ParserGenerator(build_grammar(edited)), repeat)
+    incremental, incremental_seconds = timed_generate(
+        lambda: IncrementalParserGenerator(build_grammar(edited), previous.cache), repeat)
+    assert incremental.action_table == full.action_table, "增量生成的ACTION表与完整生成不同"
+    assert incremental.goto_table == full.goto_table, "增量生成的GOTO表与完整生成不同"
+    return {
+        'name': f"{family}/{size} {description}",
+        'lr1_states': incremental.reused_states + incremental.rebuilt_states,
+        'reused_states': incremental.reused_states,
+        'reused_rows': incremental.reused_rows,
+        'rows': incremental.reused_rows + incremental.rebuilt_rows,
+        'full_seconds': round(full_seconds, 4),
+        'incremental_seconds': round(incremental_seconds, 4),
+        'speedup': round(full_seconds / max(incremental_seconds, 1e-9), 1),
+    }
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="增量分析表生成性能测试")
+    arg_parser.add_argument('--output', help="结果JSON文件路径")
+    arg_parser.add_argument('--label', default='', help="写入结果的标签(如提交号)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    arg_parser.add_argument('--quick', action='store_true', help="只测小规模合成文法")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("[增量分析表生成测试]")
+    print(f"  {'修改':<36} {'复用状态':>12} {'复用行':>10} {'完整生成':>10} {'增量生成':>10} {'加速':>7}")
+    results = []
+    for case in (QUICK_CASES if args.quick else CASES):
+        result = measure(*case, repeat=args.repeat)
+        results.append(result)
+        print(f"  {result['name']:<36} {result['reused_states']:>6}/{result['lr1_states']:<5}"
+              f" {result['reused_rows']:>5}/{result['rows']:<4}"
+              f" {result['full_seconds']:>9.3f}s {result['incremental_seconds']:>9.3f}s {result['speedup']:>6.1f}x")
+
+    if args.output:
+        report = {
+            'label': args.label,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[已保存] {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内存峰值性能测试
+用tracemalloc测量两类对象密集的操作:
+- lr1:   LR(1)项目集构造(LR1Item、Production)
+- parse: 分析一个很长的token序列(分析栈上的Symbol、语法树节点)
+
+结果可保存为JSON并与之前的结果对比:
+    python benchmarks/bench_memory.py --output benchmarks/results/memory.json
+    python benchmarks/bench_memory.py --compare benchmarks/results/memory.json
+"""
+
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.first_follow import FirstFollowCalculator
+from syntax.lr1_builder import LR1Builder
+from driver import CompiledTables
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+LR1_GRAMMARS = [('expression_tower', 8), ('statement_language', 16), ('lr1_not_lalr', 32)]
+CONFIG = project_root / "configs" / "grammar_control_flow.json"
+
+# 重复分析的语句块(声明只出现一次)
+HEADER = "int a ; int b ; "
+BLOCK = ("a := a + 1 * b ; if ( a < 3 && b != a ) b := b - 1 ; else a := a + 1 ; "
+         "while ( b > 0 ) { b := b - 1 ; } ")
+
+
+def traced(func):
+    """执行func，返回 (结果, 耗时, 内存峰值字节数)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def measure_lr1(family: str, size: int):
+    """测量LR(1)项目集构造(FIRST/FOLLOW集事先算好，不计入)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        grammar = build_grammar(FAMILIES[family](size))
+        grammar.augment()
+        calculator = FirstFollowCalculator(grammar)
+        calculator.compute_first_sets()
+        calculator.compute_follow_sets()
+        (states, _), elapsed, peak = traced(LR1Builder(grammar, calculator).build)
+    items = sum(len(state) for state in states)
+    return {
+        'name': f"lr1 {family}/{size}",
+        'states': len(states),
+        'items': items,
+        'seconds': round(elapsed, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'bytes_per_item': round(peak / items, 1),
+    }
+
+
+def measure_parse(token_count: int):
+    """测量分析约token_count个token的程序(输入token序列事先生成，不计入)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tables = CompiledTables.from_config(str(CONFIG))
+    scanner = tables.scanner()
+    header, block = scanner.scan(HEADER), scanner.scan(BLOCK)
+    tokens = header + block * max(1, (token_count - len(header)) // len(block))
+    parser = tables.parser(lambda production, symbols: {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        result, elapsed, peak = traced(lambda: parser.parse(tokens))
+    assert result == 1, "测试程序分析失败"
+    return {
+        'name': f"parse {len(tokens)} tokens",
+        'tokens': len(tokens),
+        'seconds': round(elapsed, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'bytes_per_token': round(peak / len(tokens), 1),
+    }
+
+
+def compare(results, baseline_path: str):
+    """打印与之前结果的内存峰值比值(当前/之前)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {r['name']: r for r in baseline['results']}
+    print(f"\n[对比] 基准: {baseline_path} ({baseline.get('label', '')})")
+    for result in results:
+        before = old.get(result['name'])
+        if before is None:
+            continue
+        print(f"  {result['name']:<36} 内存峰值 {result['peak_kb'] / before['peak_kb']:.2f}x"
+              f"   耗时 {result['seconds'] / max(before['seconds'], 1e-6):.2f}x")
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="内存峰值性能测试")
+    arg_parser.add_argument('--tokens', type=int, default=1000000, help="分析测试的token数")
+    arg_parser.add_argument('--output', help="结果JSON文件路径")
+    arg_parser.add_argument('--compare', help="与之前保存的结果JSON对比")
+    arg_parser.add_argument('--label', default='', help="写入结果的标签(如提交号)")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("[内存峰值测试]")
+    results = []
+    for family, size in LR1_GRAMMARS:
+        result = measure_lr1(family, size)
+        results.append(result)
+        print(f"  {result['name']:<36} {result['items']:>8}个项目 {result['peak_kb']:>10.0f} KB"
+              f" ({result['bytes_per_item']:.0f} 字节/项目) {result['seconds']:>8.2f} s")
+    result = measure_parse(args.tokens)
+    results.append(result)
+    print(f"  {result['name']:<36} {'':>12} {result['peak_kb']:>10.0f} KB"
+          f" ({result['bytes_per_token']:.0f} 字节/token) {result['seconds']:>8.2f} s")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.output:
+        report = {
+            'label': args.label,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[已保存] {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
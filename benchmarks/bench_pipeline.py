@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+端到端吞吐量性能测试
+对每个文法配置随机生成程序(见sentence_generator.py)，分别测量:
+- scan:  Scanner.scan
+- parse: LRParser.parse (不执行语义动作)
+- ir:    LRParser.parse + MySemanticAnalyzer (生成三地址码；文法不适用时跳过)
+
+报告每个阶段的 token/s、字节/s、每个token的内存峰值(tracemalloc)，
+以及小程序端到端延迟的p50/p99。结果可保存为基准并在之后对比:
+    python benchmarks/bench_pipeline.py --save-baseline
+    python benchmarks/bench_pipeline.py            # 自动与已保存的基准对比
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from lexical import LexicalGenerator, Scanner
+from syntax import ParserGenerator
+from driver import LRParser
+from driver.semantic_analyzer_k import MySemanticAnalyzer
+from utils.config_loader import ConfigLoader
+from benchmarks.grammar_factory import build_grammar
+from benchmarks.sentence_generator import SentenceGenerator
+
+
+DEFAULT_BASELINE = project_root / "benchmarks" / "results" / "pipeline_baseline.json"
+PHASES = ['scan', 'parse', 'ir']
+
+
+class Pipeline:
+    """一个文法配置生成的编译器前端，以及配套的随机程序生成器"""
+
+    def __init__(self, config_path: str):
+        """根据文法配置生成词法分析器和分析表(屏蔽生成过程的输出)"""
+        loader = ConfigLoader(os.path.dirname(os.path.abspath(config_path)))
+        self.config = loader.load(os.path.basename(config_path))
+        with contextlib.redirect_stdout(io.StringIO()):
+            table, accepting_map = LexicalGenerator().build(self.config.lexical_rules)
+            self.grammar = build_grammar(self.config.grammar_rules)
+            self.action_table, self.goto_table = ParserGenerator(self.grammar).generate()
+        self.scanner = Scanner(table, accepting_map)
+        self.generator = SentenceGenerator(self.config.grammar_rules, self.scanner)
+        self.declared = 0
+
+    def generate(self, target: int, rng: random.Random) -> str:
+        """
+        生成随机程序: 声明语句(int id)使用新的变量名，其余标识符取自预先声明的单词池，
+        使语义分析不会因重复声明或未声明而中止
+        """
+        def lexeme(item, rng):
+            terminal, right, index = item
+            if terminal == 'id' and index > 0 and right[index - 1] == 'int':
+                self.declared += 1
+                return f"d{self.declared}"
+            return None
+
+        return self.generator.generate(target, rng, lexeme)
+
+    def scan(self, source: str):
+        """词法分析"""
+        return self.scanner.scan(source)
+
+    def parse(self, tokens) -> bool:
+        """语法分析(语义动作只返回空属性)"""
+        parser = LRParser(self.grammar, self.action_table, self.goto_table,
+                          lambda production, symbols: {})
+        return parser.parse(tokens) == 1
+
+    def ir(self, tokens) -> bool:
+        """语法分析 + 语义分析和中间代码生成(单词池中的标识符预先声明为已初始化的int变量)"""
+        analyzer = MySemanticAnalyzer()
+        for name in self.generator.lexemes.get('id', ()):
+            analyzer.symbol_table[name] = {"type": "int", "initialized": True, "ir_name": name}
+        parser = LRParser(self.grammar, self.action_table, self.goto_table, analyzer)
+        return parser.parse(tokens) == 1
+
+
+def percentile(values, fraction: float) -> float:
+    """已排序数据的百分位数(最近秩)"""
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def benchmark_config(config_path: str, tokens_target: int, samples: int, repeat: int):
+    """测量一个文法配置，返回结果字典；生成的程序不能通过语法分析时(文法本身有问题)返回None"""
+    pipeline = Pipeline(config_path)
+    rng = random.Random(42)
+    source = pipeline.generate(tokens_target, rng)
+    size = len(source.encode('utf-8'))
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tokens = pipeline.scan(source)
+        runs = {
+            'scan': lambda: pipeline.scan(source),
+            'parse': lambda: pipeline.parse(tokens),
+            'ir': lambda: pipeline.ir(tokens),
+        }
+        if not pipeline.parse(tokens):
+            return None
+        phases_enabled = [p for p in PHASES if p != 'ir' or pipeline.ir(tokens)]
+
+        phases = {}
+        for phase in phases_enabled:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                runs[phase]()
+                best = min(best, time.perf_counter() - start)
+            tracemalloc.start()
+            try:
+                runs[phase]()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            phases[phase] = {
+                'seconds': round(best, 6),
+                'tokens_per_sec': round(len(tokens) / best, 1),
+                'bytes_per_sec': round(size / best, 1),
+                'peak_bytes_per_token': round(peak / len(tokens), 1),
+            }
+
+        # 小程序的端到端延迟
+        last = phases_enabled[-1]
+        latencies = []
+        for _ in range(samples):
+            small = pipeline.generate(20, rng)
+            start = time.perf_counter()
+            small_tokens = pipeline.scan(small)
+            if last != 'scan':
+                getattr(pipeline, last)(small_tokens)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+
+    return {
+        'config': Path(config_path).name,
+        'tokens': len(tokens),
+        'bytes': size,
+        'phases': phases,
+        'latency': {
+            'pipeline': last,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        },
+    }
+
+
+def compare(results, baseline_path: Path):
+    """打印与基准的吞吐量比值(当前/基准，大于1表示变快)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {r['config']: r for r in baseline['results']}
+
+    print(f"\n[对比] 基准: {baseline_path} ({baseline.get('label', '')}, {baseline.get('timestamp', '')})")
+    for result in results:
+        before = old.get(result['config'])
+        if before is None:
+            continue
+        ratios = []
+        for phase, stats in result['phases'].items():
+            if phase in before['phases']:
+                ratio = stats['tokens_per_sec'] / before['phases'][phase]['tokens_per_sec']
+                ratios.append(f"{phase} {ratio:.2f}x")
+        p50 = before['latency']['p50_ms']
+        if p50 > 0:
+            ratios.append(f"p50延迟 {result['latency']['p50_ms'] / p50:.2f}x")
+        print(f"  {result['config']:<32}" + ", ".join(ratios))
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="端到端吞吐量性能测试")
+    arg_parser.add_argument('configs', nargs='*', help="文法配置文件(默认configs/下全部)")
+    arg_parser.add_argument('--tokens', type=int, default=1000, help="吞吐量测试程序的目标token数")
+    arg_parser.add_argument('--samples', type=int, default=200, help="延迟测试的小程序个数")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    arg_parser.add_argument('--label', default='', help="写入结果的标签(如提交号)")
+    arg_parser.add_argument('--output', help="结果JSON文件路径")
+    arg_parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="基准JSON文件路径")
+    arg_parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基准")
+    args = arg_parser.parse_args()
+
+    configs = args.configs or sorted(str(p) for p in (project_root / "configs").glob("*.json"))
+    results = []
+    print("=" * 70)
+    print("[端到端吞吐量测试]")
+    for config_path in configs:
+        result = benchmark_config(config_path, args.tokens, args.samples, args.repeat)
+        if result is None:
+            print(f"\n  [跳过] {Path(config_path).name}: 随机生成的程序没有通过语法分析")
+            continue
+        results.append(result)
+        print(f"\n  {result['config']} ({result['tokens']} tokens, {result['bytes']} 字节)")
+        for phase, stats in result['phases'].items():
+            print(f"    {phase:<6} {stats['tokens_per_sec']:>12.0f} token/s {stats['bytes_per_sec']:>12.0f} 字节/s"
+                  f"   内存峰值 {stats['peak_bytes_per_token']:>8.0f} 字节/token")
+        latency = result['latency']
+        print(f"    小程序延迟(scan..{latency['pipeline']}): p50 {latency['p50_ms']:.2f} ms, "
+              f"p99 {latency['p99_ms']:.2f} ms")
+
+    report = {
+        'label': args.label,
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+    baseline = Path(args.baseline)
+    if baseline.exists() and not args.save_baseline:
+        compare(results, baseline)
+
+    for path in ([args.output] if args.output else []) + ([str(baseline)] if args.save_baseline else []):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[已保存] {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
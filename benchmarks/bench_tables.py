@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分析表生成性能测试
+对合成文法(见grammar_factory.py)分别测量分析表生成各阶段的耗时和内存峰值:
+FIRST/FOLLOW集计算、LR(1)项目集构造、LALR(1)合并、ACTION/GOTO表构造
+
+结果写入JSON文件，可与之前保存的结果对比:
+    python benchmarks/bench_tables.py --output benchmarks/results/tables.json
+    python benchmarks/bench_tables.py --compare benchmarks/results/tables.json
+"""
+
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax.first_follow import FirstFollowCalculator
+from syntax.lr1_builder import LR1Builder
+from syntax.lalr_builder import LALRBuilder
+from syntax.table_builder import TableBuilder
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+# 默认规模: {文法族: [参数, ...]}
+DEFAULT_SIZES = {
+    'expression_tower': [2, 4, 8, 16],
+    'statement_language': [4, 8, 16],
+    'lr1_not_lalr': [1, 8, 32],
+}
+QUICK_SIZES = {
+    'expression_tower': [2, 4],
+    'statement_language': [4],
+    'lr1_not_lalr': [1, 2],
+}
+
+PHASES = ['first_follow', 'lr1', 'lalr', 'table']
+
+
+def run_phases(rules, measure, workers: int = 1):
+    """
+    执行一遍分析表生成，measure(阶段名, 函数)负责执行并测量每个阶段
+    workers: LR(1)项目集构造的工作进程数
+
+    返回: 统计信息 {产生式数, LR(1)状态数, LALR(1)状态数, 冲突数}
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        grammar = build_grammar(rules)
+        grammar.augment()
+        calculator = FirstFollowCalculator(grammar)
+
+        def first_follow():
+            calculator.compute_first_sets()
+            calculator.compute_follow_sets()
+
+        measure('first_follow', first_follow)
+        lr1_states, lr1_goto = measure('lr1', lambda: LR1Builder(grammar, calculator).build(workers))
+        lalr_states, lalr_goto = measure('lalr', lambda: LALRBuilder.merge(lr1_states, lr1_goto))
+        table_builder = TableBuilder(grammar)
+        measure('table', lambda: table_builder.build(lalr_states, lalr_goto))
+
+    return {
+        'productions': len(grammar.productions),
+        'lr1_states': len(lr1_states),
+        'lalr_states': len(lalr_states),
+        'conflicts': len(table_builder.conflicts),
+    }
+
+
+def benchmark_grammar(rules, repeat: int, workers: int = 1):
+    """
+    测量一个文法: 耗时取repeat次中的最小值；内存峰值单独用tracemalloc测一遍(避免影响计时)
+    """
+    seconds = {phase: float('inf') for phase in PHASES}
+
+    def timed(phase, func):
+        start = time.perf_counter()
+        result = func()
+        seconds[phase] = min(seconds[phase], time.perf_counter() - start)
+        return result
+
+    for _ in range(repeat):
+        stats = run_phases(rules, timed, workers)
+
+    peaks = {}
+
+    def traced(phase, func):
+        tracemalloc.start()
+        try:
+            result = func()
+            peaks[phase] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+
+    run_phases(rules, traced, workers)
+
+    stats['phases'] = {
+        phase: {'seconds': round(seconds[phase], 6), 'peak_kb': round(peaks[phase] / 1024, 1)}
+        for phase in PHASES
+    }
+    return stats
+
+
+def compare(results, baseline_path: str):
+    """打印与之前结果的耗时比值(当前/之前)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r['family'], r['size']): r for r in baseline['results']}
+
+    print(f"\n[对比] 基准: {baseline_path} ({baseline.get('label', '')})")
+    print(f"  {'文法':<24}" + "".join(f"{phase:>14}" for phase in PHASES))
+    for result in results:
+        key = (result['family'], result['size'])
+        if key not in old:
+            continue
+        ratios = []
+        for phase in PHASES:
+            before = old[key]['phases'][phase]['seconds']
+            now = result['phases'][phase]['seconds']
+            ratios.append(f"{now / before:>13.2f}x" if before > 0 else f"{'-':>14}")
+        print(f"  {key[0] + '/' + str(key[1]):<24}" + "".join(ratios))
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="分析表生成性能测试")
+    arg_parser.add_argument('--output', help="结果JSON文件路径")
+    arg_parser.add_argument('--compare', help="与之前保存的结果JSON对比")
+    arg_parser.add_argument('--label', default='', help="写入结果的标签(如提交号)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="计时重复次数(取最小值)")
+    arg_parser.add_argument('--quick', action='store_true', help="只测小规模文法")
+    arg_parser.add_argument('--workers', type=int, default=1, help="LR(1)项目集构造的工作进程数")
+    args = arg_parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    results = []
+    print("=" * 70)
+    print("[分析表生成性能测试]")
+    print(f"  {'文法':<24}{'产生式':>8}{'LR(1)':>8}{'LALR':>8}{'冲突':>6}"
+          + "".join(f"{phase:>14}" for phase in PHASES))
+    for family, family_sizes in sizes.items():
+        for size in family_sizes:
+            stats = benchmark_grammar(FAMILIES[family](size), args.repeat, args.workers)
+            result = {'family': family, 'size': size, **stats}
+            results.append(result)
+            times = "".join(f"{stats['phases'][p]['seconds'] * 1000:>11.1f} ms" for p in PHASES)
+            print(f"  {family + '/' + str(size):<24}{stats['productions']:>8}{stats['lr1_states']:>8}"
+                  f"{stats['lalr_states']:>8}{stats['conflicts']:>6}{times}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.output:
+        report = {
+            'label': args.label,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[已保存] {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+合成文法生成器
+按参数生成规模可控的文法(规则字符串列表，格式与配置文件的grammar_rules相同)，供性能测试使用
+"""
+
+from typing import Callable, Dict, List
+
+from syntax import Grammar
+
+
+def expression_tower(levels: int) -> List[str]:
+    """
+    N个优先级的表达式文法(每层一个左结合的二元运算符)
+
+    E0 -> E0 op0 E1 | E1
+    ...
+    E{N-1} -> E{N-1} op{N-1} EN | EN
+    EN -> ( E0 ) | id | num
+    """
+    rules = []
+    for i in range(levels):
+        rules.append(f"E{i} -> E{i} op{i} E{i + 1}")
+        rules.append(f"E{i} -> E{i + 1}")
+    rules.append(f"E{levels} -> ( E0 )")
+    rules.append(f"E{levels} -> id")
+    rules.append(f"E{levels} -> num")
+    return rules
+
+
+def statement_language(keywords: int) -> List[str]:
+    """
+    含N个关键字语句的命令式语言: 每个关键字kw_i引出一种语句 kw_i ( E ) S
+    另有声明、赋值、语句块以及两层的算术表达式
+    """
+    rules = [
+        "P -> P S",
+        "P -> S",
+        "S -> int id ;",
+        "S -> id := E ;",
+        "S -> { P }",
+    ]
+    for i in range(keywords):
+        rules.append(f"S -> kw{i} ( E ) S")
+    rules += [
+        "E -> E + T",
+        "E -> T",
+        "T -> T * F",
+        "T -> F",
+        "F -> ( E )",
+        "F -> id",
+        "F -> num",
+    ]
+    return rules
+
+
+def lr1_not_lalr(copies: int) -> List[str]:
+    """
+    LR(1)但不是LALR(1)的文法族: N份经典的反例，合并同心项后每份产生归约-归约冲突
+
+    S -> a_i A_i d_i | b_i B_i d_i | a_i B_i e_i | b_i A_i e_i
+    A_i -> c
+    B_i -> c
+    """
+    rules = []
+    for i in range(copies):
+        rules += [
+            f"S -> a{i} A{i} d{i}",
+            f"S -> b{i} B{i} d{i}",
+            f"S -> a{i} B{i} e{i}",
+            f"S -> b{i} A{i} e{i}",
+        ]
+    for i in range(copies):
+        rules += [f"A{i} -> c", f"B{i} -> c"]
+    return rules
+
+
+# 文法族名称 -> 生成函数
+FAMILIES: Dict[str, Callable[[int], List[str]]] = {
+    'expression_tower': expression_tower,
+    'statement_language': statement_language,
+    'lr1_not_lalr': lr1_not_lalr,
+}
+
+
+def build_grammar(rules: List[str]) -> Grammar:
+    """
+    由规则字符串构造文法对象(与配置文件的解析方式相同)
+
+    参数:
+        rules: ["A -> x y", ...]
+    返回: 文法对象(未增广)
+    """
+    grammar = Grammar()
+    for rule_str in rules:
+        left, right = rule_str.split('->')
+        grammar.add_production(left.strip(), [s.strip() for s in right.strip().split()])
+    return grammar
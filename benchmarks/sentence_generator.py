@@ -0,0 +1,194 @@
+"""
+随机程序生成器
+根据配置文件中的grammar_rules随机推导句子，并借助词法DFA为每个终结符生成合法的单词，
+供端到端性能测试使用
+"""
+
+import random
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from lexical import Scanner
+
+
+# 推导出的终结符: (终结符, 所在产生式的右部, 在右部中的下标)
+Terminal = Tuple[str, Tuple[str, ...], int]
+
+
+class SentenceGenerator:
+    """
+    随机句子生成器
+
+    推导时记录推导树至少还能推出多少个终结符，预算用完后只选择推导长度最短的产生式，
+    因此句子长度接近目标长度且推导一定终止。
+    含无法生成单词的终结符(如error)的产生式不参与推导
+    """
+
+    def __init__(self, grammar_rules: List[str], scanner: Scanner, pool_size: int = 8):
+        """
+        初始化生成器
+
+        参数:
+            grammar_rules: 产生式字符串列表(与配置文件格式相同)，第一条产生式的左部为开始符号
+            scanner: 由同一配置生成的词法扫描器
+            pool_size: 每个终结符最多生成的不同单词数
+        """
+        self.scanner = scanner
+        self.productions: Dict[str, List[Tuple[str, ...]]] = {}
+        self.start = None
+        for rule_str in grammar_rules:
+            left, right = rule_str.split('->')
+            left = left.strip()
+            symbols = tuple(s for s in right.split() if s != 'ε')
+            self.start = self.start or left
+            self.productions.setdefault(left, []).append(symbols)
+
+        terminals = {s for rights in self.productions.values() for right in rights
+                     for s in right if s not in self.productions}
+        rng = random.Random(0)
+        self.lexemes: Dict[str, List[str]] = {}
+        for terminal in sorted(terminals):
+            pool = self._lexeme_pool(terminal, pool_size, rng)
+            if pool:
+                self.lexemes[terminal] = pool
+
+        # 去掉含无法生成单词的终结符的产生式
+        for left, rights in self.productions.items():
+            self.productions[left] = [r for r in rights
+                                      if all(s in self.productions or s in self.lexemes for s in r)]
+        self.min_length = self._min_lengths()
+        # 能推出比最短推导更长句子的非终结符
+        self.growable = {left for left, rights in self.productions.items()
+                         if len({self._cost(r) for r in rights}) > 1}
+
+    def _cost(self, right: Tuple[str, ...]) -> float:
+        """产生式右部最少能推出的终结符个数"""
+        return sum(self.min_length[s] if s in self.min_length else 1 for s in right)
+
+    def _min_lengths(self) -> Dict[str, float]:
+        """每个非终结符最少能推出的终结符个数(不动点迭代)"""
+        min_length = {left: float('inf') for left in self.productions}
+
+        def cost(right):
+            return sum(min_length[s] if s in min_length else 1 for s in right)
+
+        changed = True
+        while changed:
+            changed = False
+            for left, rights in self.productions.items():
+                best = min((cost(r) for r in rights), default=float('inf'))
+                if best < min_length[left]:
+                    min_length[left] = best
+                    changed = True
+        return min_length
+
+    def _lexeme_pool(self, terminal: str, size: int, rng: random.Random) -> List[str]:
+        """在词法DFA上随机游走，生成最多size个能被扫描为terminal的单词"""
+        transitions = self.scanner.transition_table
+        accepting = self.scanner.accepting_map
+
+        # 能到达terminal接受状态的DFA状态(反向BFS)
+        reverse: Dict[int, Set[int]] = {}
+        for state, row in transitions.items():
+            for target in row.values():
+                reverse.setdefault(target, set()).add(state)
+        alive = {s for s, tag in accepting.items() if tag == terminal}
+        queue = deque(alive)
+        while queue:
+            for source in reverse.get(queue.popleft(), ()):
+                if source not in alive:
+                    alive.add(source)
+                    queue.append(source)
+        if 0 not in alive:
+            return []
+
+        pool: List[str] = []
+        for _ in range(size * 20):
+            state, chars = 0, []
+            while True:
+                if accepting.get(state) == terminal and (len(chars) >= 6 or rng.random() < 0.4):
+                    break
+                moves = [(c, t) for c, t in sorted(transitions.get(state, {}).items()) if t in alive]
+                if not moves:
+                    break
+                char, state = rng.choice(moves)
+                chars.append(char)
+            text = ''.join(chars)
+            if text and text not in pool and self.scanner.match(text, 0)[:2] == (terminal, len(text)):
+                pool.append(text)
+                if len(pool) == size:
+                    break
+        return pool
+
+    def derive(self, target: int, rng: random.Random) -> List[Terminal]:
+        """
+        随机推导一个句子
+
+        每一步随机选择一个尚未展开的非终结符展开(而不是总展开最左边的)，
+        使长度预算分散到整棵推导树上，不会被第一个左递归的非终结符耗尽
+
+        参数:
+            target: 目标终结符个数(实际个数可能略多，至少为开始符号的最短推导长度)
+            rng: 随机数生成器
+        返回: 终结符序列 [(终结符, 所在产生式右部, 下标), ...]
+        """
+        min_length = self.min_length
+        growable = self.growable
+        cost = self._cost
+
+        # 推导树节点: [符号, 所在产生式右部, 下标, 子节点列表]
+        root = [self.start, (self.start,), 0, None]
+        frontier = [root]
+        size = min_length[self.start]  # 当前推导树至少能推出的终结符个数
+        growing = 1 if self.start in growable else 0  # frontier中可以继续增长的节点数
+
+        while frontier:
+            index = rng.randrange(len(frontier))
+            frontier[index], frontier[-1] = frontier[-1], frontier[index]
+            node = frontier.pop()
+            if node[0] in growable:
+                growing -= 1
+            rights = self.productions[node[0]]
+            costs = [cost(r) for r in rights]
+            shortest = min(costs)
+            room = target - size + min_length[node[0]]
+            longer = [r for r, c in zip(rights, costs) if shortest < c <= room]
+            # 没有其他可以增长的节点时必须继续增长，否则句子会远短于目标长度
+            if longer and (not growing or rng.random() < 0.9):
+                right = rng.choice(longer)
+            else:
+                right = rng.choice([r for r, c in zip(rights, costs) if c == shortest])
+            size += cost(right) - min_length[node[0]]
+            node[3] = [[s, right, i, None] for i, s in enumerate(right)]
+            for child in node[3]:
+                if child[0] in self.productions:
+                    frontier.append(child)
+                    growing += child[0] in growable
+
+        # 按从左到右的顺序读出叶子
+        output: List[Terminal] = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node[3] is None:
+                output.append((node[0], node[1], node[2]))
+            else:
+                stack.extend(reversed(node[3]))
+        return output
+
+    def generate(self, target: int, rng: random.Random,
+                 lexeme: Optional[Callable[[Terminal, random.Random], Optional[str]]] = None) -> str:
+        """
+        随机生成一个程序
+
+        参数:
+            target: 目标token个数
+            rng: 随机数生成器
+            lexeme: 可选的单词选择函数，返回None时从单词池中随机选取
+        返回: 以空格分隔单词的源程序
+        """
+        words = []
+        for item in self.derive(target, rng):
+            text = lexeme(item, rng) if lexeme is not None else None
+            words.append(text if text is not None else rng.choice(self.lexemes[item[0]]))
+        return ' '.join(words)
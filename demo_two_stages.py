@@ -21,11 +21,10 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lexical import LexicalGenerator, Scanner
-from syntax import Grammar, ParserGenerator
+from syntax import ParserGenerator
 from driver import LRParser, PL0SemanticAnalyzer, ParseTreeVisualizer
 from utils.config_loader import ConfigLoader
-from utils.visualizer import GraphvizVisualizer
-from visualize_table import generate_table_html
+from utils.logger import Logger
 
 
 def stage1_generate_compiler(config_path: str):
@@ -65,6 +64,7 @@ def stage1_generate_compiler(config_path: str):
     
     # 可视化DFA
     if lexical_gen.last_min_dfa:
+        from utils.visualizer import GraphvizVisualizer
         os.makedirs("visualizations", exist_ok=True)
         dot_file = f"visualizations/{config.name.replace(' ', '_')}_dfa.dot"
         GraphvizVisualizer.export_dfa(lexical_gen.last_min_dfa, dot_file)
@@ -75,12 +75,7 @@ def stage1_generate_compiler(config_path: str):
     print("【步骤2】生成语法分析器（LALR(1)）")
     print("-" * 80)
     
-    grammar = Grammar()
-    for rule_str in config.grammar_rules:
-        left, right = rule_str.split('->')
-        left = left.strip()
-        right = [s.strip() for s in right.strip().split()]
-        grammar.add_production(left, right)
+    grammar = config.to_grammar()
     
     print(f"\n[文法规则] 共{len(grammar.productions)}个产生式:")
     for idx, prod in enumerate(grammar.productions):
@@ -105,6 +100,7 @@ def stage1_generate_compiler(config_path: str):
     print(f"   - GOTO表项数: {len(goto_table)}")
     
     # 可视化分析表
+    from visualize_table import generate_table_html
     html_file = f"visualizations/{config.name.replace(' ', '_')}_lalr_table.html"
     generate_table_html(config_path, html_file, action_table, goto_table)
     print(f"   - [可视化] LALR分析表已导出: {html_file}")
@@ -227,6 +223,9 @@ def main():
         print(f"❌ 错误: 源程序文件不存在 - {source_file}")
         sys.exit(1)
     
+    # 演示需要展示LR分析的每一步和语义动作(DEBUG级别)
+    Logger.set_level('DEBUG')
+    
     print("\n" + "█" * 80)
     print("█" + " " * 78 + "█")
     print("█" + "   编译器生成器演示：分步骤展示".center(76) + "█")
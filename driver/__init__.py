@@ -1,13 +1,64 @@
 """
 LR分析驱动程序模块
+
+子模块在第一次访问对应属性时才导入(PEP 562)，只用LRParser分析时不会导入
+语义分析、中间代码和可视化相关的模块
 """
 
-from .symbol import Symbol
-from .lr_parser import LRParser
-from .semantic_analyzer import SemanticAnalyzer
-from .pl0_analyzer import PL0SemanticAnalyzer
-from .parse_tree import ParseTreeNode, ParseTreeBuilder
-from .tree_visualizer import ParseTreeVisualizer
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .symbol import Symbol
+    from .lr_parser import LRParser
+    from .glr_parser import GLRParser, ForestNode
+    from .earley_parser import EarleyParser
+    from .quadruple import Quadruple, QuadrupleTable
+    from .optimizer import IROptimizer
+    from .ir_vm import IRVirtualMachine, IRRuntimeError
+    from .ir_compiler import IRCompiler
+    from .symbol_table import ScopedSymbolTable
+    from .semantic_analyzer import SemanticAnalyzer
+    from .pl0_analyzer import PL0SemanticAnalyzer
+    from .parse_tree import ParseTreeNode, ParseTreeBuilder
+    from .incremental_parser import IncrementalParser
+    from .tree_visualizer import ParseTreeVisualizer
+    from .compiled_tables import CompiledTables
+
+# 导出名 -> 所在子模块
+_EXPORTS = {
+    'Symbol': '.symbol',
+    'LRParser': '.lr_parser',
+    'GLRParser': '.glr_parser',
+    'ForestNode': '.glr_parser',
+    'EarleyParser': '.earley_parser',
+    'Quadruple': '.quadruple',
+    'QuadrupleTable': '.quadruple',
+    'IROptimizer': '.optimizer',
+    'IRVirtualMachine': '.ir_vm',
+    'IRRuntimeError': '.ir_vm',
+    'IRCompiler': '.ir_compiler',
+    'ScopedSymbolTable': '.symbol_table',
+    'SemanticAnalyzer': '.semantic_analyzer',
+    'PL0SemanticAnalyzer': '.pl0_analyzer',
+    'ParseTreeNode': '.parse_tree',
+    'ParseTreeBuilder': '.parse_tree',
+    'IncrementalParser': '.incremental_parser',
+    'ParseTreeVisualizer': '.tree_visualizer',
+    'CompiledTables': '.compiled_tables',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['Symbol', 'LRParser', 'SemanticAnalyzer', 'PL0SemanticAnalyzer',
-           'ParseTreeNode', 'ParseTreeBuilder', 'ParseTreeVisualizer']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
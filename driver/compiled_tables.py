@@ -0,0 +1,210 @@
+"""
+编译好的分析表
+把词法DFA、ACTION/GOTO表和增广文法保存到缓存文件，之后只需加载缓存即可扫描和分析，
+不必导入也不必运行词法/语法分析生成器
+"""
+
+import os
+import marshal
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from syntax.grammar import Grammar, Production
+
+
+# 缓存格式版本，格式变化时递增(旧缓存自动重新生成)
+FORMAT_VERSION = 4
+
+
+@dataclass
+class CompiledTables:
+    """
+    一个文法配置生成的全部运行时数据
+
+    用法:
+        tables = CompiledTables.cached("configs/grammar_control_flow.json")
+        tokens = tables.scanner().scan(source)
+        result = tables.parser(handler).parse(tokens)
+
+    属性:
+        grammar: 增广文法(产生式0为 S' -> S)
+        action_table: ACTION表 {(state, terminal): (action, value)}
+        goto_table: GOTO表 {(state, non_terminal): next_state}
+        transition_table: 词法DFA转换表 {state: {char: next_state}}
+        accepting_map: 接受状态映射 {state_id: token_tag}
+        expected_tokens: 每个状态期望的终结符 {state: (terminal, ...)}
+        source: 生成时文法配置文件的内容(用于判断缓存是否过期)
+        options: 生成选项 (algorithm, unit_rules)，与source一起决定缓存是否可用
+        unit_chains: 跳过了单产生式归约时补回语法树层次的推导链(见LRParser)，未跳过时为None
+    """
+    grammar: Grammar
+    action_table: Dict[Tuple[int, str], Tuple[str, int]]
+    goto_table: Dict[Tuple[int, str], int]
+    transition_table: Dict[int, Dict[str, int]]
+    accepting_map: Dict[int, str]
+    expected_tokens: Dict[int, Tuple[str, ...]] = field(default_factory=dict)
+    source: bytes = b''
+    options: Tuple = ()
+    unit_chains: Optional[Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]] = None
+
+    @classmethod
+    def from_config(cls, config_path: str, build_cache: Optional[str] = None,
+                    algorithm: str = 'lalr1',
+                    unit_rules: Union[bool, Iterable[int]] = False) -> 'CompiledTables':
+        """
+        运行词法/语法分析生成器，由文法配置文件生成分析表
+
+        参数:
+            config_path: 文法配置文件路径
+            build_cache: 语法分析生成缓存的路径(可选)。给出时用IncrementalParserGenerator，
+                         复用上一次生成中不受文法修改影响的部分，并把本次的结果写回该文件
+            algorithm: 分析表算法(见ParserGenerator)
+            unit_rules: 跳过的单产生式归约(见ParserGenerator)
+        返回: CompiledTables对象
+        """
+        # 只有生成时才需要生成器，运行时加载缓存不导入这些模块
+        from lexical.generator import LexicalGenerator
+        from syntax.generator import ParserGenerator
+        from syntax.incremental_generator import IncrementalParserGenerator, BuildCache
+        from utils.config_loader import ConfigLoader
+
+        loader = ConfigLoader(os.path.dirname(os.path.abspath(config_path)))
+        config = loader.load(os.path.basename(config_path))
+        transition_table, accepting_map = LexicalGenerator().build(config.lexical_rules)
+        grammar = config.to_grammar()
+        options = _options(algorithm, unit_rules)
+        if build_cache is None:
+            generator = ParserGenerator(grammar, unit_rules=unit_rules, algorithm=algorithm)
+        else:
+            previous = None
+            if os.path.exists(build_cache):
+                try:
+                    previous = BuildCache.load(build_cache)
+                except (ValueError, KeyError, EOFError, TypeError):
+                    previous = None
+            generator = IncrementalParserGenerator(grammar, previous, unit_rules=unit_rules,
+                                                   algorithm=algorithm)
+        action_table, goto_table = generator.generate()
+        if build_cache is not None and generator.cache is not None:
+            generator.cache.save(build_cache)
+        return cls(grammar, action_table, goto_table, transition_table, accepting_map,
+                   generator.expected_tokens, _read_bytes(config_path), options, generator.unit_chains)
+
+    def save(self, path: str):
+        """
+        保存到缓存文件(marshal格式，只含内置类型，加载时不执行任何代码)
+        
+        表项按键排序后写入，同一文法生成的分析表总是得到相同的文件内容
+
+        参数:
+            path: 缓存文件路径
+        """
+        grammar = self.grammar
+        data = {
+            'version': FORMAT_VERSION,
+            'source': self.source,
+            'options': self.options,
+            'productions': [(p.left, p.right) for p in grammar.productions],
+            'start_symbol': grammar.start_symbol,
+            'terminals': sorted(grammar.terminals),
+            'non_terminals': sorted(grammar.non_terminals),
+            'list_rules': sorted((left, right, action) for (left, right), action in grammar.list_rules.items()),
+            'action_table': dict(sorted(self.action_table.items())),
+            'goto_table': dict(sorted(self.goto_table.items())),
+            'transition_table': {state: dict(sorted(row.items()))
+                                 for state, row in sorted(self.transition_table.items())},
+            'accepting_map': dict(sorted(self.accepting_map.items())),
+            'expected_tokens': dict(sorted(self.expected_tokens.items())),
+            'unit_chains': dict(sorted(self.unit_chains.items())) if self.unit_chains is not None else None,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            marshal.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledTables':
+        """
+        从缓存文件加载
+
+        参数:
+            path: 缓存文件路径
+        返回: CompiledTables对象
+        """
+        with open(path, 'rb') as f:
+            data = marshal.load(f)
+        if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"分析表缓存格式版本不匹配: {path}")
+        grammar = Grammar(
+            productions=[Production(i, left, right) for i, (left, right) in enumerate(data['productions'])],
+            start_symbol=data['start_symbol'],
+            terminals=set(data['terminals']),
+            non_terminals=set(data['non_terminals']),
+            list_rules={(left, right): action for left, right, action in data['list_rules']},
+        )
+        return cls(grammar, data['action_table'], data['goto_table'], data['transition_table'],
+                   data['accepting_map'], data['expected_tokens'], data['source'], data['options'],
+                   data['unit_chains'])
+
+    @classmethod
+    def cached(cls, config_path: str, cache_path: Optional[str] = None,
+               build_cache: Optional[str] = None, algorithm: str = 'lalr1',
+               unit_rules: Union[bool, Iterable[int]] = False) -> 'CompiledTables':
+        """
+        加载缓存的分析表；缓存不存在、格式过期、文法配置已修改或生成选项不同时重新生成并保存
+
+        参数:
+            config_path: 文法配置文件路径
+            cache_path: 缓存文件路径(默认 generated/<配置名>_tables.bin)
+            build_cache: 重新生成时使用的语法分析生成缓存(见from_config)，反复修改文法时只重算受影响的部分
+            algorithm: 分析表算法(见ParserGenerator)
+            unit_rules: 跳过的单产生式归约(见ParserGenerator)
+        返回: CompiledTables对象
+        """
+        if cache_path is None:
+            cache_path = default_cache_path(config_path)
+        source = _read_bytes(config_path)
+        if os.path.exists(cache_path):
+            try:
+                tables = cls.load(cache_path)
+            except (ValueError, KeyError, EOFError, TypeError):
+                # 格式过期或由不兼容的Python版本写入
+                tables = None
+            if tables is not None and tables.source == source \
+                    and tables.options == _options(algorithm, unit_rules):
+                return tables
+        tables = cls.from_config(config_path, build_cache, algorithm, unit_rules)
+        tables.save(cache_path)
+        return tables
+
+    def scanner(self, **kwargs):
+        """创建词法扫描器(kwargs传给Scanner)"""
+        from lexical.scanner import Scanner
+        return Scanner(self.transition_table, self.accepting_map, **kwargs)
+
+    def parser(self, semantic_handler=None, **kwargs):
+        """创建LR分析器(kwargs传给LRParser)"""
+        from .lr_parser import LRParser
+        kwargs.setdefault('expected_tokens', self.expected_tokens)
+        kwargs.setdefault('unit_chains', self.unit_chains)
+        return LRParser(self.grammar, self.action_table, self.goto_table, semantic_handler, **kwargs)
+
+
+def default_cache_path(config_path: str) -> str:
+    """文法配置对应的默认缓存文件路径"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    name = os.path.splitext(os.path.basename(config_path))[0]
+    return os.path.join(project_root, 'generated', f'{name}_tables.bin')
+
+
+def _options(algorithm: str, unit_rules: Union[bool, Iterable[int]]) -> Tuple:
+    """缓存键中的生成选项(只含内置类型，可用marshal保存)"""
+    if not isinstance(unit_rules, bool):
+        unit_rules = tuple(sorted(unit_rules))
+    return (algorithm, unit_rules)
+
+
+def _read_bytes(path: str) -> bytes:
+    """读取文件内容(文法配置文件很小，直接保存原文比计算摘要更快)"""
+    with open(path, 'rb') as f:
+        return f.read()
@@ -0,0 +1,347 @@
+"""
+Earley分析器驱动程序
+不生成分析表，直接按文法分析token序列: 用于快速验证原型文法，以及与LALR分析结果做差分测试
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from syntax import Grammar
+from utils.logger import Logger
+from utils.metrics import Metrics, timed
+from .parse_tree import ParseTreeNode
+
+
+logger = Logger.get(__name__)
+
+# Earley项目 (产生式编号, 点的位置, 起始位置)
+Item = Tuple[int, int, int]
+
+# 项目的来源(用于建树)，项目集中 项目 -> 来源，预测得到的项目来源为None:
+#   (_SCAN, 前驱项目)                 前驱项目在上一个项目集中，点后的终结符与上一个token匹配
+#   (_COMPLETE, 前驱项目, 完成项目)    完成项目在本项目集中，前驱项目在完成项目的起始项目集中
+#   (_NULLED, 前驱项目)               前驱项目在本项目集中，点后的非终结符推出ε
+#   (_LEO, Leo项, 完成项目)           沿确定的归约路径直接得到的最上层完成项目(见_leo_items)
+_SCAN, _COMPLETE, _NULLED, _LEO = range(4)
+
+
+class EarleyParser:
+    """
+    Earley分析器(Aycock-Horspool的可空处理 + Leo的右递归优化)
+
+    直接使用Grammar对象，不需要ParserGenerator生成分析表，文法也不必增广或冻结，
+    适合在文法还在修改时逐句验证；能分析任意上下文无关文法(含歧义文法、非LALR(1)文法)。
+
+    - 可空处理: 预测到可空的非终结符B时，直接把 A -> α·Bβ 推进为 A -> αB·β，
+      不必在项目集内反复完成空推导
+    - Leo优化: 项目集k中以B为点后符号的项目只有一个且形如 A -> α·B 时，B在k处开始的推导完成后
+      沿这条确定的归约路径直接加入最上层的完成项目，跳过中间的完成项目。
+      右递归(如 L -> S L)的每个项目集大小与输入长度无关，整体仍是线性时间
+
+    歧义输入上get_parse_tree返回其中一种推导；文法无歧义时语法树与LRParser的结果相同。
+
+    用法:
+        parser = EarleyParser(grammar)
+        if parser.parse(scanner.scan(source)):
+            tree = parser.get_parse_tree()
+
+    stats记录最近一次分析的工作量: 项目总数、最大的项目集、Leo路径直接完成的次数
+    """
+
+    def __init__(self, grammar: Grammar, leo: bool = True, metrics: Optional[Metrics] = None):
+        """
+        初始化Earley分析器
+
+        参数:
+            grammar: 文法对象(可以未增广；已增广时从 S' -> S 的S开始分析)
+            leo: 是否使用Leo的右递归优化(关闭后结果相同，用于对比)
+            metrics: 性能统计对象(可选)，记录parse耗时
+        """
+        self.grammar = grammar
+        self.leo = leo
+        self.metrics = metrics
+
+        productions = grammar.productions
+        if not productions:
+            raise ValueError("文法没有产生式")
+        if productions[0].left == "S'":
+            self.start_symbol = productions[0].right[0]
+        else:
+            self.start_symbol = productions[0].left
+        # 与Grammar的分类一致(首字母大写的符号是非终结符，即使没有产生式)，差分测试时与LALR分析的结果可比
+        self._non_terminals = frozenset(grammar.non_terminals) | {p.left for p in productions}
+        self._nullable = grammar.nullable if grammar.frozen else grammar.compute_nullable()
+
+        # 产生式按编号存放，末尾追加一个虚拟的开始产生式 S' -> S(不修改文法本身)
+        self._lefts = [p.left for p in productions] + ["S'"]
+        self._rights = [tuple(p.right) for p in productions] + [(self.start_symbol,)]
+        self._lengths = [len(right) for right in self._rights]
+        self._production_strs = [str(p) for p in productions] + [f"S' -> {self.start_symbol}"]
+        self._start_prod = len(productions)
+        self._by_left: Dict[str, Tuple[int, ...]] = {
+            left: tuple(p.id for p in grammar.get_productions_by_left(left)) for left in self._non_terminals}
+        self._predictions = self._prediction_closure()
+        self._empty_rules = self._empty_derivations()
+
+        # 分析结果
+        self.tokens: List[Tuple[str, Any]] = []
+        self.accepted = False
+        self.errors: List[Dict] = []
+        self.stats: Dict[str, int] = {}
+        self._sets: List[Dict[Item, Optional[tuple]]] = []
+
+    def _prediction_closure(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        预测闭包: 非终结符B -> 预测B时需要预测的所有非终结符(B本身，以及可空前缀之后出现的非终结符)
+        """
+        closure = {}
+        for symbol in self._by_left:
+            reached = [symbol]
+            seen = {symbol}
+            for current in reached:
+                for prod_id in self._by_left[current]:
+                    for s in self._rights[prod_id]:
+                        if s in self._non_terminals and s not in seen:
+                            seen.add(s)
+                            reached.append(s)
+                        if s not in self._nullable:
+                            break
+            closure[symbol] = tuple(reached)
+        return closure
+
+    def _empty_derivations(self) -> Dict[str, int]:
+        """
+        可空非终结符 -> 推出ε时使用的产生式(按不动点迭代的顺序选取，保证推导不成环)
+        """
+        rules = {}
+        changed = True
+        while changed:
+            changed = False
+            for left, prod_ids in self._by_left.items():
+                if left in rules:
+                    continue
+                for prod_id in prod_ids:
+                    if all(s in rules for s in self._rights[prod_id]):
+                        rules[left] = prod_id
+                        changed = True
+                        break
+        return rules
+
+    def parse(self, tokens: List[Tuple[str, Any]]) -> bool:
+        """
+        Earley分析
+
+        参数:
+            tokens: 输入token序列，格式[(token_type, token_value), ...](不含结束标记$)
+        返回: 输入是否属于文法的语言
+        """
+        with timed(self.metrics, 'parse'):
+            return self._parse(tokens)
+
+    def _parse(self, tokens: List[Tuple[str, Any]]) -> bool:
+        """Earley分析主循环(见parse)"""
+        if tokens and tokens[-1][0] == '$':
+            tokens = tokens[:-1]
+        self.tokens = tokens
+        self.accepted = False
+        self.errors = []
+        self._sets = sets = []
+        self.stats = {'items': 0, 'max_set': 0, 'leo_completions': 0}
+        lefts = self._lefts
+        rights = self._rights
+        lengths = self._lengths
+        by_left = self._by_left
+        non_terminals = self._non_terminals
+        nullable = self._nullable
+        predictions = self._predictions
+        use_leo = self.leo
+        postdots: List[Dict[str, List[Item]]] = []
+        leo_sets: List[Dict[str, tuple]] = []
+        leo_completions = 0
+
+        start = (self._start_prod, 0, 0)
+        items: Dict[Item, Optional[tuple]] = {start: None}
+        work = [start]
+        n = len(tokens)
+        for j in range(n + 1):
+            postdot: Dict[str, List[Item]] = {}
+            predicted = set()
+            i = 0
+            while i < len(work):
+                item = work[i]
+                i += 1
+                prod_id, dot, origin = item
+                if dot == lengths[prod_id]:
+                    # 完成: 空推导(origin == j)已在预测时推进，这里只处理非空的推导
+                    if origin == j:
+                        continue
+                    left = lefts[prod_id]
+                    entry = leo_sets[origin].get(left) if use_leo else None
+                    if entry is not None:
+                        top = entry[0]
+                        if top not in items:
+                            items[top] = (_LEO, entry, item)
+                            work.append(top)
+                            leo_completions += 1
+                        continue
+                    for waiting in postdots[origin].get(left, ()):
+                        new = (waiting[0], waiting[1] + 1, waiting[2])
+                        if new not in items:
+                            items[new] = (_COMPLETE, waiting, item)
+                            work.append(new)
+                    continue
+
+                symbol = rights[prod_id][dot]
+                waiting = postdot.get(symbol)
+                if waiting is None:
+                    postdot[symbol] = [item]
+                else:
+                    waiting.append(item)
+                if symbol not in non_terminals:
+                    continue
+                # 预测
+                if symbol not in predicted:
+                    for predicted_symbol in predictions[symbol]:
+                        if predicted_symbol in predicted:
+                            continue
+                        predicted.add(predicted_symbol)
+                        for predicted_prod in by_left[predicted_symbol]:
+                            new = (predicted_prod, 0, j)
+                            if new not in items:
+                                items[new] = None
+                                work.append(new)
+                # 可空的非终结符直接越过(Aycock-Horspool)
+                if symbol in nullable:
+                    new = (prod_id, dot + 1, origin)
+                    if new not in items:
+                        items[new] = (_NULLED, item)
+                        work.append(new)
+
+            sets.append(items)
+            postdots.append(postdot)
+            leo_sets.append(self._leo_items(j, postdot, leo_sets) if use_leo else {})
+            self.stats['items'] += len(items)
+            self.stats['max_set'] = max(self.stats['max_set'], len(items))
+            if j == n:
+                break
+
+            # 扫描
+            token = tokens[j][0]
+            items = {}
+            work = []
+            for waiting in (postdot.get(token, ()) if token not in non_terminals else ()):
+                new = (waiting[0], waiting[1] + 1, waiting[2])
+                items[new] = (_SCAN, waiting)
+                work.append(new)
+            if not work:
+                self._record_error(j, token, tokens[j][1], postdot)
+                break
+
+        self.stats['leo_completions'] = leo_completions
+        if len(sets) == n + 1 and (self._start_prod, 1, 0) in sets[n]:
+            self.accepted = True
+            logger.info("\n%s\nEarley分析成功!\n%s", "=" * 60, "=" * 60)
+            return True
+        if not self.errors:
+            self._record_error(n, '$', None, postdots[-1])
+        logger.error("\n[错误] 语法错误: %s", self.errors[-1]['message'])
+        return False
+
+    def _leo_items(self, j: int, postdot: Dict[str, List[Item]],
+                   leo_sets: List[Dict[str, tuple]]) -> Dict[str, tuple]:
+        """
+        项目集j(已完整)的Leo项: 点后符号B -> (最上层的完成项目, A -> α·B, j, 上一层的Leo项或None)
+
+        B在j处开始的推导完成后，唯一能推进的项目是 A -> α·B，它随之完成；
+        A -> α·B 起始的项目集里若A也满足同样条件，则继续向上，最上层的完成项目记在Leo项中
+        """
+        lengths = self._lengths
+        entries = {}
+        for symbol, waiting in postdot.items():
+            if len(waiting) != 1 or symbol not in self._non_terminals:
+                continue
+            item = waiting[0]
+            prod_id, dot, origin = item
+            if dot + 1 != lengths[prod_id]:
+                continue
+            above = leo_sets[origin].get(self._lefts[prod_id]) if origin < j else None
+            top = above[0] if above is not None else (prod_id, dot + 1, origin)
+            entries[symbol] = (top, item, j, above)
+        return entries
+
+    def _record_error(self, index: int, token: str, value: Any, postdot: Dict[str, List[Item]]):
+        """记录语法错误(期望的终结符为出错位置项目集中点后的终结符)"""
+        expected = sorted(s for s in postdot if s not in self._non_terminals)
+        self.errors.append({
+            'index': index,
+            'token': token,
+            'value': value,
+            'expected': tuple(expected),
+            'message': f"位置{index}: 无法处理输入'{token}'，期望: {', '.join(expected)}",
+        })
+
+    def get_parse_tree(self) -> Optional[ParseTreeNode]:
+        """
+        语法树: 从接受项目出发沿每个项目的来源回溯(歧义时取第一次加入项目集的推导)
+
+        返回: 语法树根节点(开始符号)，分析失败时返回None
+        """
+        if not self.accepted:
+            return None
+        sets = self._sets
+        tokens = self.tokens
+        lefts = self._lefts
+        lengths = self._lengths
+        rights = self._rights
+        production_strs = self._production_strs
+
+        def new_node(prod_id: int) -> ParseTreeNode:
+            return ParseTreeNode(lefts[prod_id], None, [], production_strs[prod_id])
+
+        root = new_node(self._start_prod)
+        # (项目, 所在项目集, 节点, 已确定的最右侧子节点(倒序))；从项目开始向左回溯出其余子节点
+        tasks = [((self._start_prod, 1, 0), len(sets) - 1, root, [])]
+        while tasks:
+            item, position, node, children = tasks.pop()
+            link = sets[position][item]
+            if link is not None and link[0] == _LEO:
+                # 展开Leo路径: 自底向上依次为 A1 -> α1·B、A2 -> α2·A1、...，最上层完成后即为item
+                _, entry, completed = link
+                below = new_node(completed[0])
+                tasks.append((completed, position, below, []))
+                while entry is not None:
+                    waiting, waiting_position, above = entry[1], entry[2], entry[3]
+                    current = node if above is None else new_node(waiting[0])
+                    tasks.append((waiting, waiting_position, current, [below]))
+                    below = current
+                    entry = above
+                continue
+
+            while item[1] > 0:
+                link = sets[position][item]
+                kind = link[0]
+                if kind == _SCAN:
+                    position -= 1
+                    token, value = tokens[position]
+                    children.append(ParseTreeNode(token, value))
+                    item = link[1]
+                elif kind == _COMPLETE:
+                    completed = link[2]
+                    child = new_node(completed[0])
+                    children.append(child)
+                    tasks.append((completed, position, child, []))
+                    item = link[1]
+                    position = completed[2]
+                elif kind == _NULLED:
+                    item = link[1]
+                    children.append(self._empty_tree(rights[item[0]][item[1]]))
+                else:
+                    raise AssertionError(f"项目{item}的来源不正确: {link}")
+            children.reverse()
+            node.children = children
+        return root.children[0]
+
+    def _empty_tree(self, symbol: str) -> ParseTreeNode:
+        """可空非终结符推出ε的语法树"""
+        prod_id = self._empty_rules[symbol]
+        return ParseTreeNode(symbol, None, [self._empty_tree(s) for s in self._rights[prod_id]],
+                             self._production_strs[prod_id])
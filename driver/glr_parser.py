@@ -0,0 +1,416 @@
+"""
+GLR分析器驱动程序
+在有冲突的分析表上分析歧义文法或非LALR(1)文法: 图结构栈(GSS) + 共享压缩分析森林(SPPF)
+"""
+
+import itertools
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from syntax import Grammar
+from utils.logger import Logger
+from utils.metrics import Metrics, timed
+from .parse_tree import ParseTreeNode
+
+
+logger = Logger.get(__name__)
+
+
+class ForestNode:
+    """
+    共享压缩分析森林(SPPF)的符号节点
+
+    同一个符号在同一段输入上的所有推导共用一个节点，每种推导是一个压缩选择(packed alternative)
+
+    属性:
+        symbol: 符号名称
+        start, end: 覆盖的token区间 [start, end)
+        value: 终结符的值(非终结符为None)
+        alternatives: 非终结符的各种推导 [(产生式编号, 子节点元组), ...]；终结符为None
+    """
+    __slots__ = ('symbol', 'start', 'end', 'value', 'alternatives')
+
+    def __init__(self, symbol: str, start: int, end: int, value: Any = None,
+                 alternatives: Optional[List[Tuple[int, Tuple['ForestNode', ...]]]] = None):
+        self.symbol = symbol
+        self.start = start
+        self.end = end
+        self.value = value
+        self.alternatives = alternatives
+
+    def is_terminal(self) -> bool:
+        """是否为终结符节点"""
+        return self.alternatives is None
+
+    def add_alternative(self, prod_id: int, children: Tuple['ForestNode', ...]):
+        """添加一种推导(已有相同的推导时忽略)"""
+        alternative = (prod_id, children)
+        if alternative not in self.alternatives:
+            self.alternatives.append(alternative)
+
+    def count_trees(self) -> int:
+        """
+        森林中的语法树个数(按节点自底向上计数，不展开森林)
+
+        返回: 语法树个数；文法有环(A =>+ A)导致无穷多棵树时抛出ValueError
+        """
+        counts: Dict[int, int] = {}
+        visiting = set()
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if id(node) in counts:
+                stack.pop()
+                continue
+            if node.alternatives is None:
+                counts[id(node)] = 1
+                stack.pop()
+                continue
+            pending = [child for _, children in node.alternatives for child in children
+                       if id(child) not in counts]
+            if pending:
+                if id(node) in visiting:
+                    raise ValueError(f"分析森林有环，'{node.symbol}'有无穷多种推导")
+                visiting.add(id(node))
+                stack.extend(pending)
+                continue
+            total = 0
+            for _, children in node.alternatives:
+                product = 1
+                for child in children:
+                    product *= counts[id(child)]
+                total += product
+            counts[id(node)] = total
+            stack.pop()
+        return counts[id(self)]
+
+    def __repr__(self):
+        return f"ForestNode({self.symbol}, {self.start}, {self.end})"
+
+
+class _StackNode:
+    """GSS节点: 分析状态、所在的输入位置、指向下层节点的边 [(下层节点, 边上符号的森林节点)]"""
+    __slots__ = ('state', 'position', 'links')
+
+    def __init__(self, state: int, position: int, links: List[Tuple['_StackNode', ForestNode]]):
+        self.state = state
+        self.position = position
+        self.links = links
+
+
+class GLRParser:
+    """
+    GLR分析器(Tomita算法，含Farshi对新增边的重新归约)
+
+    分析表中的冲突表项(TableBuilder.conflict_actions)同时执行全部动作，各个分支共享图结构栈；
+    同一符号在同一段输入上的不同推导合并到同一个SPPF节点中。
+    只有一个栈顶且当前表项没有冲突时走确定性的快速路径: 与LRParser一样逐个移进/归约，
+    归约时沿唯一的边弹栈，不维护栈顶集合和工作表，所以确定性的输入部分与LRParser的速度相近。
+
+    只构建分析森林，不执行语义动作(分支可能被放弃，语义动作应在选定语法树之后执行)。
+    文法不能有环(A =>+ A)，否则分析森林中有无穷多棵树。
+
+    用法:
+        generator = ParserGenerator(grammar)
+        action_table, goto_table = generator.generate()
+        parser = GLRParser(grammar, action_table, goto_table, generator.conflict_actions)
+        if parser.parse(tokens):
+            tree = parser.get_parse_tree()          # 第一种推导
+            count = parser.forest.count_trees()     # 推导的个数
+
+    stats记录最近一次分析的工作量: 确定性步数、一般GLR处理的输入位置数、最多同时存在的栈顶数
+    """
+
+    def __init__(self,
+                 grammar: Grammar,
+                 action_table: Dict[Tuple[int, str], Tuple[str, int]],
+                 goto_table: Dict[Tuple[int, str], int],
+                 conflict_actions: Optional[Dict[Tuple[int, str], Tuple[Tuple[str, int], ...]]] = None,
+                 expected_tokens: Optional[Dict[int, Tuple[str, ...]]] = None,
+                 metrics: Optional[Metrics] = None):
+        """
+        初始化GLR分析器
+
+        参数:
+            grammar: 文法对象(已增广)
+            action_table: ACTION表 {(state, terminal): (action, value)}
+            goto_table: GOTO表 {(state, non_terminal): next_state}
+            conflict_actions: 冲突表项的全部动作(ParserGenerator.conflict_actions)；
+                              不提供时只按ACTION表选中的动作分析，相当于LRParser
+            expected_tokens: 每个状态期望的终结符(可选，报错时使用)
+            metrics: 性能统计对象(可选)，记录parse耗时
+        """
+        self.grammar = grammar
+        self.action_table = action_table
+        self.goto_table = goto_table
+        self.conflict_actions = conflict_actions or {}
+        self.expected_tokens = expected_tokens
+        self.metrics = metrics
+
+        productions = grammar.productions
+        self._lefts = [p.left for p in productions]
+        self._lengths = [len(p.right) for p in productions]
+        self._production_strs = [str(p) for p in productions]
+
+        # 分析结果: 整个输入的分析森林(开始符号的节点)
+        self.forest: Optional[ForestNode] = None
+        self.errors: List[Dict] = []
+        self.stats: Dict[str, int] = {}
+
+    def parse(self, tokens: List[Tuple[str, Any]]) -> bool:
+        """
+        GLR分析
+
+        参数:
+            tokens: 输入token序列，格式[(token_type, token_value), ...]
+        返回: 是否至少有一种推导
+        """
+        with timed(self.metrics, 'parse'):
+            return self._parse(tokens)
+
+    def _parse(self, tokens: List[Tuple[str, Any]]) -> bool:
+        """GLR分析主循环(见parse)"""
+        self.forest = None
+        self.errors = []
+        self.stats = {'deterministic_steps': 0, 'general_positions': 0, 'max_stacks': 1}
+        action_table = self.action_table
+        goto_table = self.goto_table
+        conflict_actions = self.conflict_actions
+        lefts = self._lefts
+        lengths = self._lengths
+
+        tokens = tokens + [('$', None)]
+        index = 0
+        top = _StackNode(0, 0, [])
+        # 一般GLR处理时的栈顶 {state: node}，只有一个栈顶时为None
+        tops: Optional[Dict[int, _StackNode]] = None
+        steps = 0
+        while True:
+            token, value = tokens[index]
+            if tops is None:
+                key = (top.state, token)
+                if key not in conflict_actions:
+                    action = action_table.get(key)
+                    if action is None:
+                        self._record_error(index, token, value, [top])
+                        break
+                    kind, target = action
+                    steps += 1
+                    if kind == 'shift':
+                        index += 1
+                        top = _StackNode(target, index, [(top, ForestNode(token, index - 1, index, value))])
+                        continue
+                    if kind == 'accept':
+                        self.forest = top.links[0][1]
+                        break
+                    # 归约: 沿唯一的边弹出|β|个节点
+                    length = lengths[target]
+                    node = top
+                    children = [None] * length
+                    for k in range(length - 1, -1, -1):
+                        links = node.links
+                        if len(links) != 1:
+                            break
+                        node, children[k] = links[0]
+                    else:
+                        left = lefts[target]
+                        forest = ForestNode(left, node.position, index, None, [(target, tuple(children))])
+                        top = _StackNode(goto_table[(node.state, left)], index, [(node, forest)])
+                        continue
+                    # 栈在弹出的范围内有分叉，交给一般GLR处理
+                    steps -= 1
+                tops = {top.state: top}
+
+            self.stats['general_positions'] += 1
+            result = self._general_step(tops, index, token, value)
+            if result is None or token == '$':
+                break
+            tops = result
+            index += 1
+            self.stats['max_stacks'] = max(self.stats['max_stacks'], len(tops))
+            if len(tops) == 1:
+                top = next(iter(tops.values()))
+                tops = None
+
+        self.stats['deterministic_steps'] = steps
+        if self.forest is None:
+            if not self.errors:
+                self._record_error(index, token, value, list((tops or {top.state: top}).values()))
+            logger.error("\n[错误] 语法错误: %s", self.errors[-1]['message'])
+            return False
+        logger.info("\n%s\nGLR分析成功!\n%s", "=" * 60, "=" * 60)
+        return True
+
+    def _actions(self, state: int, token: str) -> Tuple[Tuple[str, int], ...]:
+        """状态在输入token上的全部动作"""
+        actions = self.conflict_actions.get((state, token))
+        if actions is None:
+            action = self.action_table.get((state, token))
+            actions = (action,) if action is not None else ()
+        return actions
+
+    def _general_step(self, tops: Dict[int, _StackNode], index: int,
+                      token: str, value: Any) -> Optional[Dict[int, _StackNode]]:
+        """
+        一般GLR处理一个输入位置: 先在所有栈顶上做完全部归约，再一起移进
+
+        参数:
+            tops: 位于index的栈顶 {state: node}
+            index: 输入位置
+            token, value: 当前输入
+        返回: 移进后的栈顶；没有栈顶能移进(语法错误)或输入结束时返回None
+        """
+        goto_table = self.goto_table
+        lefts = self._lefts
+        lengths = self._lengths
+        frontier = dict(tops)
+        # 本位置归约出的森林节点 (符号, 起始位置) -> 节点
+        level_nodes: Dict[Tuple[str, int], ForestNode] = {}
+        shifts: List[Tuple[_StackNode, int]] = []
+        # (栈顶, 产生式编号, 必须经过的边(Farshi)或None)
+        worklist = deque()
+
+        def schedule(node: _StackNode):
+            for kind, target in self._actions(node.state, token):
+                if kind == 'reduce':
+                    worklist.append((node, target, None))
+                elif kind == 'shift':
+                    shifts.append((node, target))
+                elif node.links:
+                    self.forest = node.links[0][1]
+
+        for node in tops.values():
+            schedule(node)
+        while worklist:
+            node, prod_id, required = worklist.popleft()
+            left = lefts[prod_id]
+            for base, children in self._paths(node, lengths[prod_id], required):
+                target = goto_table.get((base.state, left))
+                if target is None:
+                    continue
+                stack_node = frontier.get(target)
+                if stack_node is not None:
+                    link = next((l for l in stack_node.links if l[0] is base), None)
+                    if link is not None:
+                        # 局部歧义: 合并到已有边上的森林节点
+                        link[1].add_alternative(prod_id, children)
+                        continue
+                forest = level_nodes.get((left, base.position))
+                if forest is None:
+                    forest = level_nodes[(left, base.position)] = ForestNode(left, base.position, index, None, [])
+                forest.add_alternative(prod_id, children)
+                if stack_node is None:
+                    stack_node = frontier[target] = _StackNode(target, index, [(base, forest)])
+                    schedule(stack_node)
+                else:
+                    stack_node.links.append((base, forest))
+                    # 已处理过的栈顶上经过新边的归约需要重做
+                    edge = (stack_node, base)
+                    for other in frontier.values():
+                        for kind, other_prod in self._actions(other.state, token):
+                            if kind == 'reduce' and lengths[other_prod] > 0:
+                                worklist.append((other, other_prod, edge))
+
+        if token == '$':
+            if self.forest is None:
+                self._record_error(index, token, value, list(frontier.values()))
+            return None
+
+        shifted: Dict[int, _StackNode] = {}
+        leaf = ForestNode(token, index, index + 1, value)
+        for node, target in shifts:
+            stack_node = shifted.get(target)
+            if stack_node is None:
+                shifted[target] = _StackNode(target, index + 1, [(node, leaf)])
+            elif not any(l[0] is node for l in stack_node.links):
+                stack_node.links.append((node, leaf))
+        if not shifted:
+            self._record_error(index, token, value, list(frontier.values()))
+            return None
+        return shifted
+
+    @staticmethod
+    def _paths(node: _StackNode, length: int,
+               required: Optional[Tuple[_StackNode, _StackNode]]) -> Iterator[Tuple[_StackNode, Tuple[ForestNode, ...]]]:
+        """
+        从node出发长度为length的所有路径
+
+        参数:
+            node: 起点(栈顶)
+            length: 路径长度(产生式右部长度)
+            required: 路径必须经过的边 (上层节点, 下层节点)，None表示不限
+        返回: 迭代 (路径终点, 路径上的森林节点(从左到右))
+        """
+        stack = [(node, length, (), required is None)]
+        while stack:
+            current, remaining, children, passed = stack.pop()
+            if remaining == 0:
+                if passed:
+                    yield current, children
+                continue
+            for lower, forest in current.links:
+                stack.append((lower, remaining - 1, (forest,) + children,
+                              passed or (current is required[0] and lower is required[1])))
+
+    def _record_error(self, index: int, token: str, value: Any, nodes: List[_StackNode]):
+        """记录语法错误(期望的终结符为所有栈顶期望的并集)"""
+        expected = set()
+        for node in nodes:
+            if self.expected_tokens is not None:
+                expected.update(self.expected_tokens.get(node.state, ()))
+            else:
+                expected.update(t for (s, t) in self.action_table if s == node.state)
+        expected = tuple(sorted(expected))
+        self.errors.append({
+            'index': index,
+            'token': token,
+            'value': value,
+            'states': tuple(sorted(node.state for node in nodes)),
+            'expected': expected,
+            'message': f"位置{index}: 无法处理输入'{token}'，期望: {', '.join(expected)}",
+        })
+
+    def get_parse_tree(self) -> Optional[ParseTreeNode]:
+        """
+        语法树: 每个森林节点取第一种推导(无歧义时即唯一的语法树，与LRParser的结果相同)
+
+        返回: 语法树根节点，分析失败时返回None
+        """
+        if self.forest is None:
+            return None
+        production_strs = self._production_strs
+        root: List[ParseTreeNode] = []
+        # 自顶向下建树: (森林节点, 父节点的子节点列表)，子节点按从右到左压栈
+        stack = [(self.forest, root)]
+        while stack:
+            node, siblings = stack.pop()
+            if node.alternatives is None:
+                siblings.append(ParseTreeNode(node.symbol, node.value))
+                continue
+            prod_id, children = node.alternatives[0]
+            parent = ParseTreeNode(node.symbol, None, [], production_strs[prod_id])
+            siblings.append(parent)
+            stack.extend((child, parent.children) for child in reversed(children))
+        return root[0]
+
+    def get_parse_trees(self, limit: int = 100) -> List[ParseTreeNode]:
+        """
+        列举森林中的语法树(歧义输入上最多limit棵)
+
+        参数:
+            limit: 最多返回的语法树个数
+        返回: 语法树列表
+        """
+        if self.forest is None:
+            return []
+        return list(itertools.islice(self._trees(self.forest), limit))
+
+    def _trees(self, node: ForestNode) -> Iterator[ParseTreeNode]:
+        """惰性列举一个森林节点的所有语法树"""
+        if node.alternatives is None:
+            yield ParseTreeNode(symbol=node.symbol, value=node.value)
+            return
+        for prod_id, children in node.alternatives:
+            for subtrees in itertools.product(*(list(self._trees(child)) for child in children)):
+                yield ParseTreeNode(symbol=node.symbol, production=self._production_strs[prod_id],
+                                    children=list(subtrees))
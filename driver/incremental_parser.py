@@ -0,0 +1,271 @@
+"""
+增量语法分析器
+编辑器每次小改动后重新提交整个文件时，只重新分析受影响的部分:
+1. 增量词法分析: 从受损token之前的安全边界(DFA初始状态)开始重新扫描，
+   一旦扫描位置与旧token流重新对齐就停止，其余token直接复用
+2. 增量LR分析(Wagner-Graham): 驱动程序在每个输入位置先尝试整体移进旧语法树中的子树，
+   子树可复用的条件是: 左侧分析状态相同、覆盖的token未改变、其后紧跟的token也未改变
+
+只构建语法树，不执行语义动作；得到的语法树与完整分析的结果相同。
+注意: 跨越编辑位置的子树必须重建。L -> L M S 这样递归定义的语句序列中，
+包含编辑位置的序列节点都要重新归约，这部分代价与编辑位置之后的语句个数成正比
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from syntax import Grammar
+from lexical import Scanner
+from .parse_tree import ParseTreeNode
+
+
+class _OldTreeCursor:
+    """
+    按从左到右的顺序惰性遍历旧语法树
+
+    只有跨越查询位置的节点才会被拆开，所以遍历代价与编辑范围(而不是文件大小)成正比
+    """
+
+    def __init__(self, root: ParseTreeNode):
+        # 待考察的子树 (节点, 起始token下标)，栈顶为最左边的子树
+        self.stack: List[Tuple[ParseTreeNode, int]] = [(root, 0)]
+
+    def candidates(self, pos: int) -> List[Tuple[ParseTreeNode, int]]:
+        """
+        返回从旧token位置pos开始的所有非终结符子树，外层在前
+
+        参数:
+            pos: 旧token流中的位置(必须单调不减)
+        """
+        stack = self.stack
+        while stack:
+            node, start = stack[-1]
+            if start > pos or (start == pos and node.token_count > 0):
+                break
+            stack.pop()
+            if start + node.token_count > pos:
+                # 节点跨越pos: 拆开，子节点按从右到左的顺序压栈
+                offset = start + node.token_count
+                for child in reversed(node.children):
+                    offset -= child.token_count
+                    stack.append((child, offset))
+
+        result = []
+        if stack and stack[-1][1] == pos:
+            node = stack[-1][0]
+            while node.children:
+                result.append((node, pos))
+                node = next((c for c in node.children if c.token_count > 0), None)
+                if node is None:
+                    break
+        return result
+
+
+class IncrementalParser:
+    """
+    增量LR分析器
+
+    用法:
+        parser = IncrementalParser(scanner, grammar, action_table, goto_table)
+        tree = parser.parse(source)           # 第一次: 完整分析
+        tree = parser.edit(10, 12, "x + 1")   # 之后: 把source[10:12]替换为新文本并增量分析
+
+    stats记录最近一次分析的工作量: 重新扫描的token数、复用的子树数/token数、移进的token数
+    """
+
+    def __init__(self, scanner: Scanner, grammar: Grammar,
+                 action_table: Dict[Tuple[int, str], Tuple[str, int]],
+                 goto_table: Dict[Tuple[int, str], int]):
+        """
+        初始化增量分析器
+
+        参数:
+            scanner: 词法扫描器
+            grammar: 文法对象(已增广)
+            action_table: ACTION表
+            goto_table: GOTO表
+        """
+        self.scanner = scanner
+        self.grammar = grammar
+        self.action_table = action_table
+        self.goto_table = goto_table
+        self._production_strs = [str(p) for p in grammar.productions]
+
+        self.source = ""
+        # token流按列存放: 类型、文本、起始位置、探查到的最远位置+1
+        self.tags: List[str] = []
+        self.texts: List[str] = []
+        self.starts: List[int] = []
+        self.reaches: List[int] = []
+        self.tree: Optional[ParseTreeNode] = None
+
+        self.stats: Dict[str, int] = {}
+
+    @property
+    def tokens(self) -> List[Tuple[str, str]]:
+        """当前的token序列 [(type, value), ...]，与Scanner.scan的结果相同"""
+        return list(zip(self.tags, self.texts))
+
+    def parse(self, source: str) -> Optional[ParseTreeNode]:
+        """
+        完整分析源程序
+
+        参数:
+            source: 源程序
+        返回: 语法树根节点，有语法错误时返回None
+        """
+        self.source = source
+        self.tags, self.texts, self.starts, self.reaches = [], [], [], []
+        for tag, text, start, reach in self.scanner.scan_positions(source):
+            self.tags.append(tag)
+            self.texts.append(text)
+            self.starts.append(start)
+            self.reaches.append(reach)
+        self.stats = {'relexed': len(self.tags)}
+        self.tree = self._run(None, 0, 0, 0)
+        return self.tree
+
+    def edit(self, start: int, end: int, text: str) -> Optional[ParseTreeNode]:
+        """
+        把source[start:end]替换为text，并增量地重新分析
+
+        参数:
+            start, end: 被替换的区间
+            text: 新文本
+        返回: 新的语法树根节点，有语法错误时返回None
+        """
+        old_source = self.source
+        if not 0 <= start <= end <= len(old_source):
+            raise ValueError(f"编辑区间越界: [{start}, {end})")
+        source = old_source[:start] + text + old_source[end:]
+        if self.tree is None:
+            return self.parse(source)
+
+        tags, texts, starts, reaches = self.tags, self.texts, self.starts, self.reaches
+        delta = len(text) - (end - start)
+        n = len(tags)
+
+        # 1. 第一个受损的token: 扫描它时探查到了编辑位置
+        first = bisect_right(starts, start)
+        while first > 0 and reaches[first - 1] > start:
+            first -= 1
+        restart = starts[first - 1] + len(texts[first - 1]) if first > 0 else 0
+
+        # 2. 重新扫描，直到扫描位置与编辑区之后的某个旧token重新对齐
+        resume = bisect_right(starts, end - 1) if end > 0 else 0
+        new_tags, new_texts, new_starts, new_reaches = [], [], [], []
+        sync = n
+        for tag, tok_text, tok_start, reach in self.scanner.scan_positions(source, restart):
+            while resume < n and starts[resume] + delta < tok_start:
+                resume += 1
+            if resume < n and starts[resume] + delta == tok_start:
+                sync = resume
+                break
+            new_tags.append(tag)
+            new_texts.append(tok_text)
+            new_starts.append(tok_start)
+            new_reaches.append(reach)
+
+        # 3. 拼接token流: 前缀原样保留，后缀平移delta
+        damaged_end = first + len(new_tags)
+        self.source = source
+        self.tags = tags[:first] + new_tags + tags[sync:]
+        self.texts = texts[:first] + new_texts + texts[sync:]
+        if delta:
+            self.starts = starts[:first] + new_starts + [s + delta for s in starts[sync:]]
+            self.reaches = reaches[:first] + new_reaches + [r + delta for r in reaches[sync:]]
+        else:
+            self.starts = starts[:first] + new_starts + starts[sync:]
+            self.reaches = reaches[:first] + new_reaches + reaches[sync:]
+
+        self.stats = {'relexed': len(new_tags)}
+        self.tree = self._run(self.tree, first, damaged_end, sync)
+        return self.tree
+
+    def _run(self, old_tree: Optional[ParseTreeNode], first: int, damaged_end: int,
+             old_resume: int) -> Optional[ParseTreeNode]:
+        """
+        LR分析驱动(不打印、不执行语义动作)，尽可能整体移进旧语法树中的子树
+
+        参数:
+            old_tree: 旧语法树(None表示完整分析)
+            first: 新token流中第一个受损token的下标(此前的token未改变)
+            damaged_end: 新token流中受损区间的结束下标
+            old_resume: 旧token流中与damaged_end对应的下标(此后的token未改变)
+        """
+        action_table = self.action_table
+        goto_table = self.goto_table
+        productions = self.grammar.productions
+        production_strs = self._production_strs
+        tags, texts = self.tags, self.texts
+        n = len(tags)
+        cursor = _OldTreeCursor(old_tree) if old_tree is not None else None
+        shift_back = old_resume - damaged_end
+
+        states = [0]
+        nodes: List[ParseTreeNode] = []
+        pos = 0
+        reused_nodes = reused_tokens = shifted = 0
+
+        while True:
+            # 1. 尝试整体移进旧子树
+            if cursor is not None and (pos < first or pos >= damaged_end):
+                old_pos = pos if pos < first else pos + shift_back
+                state = states[-1]
+                for node, node_start in cursor.candidates(old_pos):
+                    node_end = node_start + node.token_count
+                    if node.left_state != state:
+                        continue
+                    # 子树及其后紧跟的token都必须未改变
+                    if not (node_end < first or node_start >= old_resume):
+                        continue
+                    target = goto_table.get((state, node.symbol))
+                    if target is None:
+                        continue
+                    states.append(target)
+                    nodes.append(node)
+                    pos += node.token_count
+                    reused_nodes += 1
+                    reused_tokens += node.token_count
+                    break
+                else:
+                    node = None
+                if node is not None:
+                    continue
+
+            # 2. 普通的LR分析步骤
+            state = states[-1]
+            token = tags[pos] if pos < n else '$'
+            entry = action_table.get((state, token))
+            if entry is None:
+                self.stats.update(reused_nodes=reused_nodes, reused_tokens=reused_tokens,
+                                  shifted=shifted, error_at=pos)
+                return None
+            action, value = entry
+
+            if action == 'shift':
+                nodes.append(ParseTreeNode(symbol=token, value=texts[pos],
+                                           left_state=state, token_count=1))
+                states.append(value)
+                pos += 1
+                shifted += 1
+
+            elif action == 'reduce':
+                production = productions[value]
+                size = len(production.right)
+                if size:
+                    children = nodes[-size:]
+                    del nodes[-size:]
+                    del states[-size:]
+                else:
+                    children = []
+                left_state = states[-1]
+                nodes.append(ParseTreeNode(symbol=production.left, children=children,
+                                           production=production_strs[value], left_state=left_state,
+                                           token_count=sum(c.token_count for c in children)))
+                states.append(goto_table[(left_state, production.left)])
+
+            else:  # accept
+                self.stats.update(reused_nodes=reused_nodes, reused_tokens=reused_tokens,
+                                  shifted=shifted)
+                return nodes[-1]
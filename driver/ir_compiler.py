@@ -0,0 +1,255 @@
+"""
+三地址码编译器
+把SemanticAnalyzer生成的四元式表翻译成Python源代码，再用compile()编译为原生Python函数:
+- 变量和临时变量都成为函数的局部变量
+- 跳转尽量还原为结构化的 while/if/else (continue/break)
+- 无法结构化的控制流退化为基本块分派循环
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .quadruple import QuadrupleTable, JUMP_OPS, RELOPS, BINARY_FUNCS, is_constant, is_temp
+from .ir_vm import IRRuntimeError
+
+
+class _Unstructured(Exception):
+    """控制流无法还原为结构化语句"""
+    pass
+
+
+# 指令的工作表示: (op, arg1, arg2, result/目标下标)，已删除标号
+Instr = Tuple[str, Optional[str], Optional[str], object]
+
+
+class IRCompiler:
+    """
+    三地址码到Python函数的编译器
+
+    用法:
+        program = IRCompiler().compile(table)
+        result = program({'n': 10})       # 返回所有用户变量的终值
+
+    编译结果的源代码保存在 self.source 中，self.structured 表示控制流是否被完全结构化
+    """
+
+    def __init__(self):
+        """初始化编译器"""
+        self.source = ""
+        self.structured = True
+        self._names: Dict[str, str] = {}
+
+    def compile(self, table: QuadrupleTable, name: str = "ir_program"):
+        """
+        编译四元式表
+
+        参数:
+            table: 四元式表
+            name: 生成的函数名
+        返回: 可调用对象 f(inputs: Dict[str, int] = None) -> Dict[str, int]
+        """
+        code = self._prepare(table)
+        self._names = {}
+        variables = []
+        for op, arg1, arg2, res in code:
+            operands = [arg1, arg2] if op in JUMP_OPS else [arg1, arg2, res]
+            for operand in operands:
+                if operand is not None and not is_constant(operand) and operand not in self._names:
+                    self._names[operand] = f"v_{operand}" if operand.isidentifier() \
+                        else f"v{len(self._names)}"
+                    variables.append(operand)
+
+        try:
+            body = self._structure(code, 0, len(code), [])
+            self.structured = True
+        except _Unstructured:
+            body = self._dispatch(code)
+            self.structured = False
+
+        lines = [f"def {name}(inputs=None):",
+                 "    inputs = inputs or {}"]
+        for var in variables:
+            init = "0" if is_temp(var) else f"int(inputs.get({var!r}, 0))"
+            lines.append(f"    {self._names[var]} = {init}")
+        lines.append("    try:")
+        lines.extend("        " + line for line in (body or ["pass"]))
+        lines.append("    except ZeroDivisionError:")
+        lines.append("        raise IRRuntimeError('除数为0') from None")
+        user_vars = [var for var in variables if not is_temp(var)]
+        lines.append("    return {" + ", ".join(f"{var!r}: {self._names[var]}"
+                                                 for var in user_vars) + "}")
+        self.source = "\n".join(lines) + "\n"
+
+        namespace = {'_div': BINARY_FUNCS['/'], 'IRRuntimeError': IRRuntimeError}
+        exec(compile(self.source, f"<{name}>", "exec"), namespace)
+        return namespace[name]
+
+    # ------------------------------------------------------------------
+    # 预处理与单条指令翻译
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _prepare(table: QuadrupleTable) -> List[Instr]:
+        """删除标号，把跳转目标改写为删除标号后的指令下标"""
+        targets = table.jump_targets()
+        new_index = []
+        count = 0
+        for i in range(len(table)):
+            new_index.append(count)
+            if table.op(i) != 'label':
+                count += 1
+        new_index.append(count)
+
+        code: List[Instr] = []
+        for i, q in enumerate(table.quads()):
+            if q.op == 'label':
+                continue
+            if q.op == 'text':
+                raise ValueError(f"无法编译三地址码文本: {q.result}")
+            res = new_index[targets[i]] if q.op in JUMP_OPS else q.result
+            code.append((q.op, q.arg1, q.arg2, res))
+        return code
+
+    def _operand(self, name: str) -> str:
+        """操作数的Python表达式"""
+        if is_constant(name):
+            return f"({name})" if name.startswith('-') else name
+        return self._names[name]
+
+    def _statement(self, instr: Instr) -> str:
+        """翻译一条非跳转指令"""
+        op, arg1, arg2, res = instr
+        target = self._names[res]
+        if op == ':=':
+            return f"{target} = {self._operand(arg1)}"
+        if op == 'uminus':
+            return f"{target} = -{self._operand(arg1)}"
+        if op == '/':
+            return f"{target} = _div({self._operand(arg1)}, {self._operand(arg2)})"
+        if op in RELOPS:
+            return f"{target} = int({self._operand(arg1)} {op} {self._operand(arg2)})"
+        return f"{target} = {self._operand(arg1)} {op} {self._operand(arg2)}"
+
+    def _condition(self, instr: Instr, negate: bool = False) -> str:
+        """翻译条件跳转的条件表达式"""
+        op, arg1, arg2, _ = instr
+        if op == 'jnz':
+            cond = self._operand(arg1)
+            return f"not {cond}" if negate else cond
+        cond = f"{self._operand(arg1)} {op[1:]} {self._operand(arg2)}"
+        return f"not ({cond})" if negate else cond
+
+    # ------------------------------------------------------------------
+    # 控制流结构化
+    # ------------------------------------------------------------------
+
+    def _structure(self, code: List[Instr], start: int, end: int,
+                   loops: List[Tuple[int, int]], loop_head: int = -1) -> List[str]:
+        """
+        把区间[start, end)内的指令还原为结构化语句
+
+        规则:
+        - 区间内存在跳回位置h的跳转时，[h, 最后一条回跳]构成 while True 循环，
+          跳到h翻译为continue，跳到循环出口翻译为break
+        - 向前的条件跳转 if c goto T 翻译为 if not c: ...；若T之前是 goto U，
+          则翻译为 if c: [T, U) else: [i+1, T-1)
+
+        参数:
+            code: 指令列表
+            start, end: 区间
+            loops: 外层循环栈 [(入口, 出口)]，只有最内层循环可以break/continue
+            loop_head: 已经作为循环入口处理过的位置
+        返回: 语句行列表(未缩进)
+        """
+        lines: List[str] = []
+        i = start
+        while i < end:
+            if i != loop_head:
+                back = [k for k in range(i, end)
+                        if code[k][0] in JUMP_OPS and code[k][3] == i]
+                if back:
+                    k = back[-1]
+                    body = self._structure(code, i, k + 1, loops + [(i, k + 1)], loop_head=i)
+                    if code[k][0] != 'j':
+                        body.append("break")
+                    elif body and body[-1] == "continue":
+                        body.pop()
+                    lines.append("while True:")
+                    lines.extend("    " + line for line in (body or ["pass"]))
+                    i = k + 1
+                    continue
+
+            instr = code[i]
+            op, target = instr[0], instr[3]
+            if op not in JUMP_OPS:
+                lines.append(self._statement(instr))
+                i += 1
+                continue
+
+            if loops and target in loops[-1]:
+                keyword = "continue" if target == loops[-1][0] else "break"
+                if op == 'j':
+                    lines.append(keyword)
+                else:
+                    lines.append(f"if {self._condition(instr)}:")
+                    lines.append(f"    {keyword}")
+                i += 1
+                continue
+
+            if op == 'j' or not i < target <= end:
+                raise _Unstructured()
+
+            last = code[target - 1]
+            if (target - 1 > i and last[0] == 'j' and target < last[3] <= end
+                    and not (loops and last[3] in loops[-1])):
+                exit_ = last[3]
+                then_part = self._structure(code, target, exit_, loops)
+                else_part = self._structure(code, i + 1, target - 1, loops)
+                lines.append(f"if {self._condition(instr)}:")
+                lines.extend("    " + line for line in (then_part or ["pass"]))
+                if else_part:
+                    lines.append("else:")
+                    lines.extend("    " + line for line in else_part)
+                i = exit_
+            else:
+                then_part = self._structure(code, i + 1, target, loops)
+                lines.append(f"if {self._condition(instr, negate=True)}:")
+                lines.extend("    " + line for line in (then_part or ["pass"]))
+                i = target
+        return lines
+
+    def _dispatch(self, code: List[Instr]) -> List[str]:
+        """
+        非结构化控制流的退路: 基本块分派循环
+        每个基本块一个分支，块末尾给出下一个块的编号
+        """
+        leaders = {0}
+        for i, instr in enumerate(code):
+            if instr[0] in JUMP_OPS:
+                leaders.add(instr[3])
+                leaders.add(i + 1)
+        leaders = sorted(l for l in leaders if l < len(code))
+        block_of = {leader: b for b, leader in enumerate(leaders)}
+        exit_block = len(leaders)
+
+        def block_id(index: int) -> int:
+            return block_of.get(index, exit_block)
+
+        lines = ["pc = 0", "while True:"]
+        for b, leader in enumerate(leaders):
+            end = leaders[b + 1] if b + 1 < len(leaders) else len(code)
+            lines.append(f"    {'if' if b == 0 else 'elif'} pc == {b}:")
+            for i in range(leader, end):
+                instr = code[i]
+                if instr[0] == 'j':
+                    lines.append(f"        pc = {block_id(instr[3])}")
+                    break
+                if instr[0] in JUMP_OPS:
+                    lines.append(f"        pc = {block_id(instr[3])} if {self._condition(instr)} "
+                                 f"else {block_id(i + 1)}")
+                    break
+                lines.append(f"        {self._statement(instr)}")
+            else:
+                lines.append(f"        pc = {block_id(end)}")
+        lines.append("    else:")
+        lines.append("        break")
+        return lines
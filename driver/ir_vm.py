@@ -0,0 +1,218 @@
+"""
+三地址码虚拟机
+直接执行SemanticAnalyzer生成的四元式表，用于通过"运行程序"来验证语义分析的输出
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from .quadruple import (QuadrupleTable, OP_CODES, NONE, JUMP_OPS, RELOPS, BINARY_FUNCS,
+                        is_constant, is_temp)
+
+
+class IRRuntimeError(Exception):
+    """虚拟机运行时错误(除零、超出步数上限等)"""
+    pass
+
+
+def _make_instruction(op: str, mem: List[int], a: int, b: int, r: int, nxt: int) -> Callable[[], int]:
+    """
+    把一条四元式编译为闭包(线索化代码)
+
+    闭包执行该指令并返回下一条指令的下标；操作数槽位和后继下标都在闭包中固定，
+    执行时不再需要解码操作码
+
+    参数:
+        op: 操作符
+        mem: 槽位列表
+        a, b: 操作数槽位
+        r: 结果槽位，跳转指令为目标下标
+        nxt: 顺序执行时的下一条指令下标
+    """
+    if op == ':=':
+        def f():
+            mem[r] = mem[a]
+            return nxt
+    elif op == '+':
+        def f():
+            mem[r] = mem[a] + mem[b]
+            return nxt
+    elif op == '-':
+        def f():
+            mem[r] = mem[a] - mem[b]
+            return nxt
+    elif op == '*':
+        def f():
+            mem[r] = mem[a] * mem[b]
+            return nxt
+    elif op == '/':
+        divide = BINARY_FUNCS['/']
+
+        def f():
+            mem[r] = divide(mem[a], mem[b])
+            return nxt
+    elif op == 'uminus':
+        def f():
+            mem[r] = -mem[a]
+            return nxt
+    elif op in RELOPS:
+        compare = BINARY_FUNCS[op]
+
+        def f():
+            mem[r] = compare(mem[a], mem[b])
+            return nxt
+    elif op == 'j':
+        def f():
+            return r
+    elif op == 'jnz':
+        def f():
+            return r if mem[a] else nxt
+    elif op == 'j<':
+        def f():
+            return r if mem[a] < mem[b] else nxt
+    elif op == 'j<=':
+        def f():
+            return r if mem[a] <= mem[b] else nxt
+    elif op == 'j>':
+        def f():
+            return r if mem[a] > mem[b] else nxt
+    elif op == 'j>=':
+        def f():
+            return r if mem[a] >= mem[b] else nxt
+    elif op == 'j==':
+        def f():
+            return r if mem[a] == mem[b] else nxt
+    elif op == 'j!=':
+        def f():
+            return r if mem[a] != mem[b] else nxt
+    else:
+        raise ValueError(f"虚拟机不支持的操作符: {op}")
+    return f
+
+
+class IRVirtualMachine:
+    """
+    三地址码虚拟机
+
+    装载阶段(load)一次性完成:
+    - 每个变量、临时变量、常量分配一个整数槽位，常量槽位预先填好值
+    - 删除标号伪指令，把跳转目标解析为指令下标
+    - 每条指令编译为一个闭包，闭包返回下一条指令的下标
+
+    执行阶段(run)的分派循环只有一行: pc = code[pc]()
+    """
+
+    def __init__(self, table: Optional[QuadrupleTable] = None):
+        """
+        初始化虚拟机
+
+        参数:
+            table: 要装载的四元式表(可选，也可以稍后调用load)
+        """
+        self.code: List[Callable[[], int]] = []
+        self.slot_names: List[str] = []
+        self.slots: Dict[str, int] = {}
+        self.initial_memory: List[int] = []
+        self.memory: List[int] = []
+
+        # 最近一次运行执行的指令条数
+        self.steps = 0
+
+        if table is not None:
+            self.load(table)
+
+    def _slot(self, name: Optional[str]) -> int:
+        """为操作数分配槽位"""
+        if name is None:
+            return NONE
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = len(self.slot_names)
+            self.slots[name] = slot
+            self.slot_names.append(name)
+            self.initial_memory.append(int(name) if is_constant(name) else 0)
+        return slot
+
+    def load(self, table: QuadrupleTable):
+        """
+        装载四元式表
+
+        参数:
+            table: 四元式表
+        """
+        self.code = []
+        self.slot_names = []
+        self.slots = {}
+        self.initial_memory = []
+        self.memory = []
+
+        targets = table.jump_targets()
+        label_code = OP_CODES['label']
+
+        # 删除标号后，原下标 -> 新下标
+        new_index: List[int] = []
+        count = 0
+        for op in table.ops:
+            new_index.append(count)
+            if op != label_code:
+                count += 1
+        new_index.append(count)
+
+        instructions = []
+        for i in range(len(table)):
+            op = table.op(i)
+            if op == 'label':
+                continue
+            if op == 'text':
+                raise ValueError(f"虚拟机无法执行三地址码文本: {table.name(table.results[i])}")
+            a = self._slot(table.name(table.arg1s[i]))
+            b = self._slot(table.name(table.arg2s[i]))
+            if op in JUMP_OPS:
+                r = new_index[targets[i]]
+            else:
+                r = self._slot(table.name(table.results[i]))
+            instructions.append((op, a, b, r))
+
+        # 所有闭包共享同一个槽位列表，每次运行前重置其内容
+        self.memory = list(self.initial_memory)
+        self.code = [_make_instruction(op, self.memory, a, b, r, pc + 1)
+                     for pc, (op, a, b, r) in enumerate(instructions)]
+
+    def run(self, inputs: Optional[Dict[str, int]] = None,
+            max_steps: Optional[int] = None) -> Dict[str, int]:
+        """
+        执行已装载的程序
+
+        参数:
+            inputs: 变量初值 {变量名: 值}，未给出的变量初值为0
+            max_steps: 最大执行步数，None表示不限制
+        返回: 程序结束时所有用户变量(不含临时变量和常量)的值
+        """
+        mem = self.memory
+        mem[:] = self.initial_memory
+        if inputs:
+            for name, value in inputs.items():
+                if name in self.slots:
+                    mem[self.slots[name]] = int(value)
+
+        code = self.code
+        n = len(code)
+        pc = 0
+        steps = 0
+        try:
+            if max_steps is None:
+                while pc < n:
+                    pc = code[pc]()
+                    steps += 1
+            else:
+                while pc < n:
+                    if steps >= max_steps:
+                        raise IRRuntimeError(f"超出最大执行步数 {max_steps}")
+                    pc = code[pc]()
+                    steps += 1
+        except ZeroDivisionError:
+            raise IRRuntimeError(f"第{pc + 1}条指令除数为0") from None
+        finally:
+            self.steps = steps
+
+        return {name: mem[slot] for slot, name in enumerate(self.slot_names)
+                if not is_constant(name) and not is_temp(name)}
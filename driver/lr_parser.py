@@ -2,12 +2,19 @@
 LR分析器驱动程序
 """
 
-from typing import List, Dict, Tuple, Callable, Optional, Any
+import time
+import logging
+from typing import List, Dict, Set, Tuple, Callable, Optional, Any
 from syntax import Grammar
+from utils.logger import Logger
+from utils.metrics import Metrics, timed
 from .symbol import Symbol
 from .parse_tree import ParseTreeBuilder, ParseTreeNode
 
 
+logger = Logger.get(__name__)
+
+
 class LRParser:
     """
     LR分析器驱动程序
@@ -18,7 +25,13 @@ class LRParser:
                  grammar: Grammar, 
                  action_table: Dict[Tuple[int, str], Tuple[str, int]], 
                  goto_table: Dict[Tuple[int, str], int],
-                 semantic_handler: Optional[Callable] = None):
+                 semantic_handler: Optional[Callable] = None,
+                 follow_sets: Optional[Dict[str, Set[str]]] = None,
+                 max_errors: int = 100,
+                 expected_tokens: Optional[Dict[int, Tuple[str, ...]]] = None,
+                 metrics: Optional[Metrics] = None,
+                 unit_chains: Optional[Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]] = None,
+                 list_values: bool = False):
         """
         初始化LR分析器
         
@@ -27,11 +40,45 @@ class LRParser:
             action_table: ACTION表 {(state, terminal): (action, value)}
             goto_table: GOTO表 {(state, non_terminal): next_state}
             semantic_handler: 语义动作处理器(可选)
+            follow_sets: FOLLOW集(可选，错误恢复时使用；不提供则在第一次需要时计算)
+            max_errors: 错误恢复模式下最多报告的错误个数
+            expected_tokens: 每个状态期望的终结符(可选，即TableBuilder.expected_tokens；
+                             不提供则在第一次报错时由ACTION表计算一次)
+            metrics: 性能统计对象(可选)，记录parse耗时、移进/归约次数和每个产生式的语义动作耗时
+            unit_chains: 分析表跳过了单产生式归约时(syntax.unit_rules.UnitRuleEliminator.unit_chains)，
+                         在语法树中补回被跳过的层次；不提供则语法树中省略这些层次
+            list_values: 为True时由分析器直接计算EBNF辅助产生式(Grammar.list_rules)的语义值，
+                         不调用语义处理器: X*、X+ 的值为逐项追加构建的列表，X? 的值为X的值或None
         """
         self.grammar = grammar
         self.action_table = action_table
         self.goto_table = goto_table
         self.semantic_handler = semantic_handler
+        self.follow_sets = follow_sets
+        self.max_errors = max_errors
+        self.expected_tokens = expected_tokens
+        self.metrics = metrics
+        
+        # 产生式的字符串表示(每个产生式一份，语法树节点和分析历史共享同一个字符串)
+        self._production_strs = [str(p) for p in grammar.productions]
+        
+        # 由分析器计算语义值的EBNF辅助产生式: 产生式编号 -> 列表语义值动作
+        self._list_actions: Dict[int, str] = {}
+        if list_values:
+            self._list_actions = {p.id: grammar.list_rules[(p.left, p.right)] for p in grammar.productions
+                                  if (p.left, p.right) in grammar.list_rules}
+        
+        # 语法错误记录: [{'index', 'token', 'value', 'state', 'expected', 'message'}]
+        self.errors: List[Dict] = []
+        
+        # 错误恢复状态: 恢复后还需成功移进的token数，期间的新错误不重复报告(同yacc)
+        self._recovering = 0
+        
+        # 紧急恢复的同步表(按需计算): {state: {terminal: (非终结符A, GOTO[state, A])}}
+        self._sync_table: Dict[int, Dict[str, Tuple[str, int]]] = {}
+        
+        # 是否输出逐步跟踪(DEBUG级别，每次parse开始时检查一次)
+        self._trace = False
         
         # 分析栈: 存储(状态, 符号)对
         self.state_stack: List[int] = []
@@ -44,9 +91,9 @@ class LRParser:
         self.production_sequence: List[int] = []
         
         # 语法树构建器（课程要求）
-        self.tree_builder: ParseTreeBuilder = ParseTreeBuilder()
+        self.tree_builder: ParseTreeBuilder = ParseTreeBuilder(unit_chains)
     
-    def parse(self, tokens: List[Tuple[str, Any]]) -> int:
+    def parse(self, tokens: List[Tuple[str, Any]], recover: bool = False) -> int:
         """
         LR分析主函数
         
@@ -58,16 +105,23 @@ class LRParser:
               - shift s: 压入状态s和符号a，前进输入指针
               - reduce A->β: 弹出|β|个状态，查GOTO[栈顶状态, A]，压入
               - accept: 分析成功
-              - error: 分析失败
+              - error: 分析失败(recover=True时进行错误恢复并继续分析)
         
         参数:
             tokens: 输入token序列，格式[(token_type, token_value), ...]
+            recover: 是否在语法错误后恢复并继续分析，所有错误记录在self.errors中
         
         返回: True表示分析成功，False表示失败
         """
-        print("\n" + "="*60)
-        print("开始LR分析")
-        print("="*60)
+        with timed(self.metrics, 'parse'):
+            return self._parse(tokens, recover)
+    
+    def _parse(self, tokens: List[Tuple[str, Any]], recover: bool) -> int:
+        """LR分析主循环(见parse)"""
+        # 逐步跟踪只在DEBUG级别输出，关闭时每一步只多一次布尔判断
+        self._trace = logger.isEnabledFor(logging.DEBUG)
+        if self._trace:
+            logger.debug("\n%s\n开始LR分析\n%s", "=" * 60, "=" * 60)
         
         # 初始化
         self.state_stack = [0]
@@ -75,6 +129,8 @@ class LRParser:
         self.parse_history = []
         self.production_sequence = []  # 清空产生式序列
         self.tree_builder.clear()  # 清空语法树构建器
+        self.errors = []
+        self._recovering = 0
         
         # 添加结束标记
         tokens = tokens + [('$', None)]
@@ -87,13 +143,22 @@ class LRParser:
             current_token, current_value = tokens[input_index]
             
             # 打印当前状态
-            self._print_step(step, current_state, current_token, input_index, tokens)
+            if self._trace:
+                self._print_step(step, current_state, current_token, input_index, tokens)
             
             # 查ACTION表
             action_key = (current_state, current_token)
             if action_key not in self.action_table:
-                print(f"\n[错误] 语法错误: 状态{current_state}无法处理输入'{current_token}'")
-                return False
+                if self.metrics is not None:
+                    self.metrics.count('parse.errors')
+                if not recover:
+                    error = self._record_error(input_index, current_token, current_value, current_state)
+                    logger.error("\n[错误] 语法错误: %s", error['message'])
+                    return False
+                input_index = self._recover(tokens, input_index)
+                if input_index is None:
+                    return False
+                continue
             
             action, value = self.action_table[action_key]
             
@@ -106,21 +171,32 @@ class LRParser:
                     return -1
             
             elif action == 'accept':
-                print(f"  动作: ACCEPT")
-                print("\n" + "="*60)
-                print("分析成功!")
-                print("="*60)
+                logger.debug("  动作: ACCEPT")
+                if self.errors:
+                    logger.warning("\n[错误恢复] 分析结束，共发现%d个语法错误", len(self.errors))
+                    return False
+                self.tree_builder.expand_root(self.grammar.productions[0].right[0])
+                logger.info("\n%s\n分析成功!\n%s", "=" * 60, "=" * 60)
                 return 1
             
             else:
-                print(f"\n[错误] 未知动作: {action}")
+                logger.error("\n[错误] 未知动作: %s", action)
                 return 0
     
     def _handle_shift(self, state: int, token: str, value: Any, step: int):
         """处理shift动作"""
-        print(f"  动作: SHIFT {state}")
+        logger.debug("  动作: SHIFT %d", state)
+        symbol = Symbol(token, value)
         self.state_stack.append(state)
-        self.symbol_stack.append(Symbol(token, value))
+        self.symbol_stack.append(symbol)
+        if self._recovering:
+            self._recovering -= 1
+        if self.metrics is not None:
+            self.metrics.count('parse.shifts')
+        
+        # 通知语义处理器(如进入作用域)；出现语法错误后不再执行语义处理
+        if not self.errors and hasattr(self.semantic_handler, 'on_shift'):
+            self.semantic_handler.on_shift(symbol)
         
         # 语法树：压入终结符节点
         self.tree_builder.push_terminal(token, value)
@@ -136,10 +212,12 @@ class LRParser:
     def _handle_reduce(self, prod_id: int, step: int) -> int:
         """处理reduce动作"""
         production = self.grammar.productions[prod_id]
-        print(f"  动作: REDUCE {production}")
+        logger.debug("  动作: REDUCE %s", production)
         
         # 记录产生式序列（课程要求）
         self.production_sequence.append(prod_id)
+        if self.metrics is not None:
+            self.metrics.count('parse.reduces')
         
         # 弹出|β|个状态和符号
         beta_length = len(production.right)
@@ -152,12 +230,22 @@ class LRParser:
             self.state_stack.pop()
             reduced_symbols.insert(0, self.symbol_stack.pop())
         
-        # 调用语义动作处理器
-        semantic_value = self._handle_semantic_action(production, reduced_symbols)
+        # 调用语义动作处理器(出现语法错误后，语义值已不可信，不再执行语义动作)
+        list_action = self._list_actions.get(prod_id) if self._list_actions else None
+        if self.errors:
+            semantic_value = None
+        elif list_action is not None:
+            semantic_value = self._list_value(list_action, reduced_symbols)
+        elif self.metrics is not None:
+            start = time.perf_counter()
+            semantic_value = self._handle_semantic_action(production, reduced_symbols)
+            self.metrics.record_semantic(prod_id, time.perf_counter() - start)
+        else:
+            semantic_value = self._handle_semantic_action(production, reduced_symbols)
         
         # 语法树：执行归约操作
         self.tree_builder.reduce(
-            production_str=str(production),
+            production_str=self._production_strs[prod_id],
             left=production.left,
             right=list(production.right)
         )
@@ -167,7 +255,7 @@ class LRParser:
         goto_key = (goto_state, production.left)
         
         if goto_key not in self.goto_table:
-            print(f"\n[错误] GOTO表错误: 状态{goto_state}无法处理非终结符'{production.left}'")
+            logger.error("\n[错误] GOTO表错误: 状态%d无法处理非终结符'%s'", goto_state, production.left)
             return 0
         
         next_state = self.goto_table[goto_key]
@@ -175,27 +263,159 @@ class LRParser:
         
         # 创建归约后的符号
         # 如果semantic_value是字典（语义属性），则设置为attributes
-        if semantic_value is None:
-            return -1
-        if isinstance(semantic_value, dict):
+        if list_action is not None and not self.errors:
+            new_symbol = Symbol(production.left, semantic_value)
+        elif semantic_value is None:
+            if not self.errors:
+                return -1
+            new_symbol = Symbol(production.left)
+        elif isinstance(semantic_value, dict):
             new_symbol = Symbol(production.left, None, semantic_value)
         else:
             new_symbol = Symbol(production.left, semantic_value)
         
         self.symbol_stack.append(new_symbol)
         
-        print(f"  GOTO 状态{next_state}")
+        logger.debug("  GOTO 状态%d", next_state)
         
         # 记录历史
         self.parse_history.append({
             'step': step,
             'action': 'reduce',
-            'production': str(production),
+            'production': self._production_strs[prod_id],
             'goto': next_state
         })
         
         return 1
     
+    def expected(self, state: int) -> Tuple[str, ...]:
+        """
+        查询状态期望的终结符(O(1)查表)
+        
+        参数:
+            state: 分析状态
+        返回: 排好序的终结符元组
+        """
+        if self.expected_tokens is None:
+            from syntax.table_builder import TableBuilder
+            self.expected_tokens = TableBuilder.compute_expected_tokens(self.action_table)
+        return self.expected_tokens.get(state, ())
+    
+    def _record_error(self, index: int, token: str, value: Any, state: int) -> Dict:
+        """记录一个语法错误"""
+        expected = self.expected(state)
+        error = {
+            'index': index,
+            'token': token,
+            'value': value,
+            'state': state,
+            'expected': expected,
+            'message': f"位置{index}: 状态{state}无法处理输入'{token}'，期望: {', '.join(expected)}"
+        }
+        self.errors.append(error)
+        return error
+    
+    def _recover(self, tokens: List[Tuple[str, Any]], index: int) -> Optional[int]:
+        """
+        错误恢复
+        
+        1. 刚恢复过(尚未成功移进3个token)时不重复报告，直接丢弃当前token
+        2. 文法含error伪终结符时(yacc风格): 弹栈直到某个状态能移进error，
+           移进error后继续分析(之后无法处理的输入会按1被丢弃)
+        3. 否则紧急恢复: 在栈中自顶向下寻找状态s和非终结符A(GOTO[s, A]存在)，
+           丢弃输入直到遇到FOLLOW(A)中、且在GOTO[s, A]状态下有动作的token，
+           然后把A压栈，相当于把出错的片段归约为A
+        
+        每个错误的恢复代价: 弹栈不超过栈深度，每个被丢弃的token检查一遍栈
+        
+        参数:
+            tokens: 输入token序列(以$结尾)
+            index: 出错位置
+        返回: 继续分析的输入位置，无法恢复时返回None
+        """
+        token, value = tokens[index]
+        state = self.state_stack[-1]
+        
+        if self._recovering == 3:
+            # 恢复后一个token都没能移进: 丢弃当前token
+            if token == '$':
+                logger.warning("\n[错误恢复] 到达输入末尾，无法恢复")
+                return None
+            logger.info("  [错误恢复] 丢弃 '%s'", token)
+            return index + 1
+        
+        if not self._recovering:
+            if len(self.errors) >= self.max_errors:
+                logger.warning("\n[错误恢复] 错误过多(超过%d个)，停止分析", self.max_errors)
+                return None
+            error = self._record_error(index, token, value, state)
+            logger.error("\n[错误] 语法错误: %s", error['message'])
+        self._recovering = 3
+        
+        # yacc风格: 寻找能移进error的状态
+        if 'error' in self.grammar.terminals:
+            for depth in range(len(self.state_stack) - 1, -1, -1):
+                entry = self.action_table.get((self.state_stack[depth], 'error'))
+                if entry is not None and entry[0] == 'shift':
+                    self._pop_to(depth)
+                    logger.info("  [错误恢复] 弹栈至状态%d，移进error", self.state_stack[-1])
+                    self.state_stack.append(entry[1])
+                    self.symbol_stack.append(Symbol('error'))
+                    self.tree_builder.push_terminal('error', None)
+                    return index
+        
+        # 紧急恢复: 按FOLLOW集同步
+        for i in range(index, len(tokens)):
+            token = tokens[i][0]
+            for depth in range(len(self.state_stack) - 1, -1, -1):
+                entry = self._sync_entries(self.state_stack[depth]).get(token)
+                if entry is None:
+                    continue
+                non_terminal, target = entry
+                self._pop_to(depth)
+                logger.info("  [错误恢复] 丢弃%d个token，弹栈至状态%d，压入%s，在'%s'处继续",
+                            i - index, self.state_stack[-1], non_terminal, token)
+                self.state_stack.append(target)
+                self.symbol_stack.append(Symbol(non_terminal))
+                self.tree_builder.node_stack.append(ParseTreeNode(symbol=non_terminal, value='error'))
+                return i
+        
+        logger.warning("\n[错误恢复] 找不到同步点，停止分析")
+        return None
+    
+    def _pop_to(self, depth: int):
+        """弹栈，使state_stack[depth]成为栈顶"""
+        while len(self.state_stack) > depth + 1:
+            self.state_stack.pop()
+            self.symbol_stack.pop()
+            self.tree_builder.node_stack.pop()
+    
+    def _sync_entries(self, state: int) -> Dict[str, Tuple[str, int]]:
+        """
+        计算(并缓存)状态的同步表: 对GOTO[state, A]存在的每个非终结符A，
+        FOLLOW(A)中在GOTO[state, A]状态下有动作的token都可以作为同步点
+        """
+        entries = self._sync_table.get(state)
+        if entries is not None:
+            return entries
+        if self.follow_sets is None:
+            from syntax.first_follow import FirstFollowCalculator
+            calculator = FirstFollowCalculator(self.grammar)
+            calculator.compute_first_sets()
+            calculator.compute_follow_sets()
+            self.follow_sets = calculator.follow_sets
+        
+        entries = {}
+        for non_terminal in sorted(self.grammar.non_terminals):
+            target = self.goto_table.get((state, non_terminal))
+            if target is None:
+                continue
+            for terminal in sorted(self.follow_sets.get(non_terminal, ())):
+                if terminal not in entries and (target, terminal) in self.action_table:
+                    entries[terminal] = (non_terminal, target)
+        self._sync_table[state] = entries
+        return entries
+    
     def _handle_semantic_action(self, production, symbols: List[Symbol]) -> Any:
         """
         处理语义动作 - 预留给同学B的接口
@@ -206,8 +426,9 @@ class LRParser:
         
         返回: 该非终结符的语义值
         """
-        print(f"    [语义动作] 产生式: {production}")
-        print(f"    [语义动作] 归约符号: {[s.name + ':' + str(s.value) for s in symbols]}")
+        if self._trace:
+            logger.debug("    [语义动作] 产生式: %s", production)
+            logger.debug("    [语义动作] 归约符号: %s", [s.name + ':' + str(s.value) for s in symbols])
         
         # 如果用户提供了语义处理器，调用它
         if self.semantic_handler is not None:
@@ -217,7 +438,7 @@ class LRParser:
             else:
                 # 尝试直接调用
                 result = self.semantic_handler(production, symbols)
-            print(f"    [语义动作] 返回值: {result}")
+            logger.debug("    [语义动作] 返回值: %s", result)
             return result
         
         # 默认行为: 简单传递第一个符号的值
@@ -225,14 +446,38 @@ class LRParser:
             return symbols[0].value
         return None
     
+    @staticmethod
+    def _list_value(action: str, symbols: List[Symbol]) -> Any:
+        """
+        EBNF辅助产生式的语义值(动作的含义见syntax.ebnf.LIST_ACTIONS)
+        
+        H -> H α 把α的值追加到栈上已有的列表，不复制列表，所以构建n项的列表总共只需O(n)时间
+        """
+        if action == 'new':
+            return []
+        if action == 'none':
+            return None
+        if action == 'append':
+            values = symbols[0].value
+            items = symbols[1:]
+        else:
+            items = symbols
+        # 符号的语义值: 语义处理器返回字典时为属性字典
+        item = tuple(s.value if s.value is not None else s.attributes for s in items)
+        item = item[0] if len(item) == 1 else item
+        if action == 'append':
+            values.append(item)
+            return values
+        return [item] if action == 'first' else item
+    
     def _print_step(self, step: int, state: int, token: str, index: int, tokens: List):
-        """打印分析步骤信息"""
-        print(f"\n步骤 {step}:")
-        print(f"  状态栈: {self.state_stack}")
-        print(f"  符号栈: {[s.name for s in self.symbol_stack]}")
-        print(f"  当前状态: {state}")
-        print(f"  当前输入: {token} (位置{index})")
-        print(f"  剩余输入: {[t[0] for t in tokens[index:]]}")
+        """输出分析步骤信息(DEBUG级别)"""
+        logger.debug("\n步骤 %d:", step)
+        logger.debug("  状态栈: %s", self.state_stack)
+        logger.debug("  符号栈: %s", [s.name for s in self.symbol_stack])
+        logger.debug("  当前状态: %d", state)
+        logger.debug("  当前输入: %s (位置%d)", token, index)
+        logger.debug("  剩余输入: %s", [t[0] for t in tokens[index:]])
     
     def get_parse_tree(self) -> Optional[ParseTreeNode]:
         """
@@ -0,0 +1,414 @@
+"""
+三地址码优化器
+在语法分析(及语义分析)结束后，对生成的四元式表依次执行若干优化遍
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import Logger
+from .quadruple import (QuadrupleTable, BINARY_OPS, BINARY_FUNCS, JUMP_OPS, OP_CODES,
+                        TEMP_PREFIX, is_constant, is_temp)
+
+
+logger = Logger.get(__name__)
+
+
+# 可交换的运算: 值编号时对操作数排序
+_COMMUTATIVE = frozenset(['+', '*', '==', '!='])
+
+# 指令的工作表示: [op, arg1, arg2, result]，被删除的指令置为None
+Instr = List[Optional[str]]
+
+
+def _defines(instr: Instr) -> Optional[str]:
+    """返回指令定值的变量(跳转和标号不定值任何变量)"""
+    op = instr[0]
+    if op in JUMP_OPS or op == 'label':
+        return None
+    return instr[3]
+
+
+def _split_blocks(code: Sequence[Instr]) -> List[Tuple[int, int]]:
+    """
+    划分基本块
+
+    首指令(leader)规则:
+    1. 第一条指令
+    2. 标号指令(跳转目标)
+    3. 紧跟在跳转指令之后的指令
+
+    返回: [(start, end), ...]，区间左闭右开
+    """
+    blocks = []
+    start = 0
+    for i, instr in enumerate(code):
+        op = instr[0]
+        if op == 'label' and i > start:
+            blocks.append((start, i))
+            start = i
+        if op in JUMP_OPS:
+            blocks.append((start, i + 1))
+            start = i + 1
+    if start < len(code):
+        blocks.append((start, len(code)))
+    return blocks
+
+
+def _use_counts(code: Sequence[Optional[Instr]]) -> Dict[str, int]:
+    """统计每个变量作为操作数被使用的次数"""
+    uses: Dict[str, int] = {}
+    for instr in code:
+        if instr is None:
+            continue
+        for arg in (instr[1], instr[2]):
+            if arg is not None:
+                uses[arg] = uses.get(arg, 0) + 1
+    return uses
+
+
+class IROptimizer:
+    """
+    三地址码优化器
+
+    优化遍(按默认顺序):
+    - constant_folding:     常量折叠与常量传播(基本块内)
+    - copy_propagation:     复写传播，并将 "t := ...; x := t" 合并为 "x := ..."
+    - common_subexpression: 基于值编号的局部公共子表达式消除
+    - dead_code:            删除结果从未被使用的临时变量定值
+    - temp_reuse:           块内临时变量槽位复用(活跃区间不重叠的临时变量共用一个名字)
+
+    用户变量在程序结束时视为活跃，只有new_temp生成的临时变量(%t1, %t2, ...)会被删除或重命名
+    """
+
+    PASSES = ('constant_folding', 'copy_propagation', 'common_subexpression',
+              'constant_folding', 'copy_propagation', 'dead_code', 'temp_reuse')
+
+    def __init__(self, passes: Optional[Sequence[str]] = None):
+        """
+        初始化优化器
+
+        参数:
+            passes: 要执行的优化遍名称序列，默认为PASSES
+        """
+        self.passes = tuple(passes) if passes is not None else self.PASSES
+        for name in self.passes:
+            if not hasattr(self, f"_pass_{name}"):
+                raise ValueError(f"未知的优化遍: {name}")
+
+        # 每遍的统计信息: [{'pass', 'before', 'after', 'time'}]
+        self.stats: List[Dict] = []
+
+    def optimize(self, table: QuadrupleTable) -> QuadrupleTable:
+        """
+        对四元式表执行全部优化遍
+
+        参数:
+            table: 输入四元式表(不会被修改)
+        返回: 优化后的新四元式表；含不透明的'text'指令时其语义未知，原样复制不做优化
+        """
+        self.stats = []
+        if OP_CODES['text'] in table.ops:
+            logger.warning("四元式表含无法解析的三地址码文本，跳过优化")
+            result = QuadrupleTable()
+            for q in table.quads():
+                result.emit(q.op, q.arg1, q.arg2, q.result)
+            return result
+
+        code = self._with_labels(table)
+
+        for name in self.passes:
+            before = len(code)
+            start = time.perf_counter()
+            code = getattr(self, f"_pass_{name}")(code)
+            elapsed = time.perf_counter() - start
+            self.stats.append({'pass': name, 'before': before,
+                               'after': len(code), 'time': elapsed})
+
+        if 'label' not in (q.op for q in table.quads()):
+            code = self._strip_labels(code)
+
+        result = QuadrupleTable()
+        for op, arg1, arg2, res in code:
+            result.emit(op, arg1, arg2, res)
+        return result
+
+    @staticmethod
+    def _with_labels(table: QuadrupleTable) -> List[Instr]:
+        """
+        转换为工作表示，并把以指令编号给出的跳转目标改写为标号
+        (优化会删除指令，编号随之失效，标号则不受影响)
+        """
+        targets = table.jump_targets()
+        quads = list(table.quads())
+        numbered = sorted({targets[i] for i, q in enumerate(quads)
+                           if q.op in JUMP_OPS and q.result.isdigit()})
+        labels: Dict[int, str] = {}
+        counter = 0
+        for index in numbered:
+            counter += 1
+            while f"L{counter}" in table.name_ids:
+                counter += 1
+            labels[index] = f"L{counter}"
+
+        code: List[Instr] = []
+        for i, q in enumerate(quads):
+            if i in labels:
+                code.append(['label', None, None, labels[i]])
+            result = labels[targets[i]] if q.op in JUMP_OPS and q.result.isdigit() else q.result
+            code.append([q.op, q.arg1, q.arg2, result])
+        if len(table) in labels:
+            code.append(['label', None, None, labels[len(table)]])
+        return code
+
+    @staticmethod
+    def _strip_labels(code: List[Instr]) -> List[Instr]:
+        """删除标号，跳转目标改回指令编号(输入本来就使用指令编号时，输出保持同样的形式)"""
+        positions: Dict[str, int] = {}
+        count = 0
+        for instr in code:
+            if instr[0] == 'label':
+                positions[instr[3]] = count + 1
+            else:
+                count += 1
+        return [[op, arg1, arg2, str(positions[res]) if op in JUMP_OPS else res]
+                for op, arg1, arg2, res in code if op != 'label']
+
+    def print_stats(self):
+        """打印每一遍的指令数变化和耗时"""
+        print("\n=== 优化统计 ===")
+        for item in self.stats:
+            print(f"  {item['pass']:<22} {item['before']:>5} -> {item['after']:<5} "
+                  f"{item['time'] * 1000:8.3f} ms")
+
+    # ------------------------------------------------------------------
+    # 优化遍
+    # ------------------------------------------------------------------
+
+    def _pass_constant_folding(self, code: List[Instr]) -> List[Instr]:
+        """
+        常量折叠与传播
+
+        在每个基本块内维护 变量 -> 常量 的映射:
+        - 操作数若为已知常量则直接替换
+        - 两个操作数都是常量的运算在编译期求值(除数为0时保留原指令)
+        - 条件恒真的跳转改为goto，恒假的跳转删除
+        """
+        for start, end in _split_blocks(code):
+            consts: Dict[str, str] = {}
+            for i in range(start, end):
+                instr = code[i]
+                op, arg1, arg2, res = instr
+                if arg1 in consts:
+                    arg1 = instr[1] = consts[arg1]
+                if arg2 in consts:
+                    arg2 = instr[2] = consts[arg2]
+
+                if op in JUMP_OPS:
+                    if op == 'j':
+                        continue
+                    if op == 'jnz':
+                        taken = int(arg1) != 0 if is_constant(arg1) else None
+                    elif is_constant(arg1) and is_constant(arg2):
+                        taken = BINARY_FUNCS[op[1:]](int(arg1), int(arg2)) != 0
+                    else:
+                        taken = None
+                    if taken is True:
+                        code[i] = ['j', None, None, res]
+                    elif taken is False:
+                        code[i] = None
+                    continue
+                if op == 'label':
+                    continue
+
+                value = None
+                if op == ':=':
+                    value = arg1 if is_constant(arg1) else None
+                elif op == 'uminus' and is_constant(arg1):
+                    value = str(-int(arg1))
+                elif op in BINARY_OPS and is_constant(arg1) and is_constant(arg2):
+                    if not (op == '/' and int(arg2) == 0):
+                        value = str(BINARY_FUNCS[op](int(arg1), int(arg2)))
+
+                if value is not None:
+                    code[i] = [':=', value, None, res]
+                    consts[res] = value
+                else:
+                    consts.pop(res, None)
+        return [instr for instr in code if instr is not None]
+
+    def _pass_copy_propagation(self, code: List[Instr]) -> List[Instr]:
+        """
+        复写传播
+
+        1. 块内遇到 x := y 后，在x或y被重新定值之前，用y替换对x的引用
+        2. 若临时变量t只被紧随其后的 x := t 使用一次，则把t的定值直接改写为x
+        """
+        for start, end in _split_blocks(code):
+            copies: Dict[str, str] = {}
+            for i in range(start, end):
+                instr = code[i]
+                if instr[1] in copies:
+                    instr[1] = copies[instr[1]]
+                if instr[2] in copies:
+                    instr[2] = copies[instr[2]]
+                target = _defines(instr)
+                if target is None:
+                    continue
+                # target被重新定值: 所有与它有关的复写关系失效
+                copies.pop(target, None)
+                for name in [n for n, src in copies.items() if src == target]:
+                    del copies[name]
+                if instr[0] == ':=' and instr[1] != target:
+                    copies[target] = instr[1]
+
+        uses = _use_counts(code)
+        for i in range(1, len(code)):
+            instr, prev = code[i], code[i - 1]
+            if (instr[0] == ':=' and is_temp(instr[1]) and prev is not None
+                    and _defines(prev) == instr[1] and uses.get(instr[1]) == 1):
+                prev[3] = instr[3]
+                code[i] = None
+        return [instr for instr in code if instr is not None]
+
+    def _pass_common_subexpression(self, code: List[Instr]) -> List[Instr]:
+        """
+        局部公共子表达式消除(值编号)
+
+        每个基本块内为变量和常量分配值编号，表达式以 (op, vn1, vn2) 为键；
+        再次出现且原结果变量仍持有该值时，改写为复制指令
+        """
+        for start, end in _split_blocks(code):
+            value_of: Dict[str, int] = {}
+            expressions: Dict[Tuple, Tuple[int, str]] = {}
+            counter = [0]
+
+            def fresh() -> int:
+                counter[0] += 1
+                return counter[0]
+
+            def number(name: Optional[str]) -> int:
+                if name is None:
+                    return 0
+                if name not in value_of:
+                    value_of[name] = fresh()
+                return value_of[name]
+
+            for i in range(start, end):
+                instr = code[i]
+                op, arg1, arg2, res = instr
+                target = _defines(instr)
+                if target is None:
+                    continue
+                if op == ':=':
+                    value_of[res] = number(arg1)
+                    continue
+                if op in BINARY_OPS or op == 'uminus':
+                    vn1, vn2 = number(arg1), number(arg2)
+                    if op in _COMMUTATIVE and vn1 > vn2:
+                        vn1, vn2 = vn2, vn1
+                    key = (op, vn1, vn2)
+                    known = expressions.get(key)
+                    if known is not None and value_of.get(known[1]) == known[0]:
+                        code[i] = [':=', known[1], None, res]
+                        value_of[res] = known[0]
+                        continue
+                    vn = fresh()
+                    value_of[res] = vn
+                    expressions[key] = (vn, res)
+                else:
+                    value_of[res] = fresh()
+        return code
+
+    def _pass_dead_code(self, code: List[Instr]) -> List[Instr]:
+        """
+        删除无用的临时变量定值
+
+        临时变量的定值若从未被使用则删除，并递减其操作数的使用计数，
+        直到没有新的无用指令出现；自复制 x := x 也一并删除
+        """
+        uses = _use_counts(code)
+        defs: Dict[str, List[int]] = {}
+        for i, instr in enumerate(code):
+            target = _defines(instr)
+            if target is not None and is_temp(target):
+                defs.setdefault(target, []).append(i)
+
+        worklist = [name for name in defs if uses.get(name, 0) == 0]
+        while worklist:
+            name = worklist.pop()
+            for i in defs.pop(name, ()):
+                instr = code[i]
+                code[i] = None
+                for arg in (instr[1], instr[2]):
+                    if arg is None:
+                        continue
+                    uses[arg] -= 1
+                    if uses[arg] == 0 and arg in defs:
+                        worklist.append(arg)
+
+        return [instr for instr in code
+                if instr is not None and not (instr[0] == ':=' and instr[1] == instr[3])]
+
+    def _pass_temp_reuse(self, code: List[Instr]) -> List[Instr]:
+        """
+        临时变量槽位复用
+
+        只在一个基本块内定值和使用的临时变量按线性扫描重新分配名字:
+        变量在最后一次使用后释放槽位，后续定值优先复用编号最小的空闲槽位；
+        跨块使用的临时变量保留原名
+        """
+        blocks = _split_blocks(code)
+        block_of: Dict[str, set] = {}
+        for b, (start, end) in enumerate(blocks):
+            for i in range(start, end):
+                op, arg1, arg2, res = code[i]
+                for name in (arg1, arg2, _defines(code[i])):
+                    if is_temp(name):
+                        block_of.setdefault(name, set()).add(b)
+
+        local = {name for name, bs in block_of.items() if len(bs) == 1}
+        reserved = set(block_of) - local
+        slot_names: List[str] = []
+        counter = 0
+        while len(slot_names) < len(local):
+            counter += 1
+            if f"{TEMP_PREFIX}{counter}" not in reserved:
+                slot_names.append(f"{TEMP_PREFIX}{counter}")
+
+        for start, end in blocks:
+            last_use: Dict[str, int] = {}
+            for i in range(start, end):
+                for arg in (code[i][1], code[i][2]):
+                    if arg in local:
+                        last_use[arg] = i
+
+            mapping: Dict[str, int] = {}
+            free: List[int] = []
+            next_slot = 0
+            for i in range(start, end):
+                instr = code[i]
+                # 先改写两个操作数，再释放最后一次使用在本条指令的槽位(两个操作数可能是同一个临时变量)
+                used = []
+                for pos in (1, 2):
+                    arg = instr[pos]
+                    if arg in mapping:
+                        instr[pos] = slot_names[mapping[arg]]
+                        used.append(arg)
+                for arg in used:
+                    if arg in mapping and last_use.get(arg) == i:
+                        free.append(mapping.pop(arg))
+                target = _defines(instr)
+                if target in local:
+                    if free:
+                        slot = min(free)
+                        free.remove(slot)
+                    else:
+                        slot = next_slot
+                        next_slot += 1
+                    instr[3] = slot_names[slot]
+                    if last_use.get(target, -1) > i:
+                        mapping[target] = slot
+                    else:
+                        free.append(slot)
+        return code
@@ -3,8 +3,8 @@
 使用组合模式 (Composite Pattern) 构建语法树
 """
 
-from typing import List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -17,6 +17,9 @@ class ParseTreeNode:
     value: Any = None  # 符号值（对于终结符）
     children: List['ParseTreeNode'] = None  # 子节点列表
     production: str = None  # 使用的产生式（对于非终结符）
+    # 增量分析用的信息(不参与相等比较): 子树左侧的分析状态、覆盖的token个数
+    left_state: Optional[int] = field(default=None, compare=False, repr=False)
+    token_count: int = field(default=0, compare=False, repr=False)
     
     def __post_init__(self):
         if self.children is None:
@@ -71,8 +74,14 @@ class ParseTreeBuilder:
     负责在LR分析过程中构建语法树
     """
     
-    def __init__(self):
+    def __init__(self, unit_chains: Optional[Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]] = None):
+        """
+        参数:
+            unit_chains: 分析表跳过了单产生式归约时，用于补回被跳过层次的推导链
+                         {(Y, X): ((左部, 产生式字符串), ...)}(见syntax.unit_rules)；None表示不补回
+        """
         self.node_stack: List[ParseTreeNode] = []
+        self.unit_chains = unit_chains
     
     def push_terminal(self, symbol: str, value: Any):
         """压入终结符节点（shift操作）"""
@@ -103,6 +112,9 @@ class ParseTreeBuilder:
             if self.node_stack:
                 children.insert(0, self.node_stack.pop())
         
+        if self.unit_chains:
+            children = [self._expand(child, symbol) for child, symbol in zip(children, right)]
+        
         # 创建父节点
         parent = ParseTreeNode(
             symbol=left,
@@ -113,6 +125,21 @@ class ParseTreeBuilder:
         self.node_stack.append(parent)
         return parent
     
+    def expand_root(self, symbol: str):
+        """分析结束时补回根节点上被跳过的单产生式层次(使根节点为symbol)"""
+        if self.unit_chains and self.node_stack:
+            self.node_stack[-1] = self._expand(self.node_stack[-1], symbol)
+    
+    def _expand(self, node: ParseTreeNode, symbol: str) -> ParseTreeNode:
+        """node位于产生式右部期望symbol的位置，按推导链补回 symbol => ... => node.symbol 的节点"""
+        chain = self.unit_chains.get((symbol, node.symbol))
+        if chain is None:
+            return node
+        for left, production_str in reversed(chain):
+            node = ParseTreeNode(symbol=left, production=production_str, children=[node],
+                                 left_state=node.left_state, token_count=node.token_count)
+        return node
+    
     def get_root(self) -> Optional[ParseTreeNode]:
         """获取根节点"""
         if self.node_stack:
@@ -26,11 +26,11 @@ class PL0SemanticAnalyzer(SemanticAnalyzer):
             if symbols[1].value in ['+','-','*','/']:
                 # 二元运算: E -> E op T
                 left = symbols[0].value
-                op = symbols[1].name
+                op = symbols[1].value
                 right = symbols[2].value
                 
                 temp = self.new_temp()
-                self.emit(f"{temp} = {left} {op} {right}")
+                self.emit_quad(op, left, right, temp)
                 return temp
             elif "(" in prod_str:
                 return symbols[1].value
@@ -41,7 +41,7 @@ class PL0SemanticAnalyzer(SemanticAnalyzer):
                 # id := expression
                 var_name = symbols[0].value
                 expr_value = symbols[2].value
-                self.emit(f"{var_name} = {expr_value}")
+                self.emit_quad(':=', expr_value, None, var_name)
                 return None
         
         # 默认: 传递第一个符号的值
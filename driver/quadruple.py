@@ -0,0 +1,423 @@
+"""
+四元式中间表示
+三地址码以 (op, arg1, arg2, result) 四元式的形式按列存放在紧凑数组中，
+操作数统一驻留(intern)为整数编号，字符串形式仅在需要时才渲染
+"""
+
+import operator
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+# 操作码表: 数组中保存的是操作码在此表中的下标
+OPS = (
+    ':=',                                   # 复制: result := arg1
+    '+', '-', '*', '/',                     # 算术运算
+    '<', '<=', '>', '>=', '==', '!=',       # 关系运算(结果为0/1)
+    'uminus',                               # 取负: result := - arg1
+    'j',                                    # 无条件跳转: goto result
+    'j<', 'j<=', 'j>', 'j>=', 'j==', 'j!=', # 条件跳转: if arg1 relop arg2 goto result
+    'jnz',                                  # 条件跳转: if arg1 goto result
+    'label',                                # 标号: LABEL result
+    'text',                                 # 无法解析的三地址码文本，原样保存在result中
+)
+# 跳转目标(result)可以是标号名，也可以是指令编号(从1开始，与to_text的行号一致)
+OP_CODES: Dict[str, int] = {op: code for code, op in enumerate(OPS)}
+
+ARITH_OPS = frozenset(['+', '-', '*', '/'])
+RELOPS = frozenset(['<', '<=', '>', '>=', '==', '!='])
+BINARY_OPS = ARITH_OPS | RELOPS
+JUMP_OPS = frozenset(op for op in OPS if op.startswith('j'))
+
+# 跳转指令的操作码在OPS中是连续的一段
+_FIRST_JUMP = OP_CODES['j']
+_LAST_JUMP = OP_CODES['jnz']
+
+# 空操作数在数组中的编号
+NONE = -1
+
+# 临时变量名的前缀: new_temp()生成 %t1, %t2, ...
+# '%'不能出现在源程序的标识符中，所以用户变量(即使名为t1)不会被当作临时变量
+TEMP_PREFIX = '%t'
+
+
+def is_temp(name: Optional[str]) -> bool:
+    """判断操作数是否为临时变量(由new_temp生成，带保留前缀TEMP_PREFIX)"""
+    return name is not None and name.startswith(TEMP_PREFIX)
+
+
+def is_constant(name: Optional[str]) -> bool:
+    """判断操作数是否为整数常量"""
+    return name is not None and name.lstrip('-').isdigit()
+
+
+def _int_div(x: int, y: int) -> int:
+    """整数除法，向零取整(与C语言一致)"""
+    q = abs(x) // abs(y)
+    return q if (x >= 0) == (y >= 0) else -q
+
+
+# 二元运算的求值函数，关系运算结果为0/1；优化器和虚拟机共用同一套语义
+BINARY_FUNCS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': _int_div,
+    '<': lambda x, y: int(x < y),
+    '<=': lambda x, y: int(x <= y),
+    '>': lambda x, y: int(x > y),
+    '>=': lambda x, y: int(x >= y),
+    '==': lambda x, y: int(x == y),
+    '!=': lambda x, y: int(x != y),
+}
+
+
+def format_quadruple(op: str, arg1: Optional[str], arg2: Optional[str],
+                     result: Optional[str]) -> str:
+    """
+    将一条四元式渲染为三地址码文本
+
+    参数:
+        op: 操作符
+        arg1: 第一个操作数
+        arg2: 第二个操作数
+        result: 结果(跳转指令为目标标号或指令编号，None表示尚未回填)
+    返回: 三地址码字符串，如 "t1 := a + b"
+    """
+    if op in JUMP_OPS and result is None:
+        result = '_'
+    if op == ':=':
+        return f"{result} := {arg1}"
+    if op in BINARY_OPS:
+        return f"{result} := {arg1} {op} {arg2}"
+    if op == 'uminus':
+        return f"{result} := - {arg1}"
+    if op == 'j':
+        return f"goto {result}"
+    if op == 'jnz':
+        return f"if {arg1} goto {result}"
+    if op in JUMP_OPS:
+        return f"if {arg1} {op[1:]} {arg2} goto {result}"
+    if op == 'label':
+        return f"LABEL {result}"
+    if op == 'text':
+        return result
+    return f"({op}, {arg1}, {arg2}, {result})"
+
+
+def parse_three_address(code: str) -> 'Quadruple':
+    """
+    将三地址码文本解析为四元式(兼容旧的字符串emit接口)
+
+    支持的形式:
+        x := y          x := y op z         x := - y
+        goto L          if a relop b goto L if a goto L
+        LABEL L
+    赋值号既可以是 ':=' 也可以是 '='
+
+    参数:
+        code: 三地址码字符串
+    返回: Quadruple
+    """
+    parts = code.split()
+    n = len(parts)
+
+    if n == 2 and parts[0] == 'goto':
+        return Quadruple('j', None, None, parts[1])
+    if n == 2 and parts[0] == 'LABEL':
+        return Quadruple('label', None, None, parts[1].rstrip(':'))
+    if n == 4 and parts[0] == 'if' and parts[2] == 'goto':
+        return Quadruple('jnz', parts[1], None, parts[3])
+    if n == 6 and parts[0] == 'if' and parts[4] == 'goto' and parts[2] in RELOPS:
+        return Quadruple('j' + parts[2], parts[1], parts[3], parts[5])
+    if n >= 3 and parts[1] in (':=', '='):
+        if n == 3:
+            return Quadruple(':=', parts[2], None, parts[0])
+        if n == 4 and parts[2] == '-':
+            return Quadruple('uminus', parts[3], None, parts[0])
+        if n == 5 and parts[3] in BINARY_OPS:
+            return Quadruple(parts[3], parts[2], parts[4], parts[0])
+
+    raise ValueError(f"无法解析的三地址码: {code}")
+
+
+@dataclass(frozen=True)
+class Quadruple:
+    """
+    四元式 (op, arg1, arg2, result)
+
+    属性:
+        op: 操作符，取值见OPS
+        arg1: 第一个操作数(可为None)
+        arg2: 第二个操作数(可为None)
+        result: 结果变量，跳转指令中为目标标号
+    """
+    op: str
+    arg1: Optional[str] = None
+    arg2: Optional[str] = None
+    result: Optional[str] = None
+
+    def __str__(self):
+        return format_quadruple(self.op, self.arg1, self.arg2, self.result)
+
+
+class QuadrupleTable:
+    """
+    四元式表 (列存储)
+
+    每一列是一个紧凑的整数数组:
+        ops:     操作码 (OPS中的下标)
+        arg1s:   第一个操作数的驻留编号
+        arg2s:   第二个操作数的驻留编号
+        results: 结果的驻留编号
+    操作数字符串只在names中保存一份，编号为其下标；NONE(-1)表示空操作数
+
+    回填链: 尚未回填的跳转指令，其results列保存链表指针 -2 - next，
+    同一条链上的跳转首尾相连成环，链的句柄是链尾指令的下标(空链为NONE)，
+    因此merge只需交换两个指针(O(1))，backpatch沿环走一遍(O(k))，不需要额外的列表
+
+    对外表现为一个只读的字符串序列(len/下标/迭代得到渲染后的三地址码)，
+    因此原先把intermediate_code当作List[str]使用的代码无需修改
+    """
+
+    def __init__(self):
+        """初始化空的四元式表"""
+        self.ops = array('B')
+        self.arg1s = array('i')
+        self.arg2s = array('i')
+        self.results = array('i')
+
+        # 操作数驻留表
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+
+    def intern(self, name: Optional[str]) -> int:
+        """
+        驻留操作数，返回其编号
+
+        参数:
+            name: 操作数(变量名、常量或标号)，None表示空
+        返回: 操作数编号
+        """
+        if name is None:
+            return NONE
+        name = str(name)
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            name = sys.intern(name)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+        return name_id
+
+    def name(self, name_id: int) -> Optional[str]:
+        """根据编号取回操作数字符串"""
+        return self.names[name_id] if name_id != NONE else None
+
+    def emit(self, op: str, arg1: Optional[str] = None, arg2: Optional[str] = None,
+             result: Optional[str] = None) -> int:
+        """
+        追加一条四元式
+
+        参数:
+            op: 操作符
+            arg1: 第一个操作数
+            arg2: 第二个操作数
+            result: 结果
+        返回: 新指令的下标(从0开始)
+        """
+        if op not in OP_CODES:
+            raise ValueError(f"未知的四元式操作符: {op}")
+        self.ops.append(OP_CODES[op])
+        self.arg1s.append(self.intern(arg1))
+        self.arg2s.append(self.intern(arg2))
+        self.results.append(self.intern(result))
+        return len(self.ops) - 1
+
+    def append(self, code) -> int:
+        """
+        追加一条指令，接受Quadruple或三地址码字符串
+        无法解析的文本(如 "param x"、"call f")不报错，作为不透明的'text'指令原样保存
+
+        参数:
+            code: Quadruple对象或三地址码文本
+        返回: 新指令的下标
+        """
+        if not isinstance(code, Quadruple):
+            try:
+                code = parse_three_address(code)
+            except ValueError:
+                return self.emit('text', result=code)
+        return self.emit(code.op, code.arg1, code.arg2, code.result)
+
+    def op(self, index: int) -> str:
+        """获取第index条指令的操作符"""
+        return OPS[self.ops[index]]
+
+    def quad(self, index: int) -> Quadruple:
+        """获取第index条指令的四元式视图"""
+        names = self.names
+        a1, a2, r = self.arg1s[index], self.arg2s[index], self.results[index]
+        return Quadruple(OPS[self.ops[index]],
+                         names[a1] if a1 != NONE else None,
+                         names[a2] if a2 != NONE else None,
+                         names[r] if r >= 0 else None)
+
+    def quads(self) -> Iterator[Quadruple]:
+        """按顺序遍历所有四元式"""
+        for i in range(len(self.ops)):
+            yield self.quad(i)
+
+    # ------------------------------------------------------------------
+    # 回填
+    # ------------------------------------------------------------------
+
+    def emit_jump(self, op: str, arg1: Optional[str] = None, arg2: Optional[str] = None) -> int:
+        """
+        追加一条目标待回填的跳转指令，它自成一条只含自身的回填链
+
+        参数:
+            op: 跳转操作符，如 'j', 'j<', 'jnz'
+            arg1: 第一个操作数
+            arg2: 第二个操作数
+        返回: 新指令的下标(同时也是该回填链的句柄)
+        """
+        if op not in JUMP_OPS:
+            raise ValueError(f"不是跳转操作符: {op}")
+        index = self.emit(op, arg1, arg2)
+        return self.makelist(index)
+
+    def _next_unfilled(self, index: int) -> int:
+        """回填链中index的后继下标"""
+        link = self.results[index]
+        if link > NONE or self.ops[index] < _FIRST_JUMP or self.ops[index] > _LAST_JUMP:
+            raise ValueError(f"第{index + 1}条指令不是待回填的跳转指令")
+        return -2 - link if link != NONE else index
+
+    def makelist(self, index: int) -> int:
+        """
+        创建只含跳转指令index的回填链
+
+        参数:
+            index: 待回填的跳转指令下标
+        返回: 链句柄
+        """
+        self._next_unfilled(index)
+        self.results[index] = -2 - index
+        return index
+
+    def merge(self, list1: int, list2: int) -> int:
+        """
+        合并两条回填链(O(1)，参数链随之失效)
+
+        参数:
+            list1, list2: 链句柄，NONE表示空链
+        返回: 合并后的链句柄，回填顺序为list1中的指令在前
+        """
+        if list1 == NONE:
+            return list2
+        if list2 == NONE:
+            return list1
+        head1 = self._next_unfilled(list1)
+        head2 = self._next_unfilled(list2)
+        self.results[list1] = -2 - head2
+        self.results[list2] = -2 - head1
+        return list2
+
+    def backpatch(self, jump_list: int, target: int):
+        """
+        将回填链上所有跳转指令的目标填为target
+
+        参数:
+            jump_list: 链句柄，NONE表示空链
+            target: 目标指令下标(从0开始，可以等于len(self)表示跳到程序末尾)
+        """
+        if jump_list == NONE:
+            return
+        target_id = self.intern(str(target + 1))
+        results = self.results
+        index = self._next_unfilled(jump_list)
+        while True:
+            following = -2 - results[index]
+            results[index] = target_id
+            if index == jump_list:
+                break
+            index = following
+
+    def jump_targets(self) -> List[int]:
+        """
+        解析所有跳转目标: 标号名查标号表，指令编号直接换算为下标
+
+        返回: 与指令一一对应的列表，跳转指令为目标指令下标，其余为NONE
+        """
+        n = len(self.ops)
+        labels: Dict[int, int] = {}
+        label_code = OP_CODES['label']
+        for i, op in enumerate(self.ops):
+            if op == label_code:
+                labels[self.results[i]] = i
+
+        targets = [NONE] * n
+        for i, op in enumerate(self.ops):
+            if _FIRST_JUMP <= op <= _LAST_JUMP:
+                r = self.results[i]
+                if r < 0:
+                    raise ValueError(f"第{i + 1}条指令的跳转目标尚未回填")
+                target = labels.get(r)
+                if target is None:
+                    name = self.names[r]
+                    if not name.isdigit() or not 1 <= int(name) <= n + 1:
+                        raise ValueError(f"第{i + 1}条指令跳转到未定义的标号: {name}")
+                    target = int(name) - 1
+                targets[i] = target
+        return targets
+
+    def render(self, index: int) -> str:
+        """渲染第index条指令为三地址码文本"""
+        q = self.quad(index)
+        return format_quadruple(q.op, q.arg1, q.arg2, q.result)
+
+    def to_text(self, start: int = 1) -> str:
+        """
+        渲染整张表，每行格式与generated/*_ir.txt一致: "  1: x := 10"
+
+        参数:
+            start: 起始行号
+        返回: 多行文本(以换行结尾)
+        """
+        return ''.join(f"{i + start:3d}: {self.render(i)}\n" for i in range(len(self.ops)))
+
+    def write(self, filename: str):
+        """一次性将整张表写入文件"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.to_text())
+
+    def clear(self):
+        """清空四元式表"""
+        del self.ops[:]
+        del self.arg1s[:]
+        del self.arg2s[:]
+        del self.results[:]
+        self.names.clear()
+        self.name_ids.clear()
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.render(i) for i in range(*index.indices(len(self.ops)))]
+        if index < 0:
+            index += len(self.ops)
+        if not 0 <= index < len(self.ops):
+            raise IndexError("四元式下标越界")
+        return self.render(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self.ops)):
+            yield self.render(i)
+
+    def __repr__(self):
+        return f"QuadrupleTable({len(self.ops)}条指令, {len(self.names)}个操作数)"
@@ -2,9 +2,17 @@
 语义分析器基类
 """
 
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Any, Optional
 from syntax.grammar import Production
+from utils.logger import Logger
 from .symbol import Symbol
+from .quadruple import QuadrupleTable, TEMP_PREFIX
+from .symbol_table import ScopedSymbolTable
+from .optimizer import IROptimizer
+
+
+logger = Logger.get(__name__)
 
 
 class SemanticAnalyzer:
@@ -19,37 +27,101 @@ class SemanticAnalyzer:
     
     def __init__(self):
         """初始化语义分析器"""
-        # 符号表: {变量名: 类型/值}
-        self.symbol_table: Dict[str, Any] = {}
+        # 符号表: {变量名: 类型/值}，支持嵌套作用域
+        self.symbol_table: ScopedSymbolTable = ScopedSymbolTable()
 
         self.nextinstr = 0
         
         # 临时变量计数器
         self.temp_counter = 0
         
-        # 三地址码序列
-        self.intermediate_code: List[str] = []
+        # 三地址码序列(四元式表，按列存储，可当作字符串序列使用)
+        self.intermediate_code: QuadrupleTable = QuadrupleTable()
     
     def new_temp(self) -> str:
         """
         生成新的临时变量
         
-        返回: 临时变量名，如t1, t2, ...
+        返回: 临时变量名，如%t1, %t2, ...(带保留前缀，不会与源程序中的变量重名)
         """
         self.temp_counter += 1
-        return f"t{self.temp_counter}"
+        return f"{TEMP_PREFIX}{self.temp_counter}"
     
     def emit(self, code: str):
         """
-        生成一条三地址码
+        生成一条三地址码(字符串形式，解析后存入四元式表)
         
         参数:
             code: 三地址码语句
         """
         self.intermediate_code.append(code)
         self.nextinstr += 1
-        print(f"     [生成代码] {code}")
+        logger.debug("     [生成代码] %s", code)
     
+    def emit_quad(self, op: str, arg1: Optional[str] = None, arg2: Optional[str] = None,
+                  result: Optional[str] = None) -> int:
+        """
+        生成一条四元式
+        
+        参数:
+            op: 操作符，如 '+', ':=', 'j<'
+            arg1: 第一个操作数
+            arg2: 第二个操作数
+            result: 结果变量或跳转目标
+        返回: 新指令的下标
+        """
+        index = self.intermediate_code.emit(op, arg1, arg2, result)
+        self.nextinstr += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("     [生成代码] %s", self.intermediate_code.render(index))
+        return index
+    
+    def emit_jump(self, op: str, arg1: Optional[str] = None, arg2: Optional[str] = None) -> int:
+        """
+        生成一条目标待回填的跳转指令
+
+        参数:
+            op: 跳转操作符，如 'j', 'j<'
+            arg1: 第一个操作数
+            arg2: 第二个操作数
+        返回: 只含该指令的回填链(可直接作为truelist/falselist/nextlist)
+        """
+        jump_list = self.intermediate_code.emit_jump(op, arg1, arg2)
+        self.nextinstr += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("     [生成代码] %s", self.intermediate_code.render(jump_list))
+        return jump_list
+
+    def makelist(self, index: int) -> int:
+        """
+        创建只含跳转指令index的回填链
+
+        参数:
+            index: 待回填跳转指令的下标
+        返回: 链句柄
+        """
+        return self.intermediate_code.makelist(index)
+
+    def merge(self, list1: int, list2: int) -> int:
+        """
+        合并两条回填链(O(1))
+
+        参数:
+            list1, list2: 链句柄，NONE(-1)表示空链
+        返回: 合并后的链句柄
+        """
+        return self.intermediate_code.merge(list1, list2)
+
+    def backpatch(self, jump_list: int, target: int):
+        """
+        回填: 将链上所有跳转指令的目标填为target
+
+        参数:
+            jump_list: 链句柄
+            target: 目标指令下标(通常取某个时刻的nextinstr)
+        """
+        self.intermediate_code.backpatch(jump_list, target)
+
     def add_symbol(self, name: str, type_or_value: Any):
         """
         向符号表添加符号
@@ -59,7 +131,17 @@ class SemanticAnalyzer:
             type_or_value: 类型或值
         """
         self.symbol_table[name] = type_or_value
-        print(f"      [符号表] 添加: {name} = {type_or_value}")
+        logger.debug("      [符号表] 添加: %s = %s", name, type_or_value)
+    
+    def enter_scope(self):
+        """进入新的作用域(如复合语句块)"""
+        self.symbol_table.enter_scope()
+        logger.debug("      [符号表] 进入作用域，层级: %d", self.symbol_table.level)
+    
+    def exit_scope(self):
+        """退出当前作用域，撤销其中声明的符号"""
+        names = self.symbol_table.exit_scope()
+        logger.debug("      [符号表] 退出作用域，移除: %s", names)
     
     def lookup_symbol(self, name: str) -> Optional[Any]:
         """
@@ -71,6 +153,15 @@ class SemanticAnalyzer:
         """
         return self.symbol_table.get(name)
     
+    def on_shift(self, symbol: Symbol):
+        """
+        移进终结符时的回调 - 子类可重写(如遇到 '{' 时进入作用域)
+        
+        参数:
+            symbol: 被移进的终结符
+        """
+        pass
+    
     def semantic_action(self, production: Production, symbols: List[Symbol]) -> Any:
         """
         语义动作处理函数 - 子类应重写此方法
@@ -85,10 +176,23 @@ class SemanticAnalyzer:
         # 默认实现: 什么都不做
         return None
     
-    def get_code(self) -> List[str]:
-        """获取生成的中间代码"""
+    def get_code(self) -> QuadrupleTable:
+        """获取生成的中间代码(四元式表)"""
         return self.intermediate_code
     
+    def optimize_code(self, passes: Optional[List[str]] = None) -> IROptimizer:
+        """
+        对已生成的中间代码执行优化(应在分析结束后调用)
+        
+        参数:
+            passes: 优化遍名称列表，默认执行IROptimizer.PASSES
+        返回: 优化器对象(其stats记录了每一遍的指令数和耗时)
+        """
+        optimizer = IROptimizer(passes)
+        self.intermediate_code = optimizer.optimize(self.intermediate_code)
+        self.nextinstr = len(self.intermediate_code)
+        return optimizer
+    
     def print_symbol_table(self):
         """打印符号表"""
         print("\n=== 符号表 ===")
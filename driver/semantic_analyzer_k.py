@@ -2,7 +2,12 @@ from typing import List, Any
 
 from driver.semantic_analyzer import SemanticAnalyzer
 from driver import Symbol
+from driver.quadruple import NONE
 from syntax import Production
+from utils.logger import Logger
+
+
+logger = Logger.get(__name__)
 
 
 class MySemanticAnalyzer(SemanticAnalyzer):
@@ -34,14 +39,31 @@ class MySemanticAnalyzer(SemanticAnalyzer):
         E -> E + T | E - T | T
         T -> T * F | T / F | F
         F -> ( E ) | id | num
+
+        控制流文法(configs/grammar_control_flow.json)另外使用回填生成跳转代码:
+        P -> L
+        L -> L M S | S
+        S -> MS | US                      (MS/US: if-else已配对/未配对的语句)
+        MS -> if ( B ) M MS N else M MS | while M ( B ) M MS | { L } | ...
+        US -> if ( B ) M S | if ( B ) M MS N else M US | while M ( B ) M US
+        B -> B || M BT | BT
+        BT -> BT && M BF | BF
+        BF -> ! BF | ( B ) | E rel E | true | false
+        M -> ε
+        N -> ε
         """
-        prod_name = str(production)
-        print(f"    [语义动作] 处理产生式：{prod_name}")
+        logger.debug("    [语义动作] 处理产生式：%s", production)
         left = production.left
         if left == 'P':
             return self.handle_program(production, symbols)
-        elif left == 'S':
+        elif left == 'L':
+            return self.handle_statement_list(production, symbols)
+        elif left in ('S', 'MS', 'US'):
             return self.handle_statement(production, symbols)
+        elif left in ('B', 'BT', 'BF'):
+            return self.handle_boolean(production, symbols)
+        elif left in ('M', 'N'):
+            return self.handle_marker(production, symbols)
         elif left == 'E':
             return self.handle_expression(production, symbols)
         elif left == 'T':
@@ -50,25 +72,44 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             return self.handle_factor(production, symbols)
 
         else:
-            print(f"    [错误] 无效的产生式左部：{left}")
+            logger.error("    [错误] 无效的产生式左部：%s", left)
             return None
 
     def handle_program(self, production: Production, symbols: List[Symbol]) -> Any:
+        if len(symbols) == 1 and symbols[0].name == 'L': # P -> L
+            # 程序末尾: 所有尚未确定去向的跳转都跳到程序结束处
+            self.backpatch(self.nextlist(symbols[0]), self.nextinstr)
+            return True
         if len(symbols) == 2: # P -> S P
             return True
         if len(symbols) == 1: # P-> S
             return True
         elif (len(symbols) == 0) or symbols[0] == 'ε': # P -> ε
             if self.block_level > 0:
-                print(f"程序结束，但仍有{self.block_level}给未关闭的复合语句块")
+                logger.warning("程序结束，但仍有%s给未关闭的复合语句块", self.block_level)
             return None
 
+    def on_shift(self, symbol: Symbol):
+        """移进 '{' 时进入新的作用域，块内声明在对应的 S -> { P } 归约时撤销"""
+        if symbol.name == '{':
+            self.block_level += 1
+            self.enter_scope()
+            logger.debug("    [语义操作] 进入复合语句块，层级：%s", self.block_level)
+
     def handle_statement(self, production: Production, symbols: List[Symbol]) -> Any:
         prod_str = str(production)
 
-        #if len(symbols) == 3 and str(symbols[0]) == '{' and str(symbols[2]) == '}':
-        #    self.block_level += 1
-        #    print(f"[语义操作] 进入复合语句块，层级：{self.block_level}")
+        if len(symbols) == 3 and symbols[0].name == '{': # S -> { P }
+            self.exit_scope()
+            self.block_level -= 1
+            logger.debug("    [语义操作] 退出复合语句块，层级：%s", self.block_level)
+            return {"nextlist": self.nextlist(symbols[1])}
+
+        if len(symbols) == 1 and symbols[0].name in ('MS', 'US'): # S -> MS | US
+            return {"nextlist": self.nextlist(symbols[0])}
+
+        if symbols and symbols[0].name in ('if', 'while'):
+            return self.handle_control(production, symbols)
 
         if "int id" in prod_str: # S -> int id ;
             type_token = symbols[0]
@@ -77,12 +118,17 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             var_type = str(type_token.value)  # 'int'
             var_name = str(id_sym.value)
 
-            if var_name in self.symbol_table:
-                print(f"    [语义错误] 变量 '{var_name}' 重复声明")
+            if self.symbol_table.declared_in_current_scope(var_name):
+                logger.error("    [语义错误] 变量 '%s' 重复声明", var_name)
                 return None
 
-            self.add_symbol(var_name, {"type": var_type, "initialized": False})
-            print(f"    [语义] 声明变量: {var_name} : {var_type}")
+            # 遮蔽外层同名变量时，中间代码中使用带层级后缀的名字加以区分
+            ir_name = var_name
+            if var_name in self.symbol_table:
+                ir_name = f"{var_name}.{self.symbol_table.level}"
+
+            self.add_symbol(var_name, {"type": var_type, "initialized": False, "ir_name": ir_name})
+            logger.debug("    [语义] 声明变量: %s : %s", var_name, var_type)
             return True
 
         elif ":=" in prod_str: # S -> id := E ;
@@ -92,7 +138,7 @@ class MySemanticAnalyzer(SemanticAnalyzer):
 
             # 检查变量是否声明
             if var_name not in self.symbol_table:
-                print(f"    [语义错误] 变量 '{var_name}' 未声明")
+                logger.error("    [语义错误] 变量 '%s' 未声明", var_name)
                 return None
 
             # 获取变量类型
@@ -100,28 +146,30 @@ class MySemanticAnalyzer(SemanticAnalyzer):
 
             # 检查表达式是否有属性
             if not expr_attr or "type" not in expr_attr:
-                print(f"    [语义错误] 表达式属性缺失")
+                logger.error("    [语义错误] 表达式属性缺失")
                 return None
 
             # 检查类型匹配
             if var_info["type"] != expr_attr["type"]:
-                print(f"    [语义错误] 类型不匹配: 不能将 {expr_attr['type']} 赋值给 {var_info['type']} 变量 {var_name}")
+                logger.error("    [语义错误] 类型不匹配: 不能将 %s 赋值给 %s 变量 %s",
+                             expr_attr['type'], var_info['type'], var_name)
                 return None
 
             # 生成中间代码
+            ir_name = var_info.get("ir_name", var_name)
             if expr_attr.get("temp"):
                 # 表达式结果在临时变量中
-                self.emit(f"{var_name} := {expr_attr['temp']}")
+                self.emit_quad(':=', expr_attr['temp'], None, ir_name)
             else:
                 # 表达式是常量或变量
-                self.emit(f"{var_name} := {expr_attr['value']}")
+                self.emit_quad(':=', expr_attr['value'], None, ir_name)
 
             # 标记变量已初始化
             var_info["initialized"] = True
             if expr_attr.get("temp"):
-                print(f"    [语义] 赋值: {var_name} := {expr_attr.get('temp')}")
+                logger.debug("    [语义] 赋值: %s := %s", var_name, expr_attr.get('temp'))
             else:
-                print(f"    [语义] 赋值: {var_name} := {expr_attr.get('value')}")
+                logger.debug("    [语义] 赋值: %s := %s", var_name, expr_attr.get('value'))
             return True
 
         else:  # S → E ;
@@ -130,7 +178,7 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             if expr_attr and "temp" in expr_attr:
                 # 表达式有结果，生成中间代码
                 temp_var = expr_attr["temp"]
-                print(f"    [语义] 表达式语句，结果在 {temp_var}")
+                logger.debug("    [语义] 表达式语句，结果在 %s", temp_var)
             return True
 
 
@@ -138,6 +186,105 @@ class MySemanticAnalyzer(SemanticAnalyzer):
 
 
 
+    @staticmethod
+    def nextlist(symbol: Symbol) -> int:
+        """语句的nextlist属性(不含跳转的语句为空链)"""
+        return symbol.attributes.get("nextlist", NONE)
+
+    def handle_statement_list(self, production: Production, symbols: List[Symbol]) -> Any:
+        """处理语句序列: L → L M S | S"""
+        if len(symbols) == 3:  # L → L1 M S: L1之后的跳转都转到S的第一条指令
+            self.backpatch(self.nextlist(symbols[0]), symbols[1].attributes["instr"])
+            return {"nextlist": self.nextlist(symbols[2])}
+        return {"nextlist": self.nextlist(symbols[0])}
+
+    def handle_control(self, production: Production, symbols: List[Symbol]) -> Any:
+        """
+        处理控制语句(回填):
+            if ( B ) M S
+            if ( B ) M1 S1 N else M2 S2
+            while M1 ( B ) M2 S
+        """
+        if symbols[0].name == 'while':
+            begin = symbols[1].attributes["instr"]
+            cond = symbols[3].attributes
+            body = symbols[6]
+            self.backpatch(self.nextlist(body), begin)
+            self.backpatch(cond["truelist"], symbols[5].attributes["instr"])
+            # 循环体结束后跳回条件判断
+            self.backpatch(self.emit_jump('j'), begin)
+            logger.debug("    [语义] while循环: 条件从第%s条指令开始", begin + 1)
+            return {"nextlist": cond["falselist"]}
+
+        cond = symbols[2].attributes
+        self.backpatch(cond["truelist"], symbols[4].attributes["instr"])
+        if len(symbols) == 6:  # if ( B ) M S
+            logger.debug("    [语义] if语句")
+            return {"nextlist": self.merge(cond["falselist"], self.nextlist(symbols[5]))}
+
+        # if ( B ) M1 S1 N else M2 S2
+        self.backpatch(cond["falselist"], symbols[8].attributes["instr"])
+        nextlist = self.merge(self.nextlist(symbols[5]), symbols[6].attributes["nextlist"])
+        logger.debug("    [语义] if-else语句")
+        return {"nextlist": self.merge(nextlist, self.nextlist(symbols[9]))}
+
+    def handle_boolean(self, production: Production, symbols: List[Symbol]) -> Any:
+        """
+        处理布尔表达式(回填): 综合属性为truelist/falselist
+            B → B1 || M BT      BT → BT1 && M BF
+            BF → ! BF1 | ( B ) | E1 rel E2 | true | false
+        """
+        if len(symbols) == 1:
+            name = symbols[0].name
+            if name == 'true':
+                return {"truelist": self.emit_jump('j'), "falselist": NONE}
+            if name == 'false':
+                return {"truelist": NONE, "falselist": self.emit_jump('j')}
+            return symbols[0].attributes  # B → BT, BT → BF
+
+        if len(symbols) == 2:  # BF → ! BF1: 交换真假出口
+            attr = symbols[1].attributes
+            return {"truelist": attr["falselist"], "falselist": attr["truelist"]}
+
+        if symbols[0].name == '(':  # BF → ( B )
+            return symbols[1].attributes
+
+        if symbols[1].name == 'rel':  # BF → E1 rel E2
+            left_attr, right_attr = symbols[0].attributes, symbols[2].attributes
+            if not left_attr or not right_attr:
+                logger.error("    [语义错误] 关系运算的操作数属性缺失")
+                return None
+            if left_attr["type"] != "int" or right_attr["type"] != "int":
+                logger.error("    [语义错误] 关系运算要求int类型")
+                return None
+            left_val = left_attr.get("temp") or left_attr.get("value")
+            right_val = right_attr.get("temp") or right_attr.get("value")
+            relop = symbols[1].value
+            truelist = self.emit_jump('j' + relop, left_val, right_val)
+            falselist = self.emit_jump('j')
+            logger.debug("    [语义] 关系运算: %s %s %s", left_val, relop, right_val)
+            return {"truelist": truelist, "falselist": falselist}
+
+        left, instr, right = symbols[0].attributes, symbols[2].attributes["instr"], symbols[3].attributes
+        if symbols[1].name == '||':  # B → B1 || M BT: B1为假时才计算BT
+            self.backpatch(left["falselist"], instr)
+            return {"truelist": self.merge(left["truelist"], right["truelist"]),
+                    "falselist": right["falselist"]}
+        # BT → BT1 && M BF: BT1为真时才计算BF
+        self.backpatch(left["truelist"], instr)
+        return {"truelist": right["truelist"],
+                "falselist": self.merge(left["falselist"], right["falselist"])}
+
+    def handle_marker(self, production: Production, symbols: List[Symbol]) -> Any:
+        """
+        处理标记非终结符:
+            M → ε  记录下一条指令的位置
+            N → ε  生成跳过else分支的goto
+        """
+        if production.left == 'M':
+            return {"instr": self.nextinstr}
+        return {"nextlist": self.emit_jump('j')}
+
     def handle_expression(self, production: Production, symbols: List[Symbol]) -> Any:
         """处理表达式: E → E + T | E - T | T"""
         prod_str = str(production)
@@ -151,14 +298,15 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             right_attr = symbols[2].attributes
             # 检查属性是否存在
             if not left_attr or "type" not in left_attr:
-                print(f"    [语义错误] 左操作数属性缺失")
+                logger.error("    [语义错误] 左操作数属性缺失")
                 return None
             if not right_attr or "type" not in right_attr:
-                print(f"    [语义错误] 右操作数属性缺失")
+                logger.error("    [语义错误] 右操作数属性缺失")
                 return None
             # 检查类型
             if left_attr["type"] != "int" or right_attr["type"] != "int":
-                print(f"    [语义错误] 算术运算要求int类型，得到 {left_attr['type']} {op} {right_attr['type']}")
+                logger.error("    [语义错误] 算术运算要求int类型，得到 %s %s %s",
+                             left_attr['type'], op, right_attr['type'])
                 return None
 
             # 生成临时变量和中间代码
@@ -167,12 +315,12 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             left_val = left_attr.get("temp") or left_attr.get("value")
             right_val = right_attr.get("temp") or right_attr.get("value")
 
-            self.emit(f"{temp_var} := {left_val} {op} {right_val}")
+            self.emit_quad(op, left_val, right_val, temp_var)
 
             # 记录临时变量类型
             self.temp_vars[temp_var] = "int"
 
-            print(f"    [语义] 生成算术运算: {temp_var} = {left_val} {op} {right_val}")
+            logger.debug("    [语义] 生成算术运算: %s = %s %s %s", temp_var, left_val, op, right_val)
 
             return {
                 "type": "int",
@@ -195,14 +343,15 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             right_attr = symbols[2].attributes
             # 检查属性是否存在
             if not left_attr or "type" not in left_attr:
-                print(f"    [语义错误] 左操作数属性缺失")
+                logger.error("    [语义错误] 左操作数属性缺失")
                 return None
             if not right_attr or "type" not in right_attr:
-                print(f"    [语义错误] 右操作数属性缺失")
+                logger.error("    [语义错误] 右操作数属性缺失")
                 return None
             # 检查类型
             if left_attr["type"] != "int" or right_attr["type"] != "int":
-                print(f"    [语义错误] 算术运算要求int类型，得到 {left_attr['type']} {op} {right_attr['type']}")
+                logger.error("    [语义错误] 算术运算要求int类型，得到 %s %s %s",
+                             left_attr['type'], op, right_attr['type'])
                 return None
 
 
@@ -212,12 +361,12 @@ class MySemanticAnalyzer(SemanticAnalyzer):
             left_val = left_attr.get("temp") or left_attr.get("value")
             right_val = right_attr.get("temp") or right_attr.get("value")
 
-            self.emit(f"{temp_var} := {left_val} {op} {right_val}")
+            self.emit_quad(op, left_val, right_val, temp_var)
 
             # 记录临时变量类型
             self.temp_vars[temp_var] = "int"
 
-            print(f"    [语义] 生成项运算: {temp_var} = {left_val} {op} {right_val}")
+            logger.debug("    [语义] 生成项运算: %s = %s %s %s", temp_var, left_val, op, right_val)
 
             return {
                 "type": "int",
@@ -251,18 +400,18 @@ class MySemanticAnalyzer(SemanticAnalyzer):
 
                 # 检查变量是否声明
                 if var_name not in self.symbol_table:
-                    print(f"    [语义错误] 变量 '{var_name}' 未声明")
+                    logger.error("    [语义错误] 变量 '%s' 未声明", var_name)
                     return None
 
                 # 检查变量是否初始化
                 var_info = self.symbol_table[var_name]
                 if not var_info["initialized"]:
-                    print(f"    [语义错误] 变量 '{var_name}' 可能未初始化")
+                    logger.error("    [语义错误] 变量 '%s' 可能未初始化", var_name)
                     return None
 
                 return {
                     "type": var_info["type"],
-                    "value": var_name,
+                    "value": var_info.get("ir_name", var_name),
                     "temp": None
                 }
 
@@ -2,23 +2,45 @@
 符号类定义
 """
 
-from typing import Any, Dict
-from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 
-@dataclass
 class Symbol:
     """
     符号类: 用于分析栈中的符号
     
+    使用__slots__；附加属性字典在第一次访问attributes时才创建
+    (移进的终结符通常没有附加属性，不必为每个token分配一个空字典)
+    
     属性:
         name: 符号名称
         value: 符号的语义值(用于语义分析)
         attributes: 附加属性字典
     """
-    name: str
-    value: Any = None
-    attributes: Dict[str, Any] = field(default_factory=dict)
+    __slots__ = ('name', 'value', '_attributes')
+    
+    def __init__(self, name: str, value: Any = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.value = value
+        self._attributes = attributes
+    
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        if self._attributes is None:
+            self._attributes = {}
+        return self._attributes
+    
+    @attributes.setter
+    def attributes(self, attributes: Dict[str, Any]):
+        self._attributes = attributes
+    
+    def __eq__(self, other):
+        if not isinstance(other, Symbol):
+            return NotImplemented
+        return (self.name == other.name and self.value == other.value
+                and (self._attributes or {}) == (other._attributes or {}))
+    
+    __hash__ = None
     
     def __repr__(self):
         return f"Symbol({self.name}, {self.value})"
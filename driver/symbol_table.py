@@ -0,0 +1,137 @@
+"""
+作用域符号表
+名字 -> 声明栈 的散列表，加上每个作用域的撤销日志:
+- 查找只看栈顶: O(1)
+- 进入作用域只压入一个空日志: O(1)
+- 退出作用域按日志弹出本作用域声明的k个名字: O(k)，不需要复制整张表
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class ScopedSymbolTable:
+    """
+    作用域符号表
+
+    对外表现为当前可见符号的字典(in / [] / get / items / len)，
+    因此原先把symbol_table当作dict使用的代码无需修改；
+    对 table[name] = value 赋值等价于在当前作用域声明(或重新声明)name
+    """
+
+    def __init__(self):
+        """初始化符号表，只有全局作用域(层级0)"""
+        # 名字 -> [(声明所在层级, 值), ...]，栈顶为当前可见的声明
+        self._entries: Dict[str, List[Tuple[int, Any]]] = {}
+
+        # 撤销日志: 每个作用域中声明的名字
+        self._scopes: List[List[str]] = [[]]
+
+    @property
+    def level(self) -> int:
+        """当前作用域层级(全局为0)"""
+        return len(self._scopes) - 1
+
+    def enter_scope(self):
+        """进入新的作用域"""
+        self._scopes.append([])
+
+    def exit_scope(self) -> List[str]:
+        """
+        退出当前作用域，撤销其中的全部声明
+
+        返回: 本作用域声明过的名字(按声明顺序)
+        """
+        if len(self._scopes) == 1:
+            raise RuntimeError("不能退出全局作用域")
+        names = self._scopes.pop()
+        entries = self._entries
+        for name in reversed(names):
+            stack = entries[name]
+            stack.pop()
+            if not stack:
+                del entries[name]
+        return names
+
+    def declare(self, name: str, value: Any):
+        """
+        在当前作用域声明符号，本作用域已有同名声明时覆盖其值
+
+        参数:
+            name: 符号名
+            value: 类型或属性
+        """
+        name = sys.intern(name)
+        level = self.level
+        stack = self._entries.get(name)
+        if stack is None:
+            self._entries[name] = [(level, value)]
+        elif stack[-1][0] == level:
+            stack[-1] = (level, value)
+            return
+        else:
+            stack.append((level, value))
+        self._scopes[-1].append(name)
+
+    def lookup(self, name: str) -> Optional[Any]:
+        """
+        查找当前可见的声明(内层遮蔽外层)
+
+        参数:
+            name: 符号名
+        返回: 符号的值，未声明时返回None
+        """
+        stack = self._entries.get(name)
+        return stack[-1][1] if stack else None
+
+    def declared_in_current_scope(self, name: str) -> bool:
+        """判断name是否已在当前作用域中声明(用于重复声明检查)"""
+        stack = self._entries.get(name)
+        return bool(stack) and stack[-1][0] == self.level
+
+    def scope_of(self, name: str) -> Optional[int]:
+        """返回当前可见的name声明所在的层级，未声明时返回None"""
+        stack = self._entries.get(name)
+        return stack[-1][0] if stack else None
+
+    def clear(self):
+        """清空符号表，回到全局作用域"""
+        self._entries.clear()
+        self._scopes = [[]]
+
+    # ------------------------------------------------------------------
+    # dict兼容接口
+    # ------------------------------------------------------------------
+
+    def get(self, name: str, default: Any = None) -> Any:
+        stack = self._entries.get(name)
+        return stack[-1][1] if stack else default
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for name, stack in self._entries.items():
+            yield name, stack[-1][1]
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def values(self) -> Iterator[Any]:
+        for stack in self._entries.values():
+            yield stack[-1][1]
+
+    def __contains__(self, name) -> bool:
+        return name in self._entries
+
+    def __getitem__(self, name: str) -> Any:
+        return self._entries[name][-1][1]
+
+    def __setitem__(self, name: str, value: Any):
+        self.declare(name, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"ScopedSymbolTable(层级{self.level}, {len(self._entries)}个可见符号)"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+独立分析器生成脚本
+根据文法配置生成词法表和LALR(1)分析表，输出一个不依赖本项目的Python模块
+
+用法:
+    python generate_parser.py <文法配置文件> <输出模块.py>
+
+示例:
+    python generate_parser.py configs/grammar_control_flow.json generated/control_flow_parser.py
+"""
+
+import sys
+import os
+import io
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lexical import LexicalGenerator
+from syntax import ParserGenerator, ParserModuleGenerator
+from utils.config_loader import ConfigLoader
+
+
+def main():
+    """主函数"""
+    if len(sys.argv) != 3:
+        print(__doc__)
+        return 1
+
+    config_path, output_path = sys.argv[1], sys.argv[2]
+    loader = ConfigLoader(os.path.dirname(os.path.abspath(config_path)))
+    config = loader.load(os.path.basename(config_path))
+
+    print(f"[文法名称] {config.name}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        table, accepting_map = LexicalGenerator().build(config.lexical_rules)
+        grammar = config.to_grammar()
+        action_table, goto_table = ParserGenerator(grammar).generate()
+
+    generator = ParserModuleGenerator(grammar, action_table, goto_table, table, accepting_map)
+    source = generator.write(output_path, title=f"{config.name} - LALR(1)分析器")
+
+    print(f"[已生成] {output_path} ({len(source)} 字节)")
+    print(f"   - 产生式数: {len(grammar.productions)}")
+    print(f"   - ACTION表项: {len(action_table)}, GOTO表项: {len(goto_table)}")
+    print(f"   - DFA状态数: {len(table)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
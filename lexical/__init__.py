@@ -1,11 +1,39 @@
 """
 词法分析模块
+
+子模块在第一次访问对应属性时才导入(PEP 562)，只使用Scanner时不会导入生成器
 """
 
-from .state import State
-from .nfa import NFA
-from .dfa import DFA
-from .generator import LexicalGenerator
-from .scanner import Scanner
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .state import State
+    from .nfa import NFA
+    from .dfa import DFA
+    from .generator import LexicalGenerator
+    from .scanner import Scanner
+
+# 导出名 -> 所在子模块
+_EXPORTS = {
+    'State': '.state',
+    'NFA': '.nfa',
+    'DFA': '.dfa',
+    'LexicalGenerator': '.generator',
+    'Scanner': '.scanner',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['State', 'NFA', 'DFA', 'LexicalGenerator', 'Scanner']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,7 +2,9 @@
 词法分析生成器主类
 """
 
-from typing import Tuple, Dict, Set
+from typing import Tuple, Dict, Set, Optional
+from utils.logger import Logger
+from utils.metrics import Metrics, timed
 from .state import State
 from .thompson import ThompsonConstructor
 from .subset_construction import SubsetConstructor
@@ -10,14 +12,23 @@ from .minimization import DFAMinimizer
 from .regex_parser import RegexParser
 
 
+logger = Logger.get(__name__)
+
+
 class   LexicalGenerator:
     """
     词法分析生成器
     负责将正则表达式转换为最小化的DFA，并生成词法分析表
     """
     
-    def __init__(self):
-        """初始化词法生成器，设置状态计数器"""
+    def __init__(self, metrics: Optional[Metrics] = None):
+        """
+        初始化词法生成器，设置状态计数器
+        
+        参数:
+            metrics: 性能统计对象(可选)，记录build各阶段的耗时和状态数
+        """
+        self.metrics = metrics
         self.state_counter = 0
         self.thompson = ThompsonConstructor(self._new_state)
         self.subset_constructor = SubsetConstructor()
@@ -55,25 +66,25 @@ class   LexicalGenerator:
             - transition_table: {state: {symbol: next_state}}
             - accepting_states: 接受状态集合
         """
-        print(f"[词法生成器] 开始处理正则表达式: {regex}")
+        logger.info("[词法生成器] 开始处理正则表达式: %s", regex)
         
         # 步骤1: RE -> NFA (Thompson构造)
-        print("  [1/4] Thompson构造法: RE -> NFA")
+        logger.info("  [1/4] Thompson构造法: RE -> NFA")
         nfa = self.thompson.construct_simple(regex, token_tag)
-        print(f"    NFA状态数: {len(nfa.states)}")
+        logger.info("    NFA状态数: %d", len(nfa.states))
         
         # 步骤2: NFA -> DFA (子集构造)
-        print("  [2/4] 子集构造法: NFA -> DFA")
+        logger.info("  [2/4] 子集构造法: NFA -> DFA")
         dfa = self.subset_constructor.construct(nfa)
-        print(f"    DFA状态数: {len(dfa.states)}")
+        logger.info("    DFA状态数: %d", len(dfa.states))
         
         # 步骤3: DFA最小化
-        print("  [3/4] 等价状态分割: DFA最小化")
+        logger.info("  [3/4] 等价状态分割: DFA最小化")
         min_dfa = self.minimizer.minimize(dfa)
-        print(f"    最小化DFA状态数: {len(min_dfa.states)}")
+        logger.info("    最小化DFA状态数: %d", len(min_dfa.states))
         
         # 步骤4: 输出转换表
-        print("  [4/4] 生成转换表")
+        logger.info("  [4/4] 生成转换表")
         transition_table = min_dfa.get_transition_table()
         
         # 构建接受状态ID到Tag的映射
@@ -84,7 +95,7 @@ class   LexicalGenerator:
             else:
                 accepting_map[state.id] = token_tag
         
-        print(f"[词法生成器] 完成! 接受状态: {list(accepting_map.keys())}\n")
+        logger.info("[词法生成器] 完成! 接受状态: %s\n", list(accepting_map.keys()))
         
         return transition_table, accepting_map
 
@@ -99,59 +110,63 @@ class   LexicalGenerator:
             (transition_table, accepting_map)
             accepting_map: {state_id: token_tag}
         """
-        print(f"[词法生成器] 开始构建多规则词法分析器 (规则数: {len(rules)})")
+        logger.info("[词法生成器] 开始构建多规则词法分析器 (规则数: %d)", len(rules))
+        metrics = self.metrics
         
         # 1. 为每条规则构建NFA
-        nfas = []
-        for i, (regex, tag) in enumerate(rules):
-            if regex == "id":
-                nfa = self.thompson.construct_identifier(tag)
-            elif regex == "num":
-                nfa = self.thompson.construct_number(tag)
-            else:
-                # 尝试解析正则表达式
-                try:
-                    nfa = self.regex_parser.parse(regex, tag)
-                except Exception as e:
-                    print(f"  [警告] 正则解析失败 '{regex}': {e}，回退到简单字符串构造")
-                    nfa = self.thompson.construct_simple(regex, tag)
-            
-            # 设置优先级 (规则索引越小优先级越高)
-            for state in nfa.accept_states:
-                state.priority = i
-                
-            nfas.append(nfa)
+        with timed(metrics, 'lexical.nfa'):
+            nfas = []
+            for i, (regex, tag) in enumerate(rules):
+                if regex == "id":
+                    nfa = self.thompson.construct_identifier(tag)
+                elif regex == "num":
+                    nfa = self.thompson.construct_number(tag)
+                else:
+                    # 尝试解析正则表达式
+                    try:
+                        nfa = self.regex_parser.parse(regex, tag)
+                    except Exception as e:
+                        logger.warning("  [警告] 正则解析失败 '%s': %s，回退到简单字符串构造", regex, e)
+                        nfa = self.thompson.construct_simple(regex, tag)
                 
-        # 2. 合并所有NFA
-        # 创建一个新的起始状态，通过epsilon连接到所有NFA的起始状态
-        from .nfa import NFA
-        combined_nfa = NFA()
-        start_state = self._new_state()
-        combined_nfa.start_state = start_state
-        combined_nfa.states.add(start_state)
-        
-        for nfa in nfas:
-            combined_nfa.states.update(nfa.states)
-            combined_nfa.alphabet.update(nfa.alphabet)
-            combined_nfa.transitions.update(nfa.transitions)
-            combined_nfa.accept_states.update(nfa.accept_states)
+                # 设置优先级 (规则索引越小优先级越高)
+                for state in nfa.accept_states:
+                    state.priority = i
+                    
+                nfas.append(nfa)
+                    
+            # 2. 合并所有NFA
+            # 创建一个新的起始状态，通过epsilon连接到所有NFA的起始状态
+            from .nfa import NFA
+            combined_nfa = NFA()
+            start_state = self._new_state()
+            combined_nfa.start_state = start_state
+            combined_nfa.states.add(start_state)
             
-            # 添加epsilon转换: start -> nfa.start
-            combined_nfa.add_transition(start_state, None, nfa.start_state)
+            for nfa in nfas:
+                combined_nfa.states.update(nfa.states)
+                combined_nfa.alphabet.update(nfa.alphabet)
+                combined_nfa.transitions.update(nfa.transitions)
+                combined_nfa.accept_states.update(nfa.accept_states)
+                
+                # 添加epsilon转换: start -> nfa.start
+                combined_nfa.add_transition(start_state, None, nfa.start_state)
             
-        print(f"  [1/3] NFA合并完成 (总状态数: {len(combined_nfa.states)})")
+        logger.info("  [1/3] NFA合并完成 (总状态数: %d)", len(combined_nfa.states))
         self.last_nfa = combined_nfa
         
         # 3. NFA -> DFA
-        print("  [2/3] 子集构造法: NFA -> DFA")
-        dfa = self.subset_constructor.construct(combined_nfa)
-        print(f"    DFA状态数: {len(dfa.states)}")
+        logger.info("  [2/3] 子集构造法: NFA -> DFA")
+        with timed(metrics, 'lexical.subset_construction'):
+            dfa = self.subset_constructor.construct(combined_nfa)
+        logger.info("    DFA状态数: %d", len(dfa.states))
         self.last_dfa = dfa
         
         # 4. DFA最小化
-        print("  [3/3] DFA最小化")
-        min_dfa = self.minimizer.minimize(dfa)
-        print(f"    最小化DFA状态数: {len(min_dfa.states)}")
+        logger.info("  [3/3] DFA最小化")
+        with timed(metrics, 'lexical.minimization'):
+            min_dfa = self.minimizer.minimize(dfa)
+        logger.info("    最小化DFA状态数: %d", len(min_dfa.states))
         self.last_min_dfa = min_dfa
         
         # 5. 构建结果
@@ -160,6 +175,11 @@ class   LexicalGenerator:
         for state_id in min_dfa.accept_states:
             if state_id in min_dfa.accept_tags:
                 accepting_map[state_id] = min_dfa.accept_tags[state_id]
+        
+        if metrics is not None:
+            metrics.set('lexical.nfa_states', len(combined_nfa.states))
+            metrics.set('lexical.dfa_states', len(dfa.states))
+            metrics.set('lexical.min_dfa_states', len(min_dfa.states))
                 
         return transition_table, accepting_map
         start_state = self._new_state()
@@ -175,16 +195,16 @@ class   LexicalGenerator:
             # 添加epsilon转换: start -> nfa.start
             combined_nfa.add_transition(start_state, None, nfa.start_state)
             
-        print(f"  [1/3] NFA合并完成 (总状态数: {len(combined_nfa.states)})")
+        logger.info("  [1/3] NFA合并完成 (总状态数: %d)", len(combined_nfa.states))
         
         # 3. NFA -> DFA
-        print("  [2/3] 子集构造法: NFA -> DFA")
+        logger.info("  [2/3] 子集构造法: NFA -> DFA")
         dfa = self.subset_constructor.construct(combined_nfa)
-        print(f"    DFA状态数: {len(dfa.states)}")
+        logger.info("    DFA状态数: %d", len(dfa.states))
         
         # 4. DFA最小化
-        print("  [3/3] DFA最小化")
+        logger.info("  [3/3] DFA最小化")
         min_dfa = self.minimizer.minimize(dfa)
-        print(f"    最小化DFA状态数: {len(min_dfa.states)}")
+        logger.info("    最小化DFA状态数: %d", len(min_dfa.states))
         
         return min_dfa.get_transition_table(), min_dfa.accept_states
@@ -3,7 +3,8 @@
 负责使用DFA转换表将源代码字符串转换为Token列表
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Iterator, Optional
+from utils.metrics import Metrics, timed
 
 
 class Scanner:
@@ -11,68 +12,135 @@ class Scanner:
     词法扫描器
     """
     
-    def __init__(self, transition_table: Dict[int, Dict[str, int]], accepting_map: Dict[int, str]):
+    def __init__(self, transition_table: Dict[int, Dict[str, int]], accepting_map: Dict[int, str],
+                 metrics: Optional[Metrics] = None):
         """
         初始化扫描器
         
         参数:
             transition_table: DFA转换表 {state: {char: next_state}}
             accepting_map: 接受状态映射 {state_id: token_tag}
+            metrics: 性能统计对象(可选)，记录scan的耗时、字符数、token数和错误数
         """
         self.transition_table = transition_table
         self.accepting_map = accepting_map
+        self.metrics = metrics
         
-    def scan(self, source_code: str) -> List[Tuple[str, str]]:
-        """
-        扫描源代码并生成Token列表 (最大匹配原则)
+        # 每个DFA状态可接受的字符(用于词法错误诊断): {state: 排好序的字符串}
+        self.expected_chars: Dict[int, str] = {
+            state: ''.join(sorted(row)) for state, row in transition_table.items()
+        }
         
+        # 词法错误记录: [{'position', 'char', 'state', 'expected', 'message'}]
+        self.errors: List[Dict] = []
+        
+    def match(self, source_code: str, pos: int) -> Tuple[Optional[str], int, int]:
+        """
+        从pos开始(DFA初始状态)寻找最长匹配
+
         参数:
             source_code: 源代码字符串
-            
+            pos: 起始位置
         返回:
-            Token列表 [(type, value), ...]
+            (token类型, 匹配结束位置, 探查到的最远位置+1)；没有匹配时token类型为None，结束位置为-1
+            "探查到的最远位置"用于增量词法分析: 编辑只要落在该位置之前，这个token就可能改变
         """
-        tokens = []
-        pos = 0
+        transitions = self.transition_table
+        accepting = self.accepting_map
+        length = len(source_code)
+
+        longest_match_tag = None
+        longest_match_end = -1
+
+        current_state = 0  # 假设初始状态总是0
+        current_pos = pos
+
+        while current_pos < length:
+            row = transitions.get(current_state)
+            char = source_code[current_pos]
+
+            # 检查是否有转换
+            if row is not None and char in row:
+                current_state = row[char]
+                current_pos += 1
+
+                # 如果是接受状态，记录匹配
+                if current_state in accepting:
+                    longest_match_tag = accepting[current_state]
+                    longest_match_end = current_pos
+            else:
+                break
+
+        # 导致失败的字符(或输入结束)也被探查过
+        return longest_match_tag, longest_match_end, current_pos + 1
+
+    def scan_positions(self, source_code: str, pos: int = 0) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        从pos开始扫描，逐个产生带位置信息的Token
+
+        参数:
+            source_code: 源代码字符串
+            pos: 起始位置，必须是一个安全的重启点(源程序开头或某个token的结束位置)
+        返回:
+            迭代器，元素为 (type, value, start, reach)，reach含义见match()；
+            跳过的非法字符记录在self.errors中(每次调用重新记录，开始迭代时清空)
+        """
+        self.errors = []
         length = len(source_code)
-        
         while pos < length:
             # 1. 跳过空白字符
             if source_code[pos].isspace():
                 pos += 1
                 continue
-                
+
             # 2. 尝试寻找最长匹配
-            longest_match_text = None
-            longest_match_tag = None
-            longest_match_end = -1
-            
-            current_state = 0  # 假设初始状态总是0
-            current_pos = pos
-            
-            while current_pos < length:
-                char = source_code[current_pos]
-                
-                # 检查是否有转换
-                if current_state in self.transition_table and char in self.transition_table[current_state]:
-                    current_state = self.transition_table[current_state][char]
-                    current_pos += 1
-                    
-                    # 如果是接受状态，记录匹配
-                    if current_state in self.accepting_map:
-                        longest_match_text = source_code[pos:current_pos]
-                        longest_match_tag = self.accepting_map[current_state]
-                        longest_match_end = current_pos
-                else:
-                    break
-            
+            tag, end, reach = self.match(source_code, pos)
+
             # 3. 处理匹配结果
-            if longest_match_text:
-                tokens.append((longest_match_tag, longest_match_text))
-                pos = longest_match_end
+            if tag is not None:
+                yield tag, source_code[pos:end], pos, reach
+                pos = end
             else:
                 # 匹配失败，跳过一个字符并报错(或作为未知字符)
                 # print(f"[Scanner] 警告: 无法识别的字符 '{source_code[pos]}' at position {pos}")
+                self._record_error(source_code, pos, reach - 1)
                 pos += 1
-                
+
+    def _record_error(self, source_code: str, pos: int, fail_pos: int):
+        """
+        记录一个词法错误: 从pos开始的输入在fail_pos处进入死状态
+
+        只在出错时重新走一遍DFA找出卡住的状态，正常扫描路径没有额外开销
+        """
+        state = 0
+        for char in source_code[pos:fail_pos]:
+            state = self.transition_table[state][char]
+        char = source_code[fail_pos] if fail_pos < len(source_code) else None
+        expected = self.expected_chars.get(state, '')
+        shown = expected if len(expected) <= 20 else expected[:20] + '...'
+        self.errors.append({
+            'position': fail_pos,
+            'char': char,
+            'state': state,
+            'expected': expected,
+            'message': f"位置{fail_pos}: 无法识别的输入{repr(char) if char else '(文件结束)'}，期望: {shown}"
+        })
+
+    def scan(self, source_code: str) -> List[Tuple[str, str]]:
+        """
+        扫描源代码并生成Token列表 (最大匹配原则)
+        
+        参数:
+            source_code: 源代码字符串
+            
+        返回:
+            Token列表 [(type, value), ...]，跳过的非法字符记录在self.errors中
+        """
+        metrics = self.metrics
+        with timed(metrics, 'scan'):
+            tokens = [(tag, text) for tag, text, _, _ in self.scan_positions(source_code)]
+        if metrics is not None:
+            metrics.count('scan.chars', len(source_code))
+            metrics.count('scan.tokens', len(tokens))
+            metrics.count('scan.errors', len(self.errors))
         return tokens
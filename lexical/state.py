@@ -3,23 +3,28 @@
 """
 
 from typing import Optional
-from dataclasses import dataclass
 
 
-@dataclass
 class State:
     """
     有限自动机的状态类
     
+    使用__slots__(Thompson构造会产生大量状态对象)
+    
     属性:
         id: 状态的唯一标识符
         is_accepting: 是否为接受状态
         tag: 接受状态的标签(如果是接受状态，表示识别的token类型)
+        priority: 接受状态的优先级(规则下标，越小越优先)
     """
-    id: int
-    is_accepting: bool = False
-    tag: Optional[str] = None
-    priority: int = float('inf')
+    __slots__ = ('id', 'is_accepting', 'tag', 'priority')
+    
+    def __init__(self, id: int, is_accepting: bool = False, tag: Optional[str] = None,
+                 priority: float = float('inf')):
+        self.id = id
+        self.is_accepting = is_accepting
+        self.tag = tag
+        self.priority = priority
     
     def __hash__(self):
         return hash(self.id)
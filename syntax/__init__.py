@@ -1,9 +1,43 @@
 """
 语法分析模块
+
+子模块在第一次访问对应属性时才导入(PEP 562)，只使用Grammar时不会导入分析表生成器
 """
 
-from .grammar import Grammar, Production
-from .lr_item import LR1Item
-from .generator import ParserGenerator
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .grammar import Grammar, Production
+    from .lr_item import LR1Item
+    from .generator import ParserGenerator
+    from .codegen import ParserModuleGenerator
+    from .unit_rules import UnitRuleEliminator
+    from .incremental_generator import IncrementalParserGenerator, BuildCache
+
+# 导出名 -> 所在子模块
+_EXPORTS = {
+    'Grammar': '.grammar',
+    'Production': '.grammar',
+    'LR1Item': '.lr_item',
+    'ParserGenerator': '.generator',
+    'ParserModuleGenerator': '.codegen',
+    'UnitRuleEliminator': '.unit_rules',
+    'IncrementalParserGenerator': '.incremental_generator',
+    'BuildCache': '.incremental_generator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['Grammar', 'Production', 'LR1Item', 'ParserGenerator']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,260 @@
+"""
+分析器代码生成器
+把LALR(1)分析表(以及可选的DFA词法表)输出为一个独立的Python模块(类似bison的输出):
+生成的模块不依赖本项目，导入时不需要重新构造分析表
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .grammar import Grammar
+
+
+# 生成模块的驱动程序模板: 表格以字面量形式插入到 {tables} 处
+_DRIVER_TEMPLATE = '''"""
+{title}
+由Compiler-Compiler自动生成，请勿手动修改
+
+用法:
+    import {module}
+    value = {module}.parse({module}.scan(source), actions)
+
+actions: {{产生式编号: 函数(右部语义值列表) -> 左部语义值}}，或按产生式编号排列的函数列表；
+没有语义动作的产生式取右部第一个符号的值(空产生式取None)。产生式编号见PRODUCTIONS
+"""
+
+{tables}
+
+
+class ParseError(Exception):
+    """语法错误: position为出错token的下标，expected为该状态期望的终结符"""
+
+    def __init__(self, position, token, value, expected):
+        self.position = position
+        self.token = token
+        self.value = value
+        self.expected = expected
+        super().__init__(f"位置{{position}}: 无法处理输入'{{token}}'，期望: {{', '.join(expected)}}")
+
+
+def scan(source):
+    """词法分析(最长匹配，跳过空白和无法识别的字符)，返回 [(type, value), ...]"""
+    if _DFA is None:
+        raise RuntimeError("生成时没有提供词法表")
+    dfa = _DFA
+    accepting = _ACCEPTING
+    tokens = []
+    length = len(source)
+    pos = 0
+    while pos < length:
+        if source[pos].isspace():
+            pos += 1
+            continue
+        state = 0
+        current = pos
+        tag = None
+        end = -1
+        while current < length:
+            row = dfa[state]
+            if row is None:
+                break
+            state = row.get(source[current])
+            if state is None:
+                break
+            current += 1
+            if state in accepting:
+                tag = accepting[state]
+                end = current
+        if tag is None:
+            pos += 1
+        else:
+            tokens.append((tag, source[pos:end]))
+            pos = end
+    return tokens
+
+
+def parse(tokens, actions=None):
+    """
+    LR分析
+
+    参数:
+        tokens: [(type, value), ...]，不含结束标记$
+        actions: 语义动作(见模块说明)
+    返回: 开始符号的语义值；有语法错误时抛出ParseError
+    """
+    hooks = [None] * len(_RLEN)
+    if actions is not None:
+        for prod_id, hook in (actions.items() if isinstance(actions, dict) else enumerate(actions)):
+            hooks[prod_id] = hook
+
+    action_rows = _ACTION
+    goto_rows = _GOTO
+    rlen = _RLEN
+    lhs = _LHS
+    states = [0]
+    values = []
+    tokens = list(tokens)
+    tokens.append(('$', None))
+    pos = 0
+    token, value = tokens[0]
+
+    while True:
+        act = action_rows[states[-1]].get(token)
+        if act is None:
+            raise ParseError(pos, token, value, tuple(sorted(action_rows[states[-1]])))
+        if act >= 0:
+            # 移进
+            states.append(act)
+            values.append(value)
+            pos += 1
+            token, value = tokens[pos]
+            continue
+        prod_id = -1 - act
+        if prod_id == 0:
+            # S' -> S: 接受
+            return values[-1] if values else None
+        size = rlen[prod_id]
+        if size:
+            args = values[-size:]
+            del values[-size:]
+            del states[-size:]
+        else:
+            args = []
+        hook = hooks[prod_id]
+        if hook is not None:
+            values.append(hook(args))
+        else:
+            values.append(args[0] if args else None)
+        states.append(goto_rows[states[-1]][lhs[prod_id]])
+'''
+
+
+class ParserModuleGenerator:
+    """
+    独立分析器模块生成器
+
+    表格编码:
+    - ACTION: 每个状态一个 {终结符: 整数} 字典，>=0 表示移进到该状态，
+      <0 表示按产生式 -1-v 归约(产生式0即 S' -> S，表示接受)；内容相同的行只输出一次
+    - GOTO: 每个状态一个 {非终结符编号: 状态} 字典，同样共享相同的行
+    - _RLEN/_LHS: 按产生式编号排列的右部长度和左部非终结符编号
+    """
+
+    def __init__(self, grammar: Grammar,
+                 action_table: Dict[Tuple[int, str], Tuple[str, int]],
+                 goto_table: Dict[Tuple[int, str], int],
+                 transition_table: Optional[Dict[int, Dict[str, int]]] = None,
+                 accepting_map: Optional[Dict[int, str]] = None):
+        """
+        初始化代码生成器
+
+        参数:
+            grammar: 文法对象(已增广，即ParserGenerator处理过的文法)
+            action_table: ACTION表
+            goto_table: GOTO表
+            transition_table: DFA转换表(可选，提供后生成的模块包含scan函数)
+            accepting_map: DFA接受状态映射
+        """
+        self.grammar = grammar
+        self.action_table = action_table
+        self.goto_table = goto_table
+        self.transition_table = transition_table
+        self.accepting_map = accepting_map
+
+    def generate(self, module_name: str = "parser_module", title: str = "LALR(1)分析器") -> str:
+        """
+        生成模块源代码
+
+        参数:
+            module_name: 模块名(只用于模块说明中的用法示例)
+            title: 模块说明的标题
+        返回: Python源代码
+        """
+        productions = self.grammar.productions
+        if not productions or productions[0].left != "S'":
+            raise ValueError("文法必须先增广(产生式0为 S' -> S)")
+
+        # 非终结符编号: 按产生式中首次出现的顺序
+        non_terminals: List[str] = []
+        nt_index: Dict[str, int] = {}
+        for production in productions:
+            if production.left not in nt_index:
+                nt_index[production.left] = len(non_terminals)
+                non_terminals.append(production.left)
+
+        state_count = 1 + max(
+            [s for s, _ in self.action_table] + [s for s, _ in self.goto_table] +
+            [v for v in self.goto_table.values()]
+        )
+
+        action_rows: List[Dict[str, int]] = [{} for _ in range(state_count)]
+        for (state, terminal), (action, value) in self.action_table.items():
+            if action == 'shift':
+                action_rows[state][terminal] = value
+            elif action == 'reduce':
+                action_rows[state][terminal] = -1 - value
+            else:  # accept
+                action_rows[state][terminal] = -1
+        goto_rows: List[Dict[int, int]] = [{} for _ in range(state_count)]
+        for (state, non_terminal), target in self.goto_table.items():
+            goto_rows[state][nt_index[non_terminal]] = target
+
+        lines = [
+            f"PRODUCTIONS = {[str(p) for p in productions]!r}",
+            f"NON_TERMINALS = {non_terminals!r}",
+            "",
+            f"_RLEN = {[len(p.right) for p in productions]!r}",
+            f"_LHS = {[nt_index[p.left] for p in productions]!r}",
+            "",
+        ]
+        lines += self._shared_rows("_ACTION", action_rows)
+        lines.append("")
+        lines += self._shared_rows("_GOTO", goto_rows)
+        lines.append("")
+
+        if self.transition_table is not None:
+            dfa_size = 1 + max(self.transition_table.keys() | set(self.accepting_map))
+            dfa_rows = [self.transition_table.get(s) for s in range(dfa_size)]
+            lines.append("_DFA = [")
+            lines += [f"    {row!r}," for row in dfa_rows]
+            lines.append("]")
+            lines.append(f"_ACCEPTING = {dict(sorted(self.accepting_map.items()))!r}")
+        else:
+            lines.append("_DFA = None")
+            lines.append("_ACCEPTING = {}")
+
+        return _DRIVER_TEMPLATE.format(title=title, module=module_name, tables="\n".join(lines))
+
+    def write(self, output_path: str, title: str = "LALR(1)分析器") -> str:
+        """
+        生成模块并写入文件
+
+        参数:
+            output_path: 输出的.py文件路径
+            title: 模块说明的标题
+        返回: 生成的源代码
+        """
+        path = Path(output_path)
+        source = self.generate(path.stem, title)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding='utf-8')
+        return source
+
+    @staticmethod
+    def _shared_rows(name: str, rows: List[dict]) -> List[str]:
+        """输出按状态排列的表: 相同的行只输出一次，状态表只保存行的引用"""
+        unique: Dict[str, int] = {}
+        literals: List[str] = []
+        refs: List[int] = []
+        for row in rows:
+            literal = repr(dict(sorted(row.items())))
+            if literal not in unique:
+                unique[literal] = len(literals)
+                literals.append(literal)
+            refs.append(unique[literal])
+
+        lines = [f"{name}_ROWS = ["]
+        lines += [f"    {literal}," for literal in literals]
+        lines.append("]")
+        lines.append(f"{name} = [{name}_ROWS[i] for i in {refs!r}]")
+        lines.append(f"del {name}_ROWS")
+        return lines
@@ -0,0 +1,170 @@
+"""
+EBNF写法展开
+grammar_rules中可以使用 X*、X+、X? 和分组，展开为左递归的辅助产生式(分析栈深度不随重复次数增长)
+"""
+
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+# 可以直接加后缀运算符的符号(标识符形式，避免与 ++、** 这样的终结符混淆)
+_SUFFIXED = re.compile(r'^([A-Za-z][A-Za-z0-9_]*)([*+?])$')
+# 分组的右括号 -> 运算符(None表示只是分组)
+_CLOSERS = {')': None, ')*': '*', ')+': '+', ')?': '?'}
+# 辅助非终结符名称的后缀
+_SUFFIXES = {'*': 'star', '+': 'plus', '?': 'opt', None: 'group'}
+
+# 辅助产生式的列表语义值动作(见LRParser的list_values参数):
+#   new:    H -> ε       值为 []
+#   first:  H -> α       值为 [α的值]
+#   append: H -> H α     把α的值追加到H的列表末尾(同一个列表对象)
+#   item:   H -> α       值为α的值(X? 出现时、无运算符的分组)
+#   none:   H -> ε       值为None(X? 不出现时)
+# α只有一个符号时其值为该符号的语义值，否则为各符号语义值组成的元组
+LIST_ACTIONS = ('new', 'first', 'append', 'item', 'none')
+
+# 辅助产生式: (左部, 右部, 列表语义值动作)
+HelperProduction = Tuple[str, List[str], str]
+
+
+def has_ebnf(symbols: Sequence[str]) -> bool:
+    """右部是否可能含EBNF写法(快速判断，不含时按普通产生式处理)"""
+    return any(s == '|' or (s in _CLOSERS and s != ')') or _SUFFIXED.match(s) for s in symbols)
+
+
+class EBNFExpander:
+    """
+    EBNF展开器
+
+    写法(右部仍以空格分隔):
+    - X* / X+ / X? 重复零次以上 / 一次以上 / 可选，X须为标识符形式的符号(如 Stmt*、id+)
+    - ( α | β )  分组，右括号可以带运算符: ( , E )*、( else S )?
+    只有右括号带运算符或内部含 | 的括号才是分组，其余的 ( 和 ) 仍是终结符，
+    所以原有的 F -> ( E )、E -> E * T 写法不受影响
+
+    展开方式(H为辅助非终结符):
+        X*  =>  H -> ε | H X
+        X+  =>  H -> X | H X
+        X?  =>  H -> X | ε
+        (α | β)  =>  H -> α | β
+    重复使用左递归，LR分析时每读入一项就归约一次，分析栈深度与重复次数无关。
+    相同的EBNF片段在整个文法中共用一个辅助非终结符(避免多个相同的空产生式引起归约-归约冲突)
+    """
+
+    def __init__(self, grammar):
+        """
+        初始化
+
+        参数:
+            grammar: 要添加辅助产生式的文法(用于检查名称冲突)
+        """
+        self.grammar = grammar
+        # (运算符, 各选择的右部) -> 辅助非终结符
+        self.helpers: Dict[Tuple, str] = {}
+        self._names: Set[str] = set()
+
+    def expand(self, left: str, symbols: Sequence[str]) -> Tuple[List[str], List[HelperProduction]]:
+        """
+        展开一条规则的右部
+
+        参数:
+            left: 规则左部
+            symbols: 规则右部的符号(按空格分开)
+        返回: (展开后的右部, 新增的辅助产生式)，辅助产生式应在规则本身之后添加
+        """
+        groups = self._match(symbols)
+        pending: List[HelperProduction] = []
+        right = self._sequence(left, symbols, 0, len(symbols), groups, pending)
+        return right, pending
+
+    @staticmethod
+    def _match(symbols: Sequence[str]) -> Dict[int, int]:
+        """找出分组: 左括号下标 -> 右括号下标"""
+        stack: List[int] = []
+        pairs: Dict[int, int] = {}
+        with_bar: Set[int] = set()
+        for i, symbol in enumerate(symbols):
+            if symbol == '(':
+                stack.append(i)
+            elif symbol in _CLOSERS:
+                if stack:
+                    pairs[stack.pop()] = i
+                elif symbol != ')':
+                    raise ValueError(f"'{symbol}'没有对应的'('")
+            elif symbol == '|' and stack:
+                with_bar.add(stack[-1])
+        return {open_: close for open_, close in pairs.items()
+                if symbols[close] != ')' or open_ in with_bar}
+
+    def _sequence(self, left: str, symbols: Sequence[str], start: int, end: int,
+                  groups: Dict[int, int], pending: List[HelperProduction]) -> List[str]:
+        """展开symbols[start:end]"""
+        result = []
+        i = start
+        while i < end:
+            symbol = symbols[i]
+            if i in groups:
+                close = groups[i]
+                alternatives = [self._sequence(left, symbols, a, b, groups, pending)
+                                for a, b in self._split(symbols, i + 1, close, groups)]
+                result.append(self._helper(left, _CLOSERS[symbols[close]], alternatives, pending))
+                i = close + 1
+                continue
+            match = _SUFFIXED.match(symbol)
+            if match:
+                result.append(self._helper(left, match.group(2), [[match.group(1)]], pending))
+            else:
+                result.append(symbol)
+            i += 1
+        return result
+
+    @staticmethod
+    def _split(symbols: Sequence[str], start: int, end: int, groups: Dict[int, int]):
+        """按不在内层分组中的 | 把symbols[start:end]分成各个选择的区间"""
+        bounds = []
+        begin = i = start
+        while i < end:
+            if i in groups:
+                i = groups[i] + 1
+                continue
+            if symbols[i] == '|':
+                bounds.append((begin, i))
+                begin = i + 1
+            i += 1
+        bounds.append((begin, end))
+        return bounds
+
+    def _helper(self, left: str, op, alternatives: List[List[str]], pending: List[HelperProduction]) -> str:
+        """返回EBNF片段对应的辅助非终结符，第一次出现时生成它的产生式"""
+        alternatives = [[] if alternative == ['ε'] else alternative for alternative in alternatives]
+        key = (op, tuple(tuple(alternative) for alternative in alternatives))
+        name = self.helpers.get(key)
+        if name is not None:
+            return name
+
+        # Stmt* -> Stmt_star；分组用规则左部命名，如 Args_star
+        if len(alternatives) == 1 and len(alternatives[0]) == 1:
+            base = alternatives[0][0][0].upper() + alternatives[0][0][1:]
+        else:
+            base = left
+        name = f"{base}_{_SUFFIXES[op]}"
+        counter = 1
+        while name == left or name in self._names or name in self.grammar.terminals \
+                or name in self.grammar.non_terminals:
+            counter += 1
+            name = f"{base}_{_SUFFIXES[op]}{counter}"
+        self.helpers[key] = name
+        self._names.add(name)
+
+        if op == '*':
+            pending.append((name, [], 'new'))
+            pending.extend((name, [name] + alternative, 'append') for alternative in alternatives)
+        elif op == '+':
+            pending.extend((name, alternative, 'first') for alternative in alternatives)
+            pending.extend((name, [name] + alternative, 'append') for alternative in alternatives)
+        elif op == '?':
+            pending.extend((name, alternative, 'item') for alternative in alternatives)
+            pending.append((name, [], 'none'))
+        else:
+            pending.extend((name, alternative, 'item') for alternative in alternatives)
+        return name
@@ -2,10 +2,14 @@
 FIRST集和FOLLOW集计算
 """
 
-from typing import Set, Dict, Tuple
+from typing import Set, Dict, FrozenSet, Optional, Tuple
+from utils.logger import Logger
 from .grammar import Grammar
 
 
+logger = Logger.get(__name__)
+
+
 class FirstFollowCalculator:
     """FIRST集和FOLLOW集计算器"""
     
@@ -19,8 +23,10 @@ class FirstFollowCalculator:
         self.grammar = grammar
         self.first_sets: Dict[str, Set[str]] = {}
         self.follow_sets: Dict[str, Set[str]] = {}
+        # 右部后缀的FIRST集缓存: (产生式编号, 位置) -> FIRST(right[位置:]) - {ε}
+        self._suffix_first: Dict[Tuple[int, int], FrozenSet[str]] = {}
     
-    def compute_first_sets(self):
+    def compute_first_sets(self, non_terminals: Optional[Set[str]] = None):
         """
         计算所有符号的FIRST集
         
@@ -33,15 +39,25 @@ class FirstFollowCalculator:
              * 如果ε ∈ FIRST(Xi) (i=1...k-1), 将FIRST(Xk)-{ε} 加入FIRST(A)
              * 如果ε ∈ FIRST(Xi) (i=1...n), 将ε加入FIRST(A)
         3. 重复应用规则2，直到所有FIRST集不再变化
+        
+        参数:
+            non_terminals: 只重新计算这些非终结符(增量生成时使用)，其余非终结符沿用first_sets中已有的结果；
+                           默认计算全部
         """
-        print("  [计算FIRST集]")
+        logger.info("  [计算FIRST集]")
+        self._suffix_first = {}
         
         # 初始化: 终结符的FIRST集
         for terminal in self.grammar.terminals:
             self.first_sets[terminal] = {terminal}
         
         # 初始化: 非终结符的FIRST集为空
-        for non_terminal in self.grammar.non_terminals:
+        if non_terminals is None:
+            non_terminals = self.grammar.non_terminals
+            productions = self.grammar.productions
+        else:
+            productions = [p for p in self.grammar.productions if p.left in non_terminals]
+        for non_terminal in non_terminals:
             self.first_sets[non_terminal] = set()
         
         # 迭代计算直到不动点
@@ -49,7 +65,7 @@ class FirstFollowCalculator:
         while changed:
             changed = False
             
-            for production in self.grammar.productions:
+            for production in productions:
                 left = production.left
                 right = production.right
                 
@@ -84,9 +100,9 @@ class FirstFollowCalculator:
                             self.first_sets[left].add('ε')
                             changed = True
         
-        print(f"    完成! 共计算{len(self.first_sets)}个符号的FIRST集")
+        logger.info("    完成! 共计算%d个符号的FIRST集", len(self.first_sets))
     
-    def compute_follow_sets(self):
+    def compute_follow_sets(self, non_terminals: Optional[Set[str]] = None):
         """
         计算所有非终结符的FOLLOW集
         
@@ -98,15 +114,22 @@ class FirstFollowCalculator:
         3. 如果有产生式 A -> αB:
            - 将FOLLOW(A)加入FOLLOW(B)
         4. 重复应用规则2和3，直到所有FOLLOW集不再变化
+        
+        参数:
+            non_terminals: 只重新计算这些非终结符(增量生成时使用)，其余非终结符沿用follow_sets中已有的结果；
+                           默认计算全部
         """
-        print("  [计算FOLLOW集]")
+        logger.info("  [计算FOLLOW集]")
         
         # 初始化
-        for non_terminal in self.grammar.non_terminals:
+        if non_terminals is None:
+            non_terminals = self.grammar.non_terminals
+        for non_terminal in non_terminals:
             self.follow_sets[non_terminal] = set()
         
         # 起始符号的FOLLOW集包含$
-        self.follow_sets[self.grammar.start_symbol].add('$')
+        if self.grammar.start_symbol in non_terminals:
+            self.follow_sets[self.grammar.start_symbol].add('$')
         
         # 迭代计算直到不动点
         changed = True
@@ -118,23 +141,23 @@ class FirstFollowCalculator:
                 right = production.right
                 
                 for i, symbol in enumerate(right):
-                    if symbol in self.grammar.non_terminals:
+                    if symbol in non_terminals:
                         # 找到非终结符B
                         beta = right[i+1:]  # B后面的符号序列
                         
                         if beta:
                             # 情况1: A -> αBβ
-                            # 计算FIRST(β)
-                            first_beta = self.first_of_sequence(beta)
+                            # FIRST(β)-{ε}(按右部后缀缓存)
+                            first_beta = self.first_of_suffix(production, i + 1)
                             
                             # 将FIRST(β)-{ε} 加入FOLLOW(B)
                             before_size = len(self.follow_sets[symbol])
-                            self.follow_sets[symbol] |= (first_beta - {'ε'})
+                            self.follow_sets[symbol] |= first_beta
                             if len(self.follow_sets[symbol]) > before_size:
                                 changed = True
                             
-                            # 如果ε ∈ FIRST(β), 将FOLLOW(A)加入FOLLOW(B)
-                            if 'ε' in first_beta:
+                            # 如果ε ∈ FIRST(β)(查文法的右部后缀可空表), 将FOLLOW(A)加入FOLLOW(B)
+                            if self.grammar.suffix_nullable[production.id][i + 1]:
                                 before_size = len(self.follow_sets[symbol])
                                 self.follow_sets[symbol] |= self.follow_sets[left]
                                 if len(self.follow_sets[symbol]) > before_size:
@@ -146,7 +169,7 @@ class FirstFollowCalculator:
                             if len(self.follow_sets[symbol]) > before_size:
                                 changed = True
         
-        print(f"    完成! 共计算{len(self.follow_sets)}个非终结符的FOLLOW集")
+        logger.info("    完成! 共计算%d个非终结符的FOLLOW集", len(self.follow_sets))
     
     def first_of_sequence(self, sequence: Tuple[str, ...]) -> Set[str]:
         """
@@ -172,3 +195,21 @@ class FirstFollowCalculator:
             result.add('ε')
         
         return result
+    
+    def first_of_suffix(self, production, position: int) -> FrozenSet[str]:
+        """
+        产生式右部后缀 right[position:] 的FIRST集(不含ε；后缀能否推出ε见Grammar.suffix_nullable)
+        
+        按 (产生式编号, 位置) 缓存，重新计算FIRST集时清空
+        
+        参数:
+            production: 产生式
+            position: 后缀的起始位置
+        返回: FIRST集
+        """
+        key = (production.id, position)
+        result = self._suffix_first.get(key)
+        if result is None:
+            result = self._suffix_first[key] = frozenset(
+                self.first_of_sequence(production.right[position:]) - {'ε'})
+        return result
@@ -2,30 +2,62 @@
 语法分析生成器主类
 """
 
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Iterable, Optional, Union
+from utils.metrics import Metrics, timed
+from utils.logger import Logger
 from .grammar import Grammar
 from .first_follow import FirstFollowCalculator
 from .lr1_builder import LR1Builder
 from .lalr_builder import LALRBuilder
+from .slr_builder import SLRBuilder
+from .pager_builder import PagerBuilder
 from .table_builder import TableBuilder
+from .unit_rules import UnitRuleEliminator
+
+
+logger = Logger.get(__name__)
+
+# 可选的分析表构造算法(状态数由少到多: slr1 ≈ lalr1 ≈ pager <= lr1，分析能力 slr1 < lalr1 < pager = lr1)
+ALGORITHMS = {
+    'slr1': 'SLR(1)',
+    'lalr1': 'LALR(1)',
+    'pager': 'Pager最小LR(1)',
+    'lr1': '规范LR(1)',
+}
 
 
 class ParserGenerator:
     """
     语法分析生成器
-    负责从BNF文法生成LALR(1)分析表
+    负责从BNF文法生成LR分析表(默认LALR(1)，可选SLR(1)、Pager最小LR(1)和规范LR(1))
     """
     
-    def __init__(self, grammar: Grammar):
+    def __init__(self, grammar: Grammar, metrics: Optional[Metrics] = None,
+                 unit_rules: Union[bool, Iterable[int]] = False, algorithm: str = 'lalr1',
+                 workers: int = 1):
         """
         初始化语法生成器
         
         参数:
             grammar: 输入的上下文无关文法
+            metrics: 性能统计对象(可选)，记录generate各阶段的耗时、状态数和闭包缓存命中数
+            unit_rules: 跳过没有语义动作的单产生式归约(见syntax.unit_rules)；
+                        True表示全部单产生式，也可以给出增广文法中的产生式编号
+            algorithm: 项目集构造算法，见ALGORITHMS:
+                       'slr1'  - LR(0)项目集 + FOLLOW集，最快
+                       'lalr1' - 规范LR(1)合并同心状态(默认)
+                       'pager' - Pager的PGM算法，弱相容时才合并，LR(1)的分析能力、接近LALR(1)的状态数
+                       'lr1'   - 规范LR(1)，不合并
+            workers: 构建LR(1)项目集的工作进程数('lalr1'和'lr1')，大于1时并行构建，生成的分析表与串行相同
         """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"未知的分析表算法'{algorithm}'，可选: {', '.join(ALGORITHMS)}")
         self.grammar = grammar
-        self.grammar.augment()  # 增广文法
-        self.grammar.terminals.add('$')  # 添加结束标记
+        self.algorithm = algorithm
+        self.workers = workers
+        self.metrics = metrics
+        self.unit_rules = unit_rules
+        self.grammar.augment()  # 增广文法(添加结束标记$并冻结、建立索引)
         
         # 初始化各个组件
         self.first_follow_calc = FirstFollowCalculator(grammar)
@@ -37,39 +69,105 @@ class ParserGenerator:
         self.follow_sets = {}
         self.action_table = {}
         self.goto_table = {}
+        self.expected_tokens = {}
+        self.states = []
+        # 跳过单产生式时，在语法树中补回被跳过层次所需的推导链(传给LRParser)
+        self.unit_chains = None
     
     def generate(self) -> Tuple[Dict, Dict]:
         """
-        主接口: 生成LALR(1)分析表
+        主接口: 按self.algorithm生成分析表
         
         返回: (action_table, goto_table)
             - action_table: {(state, terminal): (action, value)}
             - goto_table: {(state, non_terminal): next_state}
         """
-        print("[语法生成器] 开始构建LALR(1)分析表")
+        name = ALGORITHMS[self.algorithm]
+        logger.info("[语法生成器] 开始构建%s分析表", name)
+        metrics = self.metrics
         
         # 步骤1: 计算FIRST和FOLLOW集
-        print("\n[步骤1] 计算FIRST和FOLLOW集")
-        self.first_follow_calc.compute_first_sets()
-        self.first_follow_calc.compute_follow_sets()
+        logger.info("\n[步骤1] 计算FIRST和FOLLOW集")
+        with timed(metrics, 'syntax.first_follow'):
+            self._compute_first_follow()
         self.first_sets = self.first_follow_calc.first_sets
         self.follow_sets = self.first_follow_calc.follow_sets
         
-        # 步骤2: 构建LR(1)项目集规范族
-        print("\n[步骤2] 构建LR(1)项目集")
-        self.lr1_builder = LR1Builder(self.grammar, self.first_follow_calc)
-        lr1_states, lr1_goto = self.lr1_builder.build()
+        # 步骤2~4: 构建项目集和分析表
+        self._build_tables()
         
-        # 步骤3: 合并为LALR(1)
-        print("\n[步骤3] 压缩为LALR(1)")
-        lalr_states, lalr_goto = LALRBuilder.merge(lr1_states, lr1_goto)
+        # 可选步骤: 跳过单产生式归约
+        if self.unit_rules:
+            logger.info("\n[步骤5] 消除单产生式归约")
+            eliminator = UnitRuleEliminator(self.grammar, None if self.unit_rules is True else self.unit_rules)
+            with timed(metrics, 'syntax.unit_rules'):
+                self.action_table, self.goto_table = eliminator.eliminate(self.action_table, self.goto_table)
+            self.expected_tokens = eliminator.expected_tokens
+            self.unit_chains = eliminator.unit_chains
+            if metrics is not None:
+                metrics.set('syntax.bypassed_gotos', eliminator.bypassed_gotos)
+                metrics.set('syntax.unit_split_states', eliminator.added_states)
         
-        # 步骤4: 构建分析表
-        print("\n[步骤4] 生成分析表")
-        self.action_table, self.goto_table = self.table_builder.build(
-            lalr_states, lalr_goto
-        )
+        if metrics is not None:
+            metrics.set('syntax.productions', len(self.grammar.productions))
+            metrics.set('syntax.states', len(self.states))
+            if self.lr1_builder is not None:
+                metrics.set('syntax.closure_cache_hits', self.lr1_builder.cache_hits)
+                metrics.set('syntax.closure_cache_misses', self.lr1_builder.cache_misses)
+            metrics.set('syntax.action_entries', len(self.action_table))
+            metrics.set('syntax.goto_entries', len(self.goto_table))
+            metrics.set('syntax.conflicts', len(self.table_builder.conflicts))
+            metrics.set('syntax.resolved_conflicts', len(self.table_builder.resolved_entries))
         
-        print("\n[语法生成器] 完成!\n")
+        logger.info("\n[语法生成器] 完成!\n")
         
         return self.action_table, self.goto_table
+    
+    @property
+    def conflict_actions(self) -> Dict[Tuple[int, str], Tuple[Tuple[str, int], ...]]:
+        """
+        未解决冲突的表项的全部动作(传给driver.GLRParser)
+        
+        只对应TableBuilder生成的分析表；unit_rules跳过单产生式时状态重新编号，不能与GLR分析同时使用
+        """
+        return self.table_builder.conflict_actions
+    
+    def _compute_first_follow(self):
+        """步骤1: 计算FIRST和FOLLOW集(结果在self.first_follow_calc中)"""
+        self.first_follow_calc.compute_first_sets()
+        self.first_follow_calc.compute_follow_sets()
+    
+    def _build_tables(self):
+        """步骤2~4: 按self.algorithm构建项目集(各算法共用之后的分析表构建)，设置states和分析表"""
+        metrics = self.metrics
+        if self.algorithm == 'slr1':
+            logger.info("\n[步骤2] 构建SLR(1)项目集")
+            with timed(metrics, 'syntax.slr1'):
+                states, goto = SLRBuilder(self.grammar, self.follow_sets).build()
+        elif self.algorithm == 'pager':
+            logger.info("\n[步骤2] 构建Pager最小LR(1)项目集")
+            builder = PagerBuilder(self.grammar, self.first_follow_calc)
+            self.lr1_builder = builder.lr1_builder
+            with timed(metrics, 'syntax.pager'):
+                states, goto = builder.build()
+        else:
+            logger.info("\n[步骤2] 构建LR(1)项目集")
+            self.lr1_builder = LR1Builder(self.grammar, self.first_follow_calc)
+            with timed(metrics, 'syntax.lr1'):
+                states, goto = self.lr1_builder.build(self.workers)
+            if metrics is not None:
+                metrics.set('syntax.lr1_states', len(states))
+            
+            if self.algorithm == 'lalr1':
+                logger.info("\n[步骤3] 压缩为LALR(1)")
+                with timed(metrics, 'syntax.lalr'):
+                    states, goto = LALRBuilder.merge(states, goto)
+                if metrics is not None:
+                    metrics.set('syntax.lalr_states', len(states))
+        self.states = states
+        
+        # 步骤4: 构建分析表
+        logger.info("\n[步骤4] 生成分析表")
+        with timed(metrics, 'syntax.table'):
+            self.action_table, self.goto_table = self.table_builder.build(states, goto)
+        self.expected_tokens = self.table_builder.expected_tokens
@@ -2,24 +2,55 @@
 文法和产生式定义
 """
 
-from typing import List, Set, Tuple
+import sys
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, field
+from .ebnf import EBNFExpander, has_ebnf
+
+
+# 优先级声明的结合性
+ASSOCIATIVITY = ('left', 'right', 'nonassoc')
 
 
-@dataclass(frozen=True)
 class Production:
     """
     产生式类
     表示: left -> right (例如: E -> E + T)
     
+    不可变；使用__slots__并在构造时缓存哈希值(LR(1)项目集中大量以产生式为键做哈希)
+    
     属性:
         id: 产生式唯一标识
         left: 左部非终结符
         right: 右部符号列表
     """
-    id: int
-    left: str
-    right: Tuple[str, ...]  # 使用tuple确保不可变性
+    __slots__ = ('id', 'left', 'right', '_hash')
+    
+    def __init__(self, id: int, left: str, right: Tuple[str, ...]):
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'left', left)
+        object.__setattr__(self, 'right', tuple(right))  # 使用tuple确保不可变性
+        object.__setattr__(self, '_hash', hash((id, left, self.right)))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Production是不可变对象，不能修改属性'{name}'")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Production是不可变对象，不能删除属性'{name}'")
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Production):
+            return NotImplemented
+        return (self._hash == other._hash and self.id == other.id
+                and self.left == other.left and self.right == other.right)
+    
+    def __reduce__(self):
+        return (Production, (self.id, self.left, self.right))
     
     def __repr__(self):
         return f"{self.left} -> {' '.join(self.right) if self.right else 'ε'}"
@@ -35,11 +66,34 @@ class Grammar:
         start_symbol: 起始符号
         terminals: 终结符集合
         non_terminals: 非终结符集合
+        precedence: 终结符(或%prec使用的名字)的优先级和结合性 {symbol: (level, assoc)}，
+                    level越大优先级越高，assoc为 'left'/'right'/'nonassoc'
+        rule_precedence: 用%prec指定的产生式优先级 {(left, right): symbol}
+        list_rules: EBNF展开出的辅助产生式及其列表语义值动作 {(left, right): action}(见syntax.ebnf)
+    
+    索引(freeze之后可用，augment会自动冻结):
+        nullable: 能推出ε的非终结符
+        suffix_nullable: suffix_nullable[产生式编号][i] 表示右部后缀 right[i:] 能否推出ε
+    左部 -> 产生式的索引随add_production维护，get_productions_by_left不再扫描全部产生式
     """
     productions: List[Production] = field(default_factory=list)
     start_symbol: str = "S'"
     terminals: Set[str] = field(default_factory=set)
     non_terminals: Set[str] = field(default_factory=set)
+    precedence: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+    rule_precedence: Dict[Tuple[str, Tuple[str, ...]], str] = field(default_factory=dict)
+    list_rules: Dict[Tuple[str, Tuple[str, ...]], str] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        # 左部 -> 产生式(冻结后为元组)
+        self._by_left: Dict[str, Sequence[Production]] = {}
+        for production in self.productions:
+            self._by_left.setdefault(production.left, []).append(production)
+        self.frozen = False
+        self.nullable: FrozenSet[str] = frozenset()
+        self.suffix_nullable: Tuple[Tuple[bool, ...], ...] = ()
+        # EBNF展开器(第一次遇到EBNF写法时创建)
+        self._ebnf: Optional[EBNFExpander] = None
     
     def add_production(self, left: str, right: List[str]):
         """
@@ -49,9 +103,18 @@ class Grammar:
             left: 左部非终结符
             right: 右部符号列表
         """
+        if self.frozen:
+            raise RuntimeError(f"文法已冻结，不能再添加产生式: {left} -> {' '.join(right)}")
+        # A -> ε 统一表示为空右部，使圆点一开始就位于末尾(直接归约)
+        if list(right) == ['ε']:
+            right = []
+        # 驻留符号名: 项目集、分析表中的符号比较大多可以按地址完成
+        left = sys.intern(left)
+        right = [sys.intern(symbol) for symbol in right]
         prod_id = len(self.productions)
         prod = Production(prod_id, left, tuple(right))
         self.productions.append(prod)
+        self._by_left.setdefault(left, []).append(prod)
         self.non_terminals.add(left)
         
         # 识别终结符和非终结符 (约定: 大写开头为非终结符)
@@ -61,26 +124,143 @@ class Grammar:
             elif symbol and symbol != 'ε':
                 self.terminals.add(symbol)
     
-    def get_productions_by_left(self, left: str) -> List[Production]:
+    def add_rule(self, rule: str):
+        """
+        解析并添加一条产生式规则，可用 %prec 指定产生式的优先级(同yacc)，
+        可用 X*、X+、X? 和分组等EBNF写法(展开为左递归的辅助产生式，见syntax.ebnf.EBNFExpander)
+        
+        例如: "E -> E + T"、"E -> - E %prec UMINUS"、"P -> Stmt*"、"Args -> E ( , E )*"
+        
+        参数:
+            rule: 产生式规则字符串
+        """
+        if '->' not in rule:
+            raise ValueError(f"产生式规则格式错误: {rule}")
+        left, right = rule.split('->', 1)
+        left = left.strip()
+        right = right.split()
+        prec_symbol = None
+        if '%prec' in right:
+            index = right.index('%prec')
+            if index != len(right) - 2:
+                raise ValueError(f"%prec后应当恰好有一个符号: {rule}")
+            prec_symbol = right[-1]
+            right = right[:index]
+        helpers = []
+        if has_ebnf(right):
+            if self._ebnf is None:
+                self._ebnf = EBNFExpander(self)
+            right, helpers = self._ebnf.expand(left, right)
+        self.add_production(left, right)
+        if prec_symbol is not None:
+            prod = self.productions[-1]
+            self.rule_precedence[(prod.left, prod.right)] = prec_symbol
+        for helper, helper_right, action in helpers:
+            self.add_production(helper, helper_right)
+            self.list_rules[(helper, tuple(helper_right))] = action
+    
+    def set_precedence(self, levels: Sequence[Sequence[str]]):
         """
-        获取某个非终结符的所有产生式
+        设置优先级和结合性声明(同yacc的%left/%right/%nonassoc)
+        
+        参数:
+            levels: 由低到高的优先级列表，每项为 (结合性, 符号1, 符号2, ...)，
+                    例如 [('left', '+', '-'), ('left', '*', '/'), ('right', 'UMINUS')]
+        """
+        self.precedence = {}
+        for level, (assoc, *symbols) in enumerate(levels, start=1):
+            if assoc not in ASSOCIATIVITY:
+                raise ValueError(f"未知的结合性'{assoc}'，应为 {'/'.join(ASSOCIATIVITY)}")
+            for symbol in symbols:
+                self.precedence[sys.intern(symbol)] = (level, assoc)
+    
+    def production_precedence(self, production: Production) -> Optional[Tuple[int, str]]:
+        """
+        产生式的优先级: %prec指定的符号的优先级，否则为右部最后一个声明了优先级的终结符的优先级
+        
+        参数:
+            production: 产生式
+        返回: (level, assoc)，没有优先级时返回None
+        """
+        prec_symbol = self.rule_precedence.get((production.left, production.right))
+        if prec_symbol is not None:
+            return self.precedence.get(prec_symbol)
+        for symbol in reversed(production.right):
+            if symbol in self.terminals and symbol in self.precedence:
+                return self.precedence[symbol]
+        return None
+    
+    def get_productions_by_left(self, left: str) -> Tuple[Production, ...]:
+        """
+        获取某个非终结符的所有产生式(按编号顺序)
         
         参数:
             left: 非终结符
-        返回: 产生式列表
+        返回: 产生式元组
         """
-        return [p for p in self.productions if p.left == left]
+        return tuple(self._by_left.get(left, ()))
     
     def augment(self):
         """
-        增广文法: 添加新的起始产生式 S' -> S
+        增广文法: 添加新的起始产生式 S' -> S 和结束标记$，然后冻结文法(见freeze)
         用于LR分析的标准操作
+        
+        S' -> S 的编号为0，原有产生式的编号都加1(只在这里重建一次产生式对象)
         """
         if self.productions and self.productions[0].left != "S'":
-            original_start = self.productions[0].left if self.productions else "S"
-            self.productions.insert(0, Production(0, "S'", (original_start,)))
-            # 更新所有产生式的ID
-            for i, prod in enumerate(self.productions):
-                self.productions[i] = Production(i, prod.left, prod.right)
+            original_start = self.productions[0].left
+            self.productions = [Production(0, "S'", (original_start,))] + \
+                               [Production(prod.id + 1, prod.left, prod.right) for prod in self.productions]
+            self._by_left = {}
+            for production in self.productions:
+                self._by_left.setdefault(production.left, []).append(production)
             self.start_symbol = "S'"
-            self.non_terminals.add("S'")
+            self.non_terminals = set(self.non_terminals) | {"S'"}
+            self.frozen = False
+        if '$' not in self.terminals:
+            self.terminals = set(self.terminals) | {'$'}
+            self.frozen = False
+        self.freeze()
+    
+    def compute_nullable(self) -> FrozenSet[str]:
+        """
+        计算能推出ε的非终结符: 存在右部全部可空的产生式(迭代到不动点)
+        
+        不要求文法已冻结(冻结后直接用nullable属性)
+        
+        返回: 可空非终结符的集合
+        """
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for production in self.productions:
+                if production.left not in nullable and all(symbol in nullable for symbol in production.right):
+                    nullable.add(production.left)
+                    changed = True
+        return frozenset(nullable)
+    
+    def freeze(self):
+        """
+        冻结文法并建立索引(可空标记、右部后缀可空表)
+        
+        冻结后不能再添加产生式，terminals/non_terminals变为frozenset；各构建器直接查这些索引，
+        不必反复扫描产生式
+        """
+        if self.frozen:
+            return
+        self.terminals = frozenset(self.terminals)
+        self.non_terminals = frozenset(self.non_terminals)
+        self._by_left = {left: tuple(productions) for left, productions in self._by_left.items()}
+        
+        self.nullable = nullable = self.compute_nullable()
+        
+        # 右部后缀是否可空(从右向左递推，末尾的空后缀可空)
+        suffix_nullable = []
+        for production in self.productions:
+            flags = [True] * (len(production.right) + 1)
+            for i in range(len(production.right) - 1, -1, -1):
+                flags[i] = flags[i + 1] and production.right[i] in nullable
+            suffix_nullable.append(tuple(flags))
+        self.suffix_nullable = tuple(suffix_nullable)
+        self.frozen = True
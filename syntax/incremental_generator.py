@@ -0,0 +1,484 @@
+"""
+增量分析表生成
+修改文法中的少数产生式后，复用上一次生成的FIRST/FOLLOW集、LR(1)状态和分析表的行，只重新计算受影响的部分
+"""
+
+import os
+import marshal
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+from utils.metrics import Metrics, timed
+from utils.logger import Logger
+from .grammar import Grammar
+from .generator import ParserGenerator
+from .lr1_builder import LR1Builder
+from .lr_item import LR1Item
+
+
+logger = Logger.get(__name__)
+
+# 缓存格式版本，格式变化时递增(旧缓存被忽略，完整生成)
+CACHE_VERSION = 1
+
+# 产生式的标识: (左部, 右部)
+ProductionKey = Tuple[str, Tuple[str, ...]]
+
+# 编码的LR(1)项目: (登记编号, 圆点位置, 向前看)
+# 登记编号是产生式在BuildCache.productions中的位置，文法修改后不变(产生式编号会变)
+EncodedItem = Tuple[int, int, str]
+Kernel = Tuple[EncodedItem, ...]
+
+# 一个LR(1)状态: (闭包, 各符号的GOTO核心, 圆点后的符号, 展开时用到FIRST集的符号, 用到的产生式)
+StateEntry = Tuple[Kernel, Tuple[Tuple[str, Kernel], ...], Tuple[str, ...], Tuple[str, ...], Tuple[int, ...]]
+
+
+@dataclass
+class BuildCache:
+    """
+    一次分析表生成的中间结果(只含内置类型，可用marshal保存)
+
+    属性:
+        algorithm: 生成算法('lalr1'或'lr1')
+        productions: 产生式登记表 [(左部, 右部), ...]，只增不减，项目中的产生式用登记编号表示
+        grammar: 生成时增广文法各产生式的登记编号(按产生式编号)
+        first_sets: FIRST集
+        follow_sets: FOLLOW集
+        states: 规范LR(1)状态 {核心: StateEntry}
+        rows: 分析表的行 {状态的键: (组成的LR(1)核心, ((终结符, 动作, 值), ...))}，
+              状态的键对LALR(1)为核心项目的心，对LR(1)为核心；有冲突的行不缓存
+    """
+    algorithm: str = 'lalr1'
+    productions: List[ProductionKey] = field(default_factory=list)
+    grammar: List[int] = field(default_factory=list)
+    first_sets: Dict[str, Set[str]] = field(default_factory=dict)
+    follow_sets: Dict[str, Set[str]] = field(default_factory=dict)
+    states: Dict[Kernel, StateEntry] = field(default_factory=dict)
+    rows: Dict[Tuple, Tuple[FrozenSet[Kernel], Tuple[Tuple[str, str, int], ...]]] = field(default_factory=dict)
+
+    def save(self, path: str):
+        """
+        保存到文件(marshal格式，加载时不执行任何代码)
+
+        参数:
+            path: 文件路径
+        """
+        data = {'version': CACHE_VERSION}
+        data.update(self.__dict__)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            marshal.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'BuildCache':
+        """
+        从文件加载
+
+        参数:
+            path: 文件路径
+        返回: BuildCache对象
+        """
+        with open(path, 'rb') as f:
+            data = marshal.load(f)
+        if not isinstance(data, dict) or data.pop('version', None) != CACHE_VERSION:
+            raise ValueError(f"生成缓存格式版本不匹配: {path}")
+        return cls(**data)
+
+
+class IncrementalParserGenerator(ParserGenerator):
+    """
+    增量语法分析生成器
+
+    按内容比较新旧增广文法的产生式，增删产生式的左部为"改变的非终结符"，然后:
+    - FIRST集: 只重算改变的非终结符，以及(经产生式右部)引用它们的非终结符
+    - FOLLOW集: 只重算出现在增删产生式右部的、其后的符号FIRST集改变了的非终结符，以及FOLLOW集继续向下传播到的非终结符
+    - LR(1)状态: 按核心查找上一次的状态，其中没有项目要展开改变的非终结符、展开时用到的FIRST集没变、
+      用到的产生式都还在时，直接复用闭包和GOTO核心
+    - 分析表: 组成的LR(1)状态都被复用(且没有冲突)的行直接复用，其余状态才建立项目集交给TableBuilder
+
+    状态按与LR1Builder.build相同的顺序编号，生成的ACTION/GOTO表与ParserGenerator完全相同。
+
+    用法:
+        generator = IncrementalParserGenerator(grammar, previous=cache)
+        action_table, goto_table = generator.generate()
+        cache = generator.cache      # 交给下一次生成，或 cache.save(path)
+
+    属性(generate之后):
+        cache: 本次生成的BuildCache
+        changed_non_terminals: 改变的非终结符
+        first_recomputed, follow_recomputed: 重新计算了FIRST/FOLLOW集的非终结符
+        reused_states, rebuilt_states: 复用/重新计算的LR(1)状态数
+        reused_rows, rebuilt_rows: 复用/重新生成的分析表行数
+    """
+
+    def __init__(self, grammar: Grammar, previous: Optional[BuildCache] = None,
+                 metrics: Optional[Metrics] = None, unit_rules: Union[bool, Iterable[int]] = False,
+                 algorithm: str = 'lalr1'):
+        """
+        初始化增量生成器
+
+        参数:
+            grammar: 输入的上下文无关文法
+            previous: 上一次生成的BuildCache(没有时完整生成)
+            metrics: 性能统计对象(可选)
+            unit_rules: 同ParserGenerator
+            algorithm: 'lalr1'或'lr1'(其他算法不构建规范LR(1)项目集，没有可复用的部分)
+        """
+        if algorithm not in ('lalr1', 'lr1'):
+            raise ValueError(f"增量生成只支持'lalr1'和'lr1'算法，不支持'{algorithm}'")
+        super().__init__(grammar, metrics, unit_rules, algorithm)
+        self.previous = previous if previous is not None else BuildCache(algorithm)
+        self.cache: Optional[BuildCache] = None
+        self.changed_non_terminals: Set[str] = set()
+        self.first_recomputed: Set[str] = set()
+        self.follow_recomputed: Set[str] = set()
+        self.reused_states = 0
+        self.rebuilt_states = 0
+        self.reused_rows = 0
+        self.rebuilt_rows = 0
+        # 产生式登记表，以及产生式编号与登记编号的对应
+        self._registry: List[ProductionKey] = []
+        self._registry_ids: List[int] = []
+        self._production_ids: Dict[int, int] = {}
+        # 增删的产生式
+        self._edited: List[ProductionKey] = []
+        # FIRST集改变了的符号
+        self._first_changed: Set[str] = set()
+        self._diff()
+
+    def generate(self) -> Tuple[Dict, Dict]:
+        """
+        生成分析表，并记录本次的BuildCache
+
+        返回: (action_table, goto_table)
+        """
+        result = super().generate()
+        logger.info("[增量生成] 改变的非终结符: %d, 重算FIRST: %d, 重算FOLLOW: %d, "
+                    "LR(1)状态 复用/重新计算: %d/%d, 分析表行 复用/重新生成: %d/%d",
+                    len(self.changed_non_terminals), len(self.first_recomputed), len(self.follow_recomputed),
+                    self.reused_states, self.rebuilt_states, self.reused_rows, self.rebuilt_rows)
+        if self.metrics is not None:
+            self.metrics.set('syntax.reused_states', self.reused_states)
+            self.metrics.set('syntax.rebuilt_states', self.rebuilt_states)
+            self.metrics.set('syntax.reused_rows', self.reused_rows)
+        return result
+
+    def _diff(self):
+        """按内容比较新旧产生式，登记新增的产生式"""
+        previous = self.previous
+        self._registry = list(previous.productions)
+        registry_ids = {key: reg_id for reg_id, key in enumerate(self._registry)}
+        for production in self.grammar.productions:
+            key = (production.left, production.right)
+            reg_id = registry_ids.get(key)
+            if reg_id is None:
+                reg_id = registry_ids[key] = len(self._registry)
+                self._registry.append(key)
+            self._registry_ids.append(reg_id)
+        self._production_ids = {reg_id: prod_id for prod_id, reg_id in enumerate(self._registry_ids)}
+        if len(self._production_ids) != len(self._registry_ids):
+            # 重复的产生式(必然有归约-归约冲突)无法按内容对应，不复用上一次的结果
+            logger.warning("[增量生成] 文法含重复的产生式，完整生成")
+            self._production_ids = {}
+
+        old = set(previous.grammar)
+        new = set(self._registry_ids)
+        self._edited = [self._registry[reg_id] for reg_id in sorted(new - old)] + \
+                       [self._registry[reg_id] for reg_id in sorted(old - new)]
+        self.changed_non_terminals = {left for left, _ in self._edited}
+        logger.info("[增量生成] 增删产生式: %d, 改变的非终结符: %s",
+                    len(self._edited), ', '.join(sorted(self.changed_non_terminals)) or '无')
+
+    def _compute_first_follow(self):
+        """只重新计算受修改影响的FIRST/FOLLOW集，其余沿用上一次的结果"""
+        if not self._production_ids:
+            super()._compute_first_follow()
+            return
+
+        grammar = self.grammar
+        calc = self.first_follow_calc
+        previous = self.previous
+        non_terminals = grammar.non_terminals
+
+        # 新旧文法中任一个可空的符号都按可空处理，依赖关系取两者的并集
+        nullable = set(grammar.nullable) | {symbol for symbol, first in previous.first_sets.items() if 'ε' in first}
+
+        # FIRST集: FIRST(A)依赖于A的产生式中可空前缀之后的符号。改变的非终结符及依赖它们的全部非终结符
+        # (反向依赖闭包)一起重算；只重算FIRST集确实变化的部分不够，FIRST依赖成环时
+        # 环上过时的FIRST集会流回被修改的非终结符，使重算结果与旧值相同而不再向外传播
+        first_users: Dict[str, Set[str]] = {}
+        for production in grammar.productions:
+            for symbol in production.right:
+                first_users.setdefault(symbol, set()).add(production.left)
+                if symbol not in nullable:
+                    break
+        seeds = (self.changed_non_terminals & non_terminals) | (non_terminals - set(previous.first_sets))
+        dirty = self._closure(seeds, first_users)
+        calc.first_sets = {symbol: set(first) for symbol, first in previous.first_sets.items()
+                           if symbol in non_terminals and symbol not in dirty}
+        calc.compute_first_sets(dirty)
+        self._first_changed = {symbol for symbol in set(calc.first_sets) | set(previous.first_sets)
+                               if calc.first_sets.get(symbol) != previous.first_sets.get(symbol)}
+        self.first_recomputed = dirty
+
+        # FOLLOW集: 出现在增删产生式右部的、或其后的符号FIRST集改变了的非终结符，
+        # 加上FOLLOW集依赖于它们的全部非终结符(A -> αBβ 且β可空时FOLLOW(B)依赖FOLLOW(A))
+        seeds = set(non_terminals - set(previous.follow_sets))
+        for _, right in self._edited:
+            seeds.update(symbol for symbol in right if symbol in non_terminals)
+        follow_users: Dict[str, Set[str]] = {}
+        for production in grammar.productions:
+            # 从右向左扫描: 后缀中是否有FIRST集改变的符号、后缀是否可空
+            suffix_changed = False
+            suffix_nullable = True
+            for symbol in reversed(production.right):
+                if symbol in non_terminals:
+                    if suffix_changed:
+                        seeds.add(symbol)
+                    if suffix_nullable:
+                        follow_users.setdefault(production.left, set()).add(symbol)
+                suffix_changed = suffix_changed or symbol in self._first_changed
+                suffix_nullable = suffix_nullable and symbol in nullable
+        dirty = self._closure(seeds & non_terminals, follow_users)
+        self.follow_recomputed = dirty
+        calc.follow_sets = {symbol: set(follow) for symbol, follow in previous.follow_sets.items()
+                            if symbol in non_terminals and symbol not in dirty}
+        calc.compute_follow_sets(dirty)
+
+    @staticmethod
+    def _closure(seeds: Set[str], users: Dict[str, Set[str]]) -> Set[str]:
+        """seeds及(沿users)依赖于它们的全部符号"""
+        closure = set(seeds)
+        stack = list(seeds)
+        while stack:
+            for user in users.get(stack.pop(), ()):
+                if user not in closure:
+                    closure.add(user)
+                    stack.append(user)
+        return closure
+
+    def _build_tables(self):
+        """步骤2~4: 复用上一次的LR(1)状态和分析表行"""
+        if not self._production_ids:
+            super()._build_tables()
+            self.rebuilt_states = self.rebuilt_rows = len(self.states)
+            return
+
+        metrics = self.metrics
+        logger.info("\n[步骤2] 构建LR(1)项目集(增量)")
+        self.lr1_builder = LR1Builder(self.grammar, self.first_follow_calc)
+        with timed(metrics, 'syntax.lr1'):
+            kernels, entries, reused = self._build_states()
+        if metrics is not None:
+            metrics.set('syntax.lr1_states', len(kernels))
+
+        lalr = self.algorithm == 'lalr1'
+        if lalr:
+            logger.info("\n[步骤3] 压缩为LALR(1)")
+        with timed(metrics if lalr else None, 'syntax.lalr'):
+            keys, members, goto = self._group_states(kernels, entries)
+        if metrics is not None and lalr:
+            metrics.set('syntax.lalr_states', len(keys))
+
+        logger.info("\n[步骤4] 生成分析表")
+        with timed(metrics, 'syntax.table'):
+            rows = self._build_rows(kernels, entries, reused, keys, members, goto)
+
+        self.states = _LazyStates(self, entries, members)
+        self.cache = BuildCache(
+            algorithm=self.algorithm,
+            productions=self._registry,
+            grammar=self._registry_ids,
+            first_sets=self.first_sets,
+            follow_sets=self.follow_sets,
+            states=dict(zip(kernels, entries)),
+            rows=rows,
+        )
+
+    def _build_states(self):
+        """
+        按LR1Builder.build的顺序生成规范LR(1)状态，能复用的状态取上一次的结果
+
+        返回: (kernels, entries, reused) 各状态的核心、StateEntry和是否复用
+        """
+        previous = self.previous.states
+        production_ids = self._production_ids
+        changed = self.changed_non_terminals
+        first_changed = self._first_changed
+
+        start: Kernel = ((self._registry_ids[0], 0, '$'),)
+        kernels = [start]
+        kernel_ids = {start: 0}
+        entries: List[StateEntry] = []
+        reused: List[bool] = []
+        while len(entries) < len(kernels):
+            kernel = kernels[len(entries)]
+            entry = previous.get(kernel)
+            if entry is not None:
+                _, _, expand, beta, used = entry
+                if changed.isdisjoint(expand) and first_changed.isdisjoint(beta) \
+                        and all(reg_id in production_ids for reg_id in used):
+                    reused.append(True)
+                else:
+                    entry = None
+            if entry is None:
+                entry = self._expand(kernel)
+                reused.append(False)
+            entries.append(entry)
+            for _, successor in entry[1]:
+                if successor not in kernel_ids:
+                    kernel_ids[successor] = len(kernels)
+                    kernels.append(successor)
+
+        self.reused_states = sum(reused)
+        self.rebuilt_states = len(reused) - self.reused_states
+        logger.info("    完成! LR(1)状态数: %d (复用%d个)", len(kernels), self.reused_states)
+        return kernels, entries, reused
+
+    def _expand(self, kernel: Kernel) -> StateEntry:
+        """
+        计算核心的闭包、GOTO核心和依赖的符号
+
+        参数:
+            kernel: 核心
+        返回: StateEntry
+        """
+        builder = self.lr1_builder
+        productions = self.grammar.productions
+        production_ids = self._production_ids
+        registry_ids = self._registry_ids
+        non_terminals = self.grammar.non_terminals
+
+        closure = builder._cached_closure(frozenset(
+            builder.item(productions[production_ids[reg_id]], dot, lookahead) for reg_id, dot, lookahead in kernel))
+        expand, beta, used = set(), set(), set()
+        for item in closure:
+            used.add(registry_ids[item.production.id])
+            symbol = item.next_symbol()
+            if symbol is not None:
+                expand.add(symbol)
+                if symbol in non_terminals:
+                    beta.update(item.production.right[item.dot_position + 1:])
+        successors = tuple((symbol, self._encode(goto)) for symbol, goto in builder.successors(closure))
+        return (self._encode(closure), successors, tuple(sorted(expand)), tuple(sorted(beta)), tuple(sorted(used)))
+
+    def _encode(self, items: Iterable[LR1Item]) -> Kernel:
+        """项目集的规范编码(登记编号)"""
+        registry_ids = self._registry_ids
+        return tuple(sorted((registry_ids[item.production.id], item.dot_position, item.lookahead) for item in items))
+
+    def _group_states(self, kernels: List[Kernel], entries: List[StateEntry]):
+        """
+        LALR(1)按核心项目的心合并LR(1)状态(LR(1)不合并)，编号顺序与LALRBuilder.merge相同
+
+        同心的LR(1)状态的核心项目同心，所以按核心的心分组即可，不必计算整个闭包的心
+
+        返回: (keys, members, goto) 各状态的键、组成的LR(1)状态编号和转移表
+        """
+        lalr = self.algorithm == 'lalr1'
+        group_ids: Dict[Tuple, int] = {}
+        keys: List[Tuple] = []
+        members: List[List[int]] = []
+        lr1_to_group: Dict[Kernel, int] = {}
+        for lr1_id, kernel in enumerate(kernels):
+            key = tuple(sorted({(reg_id, dot) for reg_id, dot, _ in kernel})) if lalr else kernel
+            group = group_ids.get(key)
+            if group is None:
+                group = group_ids[key] = len(keys)
+                keys.append(key)
+                members.append([])
+            members[group].append(lr1_id)
+            lr1_to_group[kernel] = group
+
+        goto: Dict[Tuple[int, str], int] = {}
+        for kernel, entry in zip(kernels, entries):
+            group = lr1_to_group[kernel]
+            for symbol, successor in entry[1]:
+                goto[(group, symbol)] = lr1_to_group[successor]
+        return keys, members, goto
+
+    def _build_rows(self, kernels, entries, reused, keys, members, goto):
+        """
+        生成分析表: 复用组成不变的行，其余状态交给TableBuilder
+
+        返回: 本次的分析表行(写入BuildCache.rows)
+        """
+        previous = self.previous.rows if self.previous.algorithm == self.algorithm else {}
+        production_ids = self._production_ids
+        registry_ids = self._registry_ids
+        non_terminals = self.grammar.non_terminals
+        table_builder = self.table_builder
+
+        rows = {}
+        states: List[Optional[FrozenSet[LR1Item]]] = [None] * len(keys)
+        rebuilt = set()
+        for state_id, key in enumerate(keys):
+            row = previous.get(key)
+            if row is not None and all(reused[lr1_id] for lr1_id in members[state_id]) \
+                    and row[0] == frozenset(kernels[lr1_id] for lr1_id in members[state_id]):
+                rows[key] = row
+                for symbol, action, value in row[1]:
+                    if action == 'shift':
+                        value = goto[(state_id, symbol)]
+                    elif action == 'reduce':
+                        value = production_ids[value]
+                    table_builder.action_table[(state_id, symbol)] = (action, value)
+            else:
+                rebuilt.add(state_id)
+                states[state_id] = self._merged_state(entries, members[state_id])
+        for (state_id, symbol), target in goto.items():
+            if symbol in non_terminals and state_id not in rebuilt:
+                table_builder.goto_table[(state_id, symbol)] = target
+
+        self.action_table, self.goto_table = table_builder.build(states, goto)
+        self.expected_tokens = table_builder.expected_tokens
+        self.rebuilt_rows = len(rebuilt)
+        self.reused_rows = len(keys) - len(rebuilt)
+
+        # 缓存新生成的、没有冲突的行
+        conflicted = {conflict['state'] for conflict in table_builder.conflicts}
+        conflicted.update(state_id for state_id, _ in table_builder.resolved_entries)
+        actions: Dict[int, List[Tuple[str, str, int]]] = {state_id: [] for state_id in rebuilt - conflicted}
+        for (state_id, symbol), (action, value) in self.action_table.items():
+            row = actions.get(state_id)
+            if row is not None:
+                row.append((symbol, action, registry_ids[value] if action == 'reduce' else 0))
+        for state_id, row in actions.items():
+            rows[keys[state_id]] = (frozenset(kernels[lr1_id] for lr1_id in members[state_id]), tuple(row))
+        return rows
+
+    def _merged_state(self, entries: List[StateEntry], lr1_ids: List[int]) -> FrozenSet[LR1Item]:
+        """
+        由编码的闭包建立(合并后的)项目集
+
+        参数:
+            entries: LR(1)状态
+            lr1_ids: 组成的LR(1)状态编号
+        返回: 项目集
+        """
+        builder = self.lr1_builder
+        productions = self.grammar.productions
+        production_ids = self._production_ids
+        return frozenset(builder.item(productions[production_ids[reg_id]], dot, lookahead)
+                         for lr1_id in lr1_ids for reg_id, dot, lookahead in entries[lr1_id][0])
+
+
+class _LazyStates(Sequence):
+    """
+    增量生成的状态列表: 只有被访问时才建立项目集(复用的状态通常不需要)
+    """
+
+    def __init__(self, generator: IncrementalParserGenerator, entries: List[StateEntry],
+                 members: List[List[int]]):
+        self._generator = generator
+        self._entries = entries
+        self._members = members
+
+    def __len__(self):
+        return len(self._members)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._generator._merged_state(self._entries, self._members[index])
@@ -4,9 +4,13 @@ LALR(1)压缩算法
 
 from typing import List, FrozenSet, Dict, Tuple
 from collections import defaultdict
+from utils.logger import Logger
 from .lr_item import LR1Item
 
 
+logger = Logger.get(__name__)
+
+
 class LALRBuilder:
     """LALR(1)构建器 - 通过合并LR(1)同心项实现"""
     
@@ -27,7 +31,7 @@ class LALRBuilder:
             lr1_goto: LR(1)转移表
         返回: (lalr_states, lalr_goto)
         """
-        print("  [合并LR(1)为LALR(1)]")
+        logger.info("  [合并LR(1)为LALR(1)]")
         
         # 按核心分组LR(1)状态
         core_groups: Dict[FrozenSet[Tuple[int, int]], List[int]] = defaultdict(list)
@@ -42,33 +46,13 @@ class LALRBuilder:
         lr1_to_lalr: Dict[int, int] = {}
         
         for core, lr1_ids in core_groups.items():
-            # 合并所有同心状态
-            # 收集所有项目，合并向前看符号
-            item_map: Dict[Tuple[int, int], set] = defaultdict(set)
-            
-            for lr1_id in lr1_ids:
-                for item in lr1_states[lr1_id]:
-                    item_map[item.core()].add(item.lookahead)
-            
-            # 重建项目集
-            merged_items = set()
-            for (prod_id, dot_pos), lookaheads in item_map.items():
-                # 从第一个LR(1)状态获取产生式
-                for lr1_id in lr1_ids:
-                    for item in lr1_states[lr1_id]:
-                        if item.core() == (prod_id, dot_pos):
-                            production = item.production
-                            break
-                    else:
-                        continue
-                    break
-                
-                for lookahead in lookaheads:
-                    merged_items.add(LR1Item(production, dot_pos, lookahead))
+            # 合并所有同心状态: 同心状态的项目集的并集就是合并了向前看符号的项目集
+            # (直接复用LR(1)状态中的项目对象，不必按心收集向前看后重建项目)
+            merged_items = frozenset().union(*(lr1_states[lr1_id] for lr1_id in lr1_ids))
             
             # 创建LALR状态
             lalr_id = len(lalr_states)
-            lalr_states.append(frozenset(merged_items))
+            lalr_states.append(merged_items)
             
             for lr1_id in lr1_ids:
                 lr1_to_lalr[lr1_id] = lalr_id
@@ -80,6 +64,6 @@ class LALRBuilder:
             lalr_next = lr1_to_lalr[lr1_next]
             lalr_goto[(lalr_state, symbol)] = lalr_next
         
-        print(f"    完成! LALR(1)状态数: {len(lalr_states)} (从{len(lr1_states)}个LR(1)状态压缩)")
+        logger.info("    完成! LALR(1)状态数: %d (从%d个LR(1)状态压缩)", len(lalr_states), len(lr1_states))
         
         return lalr_states, lalr_goto
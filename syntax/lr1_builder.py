@@ -2,12 +2,19 @@
 LR(1)项目集规范族构建
 """
 
-from typing import Set, FrozenSet, Dict
-from collections import deque
+import multiprocessing
+from typing import Set, FrozenSet, Dict, List, Optional, Tuple
+from utils.logger import Logger
 from .grammar import Grammar
 from .lr_item import LR1Item
 
 
+logger = Logger.get(__name__)
+
+# 进程间传递的项目集: 排好序的 (产生式编号, 圆点位置, 向前看) 元组
+EncodedItems = Tuple[Tuple[int, int, str], ...]
+
+
 class LR1Builder:
     """LR(1)项目集规范族构建器"""
     
@@ -23,6 +30,13 @@ class LR1Builder:
         self.first_calculator = first_calculator
         self.states = []
         self.goto_table = {}
+        # 闭包缓存: 核心项目集 -> 闭包 (不同状态经GOTO常得到相同的核心)
+        self._closure_cache: Dict[FrozenSet[LR1Item], FrozenSet[LR1Item]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # 项目驻留表: (产生式编号, 圆点位置, 向前看) -> 唯一的LR1Item对象
+        # 同一项目会出现在许多状态中，共享同一个对象可以显著降低内存峰值
+        self._items: Dict[Tuple[int, int, str], LR1Item] = {}
     
     def closure(self, items: Set[LR1Item]) -> FrozenSet[LR1Item]:
         """
@@ -38,6 +52,10 @@ class LR1Builder:
             items: 初始项目集
         返回: 闭包后的项目集
         """
+        grammar = self.grammar
+        non_terminals = grammar.non_terminals
+        suffix_nullable = grammar.suffix_nullable
+        first_of_suffix = self.first_calculator.first_of_suffix
         closure_set = set(items)
         worklist = list(items)
         
@@ -46,21 +64,22 @@ class LR1Builder:
             next_sym = item.next_symbol()
             
             # 如果圆点后是非终结符
-            if next_sym and next_sym in self.grammar.non_terminals:
-                # 计算βa的FIRST集
-                beta = item.production.right[item.dot_position + 1:]  # β
-                beta_a = beta + (item.lookahead,)  # βa
-                first_beta_a = self.first_calculator.first_of_sequence(beta_a)
+            if next_sym and next_sym in non_terminals:
+                # FIRST(βa): β的FIRST集(按右部后缀缓存)，β可推出ε时再加上a
+                production = item.production
+                position = item.dot_position + 1
+                first_beta_a = first_of_suffix(production, position)
+                if suffix_nullable[production.id][position]:
+                    first_beta_a = first_beta_a | {item.lookahead}
                 
-                # 对于B的每个产生式
-                for production in self.grammar.get_productions_by_left(next_sym):
+                # 对于B的每个产生式(查文法的左部索引)
+                for new_production in grammar.get_productions_by_left(next_sym):
                     # 对于FIRST(βa)中的每个符号
                     for lookahead in first_beta_a:
-                        if lookahead != 'ε':
-                            new_item = LR1Item(production, 0, lookahead)
-                            if new_item not in closure_set:
-                                closure_set.add(new_item)
-                                worklist.append(new_item)
+                        new_item = self.item(new_production, 0, lookahead)
+                        if new_item not in closure_set:
+                            closure_set.add(new_item)
+                            worklist.append(new_item)
         
         return frozenset(closure_set)
     
@@ -81,13 +100,55 @@ class LR1Builder:
         
         for item in items:
             if item.next_symbol() == symbol:
-                goto_set.add(item.advance())
+                goto_set.add(self.item(item.production, item.dot_position + 1, item.lookahead))
         
         if goto_set:
-            return self.closure(goto_set)
+            return self._cached_closure(frozenset(goto_set))
         return frozenset()
     
-    def build(self):
+    def item(self, production, dot_position: int, lookahead: str) -> LR1Item:
+        """
+        获取驻留的LR(1)项目(相同的项目总是返回同一个对象)
+        
+        参数:
+            production: 产生式
+            dot_position: 圆点位置
+            lookahead: 向前看符号
+        返回: LR1Item
+        """
+        key = (production.id, dot_position, lookahead)
+        item = self._items.get(key)
+        if item is None:
+            item = self._items[key] = LR1Item(production, dot_position, lookahead)
+        return item
+    
+    def _cached_closure(self, kernel: FrozenSet[LR1Item]) -> FrozenSet[LR1Item]:
+        """按核心项目集缓存的闭包"""
+        result = self._closure_cache.get(kernel)
+        if result is None:
+            self.cache_misses += 1
+            result = self._closure_cache[kernel] = self.closure(kernel)
+        else:
+            self.cache_hits += 1
+        return result
+    
+    def successors(self, state: FrozenSet[LR1Item]) -> List[Tuple[str, FrozenSet[LR1Item]]]:
+        """
+        状态经各符号转移后的核心项目集(按符号排序，保证状态编号与集合的遍历顺序无关)
+        
+        参数:
+            state: 项目集
+        返回: [(符号, GOTO的核心项目集), ...]
+        """
+        kernels: Dict[str, Set[LR1Item]] = {}
+        for item in state:
+            symbol = item.next_symbol()
+            if symbol is not None:
+                kernels.setdefault(symbol, set()).add(
+                    self.item(item.production, item.dot_position + 1, item.lookahead))
+        return [(symbol, frozenset(kernels[symbol])) for symbol in sorted(kernels)]
+    
+    def build(self, workers: int = 1):
         """
         构建LR(1)项目集规范族
         
@@ -98,40 +159,117 @@ class LR1Builder:
            - 如果J非空且不在状态集中，加入状态集
            - 记录转移关系: I --X--> J
         3. 重复步骤2，直到没有新状态产生
+        
+        状态按编号顺序处理，每个状态的后继按符号排序后依次编号，因此编号是确定的
+        
+        参数:
+            workers: 工作进程数，大于1时按批并行计算闭包和GOTO(见_build_parallel)，结果与串行相同
+        返回: (states, goto_table)
         """
-        print("  [构建LR(1)项目集规范族]")
+        if workers > 1:
+            return self._build_parallel(workers)
+        
+        logger.info("  [构建LR(1)项目集规范族]")
         
         # 初始项目: [S' -> ·S, $]
         start_production = self.grammar.productions[0]
-        start_item = LR1Item(start_production, 0, '$')
-        start_state = self.closure({start_item})
+        start_item = self.item(start_production, 0, '$')
+        start_state = self._cached_closure(frozenset({start_item}))
         
         self.states = [start_state]
         state_map = {start_state: 0}
-        worklist = deque([start_state])
-        
-        # 收集所有符号
-        all_symbols = self.grammar.terminals | self.grammar.non_terminals
         
-        while worklist:
-            current_state = worklist.popleft()
-            current_id = state_map[current_state]
-            
-            for symbol in all_symbols:
-                next_state = self.goto(current_state, symbol)
+        # 按编号顺序处理(即广度优先)
+        current_id = 0
+        while current_id < len(self.states):
+            for symbol, kernel in self.successors(self.states[current_id]):
+                next_state = self._cached_closure(kernel)
+                next_id = state_map.get(next_state)
+                if next_id is None:
+                    # 新状态
+                    next_id = state_map[next_state] = len(self.states)
+                    self.states.append(next_state)
                 
-                if next_state:
-                    if next_state not in state_map:
-                        # 新状态
-                        new_id = len(self.states)
-                        self.states.append(next_state)
-                        state_map[next_state] = new_id
-                        worklist.append(next_state)
-                    
-                    # 记录转移
-                    next_id = state_map[next_state]
-                    self.goto_table[(current_id, symbol)] = next_id
-        
-        print(f"    完成! LR(1)状态数: {len(self.states)}")
+                # 记录转移
+                self.goto_table[(current_id, symbol)] = next_id
+            current_id += 1
+        
+        logger.info("    完成! LR(1)状态数: %d", len(self.states))
         
         return self.states, self.goto_table
+    
+    def _build_parallel(self, workers: int):
+        """
+        多进程构建LR(1)项目集规范族
+        
+        每一轮把尚未处理的状态(按编号连续的一段)分给工作进程，工作进程计算闭包和各符号的GOTO核心，
+        以排好序的 (产生式编号, 圆点位置, 向前看) 元组表示项目集；主进程按 (状态编号, 符号) 的顺序
+        用核心查重并分配新编号，与串行构建的处理顺序相同，因此状态编号和GOTO表完全一致
+        
+        参数:
+            workers: 工作进程数
+        返回: (states, goto_table)
+        """
+        logger.info("  [构建LR(1)项目集规范族] %d个工作进程", workers)
+        productions = self.grammar.productions
+        
+        kernels: List[EncodedItems] = [((0, 0, '$'),)]
+        kernel_ids: Dict[EncodedItems, int] = {kernels[0]: 0}
+        closures: List[EncodedItems] = []
+        
+        context = multiprocessing.get_context()
+        with context.Pool(workers, initializer=_init_worker,
+                          initargs=(self.grammar, self.first_calculator.first_sets)) as pool:
+            while len(closures) < len(kernels):
+                frontier = kernels[len(closures):]
+                chunksize = max(1, len(frontier) // (workers * 4))
+                for closure, successors in pool.imap(_expand_kernel, frontier, chunksize):
+                    current_id = len(closures)
+                    closures.append(closure)
+                    for symbol, kernel in successors:
+                        next_id = kernel_ids.get(kernel)
+                        if next_id is None:
+                            next_id = kernel_ids[kernel] = len(kernels)
+                            kernels.append(kernel)
+                        self.goto_table[(current_id, symbol)] = next_id
+        
+        self.states = [frozenset(self.item(productions[prod_id], dot, lookahead)
+                                 for prod_id, dot, lookahead in closure)
+                       for closure in closures]
+        
+        logger.info("    完成! LR(1)状态数: %d", len(self.states))
+        
+        return self.states, self.goto_table
+
+
+# 工作进程中的LR(1)构建器(由_init_worker创建)
+_worker_builder: Optional[LR1Builder] = None
+
+
+def _encode(items) -> EncodedItems:
+    """项目集的规范编码"""
+    return tuple(sorted((item.production.id, item.dot_position, item.lookahead) for item in items))
+
+
+def _init_worker(grammar: Grammar, first_sets: Dict[str, Set[str]]):
+    """工作进程初始化: 用主进程算好的FIRST集创建LR(1)构建器"""
+    global _worker_builder
+    from .first_follow import FirstFollowCalculator
+    calculator = FirstFollowCalculator(grammar)
+    calculator.first_sets = first_sets
+    _worker_builder = LR1Builder(grammar, calculator)
+
+
+def _expand_kernel(kernel: EncodedItems) -> Tuple[EncodedItems, List[Tuple[str, EncodedItems]]]:
+    """
+    工作进程: 计算核心的闭包和各符号的GOTO核心
+    
+    参数:
+        kernel: 核心项目集的编码
+    返回: (闭包的编码, [(符号, GOTO核心的编码), ...])
+    """
+    builder = _worker_builder
+    productions = builder.grammar.productions
+    closure = builder.closure(frozenset(builder.item(productions[prod_id], dot, lookahead)
+                                        for prod_id, dot, lookahead in kernel))
+    return _encode(closure), [(symbol, _encode(goto)) for symbol, goto in builder.successors(closure)]
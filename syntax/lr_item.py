@@ -3,25 +3,52 @@ LR(1)项目定义
 """
 
 from typing import Optional, Tuple
-from dataclasses import dataclass
 from .grammar import Production
 
 
-@dataclass(frozen=True)
 class LR1Item:
     """
     LR(1)项目
     表示: [A -> α·β, a]
     其中·表示当前分析位置，a是向前看符号(lookahead)
     
+    不可变；使用__slots__并缓存哈希值。同一文法的项目共享(引用)同一个Production对象，
+    哈希只用产生式编号计算，不必每次插入集合时重新哈希产生式
+    
     属性:
         production: 所属产生式
         dot_position: 圆点位置(0表示在最左边)
         lookahead: 向前看符号
     """
-    production: Production
-    dot_position: int
-    lookahead: str
+    __slots__ = ('production', 'dot_position', 'lookahead', '_hash')
+    
+    def __init__(self, production: Production, dot_position: int, lookahead: str):
+        object.__setattr__(self, 'production', production)
+        object.__setattr__(self, 'dot_position', dot_position)
+        object.__setattr__(self, 'lookahead', lookahead)
+        object.__setattr__(self, '_hash', hash((production.id, dot_position, lookahead)))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"LR1Item是不可变对象，不能修改属性'{name}'")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"LR1Item是不可变对象，不能删除属性'{name}'")
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, LR1Item):
+            return NotImplemented
+        return (self._hash == other._hash
+                and self.dot_position == other.dot_position
+                and self.lookahead == other.lookahead
+                and (self.production is other.production or self.production == other.production))
+    
+    def __reduce__(self):
+        return (LR1Item, (self.production, self.dot_position, self.lookahead))
     
     def __repr__(self):
         left = self.production.left
@@ -0,0 +1,166 @@
+"""
+Pager最小LR(1)项目集构建(PGM, 弱相容合并)
+"""
+
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from collections import deque
+from utils.logger import Logger
+from .grammar import Grammar
+from .lr1_builder import LR1Builder
+from .lr_item import LR1Item
+
+
+logger = Logger.get(__name__)
+
+# 核心项目 (产生式编号, 圆点位置) -> 向前看集合
+Kernel = Dict[Tuple[int, int], Set[str]]
+
+
+class PagerBuilder:
+    """
+    Pager的PGM算法(Practical General Method)
+
+    与规范LR(1)一样按GOTO逐个生成状态，但新状态与已有的同心状态"弱相容"时直接合并向前看，
+    不再新建状态。弱相容保证合并不会引入新的归约-归约冲突，因此对LR(1)文法得到无冲突的分析表，
+    状态数接近LALR(1)(LALR(1)文法上通常相同)
+    """
+
+    def __init__(self, grammar: Grammar, first_calculator):
+        """
+        初始化
+
+        参数:
+            grammar: 增广文法
+            first_calculator: FIRST集计算器
+        """
+        self.grammar = grammar
+        # 复用LR(1)构建器的闭包计算、闭包缓存和项目驻留
+        self.lr1_builder = LR1Builder(grammar, first_calculator)
+        self.states: List[FrozenSet[LR1Item]] = []
+        self.goto_table: Dict[Tuple[int, str], int] = {}
+        self.merges = 0
+
+    @staticmethod
+    def weakly_compatible(existing: Kernel, new: Kernel) -> bool:
+        """
+        判断两个同心核心是否弱相容(Pager 1977)
+
+        设核心项目为c1..cn，向前看集合分别为Li和Mi，对任意i≠j需满足其一:
+        - Li∩Mj 与 Mi∩Lj 都为空
+        - Li∩Lj 非空
+        - Mi∩Mj 非空
+
+        参数:
+            existing: 已有状态的核心
+            new: 新生成的核心
+        返回: 是否可以合并
+        """
+        cores = list(existing)
+        for i in range(len(cores)):
+            li, mi = existing[cores[i]], new[cores[i]]
+            for j in range(i + 1, len(cores)):
+                lj, mj = existing[cores[j]], new[cores[j]]
+                if (li & mj or mi & lj) and not (li & lj or mi & mj):
+                    return False
+        return True
+
+    def build(self):
+        """
+        构建状态
+
+        算法原理:
+        1. 初始状态的核心为 {[S' -> ·S, $]}
+        2. 处理状态I时，按符号X计算GOTO(I, X)的核心K:
+           - 有与K同心且弱相容的状态J: 把K的向前看并入J，若J的向前看因此增加，重新处理J(传播向前看)
+           - 否则新建状态
+        3. 删除因重新处理而不再可达的状态并连续编号
+
+        返回: (states, goto_table)
+        """
+        logger.info("  [构建Pager最小LR(1)项目集]")
+
+        kernels: List[Kernel] = [{(0, 0): {'$'}}]
+        by_core: Dict[FrozenSet[Tuple[int, int]], List[int]] = {frozenset(kernels[0]): [0]}
+        goto: Dict[Tuple[int, str], int] = {}
+        worklist = deque([0])
+        queued = {0}
+
+        while worklist:
+            state_id = worklist.popleft()
+            queued.discard(state_id)
+            closure = self._closure(kernels[state_id])
+
+            successors: Dict[str, Kernel] = {}
+            for item in closure:
+                symbol = item.next_symbol()
+                if symbol is not None:
+                    kernel = successors.setdefault(symbol, {})
+                    kernel.setdefault((item.production.id, item.dot_position + 1), set()).add(item.lookahead)
+
+            for symbol in sorted(successors):
+                kernel = successors[symbol]
+                target = self._find(kernels, by_core, kernel, goto.get((state_id, symbol)))
+                if target is None:
+                    target = len(kernels)
+                    kernels.append({core: set(lookaheads) for core, lookaheads in kernel.items()})
+                    by_core.setdefault(frozenset(kernel), []).append(target)
+                    changed = True
+                else:
+                    changed = False
+                    for core, lookaheads in kernel.items():
+                        if not lookaheads <= kernels[target][core]:
+                            kernels[target][core] |= lookaheads
+                            changed = True
+                    if changed:
+                        self.merges += 1
+                goto[(state_id, symbol)] = target
+                if changed and target not in queued:
+                    queued.add(target)
+                    worklist.append(target)
+
+        # 只保留从初始状态可达的状态(按首次到达的顺序编号)
+        order = [0]
+        renumber = {0: 0}
+        transitions: Dict[int, List[Tuple[str, int]]] = {}
+        for (state_id, symbol), target in goto.items():
+            transitions.setdefault(state_id, []).append((symbol, target))
+        for state_id in order:
+            for symbol, target in sorted(transitions.get(state_id, [])):
+                if target not in renumber:
+                    renumber[target] = len(order)
+                    order.append(target)
+
+        self.states = [self._closure(kernels[state_id]) for state_id in order]
+        self.goto_table = {(renumber[state_id], symbol): renumber[target]
+                           for (state_id, symbol), target in goto.items() if state_id in renumber}
+
+        logger.info("    完成! 状态数: %d (合并%d次)", len(self.states), self.merges)
+        return self.states, self.goto_table
+
+    def _closure(self, kernel: Kernel) -> FrozenSet[LR1Item]:
+        """核心的LR(1)闭包"""
+        productions = self.grammar.productions
+        builder = self.lr1_builder
+        return builder._cached_closure(frozenset(
+            builder.item(productions[prod_id], dot, lookahead)
+            for (prod_id, dot), lookaheads in kernel.items() for lookahead in lookaheads))
+
+    def _find(self, kernels: List[Kernel], by_core: Dict, kernel: Kernel,
+              preferred: Optional[int]) -> Optional[int]:
+        """
+        查找可以与kernel合并的已有状态
+
+        参数:
+            kernels: 已有状态的核心
+            by_core: 同心状态索引
+            kernel: 新核心
+            preferred: 优先考虑的状态(重新处理时原来的GOTO目标)
+        返回: 状态编号，没有时返回None
+        """
+        candidates = by_core.get(frozenset(kernel), [])
+        if preferred in candidates:
+            candidates = [preferred] + [c for c in candidates if c != preferred]
+        for candidate in candidates:
+            if self.weakly_compatible(kernels[candidate], kernel):
+                return candidate
+        return None
@@ -0,0 +1,102 @@
+"""
+SLR(1)项目集构建
+LR(0)项目集规范族 + FOLLOW集作为向前看
+"""
+
+from typing import Dict, FrozenSet, List, Set, Tuple
+from collections import deque
+from utils.logger import Logger
+from .grammar import Grammar
+from .lr_item import LR1Item
+
+
+logger = Logger.get(__name__)
+
+
+class SLRBuilder:
+    """SLR(1)构建器"""
+
+    def __init__(self, grammar: Grammar, follow_sets: Dict[str, Set[str]]):
+        """
+        初始化SLR(1)构建器
+
+        参数:
+            grammar: 增广文法
+            follow_sets: FOLLOW集(FirstFollowCalculator.follow_sets)
+        """
+        self.grammar = grammar
+        self.follow_sets = follow_sets
+        self.states: List[FrozenSet[LR1Item]] = []
+        self.goto_table: Dict[Tuple[int, str], int] = {}
+
+    def closure(self, kernel: FrozenSet[Tuple[int, int]]) -> FrozenSet[Tuple[int, int]]:
+        """
+        LR(0)项目集的闭包
+
+        参数:
+            kernel: 核心项目 {(产生式编号, 圆点位置)}
+        返回: 闭包后的LR(0)项目集
+        """
+        productions = self.grammar.productions
+        closure_set = set(kernel)
+        worklist = list(kernel)
+        while worklist:
+            prod_id, dot = worklist.pop()
+            right = productions[prod_id].right
+            if dot < len(right) and right[dot] in self.grammar.non_terminals:
+                for production in self.grammar.get_productions_by_left(right[dot]):
+                    item = (production.id, 0)
+                    if item not in closure_set:
+                        closure_set.add(item)
+                        worklist.append(item)
+        return frozenset(closure_set)
+
+    def build(self):
+        """
+        构建SLR(1)状态
+
+        算法原理:
+        1. 构建LR(0)项目集规范族(不带向前看的项目集和GOTO)
+        2. 项目 [A -> α·β] 的向前看取FOLLOW(A)，于是完成项目 [A -> α·] 在FOLLOW(A)上归约
+
+        返回: (states, goto_table)，states中的项目为带向前看的LR1Item，可直接交给TableBuilder
+        """
+        logger.info("  [构建LR(0)项目集规范族]")
+        productions = self.grammar.productions
+
+        start = self.closure(frozenset({(0, 0)}))
+        lr0_states = [start]
+        state_map = {start: 0}
+        worklist = deque([start])
+        while worklist:
+            state = worklist.popleft()
+            state_id = state_map[state]
+            kernels: Dict[str, Set[Tuple[int, int]]] = {}
+            for prod_id, dot in state:
+                right = productions[prod_id].right
+                if dot < len(right):
+                    kernels.setdefault(right[dot], set()).add((prod_id, dot + 1))
+            for symbol in sorted(kernels):
+                next_state = self.closure(frozenset(kernels[symbol]))
+                if next_state not in state_map:
+                    state_map[next_state] = len(lr0_states)
+                    lr0_states.append(next_state)
+                    worklist.append(next_state)
+                self.goto_table[(state_id, symbol)] = state_map[next_state]
+
+        # 以FOLLOW集作为向前看
+        items: Dict[Tuple[int, int, str], LR1Item] = {}
+        self.states = []
+        for state in lr0_states:
+            lr1_state = set()
+            for prod_id, dot in state:
+                production = productions[prod_id]
+                for lookahead in self.follow_sets.get(production.left, ()):
+                    key = (prod_id, dot, lookahead)
+                    if key not in items:
+                        items[key] = LR1Item(production, dot, lookahead)
+                    lr1_state.add(items[key])
+            self.states.append(frozenset(lr1_state))
+
+        logger.info("    完成! LR(0)状态数: %d", len(self.states))
+        return self.states, self.goto_table
@@ -2,11 +2,15 @@
 分析表构建器
 """
 
-from typing import List, FrozenSet, Dict, Tuple
+from typing import List, FrozenSet, Dict, Optional, Set, Tuple
+from utils.logger import Logger
 from .grammar import Grammar
 from .lr_item import LR1Item
 
 
+logger = Logger.get(__name__)
+
+
 class TableBuilder:
     """ACTION表和GOTO表构建器"""
     
@@ -20,8 +24,18 @@ class TableBuilder:
         self.grammar = grammar
         self.action_table = {}
         self.goto_table = {}
+        # 每个状态可接受的终结符(用于语法错误诊断): {state: (terminal, ...)}
+        self.expected_tokens: Dict[int, Tuple[str, ...]] = {}
+        # 未能由优先级声明解决的冲突: [{'state', 'symbol', 'kind', 'actions', 'chosen'}]
+        self.conflicts: List[Dict] = []
+        # 未解决冲突的表项的全部动作(GLR分析时同时执行): {(state, terminal): (action, ...)}
+        self.conflict_actions: Dict[Tuple[int, str], Tuple[Tuple[str, int], ...]] = {}
+        # 由优先级声明解决了冲突的表项
+        self.resolved_entries: Set[Tuple[int, str]] = set()
+        # 每个表项的全部候选动作，项目遍历完后逐项一次性解决
+        self._candidates: Dict[Tuple[int, str], Set[Tuple[str, int]]] = {}
     
-    def build(self, lalr_states: List[FrozenSet[LR1Item]], 
+    def build(self, lalr_states: List[Optional[FrozenSet[LR1Item]]], 
               lalr_goto: Dict[Tuple[int, str], int]):
         """
         构建LALR(1)分析表: ACTION表和GOTO表
@@ -34,13 +48,21 @@ class TableBuilder:
         GOTO表规则:
         如果GOTO(Ii, A) = Ij, 则GOTO[i, A] = j (A为非终结符)
         
+        冲突处理(同yacc): 先收集每个表项的全部候选动作，再逐项一次性解决，结果与项目的遍历顺序无关
+        - 移进-归约: 每个归约分别与移进比较，终结符和产生式都有优先级时，优先级高者胜；
+          优先级相同时按结合性，left归约、right移进、nonassoc两者都淘汰(没有动作剩下时置为错误)
+        - 之后仍剩下多个动作时报告冲突: 有移进时选择移进，否则选择编号较小(文法中较早)的产生式
+        ACTION表中只保留选中的动作，未解决冲突的表项的全部剩余动作另外记录在conflict_actions中
+        
         参数:
-            lalr_states: LALR(1)状态列表
+            lalr_states: LALR(1)状态列表(为None的状态跳过，增量生成时由调用方事先填入复用的表项)
             lalr_goto: LALR(1)转移表
         """
-        print("  [构建分析表]")
+        logger.info("  [构建分析表]")
         
         for state_id, state in enumerate(lalr_states):
+            if state is None:
+                continue
             for item in state:
                 next_sym = item.next_symbol()
                 
@@ -49,15 +71,7 @@ class TableBuilder:
                     if next_sym in self.grammar.terminals:
                         if (state_id, next_sym) in lalr_goto:
                             next_state = lalr_goto[(state_id, next_sym)]
-                            action = ('shift', next_state)
-                            
-                            # 检查冲突
-                            if (state_id, next_sym) in self.action_table:
-                                existing = self.action_table[(state_id, next_sym)]
-                                if existing != action:
-                                    print(f"    [警告] 移进-归约冲突: 状态{state_id}, 符号'{next_sym}'")
-                            else:
-                                self.action_table[(state_id, next_sym)] = action
+                            self._add_action(state_id, next_sym, ('shift', next_state))
                     
                     # GOTO表: A是非终结符
                     elif next_sym in self.grammar.non_terminals:
@@ -72,18 +86,133 @@ class TableBuilder:
                     
                     if production.left == "S'" and lookahead == '$':
                         # 情况3: accept
-                        self.action_table[(state_id, '$')] = ('accept', 0)
+                        self._add_action(state_id, '$', ('accept', 0))
                     else:
-                        action = ('reduce', production.id)
-                        
-                        # 检查冲突
-                        if (state_id, lookahead) in self.action_table:
-                            existing = self.action_table[(state_id, lookahead)]
-                            if existing != action:
-                                print(f"    [警告] 归约-归约冲突: 状态{state_id}, 向前看'{lookahead}'")
-                        else:
-                            self.action_table[(state_id, lookahead)] = action
-        
-        print(f"    完成! ACTION表项: {len(self.action_table)}, GOTO表项: {len(self.goto_table)}")
+                        self._add_action(state_id, lookahead, ('reduce', production.id))
+        
+        for key in sorted(self._candidates):
+            self._resolve(key, self._candidates[key])
+        self._candidates = {}
+        
+        if self.resolved_entries:
+            logger.info("    由优先级声明解决冲突的表项: %d", len(self.resolved_entries))
+        self.conflict_actions = dict(sorted(self.conflict_actions.items()))
+        self.expected_tokens = self.compute_expected_tokens(self.action_table)
+        
+        logger.info("    完成! ACTION表项: %d, GOTO表项: %d", len(self.action_table), len(self.goto_table))
         
         return self.action_table, self.goto_table
+    
+    def _add_action(self, state_id: int, symbol: str, action: Tuple[str, int]):
+        """
+        记录ACTION表项的一个候选动作(冲突在全部项目遍历完后由_resolve解决)
+        
+        参数:
+            state_id: 状态编号
+            symbol: 终结符
+            action: ('shift', next_state)、('reduce', production_id) 或 ('accept', 0)
+        """
+        self._candidates.setdefault((state_id, symbol), set()).add(action)
+    
+    def _resolve(self, key: Tuple[int, str], candidates: Set[Tuple[str, int]]):
+        """
+        由一个表项的全部候选动作确定ACTION表项
+        
+        参数:
+            key: (状态编号, 终结符)
+            candidates: 候选动作集合
+        """
+        if ('accept', 0) in candidates:
+            self.action_table[key] = ('accept', 0)
+            return
+        state_id, symbol = key
+        shifts = [action for action in candidates if action[0] == 'shift']
+        reduces = sorted(action for action in candidates if action[0] == 'reduce')
+        
+        remaining = set(candidates)
+        resolutions = set()
+        if shifts:
+            shift = shifts[0]
+            for reduce in reduces:
+                resolution = self._resolve_shift_reduce(symbol, reduce[1])
+                if resolution is None:
+                    continue
+                resolutions.add(resolution)
+                if resolution != 'reduce':
+                    remaining.discard(reduce)
+                if resolution != 'shift':
+                    remaining.discard(shift)
+        if resolutions:
+            self.resolved_entries.add(key)
+            logger.debug("    状态%d, 符号'%s': 按优先级%s", state_id, symbol,
+                         '、'.join({'shift': '移进', 'reduce': '归约', 'error': '都淘汰(nonassoc)'}[r]
+                                  for r in sorted(resolutions)))
+        
+        if not remaining:
+            # nonassoc: 移进和归约都被淘汰
+            self.action_table.pop(key, None)
+            return
+        shift = next((action for action in remaining if action[0] == 'shift'), None)
+        chosen = shift if shift is not None else min(remaining, key=lambda a: a[1])
+        self.action_table[key] = chosen
+        if len(remaining) > 1:
+            # 优先级声明淘汰的动作也不再作为GLR的候选动作
+            actions = tuple(sorted(remaining))
+            self.conflict_actions[key] = actions
+            self._record_conflict(state_id, symbol, 'shift-reduce' if shift is not None else 'reduce-reduce',
+                                  actions, chosen)
+    
+    def _resolve_shift_reduce(self, symbol: str, prod_id: int) -> Optional[str]:
+        """
+        按优先级声明解决移进-归约冲突
+        
+        参数:
+            symbol: 向前看终结符
+            prod_id: 待归约的产生式编号
+        返回: 'shift'、'reduce'、'error'(nonassoc)，终结符或产生式没有优先级时返回None
+        """
+        symbol_prec = self.grammar.precedence.get(symbol)
+        rule_prec = self.grammar.production_precedence(self.grammar.productions[prod_id])
+        if symbol_prec is None or rule_prec is None:
+            return None
+        if rule_prec[0] != symbol_prec[0]:
+            return 'reduce' if rule_prec[0] > symbol_prec[0] else 'shift'
+        return {'left': 'reduce', 'right': 'shift', 'nonassoc': 'error'}[symbol_prec[1]]
+    
+    def _record_conflict(self, state_id: int, symbol: str, kind: str,
+                         actions: Tuple[Tuple[str, int], ...], chosen: Tuple[str, int]):
+        """记录并报告未能由优先级声明解决的冲突(每个表项一条，actions为全部剩余动作)"""
+        if kind == 'shift-reduce':
+            logger.warning("    [警告] 移进-归约冲突: 状态%d, 符号'%s'，选择移进", state_id, symbol)
+        else:
+            logger.warning("    [警告] 归约-归约冲突: 状态%d, 向前看'%s'，选择产生式%d",
+                           state_id, symbol, chosen[1])
+        self.conflicts.append({
+            'state': state_id,
+            'symbol': symbol,
+            'kind': kind,
+            'actions': actions,
+            'chosen': chosen,
+        })
+    
+    @staticmethod
+    def compute_expected_tokens(action_table: Dict[Tuple[int, str], Tuple[str, int]]) -> Dict[int, Tuple[str, ...]]:
+        """
+        按状态汇总ACTION表中有动作的终结符(只需遍历一次ACTION表)
+        
+        报告语法错误时按状态直接查表得到"期望的输入"，不必再扫描整个ACTION表
+        
+        参数:
+            action_table: ACTION表
+        返回: {state: 排好序的终结符元组}，相同的集合共享同一个元组
+        """
+        grouped: Dict[int, List[str]] = {}
+        for state, terminal in action_table:
+            grouped.setdefault(state, []).append(terminal)
+        
+        shared: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        expected = {}
+        for state, terminals in grouped.items():
+            key = tuple(sorted(terminals))
+            expected[state] = shared.setdefault(key, key)
+        return expected
@@ -0,0 +1,207 @@
+"""
+单产生式(unit production)归约消除
+对生成的ACTION/GOTO表做变换，跳过没有语义动作的 A -> B 归约
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.logger import Logger
+from .grammar import Grammar
+from .table_builder import TableBuilder
+
+
+logger = Logger.get(__name__)
+
+
+class UnitRuleEliminator:
+    """
+    单产生式归约消除器
+
+    对 F -> id、T -> F、E -> T 这样的文法，每个标识符要连续归约三次。
+    设 GOTO[q, X] = r，状态r在向前看a上按单产生式 Y -> X 归约(弹出1个状态后转到GOTO[q, Y])，
+    则可以直接让GOTO[q, X]指向"归约之后"的状态:
+    - r只做这一个单产生式归约(没有其他动作和GOTO): GOTO[q, X] 改为 GOTO[q, Y] (沿链短路)
+    - r在其他向前看上还有移进等动作(如 E -> T· 与 T -> T·*F): 复制出新状态r'，
+      r'在单产生式归约的向前看上使用GOTO[q, Y]的动作，其余动作与r相同，GOTO[q, X] 改为 r'
+
+    栈上留下的是符号X(及其语义值)，占据原来Y的位置，所以只能跳过没有语义动作(即 $$ = $1)的单产生式。
+    被跳过的层次不出现在语法树中，需要时可用 unit_chains 在建树时补回(见LRParser的unit_chains参数)。
+
+    属性:
+        productions: 被跳过的单产生式编号
+        action_table, goto_table, expected_tokens: 变换后的分析表(状态重新连续编号)
+        added_states: 复制出的新状态数
+        bypassed_gotos: 被短路的GOTO表项数
+        unit_chains: {(Y, X): ((左部, 产生式字符串), ...)} 由Y经单产生式推导出X的产生式链(自顶向下)
+    """
+
+    def __init__(self, grammar: Grammar, productions: Optional[Iterable[int]] = None):
+        """
+        初始化
+
+        参数:
+            grammar: 增广后的文法
+            productions: 要跳过的单产生式编号(默认为除 S' -> S 以外的全部单产生式)
+        """
+        self.grammar = grammar
+        # EBNF的 H -> X(X+ 的第一项)构建列表语义值，不能跳过
+        units = {p.id for p in grammar.productions
+                 if len(p.right) == 1 and p.right[0] in grammar.non_terminals and p.left != "S'"
+                 and grammar.list_rules.get((p.left, p.right)) != 'first'}
+        if productions is None:
+            self.productions: Set[int] = units
+        else:
+            self.productions = set(productions)
+            for prod_id in self.productions - units:
+                raise ValueError(f"产生式{prod_id}不是单产生式: {grammar.productions[prod_id]}")
+
+        self.action_table: Dict[Tuple[int, str], Tuple[str, int]] = {}
+        self.goto_table: Dict[Tuple[int, str], int] = {}
+        self.expected_tokens: Dict[int, Tuple[str, ...]] = {}
+        self.added_states = 0
+        self.bypassed_gotos = 0
+        self.unit_chains = self._compute_unit_chains()
+
+    def eliminate(self, action_table: Dict[Tuple[int, str], Tuple[str, int]],
+                  goto_table: Dict[Tuple[int, str], int]):
+        """
+        变换分析表
+
+        参数:
+            action_table: ACTION表
+            goto_table: GOTO表
+        返回: (action_table, goto_table) 变换后的分析表
+        """
+        logger.info("  [消除单产生式归约] 跳过%d个单产生式", len(self.productions))
+
+        # 按状态分组: 动作在变换中不变，只有GOTO被改写
+        self._actions: Dict[int, Dict[str, Tuple[str, int]]] = defaultdict(dict)
+        self._gotos: Dict[int, Dict[str, int]] = defaultdict(dict)
+        for (state, symbol), action in action_table.items():
+            self._actions[state][symbol] = action
+        for (state, symbol), target in goto_table.items():
+            self._gotos[state][symbol] = target
+        self._state_count = 1 + max(set(self._actions) | set(self._gotos) | set(goto_table.values()))
+        self._split_states: Dict[Tuple, int] = {}
+        self._targets: Dict[Tuple[int, str], int] = {}
+
+        # 从状态0出发，只保留变换后仍可到达的状态
+        reachable = {0}
+        queue = deque([0])
+        new_gotos: Dict[int, Dict[str, int]] = {}
+        while queue:
+            state = queue.popleft()
+            new_gotos[state] = {symbol: self._target(state, symbol) for symbol in self._gotos[state]}
+            successors = list(new_gotos[state].values())
+            successors += [value for action, value in self._actions[state].values() if action == 'shift']
+            for successor in successors:
+                if successor not in reachable:
+                    reachable.add(successor)
+                    queue.append(successor)
+
+        self.bypassed_gotos = sum(1 for state in new_gotos for symbol, target in new_gotos[state].items()
+                                  if target != self._gotos[state][symbol])
+
+        # 重新连续编号(保持原有顺序，状态0不变)
+        renumber = {old: new for new, old in enumerate(sorted(reachable))}
+        self.action_table = {}
+        self.goto_table = {}
+        for old, new in renumber.items():
+            for symbol, (action, value) in self._actions[old].items():
+                self.action_table[(new, symbol)] = (action, renumber[value]) if action == 'shift' else (action, value)
+            for symbol, target in new_gotos[old].items():
+                self.goto_table[(new, symbol)] = renumber[target]
+        self.expected_tokens = TableBuilder.compute_expected_tokens(self.action_table)
+
+        logger.info("    完成! 短路GOTO表项: %d, 新增状态: %d, 状态数: %d -> %d",
+                    self.bypassed_gotos, self.added_states,
+                    len(set(s for s, _ in action_table) | set(s for s, _ in goto_table)), len(renumber))
+        del self._actions, self._gotos, self._split_states, self._targets
+        return self.action_table, self.goto_table
+
+    def _target(self, state: int, symbol: str) -> int:
+        """
+        状态state经非终结符symbol转移、并跳过随后的单产生式归约后到达的状态
+
+        参数:
+            state: 归约后露出的栈顶状态q
+            symbol: 归约得到的非终结符X
+        返回: 变换后的GOTO[q, X]
+        """
+        key = (state, symbol)
+        if key in self._targets:
+            return self._targets[key]
+
+        productions = self.grammar.productions
+        target = self._gotos[state][symbol]
+        actions = self._actions[target]
+        units = {lookahead: value for lookahead, (action, value) in actions.items()
+                 if action == 'reduce' and value in self.productions}
+
+        result = target
+        if units:
+            lefts = {productions[value].left for value in units.values()}
+            if len(units) == len(actions) and not self._gotos[target] and len(lefts) == 1:
+                # 纯单产生式归约状态: 沿链短路
+                result = self._target(state, lefts.pop())
+            else:
+                result = self._split(state, target, units)
+
+        self._targets[key] = result
+        return result
+
+    def _split(self, state: int, target: int, units: Dict[str, int]) -> int:
+        """
+        复制状态target，在单产生式归约的向前看上改用归约之后的状态的动作
+
+        参数:
+            state: 栈顶状态q
+            target: GOTO[q, X]
+            units: {向前看: 单产生式编号}
+        返回: 新状态(GOTO冲突无法合并时返回target，不跳过)
+        """
+        productions = self.grammar.productions
+        actions = dict(self._actions[target])
+        gotos = dict(self._gotos[target])
+        for lookahead, prod_id in units.items():
+            after = self._target(state, productions[prod_id].left)
+            action = self._actions[after].get(lookahead)
+            if action is None:
+                del actions[lookahead]
+            else:
+                actions[lookahead] = action
+            for symbol, goto_state in self._gotos[after].items():
+                if gotos.setdefault(symbol, goto_state) != goto_state:
+                    return target
+
+        signature = (frozenset(actions.items()), frozenset(gotos.items()))
+        new_state = self._split_states.get(signature)
+        if new_state is None:
+            new_state = self._split_states[signature] = self._state_count
+            self._state_count += 1
+            self.added_states += 1
+            self._actions[new_state] = actions
+            self._gotos[new_state] = gotos
+        return new_state
+
+    def _compute_unit_chains(self) -> Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]:
+        """
+        计算经被跳过的单产生式 Y =>+ X 的推导链(用于在语法树中补回被跳过的层次)
+
+        返回: {(Y, X): ((Y, "Y -> Z"), (Z, "Z -> X")), ...}
+        """
+        edges: Dict[str, List] = defaultdict(list)
+        for prod_id in sorted(self.productions):
+            production = self.grammar.productions[prod_id]
+            edges[production.left].append((production.right[0], (production.left, str(production))))
+
+        chains = {}
+        for start in list(edges):
+            queue = deque([(start, ())])
+            while queue:
+                symbol, chain = queue.popleft()
+                for child, step in edges.get(symbol, []):
+                    if (start, child) not in chains and child != start:
+                        chains[(start, child)] = chain + (step,)
+                        queue.append((child, chain + (step,)))
+        return chains
@@ -0,0 +1,89 @@
+"""
+测试共用的辅助函数(本模块不是测试，不会被收集)
+- build_compiler / optimize_file: 由文法配置生成词法分析器和分析表，对源程序生成并优化中间代码
+- make_program / random_edit: 随机程序和随机编辑(增量分析、独立分析器模块、GLR等测试共用)
+- make_loop_program: 循环求和的四元式程序(虚拟机和编译器测试共用)
+"""
+
+import os
+import io
+import random
+import contextlib
+
+from lexical import LexicalGenerator, Scanner
+from syntax import Grammar, ParserGenerator
+from driver import LRParser, QuadrupleTable
+from driver.semantic_analyzer_k import MySemanticAnalyzer
+from utils.config_loader import ConfigLoader
+
+
+def build_compiler(config_path: str):
+    """根据文法配置生成词法分析器和LALR(1)分析表(屏蔽生成过程的输出)"""
+    loader = ConfigLoader(os.path.dirname(os.path.abspath(config_path)))
+    config = loader.load(os.path.basename(config_path))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        table, accepting_map = LexicalGenerator().build(config.lexical_rules)
+        grammar = Grammar()
+        for rule_str in config.grammar_rules:
+            left, right = rule_str.split('->')
+            grammar.add_production(left.strip(), [s.strip() for s in right.strip().split()])
+        action_table, goto_table = ParserGenerator(grammar).generate()
+
+    return Scanner(table, accepting_map), grammar, action_table, goto_table
+
+
+def optimize_file(compiler, source_file: str):
+    """
+    对单个源程序生成并优化中间代码
+
+    返回: (原始代码, 优化器, 优化后的代码)，源程序有错误时返回None
+    """
+    lexer, grammar, action_table, goto_table = compiler
+    with open(source_file, 'r', encoding='utf-8') as f:
+        source_code = f.read().strip()
+
+    analyzer = MySemanticAnalyzer()
+    parser = LRParser(grammar, action_table, goto_table, analyzer)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(lexer.scan(source_code))
+    if result != 1:
+        return None
+
+    original = analyzer.get_code()
+    optimizer = analyzer.optimize_code()
+    return original, optimizer, analyzer.get_code()
+
+
+def make_program(statements: int, seed: int = 0) -> str:
+    """生成含声明、赋值、if/while的随机程序"""
+    rng = random.Random(seed)
+    lines = ["int a ;", "int b ;", "a := 1 ;", "b := 2 ;"]
+    for i in range(statements):
+        kind = rng.randrange(3)
+        if kind == 0:
+            lines.append(f"a := a + {rng.randrange(10)} * b ;")
+        elif kind == 1:
+            lines.append(f"if ( a < {rng.randrange(50)} && b != a ) b := b - 1 ; else a := a + 1 ;")
+        else:
+            lines.append(f"while ( b > {rng.randrange(5)} ) {{ b := b - 1 ; }}")
+    return "\n".join(lines)
+
+
+def random_edit(rng: random.Random, source: str):
+    """在随机位置做一次小编辑: 插入/删除/替换一小段文本"""
+    snippets = [" ", "a", "1", " + 1", " ;", "b := 3 ;", "(", ")", "x", "9 ", "while", "{ }"]
+    start = rng.randrange(len(source) + 1)
+    end = min(len(source), start + rng.choice([0, 0, 1, 2, 5]))
+    text = rng.choice(snippets) if rng.random() < 0.8 else ""
+    return start, end, text
+
+
+def make_loop_program() -> QuadrupleTable:
+    """构造 sum = 1 + 2 + ... + n 的循环程序"""
+    code = QuadrupleTable()
+    for line in ['sum := 0', 'i := 1', 'LABEL L1', 'if i > n goto L2',
+                 '%t1 := sum + i', 'sum := %t1', '%t2 := i + 1', 'i := %t2',
+                 'goto L1', 'LABEL L2']:
+        code.append(line)
+    return code
@@ -114,9 +114,7 @@ def test_intermediate_code(config_path: str, source_file: str):
                 output_file = f"generated/{source_name}_ir.txt"
                 os.makedirs("generated", exist_ok=True)
                 
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    for idx, code in enumerate(semantic_analyzer.intermediate_code, 1):
-                        f.write(f"{idx:3d}: {code}\n")
+                semantic_analyzer.intermediate_code.write(output_file)
                 
                 print(f"\n[已保存] 中间代码文件: {output_file}")
             else:
@@ -132,9 +132,7 @@ def test_advanced_file(config_path: str, source_file: str, verbose: bool = True)
             os.makedirs(output_dir, exist_ok=True)
             output_file = os.path.join(output_dir, f"{source_name}_ir.txt")
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for idx, code_line in enumerate(semantic_handler.intermediate_code, 1):
-                    f.write(f"{idx:3d}: {code_line}\n")
+            semantic_handler.intermediate_code.write(output_file)
             
             print(f"\n[已保存] 中间代码已保存至文件: {output_file}")
         
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+中间代码优化测试工具
+对test_programs/intermediate_code下的程序生成三地址码并执行优化，
+报告优化前后的指令数以及每一遍优化的耗时
+"""
+
+import sys
+import io
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import LRParser, QuadrupleTable, IROptimizer, IRVirtualMachine
+from driver.semantic_analyzer_k import MySemanticAnalyzer
+from tests.helpers import build_compiler, optimize_file
+
+
+def test_constant_folding():
+    """常量表达式应被完全折叠，临时变量全部消除"""
+    code = QuadrupleTable()
+    for line in ['%t1 := 5 * 2', '%t2 := 10 + %t1', 'x := %t2', '%t3 := x - 3', 'y := %t3']:
+        code.append(line)
+    optimized = IROptimizer().optimize(code)
+    assert list(optimized) == ['x := 20', 'y := 17'], list(optimized)
+
+
+def test_common_subexpression():
+    """交换律下相同的表达式只计算一次，临时变量槽位被复用"""
+    code = QuadrupleTable()
+    for line in ['%t1 := a * b', '%t2 := c + %t1', '%t3 := b * a', '%t4 := %t3 + d', 'r := %t2 + %t4']:
+        code.append(line)
+    optimized = IROptimizer().optimize(code)
+    assert list(optimized) == ['%t1 := a * b', '%t2 := c + %t1', '%t1 := %t1 + d',
+                               'r := %t2 + %t1'], list(optimized)
+
+
+def test_jumps_preserved():
+    """跨基本块使用的临时变量不被重命名，非常量条件跳转保留"""
+    code = QuadrupleTable()
+    for line in ['%t1 := a + 1', 'if a < b goto L1', 'x := %t1', 'LABEL L1', 'y := %t1']:
+        code.append(line)
+    optimized = IROptimizer().optimize(code)
+    assert list(optimized) == list(code), list(optimized)
+
+
+def test_same_temp_operands():
+    """两个操作数是同一个临时变量(公共子表达式 + 复写传播后的 tX op tX)时，槽位复用不能提前释放"""
+    scanner, grammar, action_table, goto_table = build_compiler(
+        str(project_root / "configs" / "grammar_control_flow.json"))
+    source = ("int a ; int c ; int d ; a := 3 ; "
+              "while ( a > 0 ) { d := a - 1 ; c := ( a + 1 ) * ( a + 1 ) ; a := a - 1 ; }")
+    analyzer = MySemanticAnalyzer()
+    parser = LRParser(grammar, action_table, goto_table, analyzer)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert parser.parse(scanner.scan(source)) == 1
+    code = analyzer.intermediate_code
+    optimized = IROptimizer().optimize(code)
+    expected = IRVirtualMachine(code).run()
+    assert expected['c'] == 4, expected
+    assert IRVirtualMachine(optimized).run() == expected, list(optimized)
+
+
+def test_user_variable_named_like_temp():
+    """名为t1的用户变量不是临时变量: 不被删除或复用，也不与new_temp生成的临时变量重名"""
+    scanner, grammar, action_table, goto_table = build_compiler(
+        str(project_root / "configs" / "grammar_control_flow.json"))
+    analyzer = MySemanticAnalyzer()
+    parser = LRParser(grammar, action_table, goto_table, analyzer)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert parser.parse(scanner.scan("int t1 ; int a ; t1 := 5 ; a := t1 + 1 ;")) == 1
+    code = analyzer.intermediate_code
+    optimized = IROptimizer().optimize(code)
+    assert IRVirtualMachine(code).run() == {'t1': 5, 'a': 6}, list(code)
+    assert IRVirtualMachine(optimized).run() == {'t1': 5, 'a': 6}, list(optimized)
+
+
+def test_opaque_text():
+    """emit()无法解析的文本(如过程调用)原样保存，含这类指令的表不做优化"""
+    analyzer = MySemanticAnalyzer()
+    for line in ['%t1 := 2 * 3', 'param %t1', 'call f, 1', 'x := %t1']:
+        analyzer.emit(line)
+    code = analyzer.intermediate_code
+    assert list(code) == ['%t1 := 2 * 3', 'param %t1', 'call f, 1', 'x := %t1'], list(code)
+    assert code.op(1) == 'text' and code.op(3) == ':='
+    assert list(IROptimizer().optimize(code)) == list(code)
+
+
+def main():
+    """主函数"""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else "configs/grammar_imperative.json"
+    source_dir = Path(sys.argv[2] if len(sys.argv) > 2 else "test_programs/intermediate_code")
+
+    passed = 0
+    unit_tests = [test_constant_folding, test_common_subexpression, test_jumps_preserved,
+                  test_same_temp_operands, test_user_variable_named_like_temp, test_opaque_text]
+    print("=" * 70)
+    print("[单元测试]")
+    for test in unit_tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    compiler = build_compiler(config_path)
+    print("\n" + "=" * 70)
+    print(f"[优化报告] {source_dir}")
+    print("=" * 70)
+
+    pass_times = {}
+    total_before = total_after = 0
+    for source_file in sorted(source_dir.glob("*.txt")):
+        outcome = optimize_file(compiler, str(source_file))
+        if outcome is None:
+            print(f"\n  {source_file.name}: 源程序存在错误，跳过")
+            continue
+        original, optimizer, optimized = outcome
+        total_before += len(original)
+        total_after += len(optimized)
+        for item in optimizer.stats:
+            pass_times[item['pass']] = pass_times.get(item['pass'], 0.0) + item['time']
+
+        print(f"\n  {source_file.name}: {len(original)} -> {len(optimized)} 条指令")
+        for idx, line in enumerate(optimized, 1):
+            print(f"    {idx:3d}: {line}")
+
+    print(f"\n[合计] {total_before} -> {total_after} 条指令")
+    print("[每遍耗时]")
+    for name, seconds in pass_times.items():
+        print(f"  {name:<22} {seconds * 1000:8.3f} ms")
+
+    print(f"\n单元测试通过率: {passed}/{len(unit_tests)}")
+    return 0 if passed == len(unit_tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
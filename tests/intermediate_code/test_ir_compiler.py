@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+三地址码编译器测试工具
+- 检查IRCompiler编译出的Python函数与虚拟机的运行结果一致
+- 对比三种执行方式的速度: 朴素解释器 / 闭包线索化虚拟机 / 编译为Python函数
+"""
+
+import sys
+import io
+import time
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import QuadrupleTable, IRVirtualMachine, IRCompiler, IRRuntimeError
+from driver.quadruple import BINARY_FUNCS, is_constant
+from tests.helpers import build_compiler, optimize_file, make_loop_program
+
+
+CONFIG = str(project_root / "configs" / "grammar_imperative.json")
+SOURCE_DIR = project_root / "test_programs" / "intermediate_code"
+
+
+def naive_interpret(table: QuadrupleTable, inputs=None):
+    """
+    朴素的三地址码解释器(性能对比基准)
+    逐条取出四元式，按操作符字符串分派，变量保存在字典中
+    """
+    code = list(table.quads())
+    labels = {q.result: i for i, q in enumerate(code) if q.op == 'label'}
+    env = dict(inputs or {})
+
+    def value(name):
+        return int(name) if is_constant(name) else env.get(name, 0)
+
+    pc = 0
+    while pc < len(code):
+        q = code[pc]
+        pc += 1
+        if q.op == ':=':
+            env[q.result] = value(q.arg1)
+        elif q.op == 'uminus':
+            env[q.result] = -value(q.arg1)
+        elif q.op == 'j':
+            pc = labels[q.result]
+        elif q.op == 'jnz':
+            if value(q.arg1):
+                pc = labels[q.result]
+        elif q.op.startswith('j'):
+            if BINARY_FUNCS[q.op[1:]](value(q.arg1), value(q.arg2)):
+                pc = labels[q.result]
+        elif q.op != 'label':
+            env[q.result] = BINARY_FUNCS[q.op](value(q.arg1), value(q.arg2))
+    return env
+
+
+def make_table(lines) -> QuadrupleTable:
+    """由三地址码文本构造四元式表"""
+    code = QuadrupleTable()
+    for line in lines:
+        code.append(line)
+    return code
+
+
+def test_structured_loop():
+    """while循环被还原为结构化语句，结果与虚拟机一致"""
+    compiler = IRCompiler()
+    program = compiler.compile(make_loop_program())
+    assert compiler.structured, compiler.source
+    assert 'while True:' in compiler.source and 'pc' not in compiler.source
+    assert program({'n': 100}) == IRVirtualMachine(make_loop_program()).run({'n': 100})
+
+
+def test_if_else_and_nested_loop():
+    """if/else与带多个出口的循环"""
+    code = make_table(['%t1 := a + 1', 'if a < b goto L1', 'x := %t1', 'goto L2',
+                       'LABEL L1', 'y := %t1', 'LABEL L2', 'LABEL L3', 'if x > 100 goto L4',
+                       '%t2 := x * 2', 'x := %t2', 'if x == 64 goto L4', 'goto L3', 'LABEL L4'])
+    compiler = IRCompiler()
+    program = compiler.compile(code)
+    assert compiler.structured, compiler.source
+    vm = IRVirtualMachine(code)
+    for a, b in [(1, 2), (2, 1), (3, 3)]:
+        inputs = {'a': a, 'b': b, 'x': 1}
+        assert program(inputs) == vm.run(inputs), (a, b)
+
+
+def test_unstructured_fallback():
+    """跳入循环体中间的控制流退化为基本块分派，结果仍然正确"""
+    code = make_table(['LABEL A', 'if x > 3 goto B', 'x := x + 1', 'goto A',
+                       'LABEL C', 'x := x + 10', 'LABEL B', 'if x < 10 goto C'])
+    compiler = IRCompiler()
+    program = compiler.compile(code)
+    assert not compiler.structured
+    for x in (0, 5, 20):
+        assert program({'x': x}) == IRVirtualMachine(code).run({'x': x}), x
+
+
+def test_division():
+    """除法向零取整，除零抛出IRRuntimeError"""
+    program = IRCompiler().compile(make_table(['%t1 := 0 - a', 'x := %t1 / 2', 'y := a / b']))
+    assert program({'a': 7, 'b': 2}) == {'a': 7, 'b': 2, 'x': -3, 'y': 3}
+    try:
+        program({'a': 7})
+        assert False, "除零未报错"
+    except IRRuntimeError:
+        pass
+
+
+def test_programs(config_path: str = CONFIG, source_dir: Path = SOURCE_DIR):
+    """测试程序的编译执行结果与虚拟机一致(优化前后)"""
+    compiler = build_compiler(config_path)
+    checked = 0
+    for source_file in sorted(source_dir.glob("*.txt")):
+        outcome = optimize_file(compiler, str(source_file))
+        if outcome is None:
+            continue
+        checked += 1
+        for table in outcome[0], outcome[2]:
+            expected = IRVirtualMachine(table).run()
+            actual = IRCompiler().compile(table)()
+            assert expected == actual, f"{source_file.name}: {expected} != {actual}"
+    assert checked > 0, f"{source_dir}中没有可以运行的程序"
+
+
+def benchmark(n: int = 200000):
+    """三种执行方式运行同一个循环程序的耗时"""
+    table = make_loop_program()
+    vm = IRVirtualMachine(table)
+    program = IRCompiler().compile(table)
+    runners = [('朴素解释器', lambda: naive_interpret(table, {'n': n})['sum']),
+               ('闭包虚拟机', lambda: vm.run({'n': n})['sum']),
+               ('编译为Python', lambda: program({'n': n})['sum'])]
+
+    print(f"\n[性能对比] sum(1..{n})")
+    baseline = None
+    for name, run in runners:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {name:<12} {elapsed * 1000:9.1f} ms  x{baseline / elapsed:6.1f}  结果={result}")
+
+
+def main():
+    """主函数"""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else CONFIG
+    source_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else SOURCE_DIR
+
+    tests = [test_structured_loop, test_if_else_and_nested_loop, test_unstructured_fallback,
+             test_division, lambda: test_programs(config_path, source_dir)]
+    names = ['test_structured_loop', 'test_if_else_and_nested_loop',
+             'test_unstructured_fallback', 'test_division', 'test_programs']
+    passed = 0
+    print("=" * 70)
+    print("[编译器测试]")
+    for name, test in zip(names, tests):
+        try:
+            test()
+            print(f"  [PASS]  {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {name}: {e}")
+
+    benchmark()
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+三地址码虚拟机测试工具
+通过运行生成的中间代码来验证语义分析结果:
+- 对test_programs/intermediate_code中的程序，比较优化前后代码的运行结果
+- 运行带循环的程序，报告虚拟机每秒执行的指令数
+"""
+
+import sys
+import io
+import time
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import QuadrupleTable, IRVirtualMachine, IRRuntimeError
+from tests.helpers import build_compiler, optimize_file, make_loop_program
+
+
+CONFIG = str(project_root / "configs" / "grammar_imperative.json")
+SOURCE_DIR = project_root / "test_programs" / "intermediate_code"
+
+
+def test_arithmetic():
+    """算术语义: 除法向零取整，关系运算结果为0/1"""
+    code = QuadrupleTable()
+    for line in ['%t1 := a / 2', 'x := %t1', '%t2 := 0 - a', '%t3 := %t2 / 2', 'y := %t3',
+                 'z := a < 3', 'w := - a']:
+        code.append(line)
+    result = IRVirtualMachine(code).run({'a': 7})
+    assert result == {'a': 7, 'x': 3, 'y': -3, 'z': 0, 'w': -7}, result
+
+
+def test_loop():
+    """跳转和标号: 循环求和"""
+    vm = IRVirtualMachine(make_loop_program())
+    assert vm.run({'n': 100})['sum'] == 5050
+    assert vm.run({'n': 10})['sum'] == 55
+
+
+def test_runtime_errors():
+    """除零和超出最大步数都应抛出IRRuntimeError"""
+    code = QuadrupleTable()
+    code.append('x := 1 / y')
+    try:
+        IRVirtualMachine(code).run()
+        assert False, "除零未报错"
+    except IRRuntimeError:
+        pass
+    try:
+        IRVirtualMachine(make_loop_program()).run({'n': 10 ** 9}, max_steps=1000)
+        assert False, "死循环未被截断"
+    except IRRuntimeError:
+        pass
+
+
+def test_backpatch():
+    """回填链: 按 if (a < b || a == 0) r := 1; else r := 2; 生成代码"""
+    code = QuadrupleTable()
+    true1 = code.emit_jump('j<', 'a', 'b')         # 0: if a < b goto _
+    false1 = code.emit_jump('j')                   # 1: goto _
+    assert code[0] == 'if a < b goto _'
+    code.backpatch(false1, len(code))
+    true2 = code.emit_jump('j==', 'a', '0')        # 2: if a == 0 goto _
+    false2 = code.emit_jump('j')                   # 3: goto _
+    code.backpatch(code.merge(true1, true2), len(code))
+    code.emit(':=', '1', None, 'r')                # 4
+    exit_list = code.emit_jump('j')                # 5: goto _
+    code.backpatch(false2, len(code))
+    code.emit(':=', '2', None, 'r')                # 6
+    code.backpatch(exit_list, len(code))
+    assert list(code)[:6] == ['if a < b goto 5', 'goto 3', 'if a == 0 goto 5', 'goto 7',
+                              'r := 1', 'goto 8']
+    vm = IRVirtualMachine(code)
+    assert vm.run({'a': 1, 'b': 2})['r'] == 1
+    assert vm.run({'a': 0, 'b': 0})['r'] == 1
+    assert vm.run({'a': 5, 'b': 2})['r'] == 2
+
+    # 多次合并后，一次backpatch填满整条链
+    code = QuadrupleTable()
+    lists = [code.emit_jump('j') for _ in range(4)]
+    merged = code.merge(code.merge(lists[0], lists[1]), code.merge(lists[2], lists[3]))
+    code.backpatch(merged, 4)
+    assert list(code) == ['goto 5'] * 4
+    try:
+        code.emit_jump('j')
+        code.jump_targets()
+        assert False, "未回填的跳转未报错"
+    except ValueError:
+        pass
+
+
+def test_programs(config_path: str = CONFIG, source_dir: Path = SOURCE_DIR):
+    """测试程序优化前后的中间代码运行结果必须一致"""
+    compiler = build_compiler(config_path)
+    checked = 0
+    for source_file in sorted(source_dir.glob("*.txt")):
+        outcome = optimize_file(compiler, str(source_file))
+        if outcome is None:
+            continue
+        checked += 1
+        original, _, optimized = outcome
+        expected = IRVirtualMachine(original).run()
+        actual = IRVirtualMachine(optimized).run()
+        assert expected == actual, f"{source_file.name}: {expected} != {actual}"
+        print(f"    {source_file.name}: {expected}")
+    assert checked > 0, f"{source_dir}中没有可以运行的程序"
+
+
+def main():
+    """主函数"""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else CONFIG
+    source_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else SOURCE_DIR
+
+    tests = [test_arithmetic, test_loop, test_runtime_errors, test_backpatch,
+             lambda: test_programs(config_path, source_dir)]
+    names = ['test_arithmetic', 'test_loop', 'test_runtime_errors', 'test_backpatch',
+             'test_programs']
+    passed = 0
+    print("=" * 70)
+    print("[虚拟机测试]")
+    for name, test in zip(names, tests):
+        try:
+            test()
+            print(f"  [PASS]  {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {name}: {e}")
+
+    vm = IRVirtualMachine(make_loop_program())
+    start = time.perf_counter()
+    vm.run({'n': 500000})
+    elapsed = time.perf_counter() - start
+    print(f"\n[吞吐量] {vm.steps} 条指令, {elapsed:.3f} s, "
+          f"{vm.steps / elapsed / 1e6:.2f} M条指令/秒")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+作用域符号表测试工具
+- ScopedSymbolTable的声明/遮蔽/撤销
+- MySemanticAnalyzer对嵌套复合语句块 { P } 的作用域处理
+- 深层嵌套时进入/退出作用域的耗时
+"""
+
+import sys
+import io
+import time
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import ScopedSymbolTable, IRVirtualMachine
+from tests.helpers import build_compiler, optimize_file
+
+
+CONFIG = str(project_root / "configs" / "grammar_imperative.json")
+
+
+def test_shadowing():
+    """内层声明遮蔽外层，退出作用域后外层声明重新可见"""
+    table = ScopedSymbolTable()
+    table['x'] = 'outer'
+    table.enter_scope()
+    assert table['x'] == 'outer' and not table.declared_in_current_scope('x')
+    table['x'] = 'inner'
+    table['y'] = 'local'
+    assert table['x'] == 'inner' and table.scope_of('x') == 1
+    assert table.exit_scope() == ['x', 'y']
+    assert table['x'] == 'outer' and 'y' not in table and table.level == 0
+    assert dict(table.items()) == {'x': 'outer'}
+
+
+def test_redeclare_same_scope():
+    """同一作用域内重复赋值只覆盖值，退出时不会多弹出"""
+    table = ScopedSymbolTable()
+    table.enter_scope()
+    table['x'] = 1
+    table['x'] = 2
+    assert table.get('x') == 2
+    table.exit_scope()
+    assert table.get('x') is None and len(table) == 0
+
+
+def test_nested_blocks(config_path: str = CONFIG):
+    """嵌套块中的遮蔽变量使用独立的存储，块外变量不受影响"""
+    compiler = build_compiler(config_path)
+    source = project_root / "test_programs" / "intermediate_code" / "ic_test2_scopes.txt"
+    outcome = optimize_file(compiler, str(source))
+    assert outcome is not None, "ic_test2_scopes.txt 分析失败"
+    result = IRVirtualMachine(outcome[0]).run()
+    assert result['x'] == 22 and result['y'] == 122, result
+
+
+def benchmark(depth: int = 20000, names: int = 4):
+    """逐层进入depth个作用域(每层声明names个变量)再全部退出的耗时"""
+    table = ScopedSymbolTable()
+    start = time.perf_counter()
+    for level in range(depth):
+        table.enter_scope()
+        for k in range(names):
+            table[f"v{k}"] = level
+    for _ in range(depth):
+        table.exit_scope()
+    elapsed = time.perf_counter() - start
+    print(f"\n[性能] 嵌套{depth}层, 每层{names}个声明: {elapsed * 1000:.1f} ms")
+
+
+def main():
+    """主函数"""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else CONFIG
+
+    tests = [test_shadowing, test_redeclare_same_scope, lambda: test_nested_blocks(config_path)]
+    names = ['test_shadowing', 'test_redeclare_same_scope', 'test_nested_blocks']
+    passed = 0
+    print("=" * 70)
+    print("[作用域测试]")
+    for name, test in zip(names, tests):
+        try:
+            test()
+            print(f"  [PASS]  {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {name}: {e}")
+
+    benchmark()
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
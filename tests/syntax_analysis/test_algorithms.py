@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分析表构造算法测试工具
+- SLR(1)、LALR(1)、Pager最小LR(1)、规范LR(1)在无冲突的文法上接受相同的语言
+- 状态数: SLR(1) = LALR(1) = Pager <= 规范LR(1)(LALR(1)文法)
+- 非LALR(1)的LR(1)文法: SLR(1)/LALR(1)有冲突，Pager与规范LR(1)无冲突
+"""
+
+import sys
+import io
+import random
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import LRParser
+from lexical import LexicalGenerator, Scanner
+from syntax.generator import ParserGenerator, ALGORITHMS
+from utils.config_loader import ConfigLoader
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+from benchmarks.sentence_generator import SentenceGenerator
+
+
+CONFIGS = ["grammar1_arithmetic.json", "grammar_control_flow.json", "grammar_precedence.json"]
+
+
+def pytest_generate_tests(metafunc):
+    """pytest: test_same_language对每个文法配置各运行一次"""
+    if 'name' in metafunc.fixturenames:
+        metafunc.parametrize('name', CONFIGS)
+
+
+def generate(make_grammar, algorithm: str) -> ParserGenerator:
+    """用algorithm生成分析表(屏蔽生成过程的输出)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(make_grammar(), algorithm=algorithm)
+        generator.generate()
+    return generator
+
+
+def accepts(generator: ParserGenerator, tokens) -> bool:
+    """分析token序列是否被接受"""
+    parser = LRParser(generator.grammar, generator.action_table, generator.goto_table,
+                      lambda production, symbols: {}, expected_tokens=generator.expected_tokens)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser.parse(tokens) == 1
+
+
+def test_same_language(name: str):
+    """各算法的分析表对随机句子及其变异的接受结果相同，状态数 SLR = LALR = Pager <= LR(1)"""
+    config = ConfigLoader(str(project_root / "configs")).load(name)
+    generators = {algorithm: generate(config.to_grammar, algorithm) for algorithm in ALGORITHMS}
+    for algorithm, generator in generators.items():
+        assert not generator.table_builder.conflicts, (algorithm, generator.table_builder.conflicts)
+    states = {algorithm: len(generator.states) for algorithm, generator in generators.items()}
+    assert states['slr1'] == states['lalr1'] == states['pager'] <= states['lr1'], states
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        transition_table, accepting_map = LexicalGenerator().build(config.lexical_rules)
+    sentences = SentenceGenerator(config.grammar_rules, Scanner(transition_table, accepting_map))
+    rng = random.Random(1)
+    outcomes = set()
+    for _ in range(40):
+        tokens = [(terminal, terminal) for terminal, _, _ in sentences.derive(rng.randint(3, 30), rng)]
+        if rng.random() < 0.5 and len(tokens) > 1:
+            del tokens[rng.randrange(len(tokens))]
+        results = {algorithm: accepts(generator, tokens) for algorithm, generator in generators.items()}
+        assert len(set(results.values())) == 1, ([t for t, _ in tokens], results)
+        outcomes.add(results['lalr1'])
+    assert outcomes == {True, False}
+
+
+def test_lr1_not_lalr():
+    """合并同心状态会产生归约-归约冲突的LR(1)文法: 只有Pager和规范LR(1)无冲突"""
+    rules = FAMILIES['lr1_not_lalr'](4)
+    generators = {algorithm: generate(lambda: build_grammar(rules), algorithm) for algorithm in ALGORITHMS}
+    conflicts = {algorithm: len(g.table_builder.conflicts) for algorithm, g in generators.items()}
+    assert conflicts['slr1'] > 0 and conflicts['lalr1'] > 0, conflicts
+    assert conflicts['pager'] == 0 and conflicts['lr1'] == 0, conflicts
+    states = {algorithm: len(g.states) for algorithm, g in generators.items()}
+    assert states['lalr1'] < states['pager'] <= states['lr1'], states
+
+    # Pager与规范LR(1)接受相同的句子
+    grammar = build_grammar(rules)
+    terminals = sorted(grammar.terminals)
+    rng = random.Random(2)
+    for _ in range(200):
+        tokens = [(t, t) for t in (rng.choice(terminals) for _ in range(rng.randint(1, 4)))]
+        assert accepts(generators['pager'], tokens) == accepts(generators['lr1'], tokens), tokens
+
+
+def test_empty_follow():
+    """FOLLOW集为空的非终结符(后面只跟着不能推出终结符串的X): SLR不凭空在$上归约，与LALR接受相同的句子"""
+    rules = ["S -> a A X", "S -> b", "A -> c", "X -> X x"]
+    generators = {algorithm: generate(lambda: build_grammar(rules), algorithm) for algorithm in ('slr1', 'lalr1')}
+    slr = generators['slr1']
+    assert slr.follow_sets['A'] == set()
+    a_to_c = next(p.id for p in slr.grammar.productions if str(p) == "A -> c")
+    assert ('reduce', a_to_c) not in slr.action_table.values(), slr.action_table
+    for text in ("b", "a c", "a c x", "a"):
+        tokens = [(t, t) for t in text.split()]
+        assert accepts(slr, tokens) == accepts(generators['lalr1'], tokens), text
+
+
+def test_unknown_algorithm():
+    """未知的算法名报错"""
+    try:
+        ParserGenerator(build_grammar(FAMILIES['expression_tower'](1)), algorithm='ielr1')
+        assert False, "应当报错"
+    except ValueError:
+        pass
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[分析表构造算法测试]")
+    checks = [(test_same_language, name) for name in CONFIGS]
+    checks += [(test_lr1_not_lalr, None), (test_empty_follow, None), (test_unknown_algorithm, None)]
+    passed = 0
+    for check, name in checks:
+        label = f"{check.__name__}({name})" if name else check.__name__
+        try:
+            check(name) if name else check()
+            print(f"  [PASS]  {label}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {label}: {e}")
+
+    print(f"\n通过率: {passed}/{len(checks)}")
+    return 0 if passed == len(checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+独立分析器模块测试工具
+- 生成的模块与LRParser的分析结果(是否合法、归约序列)一致
+- 语义动作按产生式编号绑定
+- 报告模块的导入耗时以及与LRParser的分析速度对比
+"""
+
+import sys
+import io
+import time
+import random
+import importlib.util
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import ParserModuleGenerator
+from driver import LRParser
+from tests.helpers import build_compiler, make_program, random_edit
+
+
+CONFIG = str(project_root / "configs" / "grammar_control_flow.json")
+ARITHMETIC = str(project_root / "configs" / "grammar_imperative.json")
+
+
+def generate_module(config_path: str, name: str, directory: str):
+    """生成独立分析器模块并导入，返回 (模块, 编译器组件, 导入耗时)"""
+    compiler = build_compiler(config_path)
+    scanner, grammar, action_table, goto_table = compiler
+    generator = ParserModuleGenerator(grammar, action_table, goto_table,
+                                      scanner.transition_table, scanner.accepting_map)
+    path = str(Path(directory) / f"{name}.py")
+    generator.write(path)
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module, compiler, time.perf_counter() - start
+
+
+def reference_parse(compiler, tokens):
+    """用LRParser分析，返回归约序列(有语法错误时返回None)"""
+    _, grammar, action_table, goto_table = compiler
+    parser = LRParser(grammar, action_table, goto_table, lambda production, symbols: {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tokens)
+    return parser.production_sequence if result == 1 else None
+
+
+def module_parse(module, tokens):
+    """用生成的模块分析，用语义动作记录归约序列(有语法错误时返回None)"""
+    sequence = []
+    actions = [(lambda args, p=p: sequence.append(p)) for p in range(len(module.PRODUCTIONS))]
+    try:
+        module.parse(tokens, actions)
+    except module.ParseError:
+        return None
+    return sequence
+
+
+def test_matches_lr_parser(edits: int = 100):
+    """随机程序及其随机编辑: 扫描结果和归约序列都与LRParser相同"""
+    with tempfile.TemporaryDirectory() as directory:
+        module, compiler, _ = generate_module(CONFIG, "control_flow_parser", directory)
+    scanner = compiler[0]
+    rng = random.Random(3)
+    source = make_program(15)
+    valid = 0
+    for step in range(edits):
+        tokens = module.scan(source)
+        assert tokens == scanner.scan(source), f"第{step}步token不一致"
+        expected = reference_parse(compiler, tokens)
+        assert module_parse(module, tokens) == expected, f"第{step}步归约序列不一致"
+        valid += expected is not None
+        start, end, text = random_edit(rng, source)
+        source = source[:start] + text + source[end:] if rng.random() < 0.5 else make_program(5, step)
+    assert valid > 0
+
+
+def test_semantic_actions():
+    """按产生式编号绑定语义动作: 计算表达式语句的值"""
+    with tempfile.TemporaryDirectory() as directory:
+        module, _, _ = generate_module(ARITHMETIC, "imperative_parser", directory)
+    productions = module.PRODUCTIONS
+    actions = {
+        productions.index('E -> E + T'): lambda v: v[0] + v[2],
+        productions.index('E -> E - T'): lambda v: v[0] - v[2],
+        productions.index('T -> T * F'): lambda v: v[0] * v[2],
+        productions.index('F -> ( E )'): lambda v: v[1],
+        productions.index('F -> num'): lambda v: int(v[0]),
+        productions.index('S -> E ;'): lambda v: [v[0]],
+        productions.index('P -> S P'): lambda v: v[0] + v[1],
+    }
+    assert module.parse(module.scan("1 + 2 * 3 ; ( 4 - 1 ) * 5 ;"), actions) == [7, 15]
+    try:
+        module.parse(module.scan("1 + ;"))
+        assert False, "应当报告语法错误"
+    except module.ParseError as e:
+        assert e.position == 2 and e.token == ';' and 'num' in e.expected
+
+
+def benchmark(module, compiler, statements: int = 100):
+    """同一程序: 生成的模块与LRParser(屏蔽输出)的分析耗时对比"""
+    tokens = compiler[0].scan(make_program(statements))
+    start = time.perf_counter()
+    reference_parse(compiler, tokens)
+    generic = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10):
+        module.parse(tokens)
+    generated = (time.perf_counter() - start) / 10
+    print(f"\n[性能] {len(tokens)}个token: LRParser {generic * 1000:.1f} ms, "
+          f"生成的模块 {generated * 1000:.2f} ms ({generic / generated:.0f}x)")
+
+
+def main():
+    """主函数"""
+    with tempfile.TemporaryDirectory() as directory:
+        module, compiler, import_time = generate_module(CONFIG, "control_flow_parser", directory)
+    print("=" * 70)
+    print("[独立分析器模块测试]")
+    print(f"  模块导入耗时: {import_time * 1000:.1f} ms")
+    tests = [test_matches_lr_parser, test_semantic_actions]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    benchmark(module, compiler)
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分析表缓存测试工具
+- 缓存的分析表与重新生成的分析表一致
+- 文法配置或生成选项修改后缓存自动重新生成
+- 跳过单产生式归约时，缓存的分析表得到的语法树与直接生成的相同
+- 从缓存分析时不导入词法/语法分析生成器，并报告冷启动耗时
+"""
+
+import sys
+import io
+import os
+import shutil
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import CompiledTables, LRParser
+from syntax import ParserGenerator
+from utils.config_loader import ConfigLoader
+
+
+CONFIG = str(project_root / "configs" / "grammar_control_flow.json")
+SOURCE = "int a ; a := 1 ; while ( a < 10 ) { a := a + 1 ; }"
+
+# 在新进程中从缓存分析，输出导入的项目模块和耗时
+COLD_START = """
+import sys, time
+start = time.perf_counter()
+from driver import CompiledTables
+tables = CompiledTables.load(sys.argv[1])
+tokens = tables.scanner().scan(sys.argv[2])
+result = tables.parser(lambda production, symbols: {}).parse(tokens)
+elapsed = time.perf_counter() - start
+modules = sorted(m for m in sys.modules if m.split('.')[0] in ('lexical', 'syntax', 'driver', 'utils'))
+print(result, round(elapsed * 1000, 1), ' '.join(modules))
+"""
+
+
+def parse(tables: CompiledTables, source: str):
+    """从分析表扫描并分析，返回 (分析结果, 归约序列)"""
+    tokens = tables.scanner().scan(source)
+    parser = tables.parser(lambda production, symbols: {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tokens)
+    return result, parser.production_sequence
+
+
+def test_roundtrip():
+    """保存后加载的分析表与生成的分析表相同，分析结果一致"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        built = CompiledTables.from_config(CONFIG)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tables.bin")
+        built.save(path)
+        loaded = CompiledTables.load(path)
+    assert loaded.action_table == built.action_table
+    assert loaded.goto_table == built.goto_table
+    assert loaded.transition_table == built.transition_table
+    assert loaded.accepting_map == built.accepting_map
+    assert loaded.expected_tokens == built.expected_tokens
+    assert loaded.grammar.productions == built.grammar.productions
+    assert loaded.grammar.terminals == built.grammar.terminals
+    assert parse(loaded, SOURCE) == parse(built, SOURCE)
+    assert parse(loaded, SOURCE)[0] == 1
+
+
+def test_stale_cache():
+    """文法配置或生成选项修改后重新生成缓存，未修改时直接加载"""
+    with tempfile.TemporaryDirectory() as directory:
+        check_stale_cache(directory)
+
+
+def check_stale_cache(directory: str):
+    """在directory中检查缓存的重新生成"""
+    config = os.path.join(directory, "grammar.json")
+    cache = os.path.join(directory, "grammar_tables.bin")
+    shutil.copy(CONFIG, config)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        first = CompiledTables.cached(config, cache)
+    assert output.getvalue(), "第一次应当运行生成器"
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        second = CompiledTables.cached(config, cache)
+    assert not output.getvalue(), "配置未修改时不应运行生成器"
+    assert second.action_table == first.action_table
+
+    # 生成选项不同时重新生成，同样的选项再次加载时命中缓存
+    for options in ({'algorithm': 'lr1'}, {'unit_rules': True}):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            changed = CompiledTables.cached(config, cache, **options)
+        assert output.getvalue(), f"选项{options}应当重新生成"
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            assert CompiledTables.cached(config, cache, **options).action_table == changed.action_table
+        assert not output.getvalue(), f"选项{options}未修改时不应运行生成器"
+        assert changed.action_table != first.action_table, options
+
+    # 去掉 MS -> error ; 后重新生成
+    text = Path(config).read_text(encoding='utf-8')
+    Path(config).write_text(text.replace('"MS -> error ;",', ''), encoding='utf-8')
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        third = CompiledTables.cached(config, cache)
+    assert output.getvalue(), "配置修改后应当重新生成"
+    assert 'error' not in third.grammar.terminals
+    assert 'error' in first.grammar.terminals
+
+
+def test_unit_rules_tree():
+    """unit_rules生成的缓存保存unit_chains: 从缓存分析得到的语法树与直接生成(并补回层次)的相同"""
+    config = ConfigLoader(str(project_root / "configs")).load(os.path.basename(CONFIG))
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(config.to_grammar(), unit_rules=True)
+        generator.generate()
+        plain = CompiledTables.from_config(CONFIG)
+    assert generator.unit_chains
+    direct = LRParser(generator.grammar, generator.action_table, generator.goto_table,
+                      lambda production, symbols: {}, unit_chains=generator.unit_chains)
+    tokens = plain.scanner().scan(SOURCE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert direct.parse(tokens) == 1
+    expected = direct.get_parse_tree().to_dict()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = os.path.join(directory, "tables.bin")
+        with contextlib.redirect_stdout(io.StringIO()):
+            CompiledTables.cached(CONFIG, cache, unit_rules=True)
+        loaded = CompiledTables.cached(CONFIG, cache, unit_rules=True)
+    assert loaded.unit_chains == generator.unit_chains
+    for tables in (loaded, plain):
+        parser = tables.parser(lambda production, symbols: {})
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert parser.parse(tokens) == 1
+        assert parser.get_parse_tree().to_dict() == expected
+
+
+def test_runtime_imports():
+    """从缓存分析只导入运行时模块"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tables.bin")
+        with contextlib.redirect_stdout(io.StringIO()):
+            CompiledTables.from_config(CONFIG).save(path)
+        output = subprocess.run([sys.executable, '-c', COLD_START, path, SOURCE],
+                                capture_output=True, text=True, cwd=str(project_root),
+                                env={**os.environ, 'PYTHONPATH': str(project_root)}).stdout
+    result, elapsed, *modules = output.strip().splitlines()[-1].split()
+    assert result == '1', output
+    for heavy in ['lexical.generator', 'syntax.generator', 'syntax.lr1_builder',
+                  'driver.semantic_analyzer', 'driver.tree_visualizer', 'utils.visualizer']:
+        assert heavy not in modules, heavy
+    print(f"  冷启动(导入+加载缓存+分析): {elapsed} ms, 导入的项目模块: {len(modules)}个")
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[分析表缓存测试]")
+    tests = [test_roundtrip, test_stale_cache, test_unit_rules_tree, test_runtime_imports]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Earley分析测试工具
+- 差分测试: 各文法配置的随机程序及其变形上，与LALR分析(LRParser)的接受结果和语法树相同
+- 不需要分析表，文法不被增广或冻结；已增广的文法结果相同
+- Leo优化: 右递归的项目集大小与输入长度无关，语法树与关闭优化时相同
+- 可空非终结符、EBNF的空重复、歧义文法和非LALR(1)文法、语法错误
+"""
+
+import sys
+import io
+import random
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import Grammar, ParserGenerator
+from driver import LRParser, EarleyParser, GLRParser
+from benchmarks.bench_pipeline import Pipeline
+from benchmarks.grammar_factory import build_grammar, lr1_not_lalr
+
+
+def make_grammar(rules):
+    """按规则字符串建立文法(不生成分析表)"""
+    grammar = Grammar()
+    for rule in rules:
+        grammar.add_rule(rule)
+    return grammar
+
+
+def words(text: str):
+    """按空格切分的输入(token类型与值相同)"""
+    return [(word, word) for word in text.split()]
+
+
+def quiet(parse, tokens):
+    """屏蔽分析过程的输出"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse(tokens)
+
+
+def lr_parse(grammar, rules, tokens):
+    """生成LALR分析表后用LRParser分析，返回 (是否接受, 语法树)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        action_table, goto_table = ParserGenerator(grammar).generate()
+    parser = LRParser(grammar, action_table, goto_table, lambda production, symbols: {})
+    accepted = quiet(parser.parse, tokens) == 1
+    return accepted, parser.get_parse_tree() if accepted else None
+
+
+def test_matches_lr_parser():
+    """差分测试: 随机程序及删除/重复一个token后的变形，Earley与LRParser的结果相同"""
+    rng = random.Random(7)
+    compared = 0
+    for config in sorted((project_root / "configs").glob("*.json")):
+        pipeline = Pipeline(str(config))
+        lr = LRParser(pipeline.grammar, pipeline.action_table, pipeline.goto_table,
+                      lambda production, symbols: {})
+        earley = EarleyParser(pipeline.grammar)
+        # 分析表有冲突的文法是歧义的(LRParser按默认规则选动作)，Earley可能选另一种推导，只比较是否接受
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = ParserGenerator(build_grammar(pipeline.config.grammar_rules))
+            generator.generate()
+        ambiguous = bool(generator.conflict_actions)
+        for _ in range(4):
+            tokens = pipeline.scan(pipeline.generate(40, rng))
+            variants = [tokens]
+            for _ in range(3):
+                k = rng.randrange(len(tokens))
+                variants.append(tokens[:k] + tokens[k + 1:])
+                variants.append(tokens[:k] + [tokens[k]] + tokens[k:])
+            for variant in variants:
+                expected = quiet(lr.parse, variant) == 1
+                assert quiet(earley.parse, variant) == expected, (config.name, variant)
+                if expected and not ambiguous:
+                    assert earley.get_parse_tree() == lr.get_parse_tree(), config.name
+                compared += 1
+    assert compared > 100
+
+
+def test_no_table_generation():
+    """直接使用未增广的文法，分析后文法不变；增广后的文法得到相同的语法树"""
+    rules = ["E -> E + T", "E -> T", "T -> T * F", "T -> F", "F -> ( E )", "F -> id"]
+    grammar = make_grammar(rules)
+    before = [str(p) for p in grammar.productions]
+    parser = EarleyParser(grammar)
+    tokens = words("id + id * ( id + id )")
+    assert quiet(parser.parse, tokens)
+    tree = parser.get_parse_tree()
+    assert tree.symbol == 'E' and tree.production == "E -> E + T"
+    assert not grammar.frozen and [str(p) for p in grammar.productions] == before
+
+    accepted, lr_tree = lr_parse(grammar, rules, tokens)
+    assert accepted and grammar.frozen
+    augmented = EarleyParser(grammar)
+    assert quiet(augmented.parse, tokens)
+    assert augmented.get_parse_tree() == lr_tree
+    assert [str(n) for n in lr_tree.children] == [str(n) for n in tree.children]
+
+
+def test_right_recursion_leo():
+    """右递归 L -> a L | a: Leo优化使项目集大小不随输入增长，语法树与关闭优化时相同"""
+    sizes = {}
+    for leo in (True, False):
+        parser = EarleyParser(make_grammar(["L -> a L", "L -> a"]), leo=leo)
+        for n in (50, 400):
+            assert quiet(parser.parse, words("a " * n))
+            sizes[(leo, n)] = parser.stats['max_set']
+        tree = parser.get_parse_tree()
+        depth = 0
+        while tree.children:
+            assert tree.production == ("L -> a L" if len(tree.children) == 2 else "L -> a")
+            tree = tree.children[-1]
+            depth += 1
+        assert depth == 400
+    assert sizes[(True, 50)] == sizes[(True, 400)], sizes
+    assert sizes[(False, 400)] > 300, sizes
+
+    # 右递归嵌在其他结构中: 语句序列 P -> S P | ε，S -> id = E ; | { P }
+    rules = ["P -> S P", "P -> ε", "S -> id = E ;", "S -> { P }", "E -> id"]
+    tokens = words("id = id ; { id = id ; { } id = id ; } " * 30)
+    trees = []
+    for leo in (True, False):
+        parser = EarleyParser(make_grammar(rules), leo=leo)
+        assert quiet(parser.parse, tokens)
+        trees.append(parser.get_parse_tree())
+    assert trees[0] == trees[1]
+    assert lr_parse(make_grammar(rules), rules, tokens) == (True, trees[0])
+
+
+def test_nullable():
+    """可空非终结符: 隐藏左递归、连续的空推导、EBNF的空重复、空输入"""
+    # 隐藏左递归不是LALR(1)文法，与GLR分析的(唯一)语法树比较
+    rules = ["S -> A S c", "S -> d", "A -> ε", "A -> x"]
+    grammar = make_grammar(rules)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(grammar)
+        action_table, goto_table = generator.generate()
+    glr = GLRParser(grammar, action_table, goto_table, generator.conflict_actions)
+    parser = EarleyParser(grammar)
+    for text in ("d", "d c", "x d c c", "d c c", "x x d c c c"):
+        assert quiet(parser.parse, words(text)) and quiet(glr.parse, words(text)), text
+        assert parser.get_parse_tree() == glr.get_parse_tree(), text
+    assert not quiet(parser.parse, words("x d"))
+
+    rules = ["P -> Decl* Stmt*", "Decl -> int id ;", "Stmt -> id = Opt ;", "Opt -> ( id )?"]
+    parser = EarleyParser(make_grammar(rules))
+    for text in ("", "int id ;", "id = ;", "int id ; int id ; id = id ; id = ;"):
+        accepted, lr_tree = lr_parse(make_grammar(rules), rules, words(text))
+        assert quiet(parser.parse, words(text)) and accepted, text
+        assert parser.get_parse_tree() == lr_tree, text
+    assert parser.get_parse_tree().production == "P -> Decl_star Stmt_star"
+
+    # 多层可空: 空输入的语法树用推出ε的产生式展开
+    parser = EarleyParser(make_grammar(["S -> A B", "A -> B B", "B -> b", "B -> ε"]))
+    assert quiet(parser.parse, [])
+    tree = parser.get_parse_tree()
+    assert [child.production for child in tree.children] == ["A -> B B", "B -> ε"]
+    assert quiet(parser.parse, words("b")) and quiet(parser.parse, words("b b b"))
+    assert not quiet(parser.parse, words("b b b b"))
+
+
+def test_ambiguous_and_non_lalr():
+    """歧义文法和非LALR(1)文法: 与GLR分析的接受结果相同"""
+    rules = ["E -> E + E", "E -> E * E", "E -> ( E )", "E -> id"]
+    grammar = make_grammar(rules)
+    earley = EarleyParser(grammar)
+    assert quiet(earley.parse, words("id + id * id + id"))
+    tree = earley.get_parse_tree()
+    assert tree.symbol == 'E' and len(tree.children) == 3
+
+    rules = lr1_not_lalr(3)
+    earley = EarleyParser(make_grammar(rules))
+    grammar = make_grammar(rules)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(grammar)
+        action_table, goto_table = generator.generate()
+    glr = GLRParser(grammar, action_table, goto_table, generator.conflict_actions)
+    for text in ("a0 c d0", "b1 c d1", "a2 c e2", "b0 c e0", "a0 c d1", "a1 c", "b2 c d2 d2"):
+        assert quiet(earley.parse, words(text)) == quiet(glr.parse, words(text)), text
+
+
+def test_syntax_error():
+    """语法错误: 记录出错位置和期望的终结符"""
+    parser = EarleyParser(make_grammar(["S -> if C then S", "S -> id", "C -> id == id"]))
+    assert not quiet(parser.parse, words("if id == id id"))
+    error = parser.errors[-1]
+    assert error['index'] == 4 and error['token'] == 'id' and error['expected'] == ('then',), error
+    assert parser.get_parse_tree() is None
+
+    assert not quiet(parser.parse, words("if id == id then"))
+    error = parser.errors[-1]
+    assert error['index'] == 5 and error['token'] == '$' and error['expected'] == ('id', 'if'), error
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[Earley分析测试]")
+    tests = [test_matches_lr_parser, test_no_table_generation, test_right_recursion_leo,
+             test_nullable, test_ambiguous_and_non_lalr, test_syntax_error]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
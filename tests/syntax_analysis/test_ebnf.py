@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EBNF写法测试工具
+- X*、X+、X?、分组展开为左递归的辅助产生式，相同片段共用辅助非终结符
+- 原有配置文件的规则(含终结符 ( ) * + 等)展开结果不变
+- 用 Stmt* 写的语句序列分析栈深度不随语句个数增长
+- list_values: 辅助产生式的语义值为逐项追加的列表
+"""
+
+import sys
+import io
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import Grammar, ParserGenerator
+from driver import LRParser
+from utils.config_loader import ConfigLoader
+
+
+STATEMENTS = [
+    "P -> Stmt*",
+    "Stmt -> id := E ;",
+    "Stmt -> print ( E ( , E )* ) ;",
+    "Stmt -> if E then Stmt ( else Stmt )? fi",
+    "Stmt -> { Stmt+ }",
+    "E -> E + id",
+    "E -> ( E )",
+    "E -> id",
+]
+
+# 右递归的语句序列(对照)
+RIGHT_RECURSIVE = ["P -> Stmt P", "P -> ε"] + STATEMENTS[1:]
+
+
+def make_grammar(rules):
+    """由规则字符串建立文法"""
+    grammar = Grammar()
+    for rule in rules:
+        grammar.add_rule(rule)
+    return grammar
+
+
+def build(rules):
+    """生成分析表，返回 (文法, ACTION表, GOTO表)"""
+    grammar = make_grammar(rules)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(grammar)
+        action_table, goto_table = generator.generate()
+    assert not generator.table_builder.conflicts, generator.table_builder.conflicts
+    return grammar, action_table, goto_table
+
+
+KEYWORDS = {'print', 'if', 'then', 'else', 'fi'}
+
+
+def parse(parser, text) -> int:
+    """分析按空格切分的源程序(屏蔽分析过程的输出)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser.parse(tokens_of(text))
+
+
+def tokens_of(text):
+    """按空格切分的token序列(关键字以外的单词为id)"""
+    return [('id' if word.isalpha() and word not in KEYWORDS else word, word) for word in text.split()]
+
+
+def test_expansion():
+    """展开结果: 左递归辅助产生式、共用辅助非终结符、列表语义值动作"""
+    grammar = make_grammar(STATEMENTS + ["Q -> Stmt* ;"])
+    rules = {str(p): grammar.list_rules.get((p.left, p.right)) for p in grammar.productions}
+    assert rules["P -> Stmt_star"] is None
+    assert rules["Stmt_star -> ε"] == 'new'
+    assert rules["Stmt_star -> Stmt_star Stmt"] == 'append'
+    assert rules["Stmt_star2 -> Stmt_star2 , E"] == 'append'
+    assert rules["Stmt_opt -> else Stmt"] == 'item' and rules["Stmt_opt -> ε"] == 'none'
+    assert rules["Stmt_plus -> Stmt"] == 'first'
+    assert rules["Q -> Stmt_star ;"] is None
+    assert sum(p.left == 'Stmt_star' for p in grammar.productions) == 2, "Stmt* 应当共用辅助非终结符"
+    assert "Stmt -> print ( E Stmt_star2 ) ;" in rules
+    assert "E -> ( E )" in rules and "E -> E + id" in rules
+
+
+def test_configs_unchanged():
+    """原有配置文件的规则展开后与逐条按空格切分的结果相同"""
+    loader = ConfigLoader(str(project_root / "configs"))
+    for path in sorted((project_root / "configs").glob("*.json")):
+        config = loader.load(path.name)
+        grammar = config.to_grammar()
+        expected = []
+        for rule in config.grammar_rules:
+            left, right = rule.split('->', 1)
+            right = right.split()
+            if '%prec' in right:
+                right = right[:right.index('%prec')]
+            expected.append((left.strip(), tuple(s for s in right if s != 'ε')))
+        assert [(p.left, p.right) for p in grammar.productions] == expected, path.name
+        assert not grammar.list_rules, path.name
+
+
+def max_stack_depth(rules, statements: int) -> int:
+    """分析statements条语句的程序，返回分析栈的最大深度"""
+    grammar, action_table, goto_table = build(rules)
+    depths = []
+    parser = LRParser(grammar, action_table, goto_table,
+                      lambda production, symbols: depths.append(len(parser.state_stack)) or {})
+    source = " ".join(["x := y + z ;", "print ( x , y , z ) ;", "if x then { y := z ; } else y := x ; fi"]
+                      * (statements // 3))
+    assert parse(parser, source) == 1
+    return max(depths)
+
+
+def test_constant_stack_depth():
+    """Stmt* 的分析栈深度与语句个数无关，右递归的对照文法线性增长"""
+    assert max_stack_depth(STATEMENTS, 30) == max_stack_depth(STATEMENTS, 300)
+    assert max_stack_depth(RIGHT_RECURSIVE, 300) > max_stack_depth(RIGHT_RECURSIVE, 30) + 200
+
+
+def test_list_values():
+    """list_values=True时辅助产生式的值为列表/可选值，其余产生式仍调用语义处理器"""
+    grammar, action_table, goto_table = build(STATEMENTS)
+    reduced = []
+
+    def handler(production, symbols):
+        reduced.append(production.left)
+        if production.left == 'E':
+            return symbols[-1].value
+        return {'kind': symbols[0].value, 'parts': [s.value for s in symbols[1:]]}
+
+    parser = LRParser(grammar, action_table, goto_table, handler, list_values=True)
+    source = "print ( a , b , c ) ; if x then y := z ; fi { a := b ; b := a ; }"
+    assert parse(parser, source) == 1
+    assert not any(left.startswith('Stmt_') for left in reduced), "辅助产生式不应调用语义处理器"
+
+    program = parser.symbol_stack[-1].attributes['kind']
+    assert [stmt['kind'] for stmt in program] == ['print', 'if', '{']
+    assert program[0]['parts'][2] == [(',', 'b'), (',', 'c')]
+    assert program[1]['parts'][3] is None
+    assert [stmt['kind'] for stmt in program[2]['parts'][0]] == ['a', 'b']
+
+
+def test_compiled_tables_keep_list_rules():
+    """保存和加载分析表缓存后list_rules不变"""
+    import tempfile
+    from driver import CompiledTables
+    grammar, action_table, goto_table = build(STATEMENTS)
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "tables.bin")
+        CompiledTables(grammar, action_table, goto_table, {}, {}).save(path)
+        loaded = CompiledTables.load(path)
+    assert loaded.grammar.list_rules == grammar.list_rules
+    parser = loaded.parser(list_values=True)
+    assert parse(parser, "x := y ; x := x ;") == 1
+    assert len(parser.symbol_stack[-1].value) == 2
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[EBNF写法测试]")
+    tests = [test_expansion, test_configs_unchanged, test_constant_stack_depth, test_list_values,
+             test_compiled_tables_keep_list_rules]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
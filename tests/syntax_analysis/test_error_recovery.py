@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+语法错误恢复测试工具
+- 文法含error伪终结符时(yacc风格)，一遍分析报告所有出错的语句
+- 文法不含error时，按FOLLOW集做紧急恢复
+- 错误信息中的期望token/字符来自预先计算的表
+- 报告含大量错误的文件的分析耗时
+"""
+
+import sys
+import io
+import time
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import LRParser
+from tests.helpers import build_compiler
+
+
+CONTROL_FLOW = str(project_root / "configs" / "grammar_control_flow.json")
+IMPERATIVE = str(project_root / "configs" / "grammar_imperative.json")
+
+
+def parse_with_recovery(compiler, source: str, **kwargs):
+    """错误恢复模式下分析，返回 (分析结果, 错误列表, token序列)"""
+    scanner, grammar, action_table, goto_table = compiler
+    tokens = scanner.scan(source)
+    parser = LRParser(grammar, action_table, goto_table, lambda production, symbols: {}, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tokens, recover=True)
+    return result, parser.errors, tokens
+
+
+def test_error_productions(compiler=None):
+    """MS -> error ; 使每条出错的语句各报告一次，之后的语句继续分析"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    source = ("int a ; a := 1 + ; int b ; b := ( a ; "
+              "while ( a < 3 ) { a := a + 1 ; a 2 ; } b := b * 2 ;")
+    result, errors, tokens = parse_with_recovery(compiler, source)
+    assert result is False
+    assert len(errors) == 3, errors
+    assert [tokens[e['index']][1] for e in errors] == [';', ';', '2']
+
+
+def test_valid_program_unchanged(compiler=None):
+    """没有错误时，恢复模式与普通模式的结果相同"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    result, errors, _ = parse_with_recovery(compiler, "int a ; if ( a > 0 ) a := 1 ; else a := 2 ;")
+    assert result == 1 and errors == []
+
+
+def test_panic_mode():
+    """文法不含error时，按FOLLOW集同步，仍能找到后面的错误"""
+    compiler = build_compiler(IMPERATIVE)
+    source = "int x ; x := 10 + ; x := x * 2 ; int ; y := ( 3 ; z := 4 ;"
+    result, errors, tokens = parse_with_recovery(compiler, source)
+    assert result is False
+    assert len(errors) == 3, errors
+    assert [tokens[e['index']][1] for e in errors] == [';', ';', ';']
+
+
+def test_error_at_end(compiler=None):
+    """输入在语句中间结束"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    result, errors, _ = parse_with_recovery(compiler, "int a ; a := a +")
+    assert result is False and len(errors) == 1
+
+
+def test_max_errors(compiler=None):
+    """超过max_errors个错误时停止分析"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    source = "a := ; " * 20
+    result, errors, _ = parse_with_recovery(compiler, source, max_errors=5)
+    assert result is False and len(errors) == 5
+
+
+def test_expected_tokens(compiler=None):
+    """错误信息列出出错状态期望的终结符，与逐项扫描ACTION表的结果相同"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    _, _, action_table, _ = compiler
+    result, errors, _ = parse_with_recovery(compiler, "int a ; a := 1 + ; a := 2 ; while a )")
+    assert len(errors) == 2
+    for error in errors:
+        brute = tuple(sorted(t for (s, t) in action_table if s == error['state']))
+        assert error['expected'] == brute
+        assert ', '.join(brute) in error['message']
+    assert 'id' in errors[0]['expected'] and '(' in errors[1]['expected']
+
+
+def test_scanner_errors(compiler=None):
+    """无法识别的字符被跳过，并记录该处DFA状态期望的字符"""
+    compiler = compiler or build_compiler(CONTROL_FLOW)
+    scanner = compiler[0]
+    tokens = scanner.scan("a := 1 # 2 ; b :")
+    assert [t[1] for t in tokens] == ['a', ':=', '1', '2', ';', 'b']
+    assert [e['char'] for e in scanner.errors] == ['#', None]
+    assert '=' == scanner.errors[1]['expected']
+    assert scanner.scan("a := 1 ;") and scanner.errors == []
+
+
+def benchmark(compiler, statements: int = 300):
+    """每10条语句中有1条错误的大文件: 一遍分析报告全部错误"""
+    lines = []
+    for i in range(statements):
+        lines.append("a := a + ;" if i % 10 == 0 else f"a := a + {i} ;")
+    source = "int a ; " + " ".join(lines)
+    start = time.perf_counter()
+    result, errors, tokens = parse_with_recovery(compiler, source, max_errors=statements)
+    elapsed = time.perf_counter() - start
+    assert len(errors) == statements // 10
+    print(f"\n[性能] {len(tokens)}个token, {len(errors)}个错误: 一遍分析 {elapsed * 1000:.1f} ms")
+
+
+def main():
+    """主函数"""
+    compiler = build_compiler(CONTROL_FLOW)
+    tests = [
+        ('test_error_productions', lambda: test_error_productions(compiler)),
+        ('test_valid_program_unchanged', lambda: test_valid_program_unchanged(compiler)),
+        ('test_panic_mode', test_panic_mode),
+        ('test_error_at_end', lambda: test_error_at_end(compiler)),
+        ('test_max_errors', lambda: test_max_errors(compiler)),
+        ('test_expected_tokens', lambda: test_expected_tokens(compiler)),
+        ('test_scanner_errors', lambda: test_scanner_errors(compiler)),
+    ]
+    passed = 0
+    print("=" * 70)
+    print("[错误恢复测试]")
+    for name, test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {name}: {e}")
+
+    benchmark(compiler)
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
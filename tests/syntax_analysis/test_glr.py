@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GLR分析测试工具
+- 无冲突的文法上与LRParser的语法树相同，全程走确定性快速路径
+- 歧义文法: 分析森林中的推导个数正确(E -> E + E | E * E 为Catalan数)，列举的语法树互不相同
+- 非LALR(1)文法、隐藏左递归、悬空else、语法错误、优先级声明解决的冲突不再分叉
+"""
+
+import sys
+import io
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import Grammar, ParserGenerator
+from driver import LRParser, GLRParser
+from tests.helpers import build_compiler, make_program
+
+
+def build(rules, precedence=()):
+    """生成分析表，返回GLR分析器"""
+    grammar = Grammar()
+    grammar.set_precedence(precedence)
+    for rule in rules:
+        grammar.add_rule(rule)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(grammar)
+        action_table, goto_table = generator.generate()
+    return GLRParser(grammar, action_table, goto_table, generator.conflict_actions)
+
+
+def parse(parser, text: str) -> bool:
+    """分析按空格切分的输入(token类型与值相同)，屏蔽分析过程的输出"""
+    tokens = [(word, word) for word in text.split()]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser.parse(tokens)
+
+
+def test_matches_lr_parser():
+    """无冲突的文法上GLR与LRParser的语法树相同，且不进入一般GLR处理"""
+    scanner, grammar, action_table, goto_table = build_compiler(
+        str(project_root / "configs" / "grammar_control_flow.json"))
+    tokens = scanner.scan(make_program(200))
+    lr = LRParser(grammar, action_table, goto_table, lambda production, symbols: {})
+    glr = GLRParser(grammar, action_table, goto_table)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert lr.parse(tokens) == 1 and glr.parse(tokens)
+    assert glr.get_parse_tree() == lr.get_parse_tree()
+    assert glr.stats['general_positions'] == 0, glr.stats
+    assert glr.forest.count_trees() == 1
+
+
+def test_ambiguous_expression():
+    """E -> E + E | E * E | id: n个运算符的推导个数为第n个Catalan数"""
+    parser = build(["E -> E + E", "E -> E * E", "E -> id"])
+    catalan = [1, 1, 2, 5, 14, 42, 132]
+    for operators in range(len(catalan)):
+        text = " ".join(["id"] + ["+ id", "* id"] * (operators // 2) + ["+ id"] * (operators % 2))
+        assert parse(parser, text), text
+        assert parser.forest.count_trees() == catalan[operators], (text, parser.forest.count_trees())
+    assert parse(parser, "id + id * id + id")
+    trees = parser.get_parse_trees()
+    assert len(trees) == 5
+    assert all(trees[i] != trees[j] for i in range(5) for j in range(i + 1, 5))
+    assert parser.get_parse_tree() == trees[0]
+
+
+def test_non_lalr_grammar():
+    """LR(1)但非LALR(1)的文法: LALR(1)表上LRParser选错归约，GLR全部接受且推导唯一"""
+    parser = build(["S -> a A d", "S -> b B d", "S -> a B e", "S -> b A e", "A -> c", "B -> c"])
+    assert parser.conflict_actions, "应当有归约-归约冲突"
+    lr = LRParser(parser.grammar, parser.action_table, parser.goto_table, lambda production, symbols: {})
+    results = []
+    for text in ("a c d", "a c e", "b c d", "b c e"):
+        assert parse(parser, text), text
+        assert parser.forest.count_trees() == 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(lr.parse([(word, word) for word in text.split()]) == 1)
+    assert not all(results), "LRParser应当在部分输入上选错归约"
+    assert not parse(parser, "a c c")
+
+
+def test_hidden_left_recursion():
+    """S -> A S c | d, A -> ε: 空产生式隐藏的左递归"""
+    parser = build(["S -> A S c", "S -> d", "A -> ε"])
+    for count in range(4):
+        assert parse(parser, " ".join(["d"] + ["c"] * count))
+        assert parser.forest.count_trees() == 1
+        tree = parser.get_parse_tree()
+        for _ in range(count):
+            assert [child.symbol for child in tree.children] == ['A', 'S', 'c']
+            tree = tree.children[1]
+        assert tree.children[0].symbol == 'd'
+
+
+def test_dangling_else():
+    """悬空else的两种推导合并在同一个分析森林中"""
+    parser = build(["S -> if E then S", "S -> if E then S else S", "S -> x", "E -> y"])
+    assert parse(parser, "if y then if y then x else x")
+    assert parser.forest.count_trees() == 2
+    productions = {tree.production for tree in parser.get_parse_trees()}
+    assert productions == {"S -> if E then S", "S -> if E then S else S"}
+
+
+def test_precedence_not_forked():
+    """优先级声明解决的冲突不作为GLR的候选动作"""
+    parser = build(["E -> E + E", "E -> E * E", "E -> id"], [('left', '+'), ('left', '*')])
+    assert not parser.conflict_actions
+    assert parse(parser, "id + id * id + id")
+    assert parser.forest.count_trees() == 1
+    assert parser.stats['general_positions'] == 0
+
+
+def test_syntax_error():
+    """所有分支都无法继续时报告语法错误(期望的终结符为各栈顶的并集)"""
+    parser = build(["E -> E + E", "E -> E * E", "E -> id"])
+    assert not parse(parser, "id + * id")
+    assert parser.forest is None
+    assert parser.errors[0]['index'] == 2 and parser.errors[0]['expected'] == ('id',)
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[GLR分析测试]")
+    tests = [test_matches_lr_parser, test_ambiguous_expression, test_non_lalr_grammar,
+             test_hidden_left_recursion, test_dangling_else, test_precedence_not_forked, test_syntax_error]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
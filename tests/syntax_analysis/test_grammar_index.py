@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文法索引测试工具
+- 左部 -> 产生式索引与逐条扫描的结果相同，增广后仍按编号顺序
+- augment添加$并冻结文法，冻结后不能再添加产生式
+- 冻结后符号集合不可变，可空标记和右部后缀可空表
+"""
+
+import sys
+import io
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import Grammar
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+RULES = [
+    "S -> A B c",
+    "A -> a A",
+    "A -> ε",
+    "B -> b",
+    "B -> A",
+]
+
+
+def make_grammar(rules):
+    """由规则字符串建立文法"""
+    grammar = Grammar()
+    for rule in rules:
+        left, right = rule.split('->')
+        grammar.add_production(left.strip(), right.split())
+    return grammar
+
+
+def test_productions_by_left():
+    """索引与逐条扫描产生式的结果相同(增广前后)"""
+    grammar = build_grammar(FAMILIES['statement_language'](4))
+    for stage in ("增广前", "增广后"):
+        for left in grammar.non_terminals:
+            expected = tuple(p for p in grammar.productions if p.left == left)
+            assert grammar.get_productions_by_left(left) == expected, f"{stage}: {left}"
+        assert grammar.get_productions_by_left('missing') == ()
+        grammar.augment()
+    assert grammar.get_productions_by_left("S'")[0].id == 0
+
+
+def test_augment_freezes():
+    """augment添加$并冻结；重复augment不改变文法；冻结后不能添加产生式"""
+    grammar = make_grammar(RULES)
+    assert not grammar.frozen
+    grammar.augment()
+    assert grammar.frozen and '$' in grammar.terminals
+    assert isinstance(grammar.terminals, frozenset) and isinstance(grammar.non_terminals, frozenset)
+    assert [p.id for p in grammar.productions] == list(range(len(RULES) + 1))
+    productions = list(grammar.productions)
+    grammar.augment()
+    assert grammar.productions == productions
+    try:
+        grammar.add_production('B', ['d'])
+    except RuntimeError:
+        pass
+    else:
+        assert False, "冻结后添加产生式没有报错"
+
+
+def test_nullable():
+    """可空标记和右部后缀可空表"""
+    grammar = make_grammar(RULES)
+    grammar.augment()
+    assert grammar.nullable == {'A', 'B'}
+    # S -> A B c: 只有末尾的空后缀可空
+    s = grammar.get_productions_by_left('S')[0]
+    assert grammar.suffix_nullable[s.id] == (False, False, False, True)
+    # A -> a A: 后缀 "A" 可空
+    a = grammar.get_productions_by_left('A')[0]
+    assert grammar.suffix_nullable[a.id] == (False, True, True)
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[文法索引测试]")
+    tests = [test_productions_by_left, test_augment_freezes, test_nullable]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量语法分析测试工具
+- 随机编辑源程序后增量分析，结果必须与完整分析(Scanner.scan + LRParser.parse)一致
+- 报告大文件上单次小编辑的耗时和复用情况
+"""
+
+import sys
+import io
+import random
+import time
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import LRParser, IncrementalParser
+from tests.helpers import build_compiler, make_program, random_edit
+
+
+CONFIG = str(project_root / "configs" / "grammar_control_flow.json")
+
+
+def full_parse(compiler, source: str):
+    """完整分析，返回 (token序列, 语法树)"""
+    scanner, grammar, action_table, goto_table = compiler
+    tokens = scanner.scan(source)
+    # 语义动作只返回空属性，使含ε产生式的文法也能完整分析
+    parser = LRParser(grammar, action_table, goto_table, lambda production, symbols: {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tokens)
+    return tokens, (parser.get_parse_tree() if result == 1 else None)
+
+
+def same_tree(a, b) -> bool:
+    """非递归地比较两棵语法树"""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is None or y is None:
+            if x is not y:
+                return False
+            continue
+        if (x.symbol, x.value, x.production) != (y.symbol, y.value, y.production):
+            return False
+        if len(x.children) != len(y.children):
+            return False
+        stack.extend(zip(x.children, y.children))
+    return True
+
+
+def test_matches_full_parse(compiler=None, edits: int = 150):
+    """随机编辑序列: 每一步的token和语法树都与完整分析一致(包括出错后恢复的情况)"""
+    compiler = compiler or build_compiler(CONFIG)
+    rng = random.Random(1)
+    source = make_program(30)
+    parser = IncrementalParser(*compiler)
+    parser.parse(source)
+    undo = []
+    valid = 0
+    for step in range(edits):
+        if undo and rng.random() < 0.6:
+            # 撤销之前的编辑，使程序经常回到合法状态
+            start, end, text = undo.pop()
+        else:
+            start, end, text = random_edit(rng, source)
+            undo.append((start, start + len(text), source[start:end]))
+        source = source[:start] + text + source[end:]
+        tree = parser.edit(start, end, text)
+        tokens, expected = full_parse(compiler, source)
+        assert parser.tokens == tokens, f"第{step}步token不一致"
+        assert same_tree(tree, expected), f"第{step}步语法树不一致: {(start, end, text)}"
+        valid += expected is not None
+    assert valid >= edits // 10, f"合法程序太少({valid})，测试没有意义"
+
+
+def test_token_boundary_edits(compiler=None):
+    """编辑把两个token合并、或在文件末尾追加字符"""
+    compiler = compiler or build_compiler(CONFIG)
+    parser = IncrementalParser(*compiler)
+    source = "int ab ; ab := 1 ;"
+    parser.parse(source)
+    # 删除空格: "int ab" -> "intab"
+    tree = parser.edit(3, 4, "")
+    assert tree is None and parser.tokens[0] == ('id', 'intab')
+    tree = parser.edit(3, 3, " ")
+    assert tree is not None and parser.tokens[0] == ('int', 'int')
+    # 在末尾追加，最后一个token必须重新扫描
+    parser.edit(len(parser.source), len(parser.source), "ab := ab2 ;")
+    assert parser.tokens[-4:] == [('id', 'ab'), (':=', ':='), ('id', 'ab2'), (';', ';')]
+
+
+def test_scan_positions_errors(compiler=None):
+    """scan_positions每次调用重新记录词法错误，不残留上一次扫描的错误"""
+    scanner = (compiler or build_compiler(CONFIG))[0]
+    list(scanner.scan_positions("int a @ ;"))
+    assert [e['char'] for e in scanner.errors] == ['@'], scanner.errors
+    list(scanner.scan_positions("int a ;"))
+    assert scanner.errors == [], scanner.errors
+    list(scanner.scan_positions("a # b @", 2))
+    assert [e['char'] for e in scanner.errors] == ['#', '@'], scanner.errors
+    scanner.scan("int a ;")
+    assert scanner.errors == [], scanner.errors
+
+
+def benchmark(compiler, statements: int = 2000, edits: int = 20):
+    """大文件上单次小编辑: 增量分析与完整分析的耗时对比"""
+    source = make_program(statements)
+    parser = IncrementalParser(*compiler)
+    start = time.perf_counter()
+    parser.parse(source)
+    full_time = time.perf_counter() - start
+
+    rng = random.Random(2)
+    total = 0.0
+    reused = 0
+    for _ in range(edits):
+        pos = source.index(":= a + ", rng.randrange(len(source) // 2)) + 7
+        source = source[:pos] + "1" + source[pos + 1:]
+        start = time.perf_counter()
+        tree = parser.edit(pos, pos + 1, "1")
+        total += time.perf_counter() - start
+        assert tree is not None
+        reused += parser.stats['reused_tokens']
+
+    tokens = len(parser.tags)
+    print(f"\n[性能] {tokens}个token: 完整分析 {full_time * 1000:.1f} ms, "
+          f"单次编辑平均 {total / edits * 1000:.2f} ms, 平均复用 {reused // edits} 个token")
+
+
+def main():
+    """主函数"""
+    compiler = build_compiler(CONFIG)
+    tests = [lambda: test_matches_full_parse(compiler), lambda: test_token_boundary_edits(compiler),
+             lambda: test_scan_positions_errors(compiler)]
+    names = ['test_matches_full_parse', 'test_token_boundary_edits', 'test_scan_positions_errors']
+    passed = 0
+    print("=" * 70)
+    print("[增量分析测试]")
+    for name, test in zip(names, tests):
+        try:
+            test()
+            print(f"  [PASS]  {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {name}: {e}")
+
+    benchmark(compiler)
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
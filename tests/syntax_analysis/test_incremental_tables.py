@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量分析表生成测试工具
+- 修改文法后增量生成的分析表、状态、FIRST/FOLLOW集与完整生成相同(LALR(1)和LR(1))
+- 只修改少数产生式时复用大部分LR(1)状态和分析表行
+- BuildCache可以保存和加载；CompiledTables.from_config可使用生成缓存
+"""
+
+import sys
+import io
+import json
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import ParserGenerator, IncrementalParserGenerator, BuildCache
+from driver import CompiledTables
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+BASE = FAMILIES['statement_language'](8)
+# FIRST集依赖成环的文法(A -> C d, C -> A c)
+CYCLE = ["S -> E A", "E -> e", "A -> a", "A -> b", "A -> C d", "C -> A c"]
+
+# 修改名称 -> (修改前的规则, 修改后的规则)
+EDITS = {
+    'unchanged': (BASE, BASE),
+    'add_alternative': (BASE, BASE + ["S -> kwX ( E ) S"]),
+    'remove_production': (BASE, [r for r in BASE if r != "F -> num"]),
+    'modify_right_side': (BASE, [r.replace("F -> num", "F -> num ! id") for r in BASE]),
+    'nullable_production': (BASE, BASE + ["T -> "]),
+    'new_non_terminal': (BASE, BASE + ["F -> G", "G -> [ E ]"]),
+    'new_start_symbol': (BASE, ["Q -> P ."] + BASE),
+    'introduce_conflict': (BASE, BASE + ["E -> E + E"]),
+    'remove_in_first_cycle': (CYCLE, [r for r in CYCLE if r != "A -> b"]),
+}
+
+
+def pytest_generate_tests(metafunc):
+    """pytest: test_matches_full_build对每种修改各运行一次"""
+    if 'edit' in metafunc.fixturenames:
+        metafunc.parametrize('edit', list(EDITS))
+
+
+def generate(cls, rules, *args, **kwargs):
+    """生成分析表(屏蔽生成过程的输出)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = cls(build_grammar(rules), *args, **kwargs)
+        generator.generate()
+    return generator
+
+
+def assert_same(full: ParserGenerator, incremental: IncrementalParserGenerator):
+    """增量生成与完整生成的结果相同"""
+    assert incremental.action_table == full.action_table, "ACTION表不同"
+    assert incremental.goto_table == full.goto_table, "GOTO表不同"
+    assert incremental.expected_tokens == full.expected_tokens, "期望的终结符不同"
+    assert list(incremental.states) == full.states, "状态不同"
+    assert incremental.first_sets == full.first_sets, "FIRST集不同"
+    assert incremental.follow_sets == full.follow_sets, "FOLLOW集不同"
+    assert len(incremental.table_builder.conflicts) == len(full.table_builder.conflicts), "冲突数不同"
+
+
+def test_matches_full_build(edit: str):
+    """修改文法后增量生成与完整生成相同，再改回原文法也相同"""
+    before, after = EDITS[edit]
+    for algorithm in ('lalr1', 'lr1'):
+        base = generate(IncrementalParserGenerator, before, algorithm=algorithm)
+        assert_same(generate(ParserGenerator, before, algorithm=algorithm), base)
+
+        edited = generate(IncrementalParserGenerator, after, base.cache, algorithm=algorithm)
+        assert_same(generate(ParserGenerator, after, algorithm=algorithm), edited)
+
+        restored = generate(IncrementalParserGenerator, before, edited.cache, algorithm=algorithm)
+        assert restored.action_table == base.action_table, f"{algorithm}: 改回原文法后ACTION表不同"
+        assert restored.goto_table == base.goto_table, f"{algorithm}: 改回原文法后GOTO表不同"
+
+
+def test_reuses_unaffected_parts():
+    """只修改一个产生式时大部分状态和行被复用，文法不变时全部复用"""
+    base = generate(IncrementalParserGenerator, BASE)
+    assert base.reused_states == 0 and base.rebuilt_states > 0
+
+    same = generate(IncrementalParserGenerator, BASE, base.cache)
+    assert same.rebuilt_states == 0 and same.rebuilt_rows == 0
+    assert not same.first_recomputed and not same.follow_recomputed
+
+    edited = generate(IncrementalParserGenerator, EDITS['modify_right_side'][1], base.cache)
+    assert edited.changed_non_terminals == {'F'}, edited.changed_non_terminals
+    assert 'S' not in edited.first_recomputed, edited.first_recomputed
+    assert not edited.follow_recomputed, edited.follow_recomputed
+    assert edited.reused_states > 3 * edited.rebuilt_states, (edited.reused_states, edited.rebuilt_states)
+    assert edited.reused_rows > 3 * edited.rebuilt_rows, (edited.reused_rows, edited.rebuilt_rows)
+
+
+def test_cache_save_and_load():
+    """BuildCache保存后加载，增量生成的结果不变"""
+    base = generate(IncrementalParserGenerator, BASE)
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "build.bin")
+        base.cache.save(path)
+        loaded = BuildCache.load(path)
+    assert loaded == base.cache
+    edited = generate(IncrementalParserGenerator, EDITS['add_alternative'][1], loaded)
+    assert_same(generate(ParserGenerator, EDITS['add_alternative'][1]), edited)
+    assert edited.reused_states > 0
+
+
+def test_duplicate_production_falls_back():
+    """含重复产生式的文法完整生成(不产生缓存)"""
+    base = generate(IncrementalParserGenerator, BASE)
+    rules = BASE + ["F -> id"]
+    duplicate = generate(IncrementalParserGenerator, rules, base.cache)
+    assert duplicate.cache is None
+    assert duplicate.action_table == generate(ParserGenerator, rules).action_table
+
+
+def test_compiled_tables_build_cache():
+    """CompiledTables.from_config使用生成缓存: 修改配置后生成的分析表与不用缓存时相同"""
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = Path(directory) / "grammar.json"
+        build_cache = str(Path(directory) / "grammar_build.bin")
+        shutil.copy(project_root / "configs" / "grammar_control_flow.json", config_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            CompiledTables.from_config(str(config_path), build_cache)
+            assert Path(build_cache).exists()
+
+            config = json.loads(config_path.read_text(encoding='utf-8'))
+            config['grammar_rules'] = config['grammar_rules'][:-1]
+            config_path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+            incremental = CompiledTables.from_config(str(config_path), build_cache)
+            full = CompiledTables.from_config(str(config_path))
+    assert incremental.action_table == full.action_table
+    assert incremental.goto_table == full.goto_table
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[增量分析表生成测试]")
+    checks = [(test_matches_full_build, edit) for edit in EDITS]
+    checks += [(test, None) for test in (test_reuses_unaffected_parts, test_cache_save_and_load,
+                                         test_duplicate_production_falls_back, test_compiled_tables_build_cache)]
+    passed = 0
+    for check, name in checks:
+        label = f"{check.__name__}({name})" if name else check.__name__
+        try:
+            check(name) if name else check()
+            print(f"  [PASS]  {label}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {label}: {e}")
+
+    print(f"\n通过率: {passed}/{len(checks)}")
+    return 0 if passed == len(checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+性能统计测试工具
+- 生成器记录各阶段耗时、状态数和闭包缓存命中数
+- 扫描器/分析器记录token数、移进/归约次数和每个产生式的语义动作耗时
+- 导出JSON和cProfile统计文件
+"""
+
+import sys
+import io
+import os
+import json
+import pstats
+import cProfile
+import tempfile
+import contextlib
+from collections import Counter
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from lexical import LexicalGenerator, Scanner
+from syntax import Grammar, ParserGenerator
+from driver import LRParser
+from utils import ConfigLoader, Metrics
+
+
+CONFIG = str(project_root / "configs" / "grammar_control_flow.json")
+SOURCE = "int a ; int b ; a := 1 ; while ( a < 10 ) { b := b + a * 2 ; a := a + 1 ; }"
+
+
+def run_pipeline(metrics: Metrics, source: str = SOURCE):
+    """带性能统计地执行 生成 -> 扫描 -> 分析，返回 (分析结果, token序列, 分析器)"""
+    loader = ConfigLoader(os.path.dirname(CONFIG))
+    config = loader.load(os.path.basename(CONFIG))
+    with contextlib.redirect_stdout(io.StringIO()):
+        table, accepting_map = LexicalGenerator(metrics=metrics).build(config.lexical_rules)
+        grammar = Grammar()
+        for rule_str in config.grammar_rules:
+            left, right = rule_str.split('->')
+            grammar.add_production(left.strip(), [s.strip() for s in right.strip().split()])
+        action_table, goto_table = ParserGenerator(grammar, metrics=metrics).generate()
+        tokens = Scanner(table, accepting_map, metrics=metrics).scan(source)
+        parser = LRParser(grammar, action_table, goto_table,
+                          lambda production, symbols: {}, metrics=metrics)
+        result = parser.parse(tokens)
+    return result, tokens, parser
+
+
+def test_generation_metrics():
+    """生成器各阶段都有耗时，状态数和闭包缓存计数合理"""
+    metrics = Metrics()
+    run_pipeline(metrics)
+    for phase in ['lexical.nfa', 'lexical.subset_construction', 'lexical.minimization',
+                  'syntax.first_follow', 'syntax.lr1', 'syntax.lalr', 'syntax.table']:
+        assert metrics.timings.get(phase, 0) > 0, phase
+    counters = metrics.counters
+    assert counters['lexical.dfa_states'] >= counters['lexical.min_dfa_states'] > 0
+    assert counters['syntax.lr1_states'] >= counters['syntax.lalr_states'] > 0
+    # 每个LR(1)状态恰好对应一次缓存未命中，其余GOTO都命中缓存
+    assert counters['syntax.closure_cache_misses'] == counters['syntax.lr1_states']
+    assert counters['syntax.closure_cache_hits'] > 0
+
+
+def test_parse_counters():
+    """移进次数等于token数，归约次数和语义动作调用次数与产生式序列一致"""
+    metrics = Metrics()
+    result, tokens, parser = run_pipeline(metrics)
+    assert result == 1
+    counters = metrics.counters
+    assert counters['scan.tokens'] == len(tokens)
+    assert counters['scan.chars'] == len(SOURCE)
+    assert counters['scan.errors'] == 0
+    assert counters['parse.shifts'] == len(tokens)
+    assert counters['parse.reduces'] == len(parser.production_sequence)
+    calls = Counter(parser.production_sequence)
+    assert {p: e['calls'] for p, e in metrics.semantic.items()} == dict(calls)
+    assert 'parse.errors' not in counters
+
+    metrics.reset()
+    result, _, _ = run_pipeline(metrics, "int a ; a := 1 + ; @")
+    assert result is False
+    assert metrics.counters['parse.errors'] == 1
+    assert metrics.counters['scan.errors'] == 1
+
+
+def test_export():
+    """导出JSON，并把cProfile统计写入文件"""
+    metrics = Metrics(profiler=cProfile.Profile())
+    run_pipeline(metrics)
+    data = json.loads(metrics.to_json())
+    assert set(data) == {'timings', 'counters', 'semantic'}
+    assert data['counters'] == metrics.counters
+    assert 'parse' in data['timings']
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pipeline.prof")
+        metrics.dump_profile(path)
+        stats = pstats.Stats(path)
+        functions = {name for _, _, name in stats.stats}
+        assert 'closure' in functions and '_parse' in functions
+        metrics.save(os.path.join(directory, "metrics.json"))
+        with open(os.path.join(directory, "metrics.json"), 'r', encoding='utf-8') as f:
+            assert json.load(f) == data
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[性能统计测试]")
+    tests = [test_generation_metrics, test_parse_counters, test_export]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    metrics = Metrics()
+    run_pipeline(metrics)
+    print()
+    print(metrics)
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+并行LR(1)项目集构造测试工具
+- 多进程构建的状态、GOTO表和最终分析表与串行构建完全相同
+- 状态编号与哈希种子无关(不同PYTHONHASHSEED的进程生成相同的分析表)
+"""
+
+import sys
+import io
+import os
+import marshal
+import subprocess
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from syntax import ParserGenerator
+from utils.config_loader import ConfigLoader
+from benchmarks.grammar_factory import FAMILIES, build_grammar
+
+
+# 在新进程中生成分析表，输出按键排序后的marshal编码
+DUMP_TABLES = """
+import io, sys, marshal, contextlib
+from syntax import ParserGenerator
+from utils.config_loader import ConfigLoader
+config = ConfigLoader('configs').load(sys.argv[1])
+with contextlib.redirect_stdout(io.StringIO()):
+    generator = ParserGenerator(config.to_grammar())
+    generator.generate()
+sys.stdout.buffer.write(marshal.dumps((sorted(generator.action_table.items()), sorted(generator.goto_table.items()))))
+"""
+
+
+# 文法配置或合成文法族(族名/规模)
+GRAMMARS = ["grammar_control_flow.json", "statement_language/8", "lr1_not_lalr/8"]
+WORKERS = [2, 3]
+
+
+def pytest_generate_tests(metafunc):
+    """pytest: test_parallel_identical对每个文法和工作进程数各运行一次"""
+    if 'name' in metafunc.fixturenames:
+        metafunc.parametrize('name', GRAMMARS)
+    if 'workers' in metafunc.fixturenames:
+        metafunc.parametrize('workers', WORKERS)
+
+
+def generate(make_grammar, workers: int, algorithm: str = 'lalr1') -> ParserGenerator:
+    """生成分析表(屏蔽生成过程的输出)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = ParserGenerator(make_grammar(), algorithm=algorithm, workers=workers)
+        generator.generate()
+    return generator
+
+
+def test_parallel_identical(name: str, workers: int):
+    """workers个工作进程与串行构建: LR(1)状态、GOTO表、ACTION/GOTO表相同"""
+    if name.endswith('.json'):
+        make_grammar = ConfigLoader(str(project_root / "configs")).load(name).to_grammar
+    else:
+        family, size = name.split('/')
+        rules = FAMILIES[family](int(size))
+        make_grammar = lambda: build_grammar(rules)
+    for algorithm in ('lr1', 'lalr1'):
+        serial = generate(make_grammar, 1, algorithm)
+        parallel = generate(make_grammar, workers, algorithm)
+        assert serial.states == parallel.states, algorithm
+        assert serial.action_table == parallel.action_table, algorithm
+        assert serial.goto_table == parallel.goto_table, algorithm
+        assert serial.lr1_builder.goto_table == parallel.lr1_builder.goto_table, algorithm
+
+
+def test_numbering_independent_of_hash_seed():
+    """不同哈希种子的进程生成的分析表逐字节相同"""
+    outputs = []
+    for seed in ('1', '2'):
+        outputs.append(subprocess.run(
+            [sys.executable, '-c', DUMP_TABLES, 'grammar_control_flow.json'],
+            capture_output=True, cwd=str(project_root),
+            env={**os.environ, 'PYTHONPATH': str(project_root), 'PYTHONHASHSEED': seed}).stdout)
+    assert outputs[0] and marshal.loads(outputs[0]), "子进程没有输出"
+    assert outputs[0] == outputs[1]
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[并行LR(1)构造测试]")
+    checks = [(test_parallel_identical, (name, workers)) for name in GRAMMARS for workers in WORKERS]
+    checks.append((test_numbering_independent_of_hash_seed, ()))
+    passed = 0
+    for check, args in checks:
+        label = f"{check.__name__}{args}" if args else check.__name__
+        try:
+            check(*args)
+            print(f"  [PASS]  {label}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {label}: {e}")
+
+    print(f"\n通过率: {passed}/{len(checks)}")
+    return 0 if passed == len(checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
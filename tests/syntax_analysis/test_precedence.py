@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+优先级和结合性声明测试工具
+- 扁平的表达式文法按优先级/结合性得到正确的归约顺序
+- 与分层的E/T/F文法(grammar1_arithmetic.json)相比，状态数和每个token的归约次数更少
+- 没有优先级声明的冲突按yacc的默认规则确定地解决并记录
+"""
+
+import sys
+import io
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import CompiledTables
+from syntax import Grammar, ParserGenerator
+from syntax.table_builder import TableBuilder
+
+
+CONFIGS = project_root / "configs"
+
+
+def load(name: str) -> CompiledTables:
+    """生成配置文件的分析表(屏蔽生成过程的输出)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return CompiledTables.from_config(str(CONFIGS / name))
+
+
+def parse(tables: CompiledTables, source: str):
+    """分析源程序，返回 (分析结果, 归约的产生式字符串列表)"""
+    parser = tables.parser(lambda production, symbols: {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tables.scanner().scan(source))
+    return result, [str(tables.grammar.productions[i]) for i in parser.production_sequence]
+
+
+def state_count(tables: CompiledTables) -> int:
+    """分析表中的状态数"""
+    return len({state for state, _ in tables.action_table} | {state for state, _ in tables.goto_table})
+
+
+def test_associativity():
+    """左结合、右结合、一元负号(%prec)的归约顺序"""
+    tables = load("grammar_precedence.json")
+    reductions = lambda source: [r for r in parse(tables, source)[1] if r not in ('E -> id', 'E -> num')]
+    assert reductions("a - b - c") == ['E -> E - E', 'E -> E - E', 'S -> E']
+    assert reductions("a + b * c") == ['E -> E * E', 'E -> E + E', 'S -> E']
+    assert reductions("a * b + c") == ['E -> E * E', 'E -> E + E', 'S -> E']
+    # 右结合: a ^ (b ^ c)，第二个^之前不归约
+    _, sequence = parse(tables, "a ^ b ^ c")
+    assert sequence == ['E -> id'] * 3 + ['E -> E ^ E', 'E -> E ^ E', 'S -> E'], sequence
+    # 一元负号低于^: -(a ^ 2)
+    assert reductions("- a ^ 2") == ['E -> E ^ E', 'E -> - E', 'S -> E']
+    # 一元负号高于*: (-a) * b
+    assert reductions("- a * b") == ['E -> - E', 'E -> E * E', 'S -> E']
+
+
+def test_nonassoc():
+    """%nonassoc: a < b 合法，a < b < c 是语法错误"""
+    tables = load("grammar_precedence.json")
+    assert parse(tables, "a < b")[0] == 1
+    assert parse(tables, "a + 1 < b * 2")[0] == 1
+    assert not parse(tables, "a < b < c")[0]
+
+
+def test_flat_grammar_is_smaller():
+    """与grammar1_arithmetic.json同一语言的扁平文法: 状态数更少，每个token的归约次数更少"""
+    layered = load("grammar1_arithmetic.json")
+    grammar = Grammar()
+    grammar.set_precedence([('left', '+', '-'), ('left', '*', '/')])
+    for rule in ["S -> E", "E -> E + E", "E -> E - E", "E -> E * E", "E -> E / E",
+                 "E -> ( E )", "E -> id", "E -> num"]:
+        grammar.add_rule(rule)
+    generator = ParserGenerator(grammar)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate()
+    assert not generator.table_builder.conflicts
+    flat = CompiledTables(grammar, generator.action_table, generator.goto_table,
+                          layered.transition_table, layered.accepting_map, generator.expected_tokens)
+    
+    source = " + ".join(f"( a * {i} - b / c )" for i in range(50))
+    layered_result, layered_sequence = parse(layered, source)
+    flat_result, flat_sequence = parse(flat, source)
+    assert layered_result == 1 and flat_result == 1
+    assert state_count(flat) < state_count(layered), (state_count(flat), state_count(layered))
+    assert len(flat_sequence) < len(layered_sequence) * 0.75, (len(flat_sequence), len(layered_sequence))
+    tokens = len(layered.scanner().scan(source))
+    print(f"  状态数: 分层 {state_count(layered)} / 扁平 {state_count(flat)}; "
+          f"每token归约: 分层 {len(layered_sequence) / tokens:.2f} / 扁平 {len(flat_sequence) / tokens:.2f}")
+
+
+def test_default_resolution():
+    """没有优先级声明时报告冲突，移进-归约选择移进，归约-归约选择较早的产生式"""
+    grammar = Grammar()
+    for rule in ["S -> E", "E -> E + E", "E -> id", "S -> A", "A -> id"]:
+        grammar.add_rule(rule)
+    generator = ParserGenerator(grammar)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        action_table, _ = generator.generate()
+    conflicts = generator.table_builder.conflicts
+    kinds = {c['kind'] for c in conflicts}
+    assert kinds == {'shift-reduce', 'reduce-reduce'}, conflicts
+    assert '冲突' in output.getvalue()
+    for conflict in conflicts:
+        assert action_table[(conflict['state'], conflict['symbol'])] == conflict['chosen']
+        if conflict['kind'] == 'shift-reduce':
+            assert conflict['chosen'][0] == 'shift'
+        else:
+            assert conflict['chosen'] == ('reduce', min(a[1] for a in conflict['actions']))
+
+
+def three_way_state(precedence, rules):
+    """生成分析表，返回 (生成器, 读入a之后的状态, 产生式字符串 -> 编号)"""
+    grammar = Grammar()
+    grammar.set_precedence(precedence)
+    for rule in rules:
+        grammar.add_rule(rule)
+    generator = ParserGenerator(grammar)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate()
+    state = generator.action_table[(0, 'a')][1]
+    return generator, state, {str(p): p.id for p in grammar.productions}
+
+
+def test_three_way_conflict():
+    """移进 + 两个归约的表项: 逐个归约与移进比较后再解决剩余动作，结果与项目的遍历顺序无关"""
+    # C -> a 的优先级高于+，淘汰移进；B -> a 没有优先级，与C -> a 成为归约-归约冲突，选择较早的B -> a
+    generator, state, ids = three_way_state(
+        [('left', '+'), ('left', 'HIGH')],
+        ["S -> B + b", "S -> C + c", "S -> a + d", "B -> a", "C -> a %prec HIGH"])
+    reduce_b, reduce_c = ('reduce', ids["B -> a"]), ('reduce', ids["C -> a"])
+    assert generator.action_table[(state, '+')] == reduce_b
+    assert generator.conflict_actions[(state, '+')] == (reduce_b, reduce_c)
+    conflict, = generator.table_builder.conflicts
+    assert conflict['kind'] == 'reduce-reduce' and conflict['actions'] == (reduce_b, reduce_c)
+
+    # 项目按任意顺序交给TableBuilder，得到相同的表项(移进目标不影响冲突的解决，用占位的状态编号)
+    items = sorted(generator.states[state], key=str)
+    goto = {(state, '+'): len(generator.states)}
+    for order in (items, items[::-1], items[1:] + items[:1], items[2:] + items[:2]):
+        builder = TableBuilder(generator.grammar)
+        states = [order if i == state else None for i in range(len(generator.states))]
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder.build(states, goto)
+        assert builder.action_table[(state, '+')] == reduce_b
+        assert builder.conflict_actions[(state, '+')] == (reduce_b, reduce_c)
+
+    # nonassoc淘汰移进和B -> a，剩下的C -> a、D -> a 仍然报告归约-归约冲突
+    generator, state, ids = three_way_state(
+        [('nonassoc', '<')],
+        ["S -> a < b", "S -> B < c", "S -> C < d", "S -> D < e", "B -> a %prec <", "C -> a", "D -> a"])
+    reduce_c, reduce_d = ('reduce', ids["C -> a"]), ('reduce', ids["D -> a"])
+    assert generator.action_table[(state, '<')] == reduce_c
+    assert generator.conflict_actions[(state, '<')] == (reduce_c, reduce_d)
+    assert [c['kind'] for c in generator.table_builder.conflicts] == ['reduce-reduce']
+    assert (state, '<') in generator.table_builder.resolved_entries
+
+
+def test_declaration_errors():
+    """%prec和结合性声明的格式错误"""
+    grammar = Grammar()
+    grammar.add_rule("E -> - E %prec UMINUS")
+    assert grammar.rule_precedence == {('E', ('-', 'E')): 'UMINUS'}
+    assert 'UMINUS' not in grammar.terminals and '%prec' not in grammar.terminals
+    for bad in ["E -> - E %prec", "E -> %prec UMINUS E"]:
+        try:
+            grammar.add_rule(bad)
+            assert False, f"应当报错: {bad}"
+        except ValueError:
+            pass
+    try:
+        grammar.set_precedence([('middle', '+')])
+        assert False, "应当报错: 未知的结合性"
+    except ValueError:
+        pass
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[优先级声明测试]")
+    tests = [test_associativity, test_nonassoc, test_flat_grammar_is_smaller,
+             test_default_resolution, test_three_way_conflict, test_declaration_errors]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  [PASS]  {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {test.__name__}: {e}")
+
+    print(f"\n通过率: {passed}/{len(tests)}")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+单产生式归约消除测试工具
+- 变换后的分析表接受/拒绝的输入与原分析表相同(随机句子及其变异)
+- 表达式密集的输入归约次数约减半
+- 提供unit_chains时语法树与原分析表得到的语法树相同
+"""
+
+import sys
+import io
+import random
+import contextlib
+from pathlib import Path
+
+# Windows控制台编码修复
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from driver import CompiledTables, LRParser
+from syntax import ParserGenerator
+from syntax.unit_rules import UnitRuleEliminator
+from utils.config_loader import ConfigLoader
+from benchmarks.sentence_generator import SentenceGenerator
+
+
+CONFIGS = ["grammar1_arithmetic.json", "grammar_control_flow.json"]
+
+
+def pytest_generate_tests(metafunc):
+    """pytest: 带name参数的测试对每个文法配置各运行一次"""
+    if 'name' in metafunc.fixturenames:
+        metafunc.parametrize('name', CONFIGS)
+
+
+def build(name: str, unit_rules=True):
+    """返回 (原分析表, 跳过单产生式的文法, 生成器)"""
+    config = ConfigLoader(str(project_root / "configs")).load(name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tables = CompiledTables.from_config(str(project_root / "configs" / name))
+        grammar = config.to_grammar()
+        generator = ParserGenerator(grammar, unit_rules=unit_rules)
+        generator.generate()
+    return tables, grammar, generator, config
+
+
+def parse(parser: LRParser, tokens):
+    """分析token序列，返回 (是否接受, 归约次数)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parser.parse(tokens)
+    return result == 1, len(parser.production_sequence)
+
+
+def test_same_language(name: str):
+    """随机句子及删除/交换token后的变异句子: 两个分析表的接受结果相同"""
+    tables, grammar, generator, config = build(name)
+    bypass = LRParser(grammar, generator.action_table, generator.goto_table,
+                      lambda production, symbols: {}, expected_tokens=generator.expected_tokens)
+    original = tables.parser(lambda production, symbols: {})
+    sentences = SentenceGenerator(config.grammar_rules, tables.scanner())
+    rng = random.Random(0)
+    accepted = rejected = 0
+    for _ in range(60):
+        tokens = [(terminal, terminal) for terminal, _, _ in sentences.derive(rng.randint(3, 40), rng)]
+        if rng.random() < 0.5 and len(tokens) > 1:
+            i, j = rng.randrange(len(tokens)), rng.randrange(len(tokens))
+            if rng.random() < 0.5:
+                del tokens[i]
+            else:
+                tokens[i], tokens[j] = tokens[j], tokens[i]
+        expected, _ = parse(original, tokens)
+        actual, _ = parse(bypass, tokens)
+        assert actual == expected, [t for t, _ in tokens]
+        accepted += expected
+        rejected += not expected
+    assert accepted and rejected, (accepted, rejected)
+
+
+def test_fewer_reductions(name: str):
+    """表达式密集的输入: 归约次数减少三成以上(每个操作数只剩一次归约)"""
+    tables, grammar, generator, _ = build(name)
+    source = {
+        "grammar1_arithmetic.json": " + ".join(f"( a * {i} - b / c )" for i in range(20)),
+        "grammar_control_flow.json": "int a ; " + "a := a + 1 * ( a - 2 ) / 3 ; " * 20,
+    }[name]
+    tokens = tables.scanner().scan(source)
+    _, before = parse(tables.parser(lambda production, symbols: {}), tokens)
+    bypass = LRParser(grammar, generator.action_table, generator.goto_table, lambda production, symbols: {})
+    accepted, after = parse(bypass, tokens)
+    assert accepted
+    assert after < before * 0.7, (after, before)
+    print(f"  {name}: 归约次数 {before} -> {after}")
+
+
+def test_tree_expansion(name: str):
+    """提供unit_chains时补回被跳过的层次，语法树与原来相同；不提供时树更浅"""
+    tables, grammar, generator, _ = build(name)
+    source = {
+        "grammar1_arithmetic.json": "a + b * ( c - 1 ) / d",
+        "grammar_control_flow.json": "int a ; if ( a < 3 && a != 2 ) a := a - 1 ; else a := 2 ;",
+    }[name]
+    tokens = tables.scanner().scan(source)
+    original = tables.parser(lambda production, symbols: {})
+    expanded = LRParser(grammar, generator.action_table, generator.goto_table,
+                        lambda production, symbols: {}, unit_chains=generator.unit_chains)
+    collapsed = LRParser(grammar, generator.action_table, generator.goto_table, lambda production, symbols: {})
+    for parser in (original, expanded, collapsed):
+        assert parse(parser, tokens)[0]
+    assert expanded.get_parse_tree().to_dict() == original.get_parse_tree().to_dict()
+    count = lambda node: 1 + sum(count(child) for child in node.children)
+    assert count(collapsed.get_parse_tree()) < count(original.get_parse_tree())
+
+
+def test_selected_productions():
+    """只跳过指定的单产生式；指定非单产生式时报错"""
+    tables, grammar, generator, _ = build("grammar1_arithmetic.json", unit_rules=False)
+    t_to_f = next(p.id for p in grammar.productions if str(p) == "T -> F")
+    tables, grammar, generator, _ = build("grammar1_arithmetic.json", unit_rules=[t_to_f])
+    assert set(generator.unit_chains) == {('T', 'F')}
+    tokens = tables.scanner().scan("a + b")
+    parser = LRParser(grammar, generator.action_table, generator.goto_table, lambda production, symbols: {})
+    accepted, _ = parse(parser, tokens)
+    assert accepted
+    reduced = {str(grammar.productions[i]) for i in parser.production_sequence}
+    assert "T -> F" not in reduced and "E -> T" in reduced
+    try:
+        UnitRuleEliminator(grammar, [0])
+        assert False, "S' -> S 不应被跳过"
+    except ValueError:
+        pass
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("[单产生式归约消除测试]")
+    checks = [(check, name) for check in (test_same_language, test_fewer_reductions, test_tree_expansion)
+              for name in CONFIGS]
+    checks.append((test_selected_productions, None))
+    passed = 0
+    for check, name in checks:
+        label = f"{check.__name__}({name})" if name else check.__name__
+        try:
+            check(name) if name else check()
+            print(f"  [PASS]  {label}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL]  {label}: {e}")
+
+    print(f"\n通过率: {passed}/{len(checks)}")
+    return 0 if passed == len(checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
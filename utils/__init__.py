@@ -1,11 +1,43 @@
 """
 工具函数模块
+
+子模块在第一次访问对应属性时才导入(PEP 562)，使用utils.logger时不会导入可视化工具
 """
 
-from .logger import Logger
-from .file_io import save_json, load_json, save_parsing_tables
-from .visualizer import GraphvizVisualizer
-from .config_loader import ConfigLoader, ConfigValidator, GrammarConfig
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .logger import Logger
+    from .file_io import save_json, load_json, save_parsing_tables
+    from .visualizer import GraphvizVisualizer
+    from .config_loader import ConfigLoader, ConfigValidator, GrammarConfig
+    from .metrics import Metrics
+
+# 导出名 -> 所在子模块
+_EXPORTS = {
+    'Logger': '.logger',
+    'save_json': '.file_io',
+    'load_json': '.file_io',
+    'save_parsing_tables': '.file_io',
+    'GraphvizVisualizer': '.visualizer',
+    'ConfigLoader': '.config_loader',
+    'ConfigValidator': '.config_loader',
+    'GrammarConfig': '.config_loader',
+    'Metrics': '.metrics',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['Logger', 'save_json', 'load_json', 'save_parsing_tables',
-           'GraphvizVisualizer', 'ConfigLoader', 'ConfigValidator', 'GrammarConfig']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
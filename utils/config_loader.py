@@ -5,7 +5,7 @@
 
 import json
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 
 
@@ -28,11 +28,27 @@ class GrammarConfig:
     lexical_rules: List[tuple]  # [(pattern, token), ...]
     grammar_rules: List[str]    # ["S -> E", "E -> E + T", ...]
     test_cases: List[TestCase]
+    # 优先级声明(由低到高): [('left', '+', '-'), ('left', '*', '/'), ...]
+    precedence: List[tuple] = field(default_factory=list)
     
     @property
     def terminals(self) -> List[str]:
         """从词法规则中提取终结符"""
         return [token for _, token in self.lexical_rules]
+    
+    def to_grammar(self):
+        """
+        由语法规则和优先级声明构建文法对象
+        
+        返回:
+            syntax.grammar.Grammar对象(未增广)
+        """
+        from syntax.grammar import Grammar
+        grammar = Grammar()
+        grammar.set_precedence(self.precedence)
+        for rule_str in self.grammar_rules:
+            grammar.add_rule(rule_str)
+        return grammar
 
 
 class ConfigLoader:
@@ -109,6 +125,9 @@ class ConfigLoader:
         # 解析语法规则
         grammar_rules = data.get('grammar_rules', [])
         
+        # 解析优先级声明: [["left", "+", "-"], ["left", "*", "/"], ...]
+        precedence = [tuple(level) for level in data.get('precedence', [])]
+        
         # 解析测试用例
         test_cases = []
         for test in data.get('test_cases', []):
@@ -124,7 +143,8 @@ class ConfigLoader:
             description=data.get('description', ''),
             lexical_rules=lexical_rules,
             grammar_rules=grammar_rules,
-            test_cases=test_cases
+            test_cases=test_cases,
+            precedence=precedence
         )
 
 
@@ -161,5 +181,11 @@ class ConfigValidator:
             if '->' not in rule:
                 print(f"[错误] 语法规则格式错误: {rule}")
                 return False
+        
+        # 验证优先级声明
+        for level in config.precedence:
+            if len(level) < 2 or level[0] not in ('left', 'right', 'nonassoc'):
+                print(f"[错误] 优先级声明格式错误: {list(level)}")
+                return False
                 
         return True
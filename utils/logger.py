@@ -1,33 +1,114 @@
 """
 日志工具类
+基于标准库logging: 各模块通过Logger.get(__name__)取得"compiler"下的子logger，
+消息使用%格式参数，被过滤的级别不会格式化消息
 """
 
-from datetime import datetime
+import os
+import sys
+import logging
+from typing import Optional, TextIO, Union
+
+
+ROOT_NAME = 'compiler'
+
+# 默认级别: INFO输出生成过程，DEBUG额外输出分析器逐步跟踪和语义动作(可由环境变量覆盖)
+DEFAULT_LEVEL = os.environ.get('COMPILER_LOG_LEVEL', 'INFO').upper()
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """输出时才取sys.stdout，使contextlib.redirect_stdout可以照常捕获或屏蔽日志"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_root = logging.getLogger(ROOT_NAME)
+if not _root.handlers:
+    _handler = _StdoutHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    _root.addHandler(_handler)
+    _root.setLevel(DEFAULT_LEVEL)
+    _root.propagate = False
 
 
 class Logger:
-    """简单的日志工具类"""
-    
+    """
+    日志工具类
+
+    用法:
+        logger = Logger.get(__name__)
+        logger.info("    DFA状态数: %d", len(dfa.states))
+        if logger.isEnabledFor(logging.DEBUG):   # 参数本身开销大时再加判断
+            logger.debug("  符号栈: %s", [s.name for s in stack])
+
+        Logger.set_level('DEBUG')                 # 输出分析器逐步跟踪
+        Logger.configure(stream=open('build.log', 'w'), timestamps=True)
+    """
+
+    @staticmethod
+    def get(name: str) -> logging.Logger:
+        """
+        获取模块的logger
+
+        参数:
+            name: 模块名(通常为__name__)
+        返回: 名为 compiler.<name> 的logging.Logger
+        """
+        return _root.getChild(name)
+
+    @staticmethod
+    def set_level(level: Union[int, str]):
+        """设置所有模块的日志级别，如 'DEBUG'、'INFO'、'WARNING'"""
+        _root.setLevel(level.upper() if isinstance(level, str) else level)
+
     @staticmethod
-    def info(message: str):
+    def configure(level: Optional[Union[int, str]] = None,
+                  stream: Optional[TextIO] = None,
+                  timestamps: bool = False):
+        """
+        重新配置日志输出
+
+        参数:
+            level: 日志级别(None表示不变)
+            stream: 输出流(None表示输出时的sys.stdout)
+            timestamps: 是否在每条消息前加时间和级别
+        """
+        if level is not None:
+            Logger.set_level(level)
+        handler = _StdoutHandler() if stream is None else logging.StreamHandler(stream)
+        if timestamps:
+            handler.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s', '%H:%M:%S'))
+        else:
+            handler.setFormatter(logging.Formatter('%(message)s'))
+        for old in list(_root.handlers):
+            _root.removeHandler(old)
+        _root.addHandler(handler)
+
+    @staticmethod
+    def info(message: str, *args):
         """输出信息日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [INFO] {message}")
-    
+        _root.info(message, *args)
+
     @staticmethod
-    def warning(message: str):
+    def warning(message: str, *args):
         """输出警告日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [WARNING] {message}")
-    
+        _root.warning(message, *args)
+
     @staticmethod
-    def error(message: str):
+    def error(message: str, *args):
         """输出错误日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [ERROR] {message}")
-    
+        _root.error(message, *args)
+
     @staticmethod
-    def debug(message: str):
+    def debug(message: str, *args):
         """输出调试日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [DEBUG] {message}")
+        _root.debug(message, *args)
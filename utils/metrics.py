@@ -0,0 +1,127 @@
+"""
+性能统计工具
+在编译器流水线的各个阶段记录耗时和计数，可导出为JSON，也可挂接cProfile
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Optional
+
+
+class Metrics:
+    """
+    性能统计对象
+
+    通过构造参数传给LexicalGenerator、ParserGenerator、Scanner、LRParser，
+    各组件在其中累计:
+    - timings: 每个阶段的耗时(秒)，同名阶段多次执行时累加
+    - counters: 计数(状态数、闭包缓存命中数、移进/归约次数等)
+    - semantic: 按产生式编号统计的语义动作调用次数和耗时
+
+    用法:
+        metrics = Metrics()
+        table, accepting = LexicalGenerator(metrics=metrics).build(rules)
+        ...
+        metrics.save("metrics.json")
+
+    挂接cProfile(只剖析各阶段内部的执行):
+        metrics = Metrics(profiler=cProfile.Profile())
+        ...
+        metrics.dump_profile("pipeline.prof")   # 可用pstats/snakeviz查看
+    """
+
+    def __init__(self, profiler=None):
+        """
+        初始化统计对象
+
+        参数:
+            profiler: 可选的cProfile.Profile对象，在各阶段执行期间启用
+        """
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.semantic: Dict[int, Dict[str, float]] = {}
+        self.profiler = profiler
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        记录一个阶段的耗时(with语句)
+
+        参数:
+            name: 阶段名，如 'syntax.lr1'
+        """
+        if self.profiler is not None and self._depth == 0:
+            self.profiler.enable()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            if self.profiler is not None and self._depth == 0:
+                self.profiler.disable()
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def count(self, name: str, n: int = 1):
+        """计数器加n"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name: str, value: int):
+        """设置计数器(用于状态数等一次性的量)"""
+        self.counters[name] = value
+
+    def record_semantic(self, production_id: int, seconds: float):
+        """记录一次语义动作的耗时"""
+        entry = self.semantic.get(production_id)
+        if entry is None:
+            entry = self.semantic[production_id] = {'calls': 0, 'seconds': 0.0}
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式(便于JSON序列化)"""
+        return {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': dict(self.counters),
+            'semantic': {str(prod_id): {'calls': entry['calls'], 'seconds': round(entry['seconds'], 6)}
+                         for prod_id, entry in sorted(self.semantic.items())},
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """导出为JSON字符串"""
+        import json
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def save(self, path: str):
+        """导出为JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def dump_profile(self, path: str):
+        """把cProfile的统计结果写入文件(pstats格式)"""
+        if self.profiler is None:
+            raise ValueError("创建Metrics时没有提供profiler")
+        self.profiler.dump_stats(path)
+
+    def reset(self):
+        """清空所有统计"""
+        self.timings.clear()
+        self.counters.clear()
+        self.semantic.clear()
+
+    def __str__(self) -> str:
+        lines = ["=== 性能统计 ==="]
+        for name, seconds in self.timings.items():
+            lines.append(f"  {name:<28} {seconds * 1000:>10.2f} ms")
+        for name, value in self.counters.items():
+            lines.append(f"  {name:<28} {value:>10}")
+        return "\n".join(lines)
+
+
+def timed(metrics: Optional[Metrics], name: str):
+    """metrics为None时返回空的上下文管理器，使调用方不必判断"""
+    if metrics is None:
+        return nullcontext()
+    return metrics.phase(name)
@@ -15,7 +15,7 @@ from typing import Dict, List, Any
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lexical import LexicalGenerator
-from syntax import Grammar, ParserGenerator
+from syntax import ParserGenerator
 from utils.config_loader import ConfigLoader
 
 
@@ -34,12 +34,7 @@ def generate_table_html(config_path: str, output_path: str = None, action_table=
     config = loader.load(os.path.basename(config_path))
     
     # 总是构建文法对象，因为后续可视化需要用到产生式信息
-    grammar = Grammar()
-    for rule_str in config.grammar_rules:
-        left, right = rule_str.split('->')
-        left = left.strip()
-        right = [s.strip() for s in right.strip().split()]
-        grammar.add_production(left, right)
+    grammar = config.to_grammar()
     
     if action_table is None or goto_table is None:
         # 生成语法分析器